@@ -5,6 +5,14 @@ import type { ForceGraphMethods } from "react-force-graph-2d";
 import * as d3 from "d3-force";
 import useGraphSearch from "../../hooks/useGraphSearch";
 import type { GraphCollabT, LinkCollabT, NodeCollabT } from "../../types/graph";
+import { expandNetwork } from "../../utils/graphSchema";
+import { decodeNetworkBinary } from "../../utils/networkBinary";
+import {
+  createShardLoader,
+  fetchManifest,
+  fetchOverview,
+} from "../../utils/networkShards";
+import type { ShardLoader } from "../../utils/networkShards";
 
 type CollabNetworkGraphProps = {
   resetViewFlag: boolean;
@@ -82,12 +90,55 @@ const drawLabel = (
   ctx.fillText(text, x, y);
 };
 
+// 이웃 집합 구성 + 미리 계산된 좌표 고정 (반환: 좌표가 모두 있는지)
+const prepareGraph = ({ nodes, links }: GraphCollabT) => {
+  const idToNode = new Map<string | number, NodeCollabT>();
+  const hasLayout =
+    nodes.length > 0 &&
+    nodes.every(
+      (node) => typeof node.x === "number" && typeof node.y === "number"
+    );
+
+  nodes.forEach((node) => {
+    node.neighbors = new Set();
+    idToNode.set(node.id, node);
+    if (hasLayout) {
+      // 좌표 고정 (드래그한 노드만 움직임)
+      node.fx = node.fx ?? node.x;
+      node.fy = node.fy ?? node.y;
+    } else if (node.x === undefined) {
+      node.y = (node.y ?? 0) - 200;
+    }
+  });
+
+  links.forEach((link) => {
+    const a = idToNode.get(
+      typeof link.source === "object"
+        ? (link.source as NodeCollabT).id
+        : link.source
+    );
+    const b = idToNode.get(
+      typeof link.target === "object"
+        ? (link.target as NodeCollabT).id
+        : link.target
+    );
+    if (a && b) {
+      a.neighbors?.add(b.id);
+      b.neighbors?.add(a.id);
+    }
+  });
+
+  return hasLayout;
+};
+
 export default function CollabNetworkGraph({
   resetViewFlag,
   searchTerm,
   onNoResult,
 }: CollabNetworkGraphProps) {
   const [data, setData] = useState<GraphCollabT | null>(null);
+  // network_data.json에 미리 계산된 좌표(x, y)가 있으면 브라우저에서 시뮬레이션하지 않음
+  const [precomputed, setPrecomputed] = useState(false);
   const [selectedNode, setSelectedNode] = useState<NodeCollabT | null>(null);
 
   const fgRef = useRef<ForceGraphMethods<NodeCollabT, LinkCollabT> | undefined>(
@@ -116,50 +167,62 @@ export default function CollabNetworkGraph({
     return () => window.removeEventListener("resize", updateSize);
   }, []);
 
-  // JSON 로드
+  // 커뮤니티 분할 로더 (개요 노드 클릭 시 해당 커뮤니티를 먼저 받음)
+  const shardLoaderRef = useRef<ShardLoader | null>(null);
+
+  // 네트워크 로드
+  // 1) 분할 파일(network_shards/)이 있으면 개요 그래프를 먼저 그리고 커뮤니티를 하나씩 합침
+  // 2) 없으면 바이너리(network_data.bin), 그것도 없으면 JSON
   useEffect(() => {
-    fetch("/graph/network_data.json")
-      .then((res) => res.json())
-      .then((json: GraphCollabT) => {
-        const { nodes, links } = json;
-        const idToNode = new Map<string | number, NodeCollabT>();
-
-        nodes.forEach((node) => {
-          node.neighbors = new Set();
-          idToNode.set(node.id, node);
-          node.y = (node.y ?? 0) - 200;
-        });
-
-        links.forEach((link) => {
-          const a = idToNode.get(
-            typeof link.source === "object"
-              ? (link.source as NodeCollabT).id
-              : link.source
-          );
-          const b = idToNode.get(
-            typeof link.target === "object"
-              ? (link.target as NodeCollabT).id
-              : link.target
-          );
-          if (a && b) {
-            a.neighbors?.add(b.id);
-            b.neighbors?.add(a.id);
-          }
-        });
+    let cancelled = false;
+
+    const show = (graph: GraphCollabT) => {
+      if (cancelled) return;
+      setPrecomputed(prepareGraph(graph));
+      setData(graph);
+    };
 
-        setData({ nodes, links });
+    // schema v2(노드 번호/영화 표 참조)면 기존 모양으로 펼침
+    const loadJson = () =>
+      fetch("/graph/network_data.json")
+        .then((res) => res.json())
+        .then(expandNetwork);
+
+    const loadFull = () =>
+      fetch("/graph/network_data.bin")
+        .then((res) => {
+          if (!res.ok) throw new Error(`HTTP ${res.status}`);
+          return res.arrayBuffer();
+        })
+        .then(decodeNetworkBinary)
+        .catch(loadJson)
+        .then(show);
+
+    fetchManifest()
+      .then(async (manifest) => {
+        const overview = await fetchOverview(manifest);
+        if (cancelled) return;
+        const loader = createShardLoader(manifest, overview, show);
+        shardLoaderRef.current = loader;
+        loader.start();
       })
+      .catch(loadFull)
       .catch((err) => {
         console.error("네트워크 데이터 로드 실패:", err);
-        setData({ nodes: [], links: [] });
+        show({ nodes: [], links: [] });
       });
+
+    return () => {
+      cancelled = true;
+      shardLoaderRef.current?.stop();
+    };
   }, []);
 
   const graphData = useMemo(() => data ?? { nodes: [], links: [] }, [data]);
 
-  // 포스 설정
+  // 포스 설정 (좌표가 미리 계산된 경우 생략)
   useEffect(() => {
-    if (!fgRef.current || !graphData.nodes.length) return;
+    if (!fgRef.current || !graphData.nodes.length || precomputed) return;
 
     const fg = fgRef.current;
 
@@ -197,7 +260,7 @@ export default function CollabNetworkGraph({
     );
 
     fg.d3ReheatSimulation();
-  }, [graphData]);
+  }, [graphData, precomputed]);
 
   // 선택 노드 zoom
   useEffect(() => {
@@ -230,6 +293,11 @@ export default function CollabNetworkGraph({
     searchKey: "label",
 
     onMatch: (target) => {
+      // 개요 노드면 그 커뮤니티부터 받음 (로드되면 다시 검색됨)
+      if (target.members !== undefined) {
+        shardLoaderRef.current?.prioritize(target.community);
+        return;
+      }
       setSelectedNode(target as NodeCollabT);
 
       if (!fgRef.current || !data) return;
@@ -292,9 +360,13 @@ export default function CollabNetworkGraph({
           graphData={graphData}
           backgroundColor="transparent"
           nodeId="id"
-          nodeLabel={(node) => `${node.label} (${node.role ?? "-"})`}
-          warmupTicks={70}
-          cooldownTicks={300}
+          nodeLabel={(node) =>
+            node.members !== undefined
+              ? `커뮤니티 ${node.community} (${node.members}명, 불러오는 중)`
+              : `${node.label} (${node.role ?? "-"})`
+          }
+          warmupTicks={precomputed ? 0 : 70}
+          cooldownTicks={precomputed ? 0 : 300}
           onBackgroundClick={() => setSelectedNode(null)}
           linkColor={(link: LinkCollabT) => {
             if (!selectedNode) return "rgba(255,255,255,0.25)";
@@ -332,6 +404,25 @@ export default function CollabNetworkGraph({
             const node = rawNode as NodeCollabT & { x: number; y: number };
             const color = COLORS[(node.community ?? 0) % COLORS.length];
 
+            // 아직 로드되지 않은 커뮤니티: 인원에 비례한 원 + 대표 인물
+            if (node.members !== undefined) {
+              const radius = 4 + Math.sqrt(node.members) * 2;
+              ctx.beginPath();
+              ctx.globalAlpha = selectedNode ? 0.08 : 0.6;
+              ctx.arc(node.x, node.y, radius, 0, 2 * Math.PI);
+              ctx.fillStyle = color;
+              ctx.fill();
+              ctx.globalAlpha = 1;
+              drawLabel(
+                ctx,
+                `${node.label} 외 ${node.members - 1}명`,
+                node.x,
+                node.y,
+                11 / globalScale
+              );
+              return;
+            }
+
             const isMain = selectedNode != null && selectedNode.id == node.id;
             const isNeighbor =
               selectedNode != null &&
@@ -382,7 +473,13 @@ export default function CollabNetworkGraph({
               drawLabel(ctx, node.label, node.x, node.y, fontSize);
             }
           }}
-          onNodeClick={(node) => setSelectedNode(node as NodeCollabT)}
+          onNodeClick={(node) => {
+            if (node.members !== undefined) {
+              shardLoaderRef.current?.prioritize(node.community ?? -1);
+              return;
+            }
+            setSelectedNode(node as NodeCollabT);
+          }}
           enableNodeDrag
         />
       </div>
@@ -1,7 +1,7 @@
 // src/components/GraphPage/EgoGraph.tsx
 import { useCallback, useEffect, useMemo, useRef, useState } from "react";
 import ForceGraph2D from "react-force-graph-2d";
-import { collection, doc, getDoc, getDocs } from "firebase/firestore";
+import { doc, getDoc } from "firebase/firestore";
 import { db } from "../../services/data/firebaseConfig";
 
 import type {
@@ -10,6 +10,12 @@ import type {
   LinkObject,
 } from "react-force-graph-2d";
 import type { GraphEgoT, LinkEgoT, NodeEgoT } from "../../types/graph";
+import { expandEgoGraph } from "../../utils/graphSchema";
+import {
+  loadEgoIndex,
+  lookupEgoPrefix,
+  type EgoIndexEntry,
+} from "../../utils/egoIndex";
 
 // 기본 중심 인물 ID
 const DEFAULT_EGO_ID = "10047370";
@@ -29,11 +35,13 @@ export default function EgoGraph({
     staff: "#E040FB",
   };
 
-  const [allPersons, setAllPersons] = useState<{ id: string; label: string }[]>(
-    []
-  );
+  // 검색 색인(egoIndex)의 영화인 목록 (egoGraphs 전체를 읽지 않음)
+  const [allPersons, setAllPersons] = useState<EgoIndexEntry[]>([]);
 
   const [data, setData] = useState<GraphEgoT | null>(null);
+  // 이웃이 많은 인물은 협업이 많은 순으로 본 문서에 일부만 있고 나머지는 페이지 문서로 나뉨
+  const [pages, setPages] = useState({ loaded: 0, total: 0, remaining: 0 });
+  const [loadingMore, setLoadingMore] = useState(false);
   const [filteredData, setFilteredData] = useState<GraphEgoT | null>(null);
 
   const [centerPerson, setCenterPerson] = useState<{
@@ -68,34 +76,50 @@ export default function EgoGraph({
       : Math.floor(size.height * 0.82);
   }, [size]);
 
-  // Firestore 전체 egoGraphs 목록 불러오기
-  async function loadAllEgoGraphs() {
-    const ref = collection(db, "egoGraphs");
-    const snap = await getDocs(ref);
-
-    return snap.docs.map((d) => {
-      const raw = d.data() as any;
-      return { id: d.id, label: raw.label ?? "" };
-    });
-  }
-
+  // 검색 색인에서 영화인 목록 불러오기
   useEffect(() => {
     async function init() {
-      const list = await loadAllEgoGraphs();
+      const list = await loadEgoIndex();
       setAllPersons(list);
     }
     init();
   }, []);
 
   // 특정 인물 그래프 가져오기
-  async function fetchEgoGraph(id: string): Promise<GraphEgoT | null> {
+  async function fetchEgoGraph(
+    id: string
+  ): Promise<{ graph: GraphEgoT; pages: number; total: number } | null> {
     try {
       const ref = doc(db, "egoGraphs", id);
       const snap = await getDoc(ref);
       if (!snap.exists()) return null;
 
+      // schema v2 문서(노드 위치/영화 표 참조)는 기존 모양으로 펼침
       const raw = snap.data() as any;
-      return { nodes: raw.nodes, links: raw.links };
+      const graph = expandEgoGraph(raw);
+      return {
+        graph,
+        pages: raw.meta?.pages ?? 0,
+        total: raw.meta?.totalNodeCount ?? graph.nodes.length,
+      };
+    } catch (e) {
+      console.error("Firestore Error:", e);
+      return null;
+    }
+  }
+
+  // 넘친 이웃 페이지 하나 가져오기
+  async function fetchEgoPage(
+    id: string,
+    page: number,
+    previous: GraphEgoT["nodes"]
+  ): Promise<GraphEgoT | null> {
+    try {
+      const snap = await getDoc(
+        doc(db, "egoGraphs", id, "pages", String(page))
+      );
+      if (!snap.exists()) return null;
+      return expandEgoGraph(snap.data(), previous);
     } catch (e) {
       console.error("Firestore Error:", e);
       return null;
@@ -105,10 +129,16 @@ export default function EgoGraph({
   const loadGraph = useCallback(async (id: string) => {
     const fg = fgRef.current;
 
-    const d = await fetchEgoGraph(id);
-    if (!d) return;
+    const result = await fetchEgoGraph(id);
+    if (!result) return;
+    const d = result.graph;
 
     setData(d);
+    setPages({
+      loaded: 0,
+      total: result.pages,
+      remaining: result.total - d.nodes.length,
+    });
 
     const center = d.nodes.find((n) => String(n.id) === id);
     if (center) {
@@ -126,6 +156,30 @@ export default function EgoGraph({
     }, 600);
   }, []);
 
+  // 다음 페이지 이웃을 받아 현재 그래프에 이어 붙임
+  const loadMore = useCallback(async () => {
+    if (!data || !centerPerson || pages.loaded >= pages.total) return;
+
+    setLoadingMore(true);
+    const page = await fetchEgoPage(
+      centerPerson.id,
+      pages.loaded + 1,
+      data.nodes
+    );
+    setLoadingMore(false);
+    if (!page) return;
+
+    setData({
+      nodes: [...data.nodes, ...page.nodes],
+      links: [...data.links, ...page.links],
+    });
+    setPages({
+      ...pages,
+      loaded: pages.loaded + 1,
+      remaining: pages.remaining - page.nodes.length,
+    });
+  }, [data, centerPerson, pages]);
+
   useEffect(() => {
     if (allPersons.length === 0) return;
 
@@ -207,21 +261,41 @@ export default function EgoGraph({
   );
 
   // 검색 → 자동 로드
+  // 목록이 아직 없으면 이름 첫 글자 버킷 하나만 읽어 찾음
+  const searchedRef = useRef("");
   useEffect(() => {
-    if (!searchTerm.trim() || allPersons.length === 0) return;
+    if (!searchTerm.trim() || searchedRef.current === searchTerm) return;
 
     const keyword = searchTerm.trim().toLowerCase();
+    let cancelled = false;
+
+    async function search() {
+      let found: EgoIndexEntry | undefined;
+      if (allPersons.length > 0) {
+        found = allPersons.find((p) =>
+          p.label.toLowerCase().includes(keyword)
+        );
+      } else {
+        const bucket = await lookupEgoPrefix(keyword);
+        // 버킷에 없으면 (이름 중간에 있을 수 있음) 목록이 도착한 뒤 다시 찾음
+        if (!bucket?.length) return;
+        found = bucket[0];
+      }
+      if (cancelled) return;
+      searchedRef.current = searchTerm;
 
-    const found = allPersons.find((p) =>
-      p.label.toLowerCase().includes(keyword)
-    );
+      if (!found) {
+        onNoResult();
+        return;
+      }
 
-    if (!found) {
-      onNoResult();
-      return;
+      loadGraph(found.id);
     }
+    search();
 
-    loadGraph(found.id);
+    return () => {
+      cancelled = true;
+    };
   }, [searchTerm, allPersons, loadGraph, onNoResult]);
 
   useEffect(() => {
@@ -230,6 +304,7 @@ export default function EgoGraph({
     setCenterPerson(null);
     setData(null);
     setFilteredData(null);
+    setPages({ loaded: 0, total: 0, remaining: 0 });
 
     fgRef.current.d3Force("charge")?.strength(-200);
     fgRef.current.d3Force("link")?.strength(0.1);
@@ -315,6 +390,19 @@ export default function EgoGraph({
           }}
           onNodeClick={(node) => loadGraph(String(node.id))}
         />
+
+        {/* 넘친 이웃 더 불러오기 */}
+        {pages.loaded < pages.total && (
+          <button
+            onClick={loadMore}
+            disabled={loadingMore}
+            className="absolute bottom-4 left-1/2 -translate-x-1/2 px-4 py-2 bg-[#FFE66D] hover:bg-[#FFF176] text-black rounded-lg font-bold transition-colors shadow-md disabled:opacity-60"
+          >
+            {loadingMore
+              ? "불러오는 중· · ·"
+              : `협업자 더 보기 (${pages.remaining}명 남음)`}
+          </button>
+        )}
       </div>
     </div>
   );
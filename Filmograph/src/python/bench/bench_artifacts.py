@@ -0,0 +1,101 @@
+"""
+pickle vs Arrow IPC(memory map) 로드 벤치마크
+
+합성 영화인-영화 관계 표를 두 형식으로 저장한 뒤,
+각 로드 방식을 별도 프로세스에서 실행해 로드 시간과 RSS 증가량을 비교함
+
+사용법:
+    python bench_artifacts.py --rows 2000000
+"""
+import argparse
+import os
+import subprocess
+import sys
+import tempfile
+
+import numpy as np
+import pandas as pd
+
+SCRIPTS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "scripts")
+sys.path.insert(0, SCRIPTS_DIR)
+
+from artifacts import RELATION_DICTIONARY_COLUMNS, write_frame  # noqa: E402
+
+ROLES = np.array(["배우", "감독", "음악", "촬영", "각본", "미술"], dtype=object)
+
+# 각 로드 방식 (별도 프로세스에서 실행)
+LOADERS = {
+    "pickle 전체": "import pandas as pd; obj = pd.read_pickle(PKL)",
+    "Arrow 전체 (mmap)": "from artifacts import read_table; obj = read_table(ARROW)",
+    "Arrow 2개 컬럼 (mmap)": "from artifacts import read_table; obj = read_table(ARROW, ['person_name', 'movie_title'])",
+    "Arrow 4개 컬럼 → pandas": (
+        "from artifacts import read_relations; "
+        "obj = read_relations(ARROW, ['person_id', 'person_name', 'person_role', 'movie_title'])"
+    ),
+}
+
+CHILD = """
+import sys, time
+sys.path.insert(0, {scripts!r})
+PKL, ARROW = {pkl!r}, {arrow!r}
+
+def rss():
+    with open('/proc/self/status') as f:
+        for line in f:
+            if line.startswith('VmRSS:'):
+                return int(line.split()[1]) * 1024
+    return 0
+
+import pandas, pyarrow
+before = rss()
+started = time.perf_counter()
+{code}
+elapsed = time.perf_counter() - started
+print(elapsed, rss() - before)
+"""
+
+
+def make_relations(rows, seed=42):
+    rng = np.random.default_rng(seed)
+    num_persons = max(rows // 20, 1)
+    num_movies = max(rows // 8, 1)
+    person = rng.integers(0, num_persons, rows)
+    movie = rng.zipf(1.5, rows) % num_movies
+    return pd.DataFrame({
+        "person_id": (10000000 + person).astype(str),
+        "person_name": np.char.add("영화인", person.astype(str)).astype(object),
+        "person_role": ROLES[person % len(ROLES)],
+        "movie_id": movie.astype(float),
+        "movie_title": np.char.add("영화", movie.astype(str)).astype(object),
+        "character_name": None,
+    })
+
+
+def main():
+    parser = argparse.ArgumentParser(description="pickle vs Arrow 로드 벤치마크")
+    parser.add_argument("--rows", type=int, default=2_000_000)
+    args = parser.parse_args()
+
+    df = make_relations(args.rows)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        pkl = os.path.join(tmp, "movies_data.pkl")
+        arrow = os.path.join(tmp, "movies_data.arrow")
+        df.to_pickle(pkl)
+        write_frame(df, arrow, dictionary_columns=RELATION_DICTIONARY_COLUMNS)
+        del df
+
+        print(f"행 수: {args.rows:,}")
+        print(f"파일 크기: pickle {os.path.getsize(pkl) / 1e6:.1f} MB, "
+              f"Arrow {os.path.getsize(arrow) / 1e6:.1f} MB\n")
+        print(f"{'방식':28s} {'로드 시간':>10s} {'RSS 증가':>12s}")
+
+        for label, code in LOADERS.items():
+            script = CHILD.format(scripts=SCRIPTS_DIR, pkl=pkl, arrow=arrow, code=code)
+            out = subprocess.run([sys.executable, "-c", script], capture_output=True, text=True, check=True)
+            elapsed, rss = out.stdout.split()
+            print(f"{label:28s} {float(elapsed) * 1000:8.1f}ms {int(rss) / 1e6:10.1f}MB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,129 @@
+"""
+중심성 벤치마크 (centrality.py)
+
+합성 영화인 문서로 02 단계와 같은 협업 그래프를 만든 뒤
+- PageRank / 고유벡터: 실행 시간, 반복 횟수, networkx 결과와의 최대 차이 (--nx-max명 이하일 때만)
+- 매개 중심성: 출발점 전체(정확한 값)와 표본 수별 근사를 비교
+  (스피어만 순위 상관, 상위 100명 일치율, 상위 100명의 평균 상대 오차, 표본 절반끼리 일치율, 실행 시간)
+  표본마다 --repeats개 seed로 돌려 평균
+
+사용법:
+    python bench_centrality.py --persons 10000
+    python bench_centrality.py --persons 20000 --samples 64 256 1024 --workers 4
+"""
+import argparse
+import contextlib
+import importlib
+import io
+import os
+import sys
+import tempfile
+import time
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(BENCH_DIR, "..", "scripts"))
+sys.path.insert(0, BENCH_DIR)
+
+import numpy as np  # noqa: E402
+
+from artifacts import save_edges  # noqa: E402
+from centrality import (  # noqa: E402
+    betweenness, eigenvector, pagerank, rank_correlation, split_half, top_overlap
+)
+from csr_graph import CSRGraph  # noqa: E402
+from firestore_decode import PersonMovieColumns  # noqa: E402
+from metrics import default_workers  # noqa: E402
+from synthetic_persons import documents, generate  # noqa: E402
+
+TOP_K = 100
+
+
+def build_graph(num_persons, seed, workdir):
+    """합성 문서 → 02 build_network → CSR 그래프 (작업 프로세스용 Arrow 파일도 저장)"""
+    build_network = importlib.import_module("02_build_network")
+    columns = PersonMovieColumns()
+    for doc in documents(generate(num_persons, seed=seed)):
+        columns.add_document(doc)
+    df = columns.to_frame().drop_duplicates(subset=["person_name", "movie_title"])
+    with contextlib.redirect_stdout(io.StringIO()):
+        projection, _ = build_network.build_network(df)
+
+    graph = CSRGraph.from_projection(projection)
+    paths = (os.path.join(workdir, "network.adjacency.arrow"), os.path.join(workdir, "network.edges.arrow"))
+    graph.save_adjacency(paths[0])
+    save_edges(projection, paths[1])
+    weight_key = "strength" if graph.strength is not None else "weight"
+    return graph, getattr(graph, weight_key), weight_key, paths
+
+
+def compare_networkx(graph, weight, scores):
+    """networkx 결과와의 최대 차이 (PageRank, 고유벡터), networkx 실행 시간"""
+    import networkx as nx
+
+    G = graph.to_networkx(edge_attrs=())
+    for e, (u, v) in enumerate(zip(graph.src.tolist(), graph.dst.tolist())):
+        G[u][v]["weight"] = float(weight[e])
+    report = {}
+    for name, func in (("pagerank", nx.pagerank), ("eigenvector", nx.eigenvector_centrality)):
+        started = time.perf_counter()
+        kwargs = {"max_iter": 1000} if name == "eigenvector" else {}
+        result = func(G, weight="weight", **kwargs)
+        elapsed = time.perf_counter() - started
+        expected = np.asarray([result[i] for i in range(graph.num_nodes)])
+        report[name] = (np.abs(scores[name] - expected).max(), elapsed)
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description="중심성 벤치마크")
+    parser.add_argument("--persons", type=int, default=10000)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--samples", type=int, nargs="+", default=[16, 32, 64, 128, 256, 512, 1024])
+    parser.add_argument("--repeats", type=int, default=3)
+    parser.add_argument("--workers", type=int, default=0, help="매개 중심성 프로세스 수 (0이면 CPU 수)")
+    parser.add_argument("--nx-max", type=int, default=20000, help="이 노드 수 이하면 networkx와 비교")
+    args = parser.parse_args()
+    workers = args.workers or default_workers()
+
+    with tempfile.TemporaryDirectory() as workdir:
+        graph, weight, weight_key, paths = build_graph(args.persons, args.seed, workdir)
+        print(f"영화인 {args.persons:,}명 → 노드 {graph.num_nodes:,}개, 엣지 {graph.num_edges:,}개 "
+              f"({weight_key} 가중치), 프로세스 {workers}개\n")
+
+        scores = {}
+        for name, func in (("pagerank", pagerank), ("eigenvector", eigenvector)):
+            started = time.perf_counter()
+            scores[name], iterations = func(graph, weight)
+            print(f"{name:12s}: {(time.perf_counter() - started) * 1000:9.1f}ms ({iterations}회 반복)")
+        if graph.num_nodes <= args.nx_max:
+            for name, (diff, elapsed) in compare_networkx(graph, weight, scores).items():
+                print(f"   networkx {name:12s}: 최대 차이 {diff:.1e}, {elapsed * 1000:9.1f}ms")
+
+        started = time.perf_counter()
+        exact, _, _ = betweenness(graph, samples=0, workers=workers, paths=paths)
+        exact_sec = time.perf_counter() - started
+        print(f"\nbetweenness 정확한 값 (출발점 {graph.num_nodes:,}개): {exact_sec:.2f}초 "
+              f"({exact_sec / graph.num_nodes * 1000:.2f}ms/출발점)\n")
+
+        top = np.argsort(-exact, kind="stable")[:TOP_K]
+        print(f"{'표본':>6s} {'시간':>9s} {'순위 상관':>9s} {f'상위{TOP_K} 일치':>10s} "
+              f"{'상대 오차':>9s} {'절반 일치':>9s}")
+        for samples in args.samples:
+            if samples >= graph.num_nodes:
+                continue
+            rows = []
+            for repeat in range(args.repeats):
+                started = time.perf_counter()
+                estimate, parts, _ = betweenness(graph, samples=samples, seed=args.seed + repeat,
+                                                 workers=workers, paths=paths)
+                elapsed = time.perf_counter() - started
+                error = np.abs(estimate[top] - exact[top]) / np.maximum(exact[top], 1e-12)
+                half = split_half(parts, TOP_K)
+                rows.append((elapsed, rank_correlation(estimate, exact), top_overlap(estimate, exact, TOP_K),
+                             error.mean(), np.nan if half is None else half))
+            elapsed, spearman, overlap, error, half = np.nanmean(np.asarray(rows, dtype=np.float64), axis=0)
+            print(f"{samples:6d} {elapsed:8.2f}s {spearman:9.3f} {overlap:10.0%} {error:9.1%} {half:9.0%}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,156 @@
+"""
+커뮤니티 탐지 백엔드 벤치마크
+
+실제 네트워크(output/network.*.arrow가 있으면)와 합성 planted-partition 그래프에서
+백엔드별 실행 시간, 커뮤니티 수, 모듈성을 표로 비교함
+(모듈성은 모든 백엔드에 같은 식을 적용: community_backends.modularity)
+
+--changed를 주면 증분 탐지도 비교: 합성 그래프에서 일부 노드의 엣지를 다른 커뮤니티로 옮긴 뒤
+이전 결과에서 출발하는 incremental_communities와 전체 재탐지의 시간, 모듈성, id 유지 비율을 잼
+
+사용법:
+    python bench_community.py --sizes 10000 100000
+    python bench_community.py --backends igraph-louvain igraph-leiden --sizes 1000000
+    python bench_community.py --backends igraph-leiden --sizes 100000 --changed 0.001 0.01
+"""
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+SCRIPTS_DIR = os.path.join(BENCH_DIR, "..", "scripts")
+OUTPUT_DIR = os.path.join(BENCH_DIR, "..", "output")
+sys.path.insert(0, SCRIPTS_DIR)
+
+from community_backends import BACKENDS, detect_communities, incremental_communities, modularity, stable_ids  # noqa: E402
+from csr_graph import CSRGraph  # noqa: E402
+
+
+def planted_partition(num_nodes, avg_degree=10, num_communities=None, mixing=0.2, seed=42,
+                      return_communities=False):
+    """
+    커뮤니티 구조가 있는 합성 그래프
+    엣지마다 확률 1-mixing으로 같은 커뮤니티, mixing으로 임의의 노드와 연결
+    return_communities=True면 (그래프, 심어둔 커뮤니티 id) 반환
+    """
+    rng = np.random.default_rng(seed)
+    num_communities = num_communities or max(num_nodes // 200, 2)
+    community = np.sort(rng.integers(0, num_communities, num_nodes))
+    starts = np.searchsorted(community, np.arange(num_communities))
+    sizes = np.bincount(community, minlength=num_communities)
+
+    num_edges = num_nodes * avg_degree // 2
+    u = rng.integers(0, num_nodes, num_edges)
+    same = rng.random(num_edges) >= mixing
+    v = rng.integers(0, num_nodes, num_edges)
+    cu = community[u[same]]
+    v[same] = starts[cu] + (rng.random(same.sum()) * sizes[cu]).astype(np.int64)
+
+    src, dst = np.minimum(u, v), np.maximum(u, v)
+    keys = np.unique(src[src != dst].astype(np.int64) * num_nodes + dst[src != dst])
+    src = (keys // num_nodes).astype(np.int32)
+    dst = (keys % num_nodes).astype(np.int32)
+    indptr, neighbors, edge_ids = CSRGraph.build_adjacency(src, dst, num_nodes)
+    graph = CSRGraph(indptr, neighbors, edge_ids, src, dst, np.ones(len(src), dtype=np.int32))
+    return (graph, community.astype(np.int32)) if return_communities else graph
+
+
+def rewire(graph, community, fraction, seed=0):
+    """
+    노드 일부(fraction)의 엣지를 모두 지우고 같은 수만큼 임의의 다른 커뮤니티 노드와 다시 연결
+    반환: (새 그래프, 바뀐 노드 id)
+    """
+    rng = np.random.default_rng(seed)
+    n = graph.num_nodes
+    changed = np.sort(rng.choice(n, size=max(int(n * fraction), 1), replace=False))
+    is_changed = np.zeros(n, dtype=bool)
+    is_changed[changed] = True
+
+    keep = ~(is_changed[graph.src] | is_changed[graph.dst])
+    target = rng.integers(0, community.max() + 1, len(changed))
+    by_community = np.argsort(community, kind="stable")
+    starts = np.searchsorted(community[by_community], np.arange(community.max() + 2))
+    degree = np.maximum(graph.degree[changed], 1)
+    u = np.repeat(changed, degree)
+    t = np.repeat(target, degree)
+    v = by_community[starts[t] + (rng.random(len(u)) * (starts[t + 1] - starts[t])).astype(np.int64)]
+
+    src = np.concatenate([graph.src[keep], np.minimum(u, v)]).astype(np.int64)
+    dst = np.concatenate([graph.dst[keep], np.maximum(u, v)]).astype(np.int64)
+    keys = np.unique(src[src != dst] * n + dst[src != dst])
+    src, dst = (keys // n).astype(np.int32), (keys % n).astype(np.int32)
+    indptr, neighbors, edge_ids = CSRGraph.build_adjacency(src, dst, n)
+    return CSRGraph(indptr, neighbors, edge_ids, src, dst, np.ones(len(src), dtype=np.int32)), changed
+
+
+def run_incremental(name, graph, community, backend, fractions, seed):
+    """이전 결과(전체 탐지) → 그래프 일부 변경 → 증분 vs 전체 재탐지"""
+    previous = detect_communities(graph, backend, seed=seed)
+    print(f"\n[{name} 증분, {backend}]")
+    print(f"{'바뀐 비율':<10}{'증분(초)':>10}{'전체(초)':>10}{'배':>8}{'증분 Q':>10}{'전체 Q':>10}{'id 유지':>10}")
+    for fraction in fractions:
+        changed_graph, changed = rewire(graph, community, fraction, seed)
+
+        started = time.perf_counter()
+        membership, _ = incremental_communities(changed_graph, previous, changed)
+        incremental_time = time.perf_counter() - started
+
+        started = time.perf_counter()
+        full = stable_ids(detect_communities(changed_graph, backend, seed=seed), previous)
+        full_time = time.perf_counter() - started
+
+        print(f"{fraction:<10.2%}{incremental_time:>10.3f}{full_time:>10.3f}"
+              f"{full_time / max(incremental_time, 1e-9):>8.1f}"
+              f"{modularity(changed_graph, membership):>10.4f}{modularity(changed_graph, full):>10.4f}"
+              f"{(membership == previous).mean():>10.1%}")
+
+
+def load_network():
+    adjacency = os.path.join(OUTPUT_DIR, "network.adjacency.arrow")
+    edges = os.path.join(OUTPUT_DIR, "network.edges.arrow")
+    if not (os.path.exists(adjacency) and os.path.exists(edges)):
+        return None
+    return CSRGraph.load(adjacency, edges, edge_columns=["weight"])
+
+
+def run(name, graph, backends, seed):
+    print(f"\n[{name}] 노드 {graph.num_nodes:,}개, 엣지 {graph.num_edges:,}개")
+    print(f"{'백엔드':<18}{'시간(초)':>10}{'커뮤니티':>10}{'모듈성':>10}")
+    for backend in backends:
+        try:
+            started = time.perf_counter()
+            membership = detect_communities(graph, backend, seed=seed)
+            elapsed = time.perf_counter() - started
+        except ImportError as e:
+            print(f"{backend:<18}  건너뜀 ({e})")
+            continue
+        q = modularity(graph, membership)
+        print(f"{backend:<18}{elapsed:>10.3f}{len(np.unique(membership)):>10,}{q:>10.4f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="커뮤니티 탐지 백엔드 벤치마크")
+    parser.add_argument("--backends", nargs="+", default=list(BACKENDS), choices=list(BACKENDS))
+    parser.add_argument("--sizes", nargs="+", type=int, default=[10000, 100000], help="합성 그래프 노드 수")
+    parser.add_argument("--avg-degree", type=int, default=10)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--changed", nargs="+", type=float, default=[],
+                        help="증분 탐지 비교: 바꿀 노드 비율 (예: 0.001 0.01)")
+    args = parser.parse_args()
+
+    network = load_network()
+    if network is not None:
+        run("협업 네트워크", network, args.backends, args.seed)
+
+    for size in args.sizes:
+        graph, community = planted_partition(size, args.avg_degree, seed=args.seed, return_communities=True)
+        run(f"합성 {size:,}", graph, args.backends, args.seed)
+        if args.changed:
+            run_incremental(f"합성 {size:,}", graph, community, args.backends[0], args.changed, args.seed)
+
+
+if __name__ == "__main__":
+    main()
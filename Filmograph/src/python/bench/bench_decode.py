@@ -0,0 +1,178 @@
+"""
+영화인 문서 파싱 마이크로 벤치마크
+
+기존 방식: response.json() → parse_firestore_document → person_movie_list(dict 리스트) → DataFrame
+새 방식:   PageStreamParser(조각 단위) → decode_document → PersonMovieColumns.add_person → DataFrame
+직접 디코딩: PageStreamParser(조각 단위) → PersonMovieColumns.add_document (영화인/배역 dict 없음) → DataFrame
+
+rows/s와 tracemalloc 기준 최대 메모리를 비교함
+
+사용법:
+    python bench_decode.py --persons 20000 --chars 20
+"""
+import argparse
+import json
+import os
+import random
+import sys
+import time
+import tracemalloc
+
+import pandas as pd
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "scripts"))
+
+from firestore_decode import PageStreamParser, PersonMovieColumns, decode_document  # noqa: E402
+
+
+def legacy_parse_firestore_document(doc):
+    """기존 01_load_from_firestore.py의 파서 (비교용 복사본)"""
+    if 'fields' not in doc:
+        return {}
+
+    result = {}
+    for key, value in doc['fields'].items():
+        if 'stringValue' in value:
+            result[key] = value['stringValue']
+        elif 'integerValue' in value:
+            result[key] = int(value['integerValue'])
+        elif 'arrayValue' in value:
+            result[key] = []
+            for item in value['arrayValue'].get('values', []):
+                if 'stringValue' in item:
+                    result[key].append(item['stringValue'])
+                elif 'mapValue' in item:
+                    obj = {}
+                    for map_key, map_value in item['mapValue'].get('fields', {}).items():
+                        if 'stringValue' in map_value:
+                            obj[map_key] = map_value['stringValue']
+                        elif 'integerValue' in map_value:
+                            obj[map_key] = int(map_value['integerValue'])
+                    result[key].append(obj)
+        elif 'timestampValue' in value:
+            result[key] = value['timestampValue']
+    return result
+
+
+def legacy_rows(persons_data):
+    person_movie_list = []
+    for person in persons_data:
+        person_id = person.get('id', 'Unknown')
+        person_name = person.get('name', 'Unknown')
+        person_role = person.get('repRoleNm', '기타')
+        characters = person.get('characters', [])
+        if not characters:
+            for movie_title in person.get('filmo', []):
+                if movie_title:
+                    person_movie_list.append({
+                        'person_id': person_id, 'person_name': person_name,
+                        'person_role': person_role, 'movie_id': None,
+                        'movie_title': movie_title, 'character_name': None,
+                    })
+        else:
+            for char in characters:
+                movie_title = char.get('movieTitle', 'Unknown')
+                if movie_title and movie_title != 'Unknown':
+                    person_movie_list.append({
+                        'person_id': person_id, 'person_name': person_name,
+                        'person_role': person_role, 'movie_id': char.get('movieId', None),
+                        'movie_title': movie_title, 'character_name': char.get('characterName', None),
+                    })
+    return pd.DataFrame(person_movie_list)
+
+
+def make_page(num_persons, chars_per_person, seed=42):
+    """Firestore 목록 응답 한 페이지 (JSON 바이트)"""
+    rng = random.Random(seed)
+    documents = []
+    for i in range(num_persons):
+        characters = [
+            {"mapValue": {"fields": {
+                "movieId": {"integerValue": str(rng.randrange(1, 10 ** 6))},
+                "movieTitle": {"stringValue": f"영화{rng.randrange(50000)}"},
+                "characterName": {"stringValue": f"역할{k}"},
+            }}}
+            for k in range(rng.randint(1, chars_per_person * 2))
+        ]
+        documents.append({
+            "name": f"projects/bench/databases/(default)/documents/persons/{10000000 + i}",
+            "fields": {
+                "id": {"stringValue": str(10000000 + i)},
+                "name": {"stringValue": f"영화인{i}"},
+                "repRoleNm": {"stringValue": rng.choice(["배우", "감독", "음악", "촬영"])},
+                "tmdbId": {"integerValue": str(rng.randrange(10 ** 6))},
+                "popularity": {"doubleValue": rng.random() * 100},
+                "profileImage": {"nullValue": None},
+                "characters": {"arrayValue": {"values": characters}},
+                "filmo": {"arrayValue": {"values": [
+                    {"stringValue": f"영화{rng.randrange(50000)}"} for _ in range(5)
+                ]}},
+                "createdAt": {"timestampValue": "2025-11-23T09:52:41.554Z"},
+            },
+            "createTime": "2025-11-23T09:52:41.554Z",
+            "updateTime": "2025-11-23T09:52:41.554Z",
+        })
+    return json.dumps({"documents": documents, "nextPageToken": "next"}).encode("utf-8")
+
+
+def run_legacy(page):
+    response = json.loads(page)
+    persons = [p for p in (legacy_parse_firestore_document(d) for d in response["documents"]) if p]
+    return legacy_rows(persons)
+
+
+def run_streaming(page, chunk_size=64 * 1024):
+    parser = PageStreamParser()
+    columns = PersonMovieColumns()
+    for start in range(0, len(page), chunk_size):
+        for doc in parser.feed(page[start:start + chunk_size]):
+            person = decode_document(doc)
+            if person:
+                columns.add_person(person)
+    parser.close()
+    return columns.to_frame()
+
+
+def run_direct(page, chunk_size=64 * 1024):
+    parser = PageStreamParser()
+    columns = PersonMovieColumns()
+    for start in range(0, len(page), chunk_size):
+        for doc in parser.feed(page[start:start + chunk_size]):
+            columns.add_document(doc)
+    parser.close()
+    return columns.to_frame()
+
+
+def measure(fn, page):
+    tracemalloc.start()
+    started = time.perf_counter()
+    df = fn(page)
+    elapsed = time.perf_counter() - started
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return df, elapsed, peak
+
+
+def main():
+    parser = argparse.ArgumentParser(description="영화인 문서 파싱 마이크로 벤치마크")
+    parser.add_argument("--persons", type=int, default=20000)
+    parser.add_argument("--chars", type=int, default=20)
+    args = parser.parse_args()
+
+    page = make_page(args.persons, args.chars)
+    print(f"페이지 크기: {len(page) / 1024 / 1024:.1f} MB, 영화인 {args.persons}명\n")
+
+    results = {}
+    for label, fn in [("기존 파서", run_legacy), ("스트리밍 디코더", run_streaming), ("직접 디코딩", run_direct)]:
+        df, elapsed, peak = measure(fn, page)
+        results[label] = df
+        print(f"{label:10s}: {len(df):8d}행, {len(df) / elapsed:12,.0f} rows/s, "
+              f"최대 메모리 {peak / 1024 / 1024:7.1f} MB ({elapsed:.2f}초)")
+
+    legacy, *others = [df.astype(object).fillna("") for df in results.values()]
+    same = all(legacy.equals(df) for df in others)
+    print(f"\n결과 일치: {'✅' if same else '❌'}")
+
+
+if __name__ == "__main__":
+    main()
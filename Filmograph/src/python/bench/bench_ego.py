@@ -0,0 +1,121 @@
+"""
+ego 문서 생성 벤치마크: 노드마다 ego_to_json vs 구간 단위 추출 엔진(EgoExtractor)
+
+합성 협업 그래프를 Arrow 파일(nodes/edges/adjacency)로 저장한 뒤
+- ego 추출만: 노드마다 CSRGraph.ego vs batch_egos (구간 단위 교집합)
+- 문서 생성 전체: 노드마다 ego_to_json vs EgoExtractor (프로세스 수 1, 2, 4, ...)
+의 초당 ego 수를 비교하고, 모든 문서의 내용 해시(생성 시각 제외)가 같은지 확인함
+
+사용법:
+    python bench_ego.py
+    python bench_ego.py --movies 20000 --max-cast 60 --workers 1,2,4,8
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(BENCH_DIR, "..", "scripts"))
+sys.path.insert(0, BENCH_DIR)
+
+from artifacts import save_edges  # noqa: E402
+from bench_projection import make_relations  # noqa: E402
+from csr_graph import CSRGraph  # noqa: E402
+from ego_extract import EgoExtractor, batch_egos, doc_size, ego_ranges, ego_to_json, page_id  # noqa: E402
+from ego_publish import content_hash  # noqa: E402
+from metrics import default_workers  # noqa: E402
+from node_table import NodeTable  # noqa: E402
+from projection import project  # noqa: E402
+
+
+def build_artifacts(args, tmp):
+    df = make_relations(args.movies, args.max_cast, args.persons)
+    df["person_id"] = df["person_name"].str.replace("영화인", "", regex=False)
+    df["person_role"] = "배우"
+    projection = project(df["person_name"].to_numpy(), df["movie_title"].to_numpy()).compact()
+
+    nodes = NodeTable.from_relations(df, projection.persons)
+    nodes.set_degree(projection.src, projection.dst)
+    nodes.community = np.zeros(len(nodes), dtype=np.int32)
+
+    paths = tuple(os.path.join(tmp, name) for name in ("nodes.arrow", "adjacency.arrow", "edges.arrow"))
+    nodes.save(paths[0])
+    CSRGraph.from_projection(projection).save_adjacency(paths[1])
+    save_edges(projection, paths[2])
+    return paths
+
+
+def main():
+    parser = argparse.ArgumentParser(description="ego 문서 생성 벤치마크")
+    parser.add_argument("--movies", type=int, default=5000)
+    parser.add_argument("--max-cast", type=int, default=30)
+    parser.add_argument("--persons", type=int, default=20000)
+    parser.add_argument("--workers", default=None, help="비교할 프로세스 수 (쉼표 구분, 기본: 1부터 CPU 수까지 2배씩)")
+    parser.add_argument("--top-k", type=int, default=100)
+    parser.add_argument("--page-size", type=int, default=200)
+    args = parser.parse_args()
+
+    if args.workers:
+        worker_counts = [int(w) for w in args.workers.split(",")]
+    else:
+        worker_counts = [1]
+        while worker_counts[-1] * 2 <= default_workers():
+            worker_counts.append(worker_counts[-1] * 2)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        paths = build_artifacts(args, tmp)
+        nodes = NodeTable.load(paths[0])
+        graph = CSRGraph.load(paths[1], paths[2])
+        n = graph.num_nodes
+        print(f"노드 {n:,}개, 엣지 {graph.num_edges:,}개, 최대 degree {graph.degree.max():,}")
+        print(f"CPU {default_workers()}개\n")
+
+        # ego 추출만 (같은 members/edges인지 확인)
+        started = time.perf_counter()
+        single = [graph.ego(u) for u in range(n)]
+        single_time = time.perf_counter() - started
+
+        started = time.perf_counter()
+        batched = [
+            (members, edges)
+            for start, stop in ego_ranges(graph)
+            for _, members, edges in batch_egos(graph, start, stop)
+        ]
+        batch_time = time.perf_counter() - started
+
+        same = all(
+            np.array_equal(a[0], b[0]) and np.array_equal(a[1], b[1]) for a, b in zip(single, batched)
+        )
+        print("ego 추출만")
+        print(f"   노드마다 CSRGraph.ego {single_time:7.2f}초 ({n / single_time:10,.0f} ego/초)")
+        print(f"   batch_egos           {batch_time:7.2f}초 ({n / batch_time:10,.0f} ego/초), "
+              f"{single_time / batch_time:.1f}배, 결과 일치: {'✅' if same else '❌'}\n")
+        del single, batched
+
+        # 문서 생성 전체 (문서 id, 크기, 내용 해시까지)
+        started = time.perf_counter()
+        expected = []
+        for u in range(n):
+            ego_json, pages = ego_to_json(graph, nodes, u, top_k=args.top_k, page_size=args.page_size)
+            for doc_id, doc in [(ego_json["ego"], ego_json), *((page_id(page), page) for page in pages)]:
+                expected.append((doc_id, doc_size(doc), content_hash(doc)))
+        base_time = time.perf_counter() - started
+
+        print("문서 생성 (JSON + 크기 + 해시)")
+        print(f"{'방식':24s} {'시간':>8s} {'ego/초':>10s} {'배율':>6s} {'일치':>4s}")
+        print(f"{'노드마다 ego_to_json':24s} {base_time:7.2f}s {n / base_time:10,.0f} {1.0:5.1f}x")
+        for workers in worker_counts:
+            extractor = EgoExtractor(*paths, workers=workers, top_k=args.top_k, page_size=args.page_size)
+            started = time.perf_counter()
+            produced = [(doc_id, size, digest) for _, entries, _ in extractor for doc_id, _, size, digest in entries]
+            elapsed = time.perf_counter() - started
+            print(f"{f'EgoExtractor ×{workers}':24s} {elapsed:7.2f}s {n / elapsed:10,.0f} "
+                  f"{base_time / elapsed:5.1f}x {'✅' if produced == expected else '❌':>4s}")
+
+
+if __name__ == "__main__":
+    main()
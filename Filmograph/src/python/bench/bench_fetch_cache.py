@@ -0,0 +1,93 @@
+"""
+Firestore REST 응답 캐시 벤치마크 (firestore_cache.py)
+
+스탠드인 서버에 합성 영화인 문서를 올리고 같은 컬렉션을 여러 번 가져오며 비교함
+- 캐시 없음 → record(받으면서 저장) → auto ttl=0(ETag 재검증, 304) → auto(저장본 재사용)
+  → replay(서버를 내린 뒤 캐시만으로)
+- 크기 제한: 캐시 한도를 전체의 절반으로 두고 기록했을 때 오래된 응답부터 지워지는지
+모든 실행에서 받은 문서가 원본과 같은지 확인함
+
+사용법:
+    python bench_fetch_cache.py --persons 20000 --page-size 300
+    python bench_fetch_cache.py --persons 20000 --partitions 4   # runQuery(POST) 응답 캐시
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(BENCH_DIR, "..", "scripts"))
+sys.path.insert(0, BENCH_DIR)
+
+from firestore_cache import CachedSession, ResponseCache  # noqa: E402
+from firestore_fetch import FirestoreFetcher, make_session  # noqa: E402
+from firestore_standin import serve  # noqa: E402
+from synthetic_persons import documents, generate  # noqa: E402
+
+
+def fetch(base_url, session, args):
+    fetcher = FirestoreFetcher(base_url, page_size=args.page_size, max_workers=4, session=session,
+                               max_retries=1, backoff=0.01)
+    started = time.perf_counter()
+    if args.partitions > 1:
+        docs = [d for _, page in fetcher.fetch_partitioned("persons", args.partitions) for d in page]
+    else:
+        docs = [d for page in fetcher.iter_pages("persons") for d in page]
+    return sorted(docs, key=lambda d: d["name"]), time.perf_counter() - started
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Firestore REST 응답 캐시 벤치마크")
+    parser.add_argument("--persons", type=int, default=20000)
+    parser.add_argument("--page-size", type=int, default=300)
+    parser.add_argument("--partitions", type=int, default=1)
+    args = parser.parse_args()
+
+    source = sorted(documents(generate(args.persons)), key=lambda d: d["name"])
+    server, base_url = serve({"persons": source})
+
+    with tempfile.TemporaryDirectory() as tmp:
+        cache = ResponseCache(os.path.join(tmp, "cache"))
+        runs = [
+            ("캐시 없음", lambda: make_session()),
+            ("record", lambda: CachedSession(make_session(), cache, mode="record")),
+            ("auto ttl=0 (재검증)", lambda: CachedSession(make_session(), cache, mode="auto", ttl=0)),
+            ("auto (재사용)", lambda: CachedSession(make_session(), cache, mode="auto")),
+            ("replay (서버 없음)", lambda: CachedSession(make_session(), cache, mode="replay")),
+        ]
+
+        print(f"영화인 {args.persons:,}명, 페이지 {args.page_size}개씩, 분할 {args.partitions}\n")
+        baseline = None
+        for label, make in runs:
+            if label.startswith("replay"):
+                server.shutdown()
+                server.server_close()
+            session = make()
+            before = cache.stats.report()
+            docs, elapsed = fetch(base_url, session, args)
+            after = cache.stats.report()
+            delta = {k: after[k] - before[k] for k in after}
+            baseline = baseline or elapsed
+            same = "✅" if docs == source else "❌"
+            print(f"{label:22s}: {elapsed * 1000:9.1f}ms ({baseline / elapsed:6.1f}x)  문서 일치 {same}  "
+                  f"재사용 {delta['hits']}, 재검증 {delta['revalidated']}, 네트워크 {delta['fetched']}")
+        print(f"\n캐시 크기: {cache.total_bytes / 1024 ** 2:.1f}MB")
+
+        # 크기 제한: 한도를 절반으로 줄인 캐시에 다시 기록
+        server, base_url = serve({"persons": source})
+        try:
+            limit = cache.total_bytes // 2
+            small = ResponseCache(os.path.join(tmp, "small"), max_bytes=limit)
+            fetch(base_url, CachedSession(make_session(), small, mode="record"), args)
+            stats = small.stats.report()
+            ok = "✅" if small.total_bytes <= limit else "❌"
+            print(f"한도 {limit / 1024 ** 2:.1f}MB: 저장 {stats['stored']}개, 삭제 {stats['evicted']}개, "
+                  f"남은 크기 {small.total_bytes / 1024 ** 2:.1f}MB {ok}")
+        finally:
+            server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,119 @@
+"""
+그래프 백엔드 벤치마크: networkx gpickle vs CSR(Arrow memory map)
+
+합성 협업 그래프를 기존 형식(영화 목록을 가진 networkx 그래프 pickle)과
+CSR 형식(엣지 표 + 인접 구조)으로 저장한 뒤,
+각 로드 방식을 별도 프로세스에서 실행해 로드 시간과 RSS 증가량을 비교하고
+ego 네트워크 추출 시간(nx.ego_graph vs CSRGraph.ego)을 비교함
+
+사용법:
+    python bench_graph.py --movies 20000 --max-cast 60
+"""
+import argparse
+import os
+import pickle
+import subprocess
+import sys
+import tempfile
+import time
+
+import networkx as nx
+import numpy as np
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+SCRIPTS_DIR = os.path.join(BENCH_DIR, "..", "scripts")
+sys.path.insert(0, SCRIPTS_DIR)
+sys.path.insert(0, BENCH_DIR)
+
+from artifacts import save_edges  # noqa: E402
+from bench_projection import make_relations  # noqa: E402
+from csr_graph import CSRGraph  # noqa: E402
+from projection import project  # noqa: E402
+
+# 각 로드 방식 (별도 프로세스에서 실행)
+LOADERS = {
+    "gpickle (networkx)": "import pickle; obj = pickle.load(open(PKL, 'rb'))",
+    "CSR 전체 (mmap)": "from csr_graph import CSRGraph; obj = CSRGraph.load(ADJ, EDGES)",
+    "CSR weight → networkx": (
+        "from csr_graph import CSRGraph; "
+        "obj = CSRGraph.load(ADJ, EDGES, edge_columns=['weight']).to_networkx()"
+    ),
+}
+
+CHILD = """
+import sys, time
+sys.path.insert(0, {scripts!r})
+PKL, ADJ, EDGES = {pkl!r}, {adj!r}, {edges!r}
+
+def rss():
+    with open('/proc/self/status') as f:
+        for line in f:
+            if line.startswith('VmRSS:'):
+                return int(line.split()[1]) * 1024
+    return 0
+
+import networkx, numpy, pyarrow
+before = rss()
+started = time.perf_counter()
+{code}
+elapsed = time.perf_counter() - started
+print(elapsed, rss() - before)
+"""
+
+
+def main():
+    parser = argparse.ArgumentParser(description="networkx vs CSR 그래프 백엔드 벤치마크")
+    parser.add_argument("--movies", type=int, default=20000)
+    parser.add_argument("--max-cast", type=int, default=60)
+    parser.add_argument("--persons", type=int, default=50000)
+    parser.add_argument("--egos", type=int, default=300, help="ego 추출을 잴 노드 수")
+    args = parser.parse_args()
+
+    df = make_relations(args.movies, args.max_cast, args.persons)
+    projection = project(df["person_name"].to_numpy(), df["movie_title"].to_numpy()).compact()
+    graph = CSRGraph.from_projection(projection)
+    G = projection.to_networkx()
+    print(f"노드 {graph.num_nodes:,}개, 엣지 {graph.num_edges:,}개\n")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        pkl = os.path.join(tmp, "network.gpickle")
+        adj = os.path.join(tmp, "network.adjacency.arrow")
+        edges = os.path.join(tmp, "network.edges.arrow")
+        with open(pkl, "wb") as f:
+            pickle.dump(G, f, pickle.HIGHEST_PROTOCOL)
+        save_edges(projection, edges)
+        graph.save_adjacency(adj)
+
+        print(f"파일 크기: gpickle {os.path.getsize(pkl) / 1e6:.1f} MB, "
+              f"CSR {(os.path.getsize(adj) + os.path.getsize(edges)) / 1e6:.1f} MB\n")
+        print(f"{'방식':28s} {'로드 시간':>10s} {'RSS 증가':>12s}")
+
+        for label, code in LOADERS.items():
+            script = CHILD.format(scripts=SCRIPTS_DIR, pkl=pkl, adj=adj, edges=edges, code=code)
+            out = subprocess.run([sys.executable, "-c", script], capture_output=True, text=True, check=True)
+            elapsed, rss = out.stdout.split()
+            print(f"{label:28s} {float(elapsed) * 1000:8.1f}ms {int(rss) / 1e6:10.1f}MB")
+
+    # ego 네트워크 추출 (같은 노드/엣지인지도 확인)
+    rng = np.random.default_rng(0)
+    egos = rng.choice(graph.num_nodes, size=min(args.egos, graph.num_nodes), replace=False).tolist()
+
+    started = time.perf_counter()
+    nx_egos = [nx.ego_graph(G, u, radius=1) for u in egos]
+    nx_time = time.perf_counter() - started
+
+    started = time.perf_counter()
+    csr_egos = [graph.ego(u) for u in egos]
+    csr_time = time.perf_counter() - started
+
+    same = all(
+        sorted(H.nodes()) == members.tolist()
+        and sorted(tuple(sorted(e)) for e in H.edges()) == list(zip(graph.src[edges].tolist(), graph.dst[edges].tolist()))
+        for H, (members, edges) in zip(nx_egos, csr_egos)
+    )
+    print(f"\nego 추출 {len(egos):,}개: nx.ego_graph {nx_time:.3f}초, CSRGraph.ego {csr_time:.3f}초 "
+          f"({nx_time / csr_time:.1f}배), 결과 일치: {'✅' if same else '❌'}")
+
+
+if __name__ == "__main__":
+    main()
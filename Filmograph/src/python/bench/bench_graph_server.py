@@ -0,0 +1,243 @@
+"""
+그래프 조회 서버 부하 시험 (scripts/graph_server.py)
+
+서버를 별도 프로세스로 띄우고 keep-alive 연결 --concurrency개로 요청을 보내 지연 시간 분포와 초당 요청 수를 잼
+- 요청 종류 비율: --mix ego1=0.6,ego2=0.2,neighbors=0.15,community=0.05
+- 영화인 선택: Zipf 분포 (--zipf 지수, 소수의 영화인이 자주 조회됨 → 캐시 적중), 0이면 균등
+- 결과: 종류별 / 전체 p50, p90, p99, 최대, 초당 요청 수, 서버 캐시 적중률 (/stats)
+
+기본은 합성 영화인(synthetic_persons.py)으로 Step 2/3 결과 파일을 임시 폴더에 만들어 씀
+--url을 주면 이미 떠 있는 서버에 보냄 (영화인 id는 --nodes 노드 테이블에서 읽음)
+부하 생성기와 서버가 같은 기계의 CPU를 나눠 쓰므로 절대값보다 설정 간 비교용
+
+사용법:
+    python bench_graph_server.py --persons 10000 --requests 5000 --concurrency 16
+    python bench_graph_server.py --cache-mb 0                  # 캐시 없이
+    python bench_graph_server.py --url http://127.0.0.1:8765 --nodes ../output/network_with_community.nodes.arrow
+"""
+import argparse
+import asyncio
+import contextlib
+import importlib
+import io
+import json
+import os
+import re
+import subprocess
+import sys
+import tempfile
+import time
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+SCRIPTS_DIR = os.path.join(BENCH_DIR, "..", "scripts")
+sys.path.insert(0, SCRIPTS_DIR)
+sys.path.insert(0, BENCH_DIR)
+
+import numpy as np  # noqa: E402
+
+from node_table import NodeTable  # noqa: E402
+
+KINDS = ("ego1", "ego2", "neighbors", "community")
+
+
+def parse_mix(text):
+    """'ego1=0.6,ego2=0.2' → {'ego1': 0.6, 'ego2': 0.2} (비율 합으로 나눔)"""
+    mix = {}
+    for item in text.split(","):
+        name, _, share = item.partition("=")
+        if name.strip() not in KINDS:
+            raise argparse.ArgumentTypeError(f"요청 종류는 {KINDS} 중 하나여야 합니다: {name}")
+        mix[name.strip()] = float(share)
+    total = sum(mix.values())
+    return {name: share / total for name, share in mix.items()}
+
+
+# ===========================
+# 합성 네트워크 + 서버 프로세스
+# ===========================
+
+
+def build_network(num_persons, seed, output_dir):
+    """합성 문서 → Step 2 파일 + 커뮤니티를 넣은 노드 테이블 (중심성은 생략)"""
+    from artifacts import save_edges
+    from community_backends import detect_communities
+    from csr_graph import CSRGraph
+    from firestore_decode import PersonMovieColumns
+    from synthetic_persons import documents, generate
+
+    build = importlib.import_module("02_build_network")
+    columns = PersonMovieColumns()
+    for doc in documents(generate(num_persons, seed=seed)):
+        columns.add_document(doc)
+    df = columns.to_frame().drop_duplicates(subset=["person_name", "movie_title"])
+    with contextlib.redirect_stdout(io.StringIO()):
+        projection, nodes = build.build_network(df)
+
+    paths = {name: os.path.join(output_dir, f"network.{name}.arrow") for name in ("nodes", "adjacency", "edges")}
+    save_edges(projection, paths["edges"])
+    graph = CSRGraph.from_projection(projection)
+    graph.save_adjacency(paths["adjacency"])
+    nodes.community = detect_communities(graph, "python-louvain", weight="weight", seed=seed)
+    nodes.save(paths["nodes"])
+    return paths
+
+
+def start_server(paths, cache_mb, workers):
+    """graph_server.py를 빈 포트로 띄우고 (프로세스, 주소) 반환"""
+    process = subprocess.Popen(
+        [sys.executable, "graph_server.py", "--port", "0", "--cache-mb", str(cache_mb), "--workers", str(workers),
+         "--nodes", paths["nodes"], "--adjacency", paths["adjacency"], "--edges", paths["edges"]],
+        cwd=SCRIPTS_DIR, stdout=subprocess.PIPE, text=True,
+    )
+    for line in process.stdout:
+        print(f"   {line.rstrip()}")
+        found = re.search(r"http://\S+", line)
+        if found:
+            return process, found.group(0)
+    raise RuntimeError("서버가 시작하지 못했습니다")
+
+
+# ===========================
+# 부하 생성
+# ===========================
+
+
+def make_requests(nodes, count, mix, zipf, seed):
+    """[(종류, 경로)] count개"""
+    rng = np.random.default_rng(seed)
+    n = len(nodes)
+    if zipf > 0:
+        # 인기 순위를 무작위로 섞어 노드 번호와 무관하게
+        weights = 1.0 / np.arange(1, n + 1) ** zipf
+        people = rng.permutation(n)[rng.choice(n, size=count, p=weights / weights.sum())]
+    else:
+        people = rng.integers(0, n, size=count)
+    names = list(mix)
+    kinds = rng.choice(len(names), size=count, p=[mix[name] for name in names])
+
+    requests = []
+    for kind, person in zip(kinds.tolist(), people.tolist()):
+        name = names[kind]
+        pid = nodes.person_id[person]
+        if name == "ego1":
+            path = f"/ego/{pid}?radius=1"
+        elif name == "ego2":
+            path = f"/ego/{pid}?radius=2&limit=150"
+        elif name == "neighbors":
+            path = f"/neighbors/{pid}?limit=50"
+        else:
+            path = f"/community/{int(nodes.community[person])}?limit=100"
+        requests.append((name, path))
+    return requests
+
+
+async def fetch(reader, writer, host, path):
+    """keep-alive 연결로 GET 하나, (상태 코드, 본문 길이)"""
+    writer.write(f"GET {path} HTTP/1.1\r\nHost: {host}\r\n\r\n".encode("latin-1"))
+    await writer.drain()
+    status = int((await reader.readline()).split()[1])
+    length = 0
+    while True:
+        line = await reader.readline()
+        if line in (b"\r\n", b""):
+            break
+        name, _, value = line.decode("latin-1").partition(":")
+        if name.lower() == "content-length":
+            length = int(value)
+    await reader.readexactly(length)
+    return status, length
+
+
+async def run_load(url, requests, concurrency):
+    """요청을 concurrency개 연결로 보냄, ([(종류, 지연 초, 상태, 바이트)], 전체 초)"""
+    host, port = re.match(r"http://([^:/]+):(\d+)", url).groups()
+    queue = iter(requests)
+    results = []
+
+    async def client():
+        reader, writer = await asyncio.open_connection(host, int(port))
+        try:
+            for kind, path in queue:
+                started = time.perf_counter()
+                status, size = await fetch(reader, writer, host, path)
+                results.append((kind, time.perf_counter() - started, status, size))
+        finally:
+            writer.close()
+
+    started = time.perf_counter()
+    await asyncio.gather(*(client() for _ in range(concurrency)))
+    return results, time.perf_counter() - started
+
+
+async def server_stats(url):
+    host, port = re.match(r"http://([^:/]+):(\d+)", url).groups()
+    reader, writer = await asyncio.open_connection(host, int(port))
+    writer.write(f"GET /stats HTTP/1.1\r\nHost: {host}\r\nConnection: close\r\n\r\n".encode("latin-1"))
+    data = await reader.read()
+    writer.close()
+    return json.loads(data.split(b"\r\n\r\n", 1)[1])
+
+
+def print_report(results, elapsed):
+    print(f"\n{'종류':10s} {'요청':>7s} {'p50':>9s} {'p90':>9s} {'p99':>9s} {'최대':>9s} {'평균 크기':>10s}")
+    for kind in KINDS + ("전체",):
+        rows = [r for r in results if kind == "전체" or r[0] == kind]
+        if not rows:
+            continue
+        latency = np.asarray([r[1] for r in rows]) * 1000
+        p50, p90, p99 = np.percentile(latency, [50, 90, 99])
+        size = np.mean([r[3] for r in rows]) / 1024
+        print(f"{kind:10s} {len(rows):7d} {p50:7.2f}ms {p90:7.2f}ms {p99:7.2f}ms {latency.max():7.2f}ms "
+              f"{size:8.1f}KB")
+    errors = sum(r[2] != 200 for r in results)
+    print(f"\n처리량: {len(results) / elapsed:.1f} 요청/초 ({len(results)}개, {elapsed:.2f}초), 오류 응답 {errors}개")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="그래프 조회 서버 부하 시험")
+    parser.add_argument("--persons", type=int, default=10000)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--requests", type=int, default=5000)
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--mix", type=parse_mix, default=parse_mix("ego1=0.6,ego2=0.2,neighbors=0.15,community=0.05"))
+    parser.add_argument("--zipf", type=float, default=1.1, help="영화인 조회 분포 지수 (0이면 균등)")
+    parser.add_argument("--cache-mb", type=int, default=128)
+    parser.add_argument("--workers", type=int, default=4, help="서버 계산 스레드 수")
+    parser.add_argument("--url", default=None, help="이미 떠 있는 서버 주소")
+    parser.add_argument("--nodes", default=None, help="--url일 때 영화인 id를 읽을 노드 테이블")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as workdir:
+        process = None
+        if args.url:
+            if not args.nodes:
+                parser.error("--url에는 --nodes가 필요합니다")
+            url, nodes = args.url, NodeTable.load(args.nodes)
+        else:
+            started = time.perf_counter()
+            paths = build_network(args.persons, args.seed, workdir)
+            nodes = NodeTable.load(paths["nodes"])
+            print(f"합성 네트워크: 영화인 {args.persons:,}명 → 노드 {len(nodes):,}개 "
+                  f"({time.perf_counter() - started:.1f}초)")
+            process, url = start_server(paths, args.cache_mb, args.workers)
+
+        try:
+            requests = make_requests(nodes, args.requests, args.mix, args.zipf, args.seed)
+            print(f"\n요청 {len(requests):,}개, 연결 {args.concurrency}개, Zipf {args.zipf}, "
+                  f"비율 {', '.join(f'{k} {v:.0%}' for k, v in args.mix.items())}")
+            results, elapsed = asyncio.run(run_load(url, requests, args.concurrency))
+            print_report(results, elapsed)
+
+            stats = asyncio.run(server_stats(url))
+            cache = stats["cache"]
+            print(f"서버 캐시: 적중률 {cache['hit_ratio']:.1%} (적중 {cache['hits']}, 계산 {cache['misses']}, "
+                  f"동시 요청 합침 {stats['coalesced']}), {cache['entries']}개 {cache['bytes'] / 1024 ** 2:.1f}MB, "
+                  f"삭제 {cache['evicted']}개")
+        finally:
+            if process is not None:
+                process.terminate()
+                process.wait()
+
+
+if __name__ == "__main__":
+    main()
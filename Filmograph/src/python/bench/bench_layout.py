@@ -0,0 +1,65 @@
+"""
+레이아웃 벤치마크: numpy 힘 기반 레이아웃(layout.py) vs nx.spring_layout
+
+합성 planted-partition 그래프(10k / 100k / 1M 노드)에서
+- 처음부터 배치 (커뮤니티 다단계)
+- warm start (이전 좌표에서 노드 1%를 새로 추가한 상황)
+의 실행 시간과 품질 지표(평균 엣지 길이 / 임의 노드쌍 거리, 작을수록 좋음)를 비교함
+nx.spring_layout은 --nx-max 이하 크기에서만 실행
+
+사용법:
+    python bench_layout.py --sizes 10000 100000 1000000
+"""
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(BENCH_DIR, "..", "scripts"))
+sys.path.insert(0, BENCH_DIR)
+
+from bench_community import planted_partition  # noqa: E402
+from layout import compute_layout, edge_length_ratio  # noqa: E402
+
+
+def main():
+    parser = argparse.ArgumentParser(description="레이아웃 벤치마크")
+    parser.add_argument("--sizes", nargs="+", type=int, default=[10000, 100000, 1000000])
+    parser.add_argument("--iterations", type=int, default=100)
+    parser.add_argument("--nx-max", type=int, default=10000, help="nx.spring_layout을 돌릴 최대 노드 수")
+    args = parser.parse_args()
+
+    print(f"{'노드':>10}{'엣지':>12}  {'방식':<22}{'시간(초)':>10}{'엣지/쌍 거리':>14}")
+    for size in args.sizes:
+        graph, communities = planted_partition(size, return_communities=True)
+        src, dst, n = graph.src, graph.dst, graph.num_nodes
+
+        def row(name, elapsed, pos):
+            print(f"{n:>10,}{graph.num_edges:>12,}  {name:<22}{elapsed:>10.2f}{edge_length_ratio(pos, src, dst):>14.3f}")
+
+        started = time.perf_counter()
+        pos = compute_layout(src, dst, n, membership=communities, iterations=args.iterations)
+        row("numpy 다단계", time.perf_counter() - started, pos)
+
+        # 노드 1%의 좌표를 지우고 이어서 배치 (새 영화인이 추가된 재실행)
+        previous = pos.astype(np.float64)
+        previous[np.random.default_rng(0).random(n) < 0.01] = np.nan
+        started = time.perf_counter()
+        warm = compute_layout(src, dst, n, previous=previous, iterations=args.iterations)
+        row("numpy warm start", time.perf_counter() - started, warm)
+
+        if size <= args.nx_max:
+            import networkx as nx
+
+            G = graph.to_networkx(edge_attrs=[])
+            started = time.perf_counter()
+            layout = nx.spring_layout(G, iterations=50, seed=42)
+            elapsed = time.perf_counter() - started
+            row("nx.spring_layout (50회)", elapsed, np.array([layout[i] for i in range(n)]))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,299 @@
+"""
+파이프라인 단계별 규모 벤치마크 (합성 영화인 문서, 기본 1만 / 10만 / 100만 명)
+
+규모마다 별도 프로세스에서 실제 스크립트 함수를 차례로 실행해 단계별 시간과 최대 RSS를 잼
+- parse:      목록 응답 JSON → PageStreamParser → PersonMovieColumns.add_document (01)
+- projection: 02_build_network.build_network (투영 + 노드 속성)
+- community:  03_detect_community.detect (COMMUNITY_BACKEND, 기본 python-louvain)
+- export:     04_export_json.main (network_data.json만, 압축/바이너리/분할 파일 제외)
+- ego:        EgoExtractor로 앞쪽 --ego-nodes개 노드의 ego 문서 생성 (05, 업로드 제외, 0이면 전체)
+              허브 ego는 이웃 사이 엣지가 많아 전체를 돌리면 규모가 클 때 너무 오래 걸림
+
+측정은 metrics.py의 단계 기록(wall, CPU, RSS 샘플링)을 그대로 씀
+단계 사이의 파일 저장은 측정하지 않음 (임시 폴더의 data/, output/에 씀)
+
+기준값(baseline/pipeline.json)과 비교해 시간이나 메모리가 허용 범위를 넘으면 종료 코드 1
+기준값이 없는 규모는 결과만 출력 (비교/실패 없음), 기준값은 --update-baseline일 때만 저장
+기준값은 규모마다 측정한 환경(machine)을 함께 기록, 시간은 기계마다 다르므로 같은 기계에서 만든 것과 비교할 것
+
+사용법:
+    python bench_pipeline.py
+    python bench_pipeline.py --sizes 10000 100000 --backend igraph-leiden
+    python bench_pipeline.py --sizes 1000000 --backend igraph-leiden --ego-workers 4
+    python bench_pipeline.py --update-baseline
+"""
+import argparse
+import contextlib
+import importlib
+import io
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+SCRIPTS_DIR = os.path.join(BENCH_DIR, "..", "scripts")
+sys.path.insert(0, SCRIPTS_DIR)
+sys.path.insert(0, BENCH_DIR)
+
+BASELINE_PATH = os.path.join(BENCH_DIR, "baseline", "pipeline.json")
+STAGES = ("parse", "projection", "community", "export", "ego")
+
+# 허용 범위: 기준값 × (1 + 비율) + 여유 (짧은 단계의 측정 잡음)
+TIME_SLACK = 0.05      # 초
+MEMORY_SLACK = 32      # MB
+
+
+# ===========================
+# 한 규모 실행 (작업 프로세스)
+# ===========================
+
+
+def sampled_extractor(limit, *args, **kwargs):
+    """앞쪽 limit개 노드만 추출하는 EgoExtractor (노드 순서는 이름순이라 허브가 고르게 섞여 있음)"""
+    from ego_extract import EgoExtractor
+
+    class SampledExtractor(EgoExtractor):
+        def ranges(self):
+            if not limit:
+                return super().ranges()
+            return [(start, min(stop, limit)) for start, stop in super().ranges() if start < limit]
+
+    return SampledExtractor(*args, **kwargs)
+
+
+def run_stages(args, workdir):
+    """workdir/data, workdir/output을 쓰며 단계를 차례로 실행, {단계: 기록} 반환"""
+    # 스크립트의 모듈 수준 설정은 import 시점에 읽으므로 먼저 환경 변수를 맞춤
+    os.environ.update(EXPORT_COMPRESS="", EXPORT_BINARY="0", EXPORT_SHARDS="0", COMMUNITY_INCREMENTAL="0")
+    if args.backend:
+        os.environ["COMMUNITY_BACKEND"] = args.backend
+    os.environ["COMMUNITY_SEED"] = str(args.seed)
+
+    import metrics
+    from artifacts import save_edges
+    from csr_graph import CSRGraph
+    from firestore_decode import PageStreamParser, PersonMovieColumns
+    from synthetic_persons import documents, generate
+
+    build_network = importlib.import_module("02_build_network")
+    detect_community = importlib.import_module("03_detect_community")
+    export_json = importlib.import_module("04_export_json")
+
+    film = generate(args.worker, seed=args.seed)
+    source = os.path.join(workdir, "data", "persons.json")
+    with open(source, "w", encoding="utf-8") as f:
+        f.write('{"documents": [')
+        for i, doc in enumerate(documents(film)):
+            f.write(("," if i else "") + json.dumps(doc, ensure_ascii=False))
+        f.write("]}")
+
+    results = {}
+
+    @contextlib.contextmanager
+    def stage(name):
+        rss = metrics.current_rss() or 0
+        with metrics.stage(name) as record:
+            yield record
+        results[name] = {
+            "wall_sec": round(record.wall_sec, 3),
+            "cpu_sec": round(record.cpu_sec + record.cpu_children_sec, 3),
+            "peak_rss_mb": round(record.peak_rss / 1024 ** 2, 1),
+            "rss_growth_mb": round(max(record.peak_rss - rss, 0) / 1024 ** 2, 1),
+            "counts": record.counts,
+        }
+
+    with metrics.run(f"bench_pipeline_{args.worker}"):
+        with stage("parse") as record:
+            parser = PageStreamParser()
+            columns = PersonMovieColumns()
+            persons = 0
+            with open(source, "rb") as f:
+                for chunk in iter(lambda: f.read(1 << 20), b""):
+                    for doc in parser.feed(chunk):
+                        columns.add_document(doc)
+                        persons += 1
+            parser.close()
+            df = columns.to_frame().drop_duplicates(subset=["person_name", "movie_title"])
+            record.count(persons=persons, rows=len(df))
+
+        with stage("projection") as record:
+            projection, nodes = build_network.build_network(df)
+            record.count(nodes=len(nodes), edges=projection.num_edges)
+        del df
+
+        nodes.save(build_network.NODES_PATH)
+        save_edges(projection, build_network.EDGES_PATH)
+        CSRGraph.from_projection(projection).save_adjacency(build_network.ADJACENCY_PATH)
+        del projection
+
+        with stage("community") as record:
+            nodes, graph, weight_key = detect_community.load_network(nodes)
+            membership = detect_community.detect(graph, nodes, None, weight_key)
+            record.count(nodes=graph.num_nodes, edges=graph.num_edges, communities=len(set(membership.tolist())))
+        nodes.community = membership
+        nodes.save(detect_community.PREVIOUS_PATH)
+        del graph
+
+        with stage("export") as record:
+            outputs = export_json.main(nodes)
+            record.count(bytes=sum(os.path.getsize(path) for path in outputs))
+
+        with stage("ego") as record:
+            extractor = sampled_extractor(args.ego_nodes, detect_community.PREVIOUS_PATH,
+                                          build_network.ADJACENCY_PATH, build_network.EDGES_PATH,
+                                          workers=args.ego_workers)
+            egos = docs = size = 0
+            for _, entries, _ in extractor:
+                egos += 1
+                docs += len(entries)
+                size += sum(entry[2] for entry in entries)
+            record.count(egos=egos, documents=docs, bytes=size)
+
+    return results
+
+
+def worker_main(args):
+    with tempfile.TemporaryDirectory() as workdir:
+        for name in ("data", "output"):
+            os.makedirs(os.path.join(workdir, name))
+        # 스크립트의 data/, output/을 임시 폴더로 (paths.py, 스크립트를 import하기 전에 맞춤)
+        os.environ["FILMOGRAPH_ROOT"] = workdir
+        # 스크립트의 진행 출력은 버림 (결과는 --result 파일로)
+        with contextlib.redirect_stdout(io.StringIO()):
+            results = run_stages(args, workdir)
+    with open(args.result, "w", encoding="utf-8") as f:
+        json.dump(results, f, ensure_ascii=False)
+
+# ===========================
+# 기준값 비교
+# ===========================
+
+
+def machine():
+    return f"{platform.machine()} / CPU {os.cpu_count()} / Python {platform.python_version()}"
+
+
+def load_baseline(path):
+    """{"sizes": {규모: {"machine": 측정 환경, "stages": {단계: {wall_sec, peak_rss_mb}}}}}"""
+    if not os.path.exists(path):
+        return {"sizes": {}}
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def save_baseline(path, baseline):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(baseline, f, ensure_ascii=False, indent=2)
+
+
+def regressions(size, results, base, tolerance, memory_tolerance):
+    """기준값보다 느려지거나 메모리가 늘어난 단계 목록 (문자열)"""
+    found = []
+    for name, record in results.items():
+        if name not in base:
+            continue
+        prev = base[name]
+        if record["wall_sec"] > prev["wall_sec"] * (1 + tolerance) + TIME_SLACK:
+            found.append(f"{size:,}명 {name}: 시간 {prev['wall_sec']:.2f}s → {record['wall_sec']:.2f}s")
+        if record["peak_rss_mb"] > prev["peak_rss_mb"] * (1 + memory_tolerance) + MEMORY_SLACK:
+            found.append(f"{size:,}명 {name}: 최대 RSS {prev['peak_rss_mb']:.0f}MB → {record['peak_rss_mb']:.0f}MB")
+    return found
+
+
+def print_results(size, results, base):
+    print(f"\n=== 영화인 {size:,}명 ===")
+    print(f"   {'단계':10s} {'wall':>9s} {'CPU':>9s} {'최대 RSS':>8s} {'증가':>7s} {'기준 대비':>6s}  처리량")
+    for name in STAGES:
+        if name not in results:
+            continue
+        record = results[name]
+        ratio = ""
+        if name in base:
+            ratio = f"{record['wall_sec'] / max(base[name]['wall_sec'], 1e-9):.2f}x"
+        counts = ", ".join(f"{k} {v:,}" for k, v in record["counts"].items())
+        print(f"   {name:12s} {record['wall_sec']:8.2f}s {record['cpu_sec']:8.2f}s "
+              f"{record['peak_rss_mb']:8.0f}MB {record['rss_growth_mb']:7.0f}MB {ratio:>10s}  {counts}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="파이프라인 단계별 규모 벤치마크")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10000, 100000, 1000000])
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--backend", default=None, help="커뮤니티 탐지 백엔드 (기본: 03의 COMMUNITY_BACKEND)")
+    parser.add_argument("--ego-nodes", type=int, default=2000, help="ego 문서를 만들 노드 수 (0이면 전체)")
+    parser.add_argument("--ego-workers", type=int, default=1)
+    parser.add_argument("--baseline", default=BASELINE_PATH)
+    parser.add_argument("--update-baseline", action="store_true", help="이번 결과로 기준값을 덮어씀")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="허용 시간 증가 비율")
+    parser.add_argument("--memory-tolerance", type=float, default=0.15, help="허용 최대 RSS 증가 비율")
+    parser.add_argument("--worker", type=int, default=None, help=argparse.SUPPRESS)
+    parser.add_argument("--result", default=None, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker is not None:
+        return worker_main(args)
+
+    baseline = load_baseline(args.baseline)
+    found, failed, missing = [], [], []
+    for size in args.sizes:
+        with tempfile.NamedTemporaryFile(suffix=".json", delete=False) as tmp:
+            result_path = tmp.name
+        command = [sys.executable, os.path.abspath(__file__), "--worker", str(size), "--result", result_path,
+                   "--seed", str(args.seed), "--ego-nodes", str(args.ego_nodes),
+                   "--ego-workers", str(args.ego_workers)]
+        if args.backend:
+            command += ["--backend", args.backend]
+        try:
+            completed = subprocess.run(command)
+            if completed.returncode != 0:
+                # 메모리 부족으로 죽는 경우 등
+                failed.append(f"{size:,}명: 작업 프로세스 종료 코드 {completed.returncode}")
+                continue
+            with open(result_path, encoding="utf-8") as f:
+                results = json.load(f)
+        finally:
+            os.remove(result_path)
+
+        key = str(size)
+        entry = baseline["sizes"].get(key)
+        base = entry["stages"] if entry else {}
+        print_results(size, results, base)
+        if entry and entry.get("machine") != machine():
+            print(f"   ⚠️  기준값은 다른 환경에서 측정됨 ({entry.get('machine')}), 지금: {machine()}")
+        if args.update_baseline:
+            baseline["sizes"][key] = {
+                "machine": machine(),
+                "stages": {name: {"wall_sec": r["wall_sec"], "peak_rss_mb": r["peak_rss_mb"]}
+                           for name, r in results.items()},
+            }
+        elif entry:
+            found += regressions(size, results, base, args.tolerance, args.memory_tolerance)
+        else:
+            missing.append(size)
+
+    if args.update_baseline:
+        save_baseline(args.baseline, baseline)
+        print(f"\n→ 기준값 저장: {args.baseline}")
+    if missing:
+        print(f"\nℹ️  기준값 없음 (비교 안 함): {', '.join(f'{size:,}명' for size in missing)} "
+              f"- --update-baseline으로 저장")
+
+    for line in failed:
+        print(f"❌ {line}")
+    if found:
+        print(f"\n❌ 기준값 대비 성능 저하 {len(found)}건 (허용: 시간 +{args.tolerance:.0%}, 메모리 +{args.memory_tolerance:.0%})")
+        for line in found:
+            print(f"   - {line}")
+    if found or failed:
+        return 1
+    if not args.update_baseline and len(missing) < len(args.sizes):
+        print("\n✅ 기준값 대비 성능 저하 없음")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,137 @@
+"""
+협업 그래프 투영 벤치마크: combinations 루프 vs 희소 행렬 투영
+
+두 방식의 weight/movies가 완전히 같은지 확인하고 실행 시간을 비교함
+--modes를 주면 허브 제한 모드(캐스트 상한, 상위 출연자, Newman, 스트리밍)별
+엣지 수/제거된 엣지/시간/최대 메모리를 표로 출력함
+
+사용법:
+    python bench_projection.py --movies 20000 --max-cast 300
+    python bench_projection.py --movies 20000 --max-cast 300 --skip-legacy --modes
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+from collections import defaultdict
+from itertools import combinations
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "scripts"))
+
+from projection import project, stream_project  # noqa: E402
+
+
+def legacy_projection(df):
+    """기존 02_build_network.py의 루프 (비교용 복사본)"""
+    movies_dict = df.groupby('movie_title')['person_name'].apply(list).to_dict()
+    collaboration_count = defaultdict(int)
+    collaboration_movies = defaultdict(list)
+    for movie_title, people in movies_dict.items():
+        if len(people) >= 2:
+            for person1, person2 in combinations(people, 2):
+                edge = tuple(sorted([person1, person2]))
+                collaboration_count[edge] += 1
+                collaboration_movies[edge].append(movie_title)
+    return collaboration_count, collaboration_movies
+
+
+def make_relations(num_movies, max_cast, num_persons, seed=42):
+    """캐스트 크기가 멱법칙을 따르는 합성 (영화인, 영화) 관계"""
+    rng = np.random.default_rng(seed)
+    cast_sizes = np.minimum(rng.zipf(1.8, num_movies) + 1, max_cast)
+    # 인기 영화인일수록 여러 영화에 등장
+    weights = 1.0 / np.arange(1, num_persons + 1) ** 0.8
+    weights /= weights.sum()
+
+    persons, movies = [], []
+    for m, k in enumerate(cast_sizes):
+        cast = rng.choice(num_persons, size=min(k, num_persons), replace=False, p=weights)
+        persons.extend(f"영화인{p}" for p in cast)
+        movies.extend([f"영화{m}"] * len(cast))
+    return pd.DataFrame({"person_name": persons, "movie_title": movies})
+
+
+def measure(func, *args, **kwargs):
+    tracemalloc.start()
+    started = time.perf_counter()
+    result = func(*args, **kwargs)
+    elapsed = time.perf_counter() - started
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, elapsed, peak
+
+
+def compare_modes(df, cast_cap, top_billed, chunk_pairs):
+    """모드별 엣지 수, 전체 대비 제거된 엣지, 시간, 최대 메모리"""
+    persons, movies = df["person_name"].to_numpy(), df["movie_title"].to_numpy()
+    edges_path = os.path.join(tempfile.mkdtemp(), "edges.arrow")
+    modes = [
+        ("전체", lambda: project(persons, movies)),
+        (f"캐스트 ≤{cast_cap}", lambda: project(persons, movies, max_cast=cast_cap)),
+        (f"상위 {top_billed}명", lambda: project(persons, movies, top_billed=top_billed)),
+        ("Newman", lambda: project(persons, movies, weighting="newman")),
+        ("스트리밍", lambda: stream_project(persons, movies, edges_path, chunk_pairs=chunk_pairs)),
+    ]
+
+    print(f"\n{'모드':<12}{'엣지':>12}{'제거':>12}{'시간(초)':>10}{'메모리(MB)':>12}")
+    full_edges = None
+    for name, run in modes:
+        projection, elapsed, peak = measure(run)
+        if full_edges is None:
+            full_edges = projection.num_edges
+        removed = full_edges - projection.num_edges
+        print(f"{name:<12}{projection.num_edges:>12,}{removed:>12,}{elapsed:>10.3f}{peak / 1024**2:>12.1f}")
+        del projection
+
+
+def main():
+    parser = argparse.ArgumentParser(description="협업 그래프 투영 벤치마크")
+    parser.add_argument("--movies", type=int, default=20000)
+    parser.add_argument("--max-cast", type=int, default=300)
+    parser.add_argument("--persons", type=int, default=50000)
+    parser.add_argument("--skip-legacy", action="store_true", help="큰 입력에서 기존 루프 생략")
+    parser.add_argument("--modes", action="store_true", help="허브 제한 모드별 비교")
+    parser.add_argument("--cast-cap", type=int, default=50, help="--modes의 캐스트 상한")
+    parser.add_argument("--top-billed", type=int, default=20, help="--modes의 영화별 상위 출연자 수")
+    parser.add_argument("--chunk-pairs", type=int, default=1_000_000, help="--modes의 스트리밍 블록 크기")
+    args = parser.parse_args()
+
+    df = make_relations(args.movies, args.max_cast, args.persons)
+    print(f"관계 {len(df):,}행, 영화 {args.movies:,}편, 최대 캐스트 {args.max_cast}명\n")
+
+    started = time.perf_counter()
+    projection = project(df["person_name"].to_numpy(), df["movie_title"].to_numpy())
+    new_time = time.perf_counter() - started
+    print(f"희소 행렬 투영 : {new_time:8.3f}초, 엣지 {projection.num_edges:,}개")
+
+    started = time.perf_counter()
+    project(df["person_name"].to_numpy(), df["movie_title"].to_numpy(), with_movies=False)
+    print(f"  (weight만)    : {time.perf_counter() - started:8.3f}초")
+
+    if args.modes:
+        compare_modes(df, args.cast_cap, args.top_billed, args.chunk_pairs)
+
+    if args.skip_legacy:
+        return
+
+    started = time.perf_counter()
+    count, movies = legacy_projection(df)
+    old_time = time.perf_counter() - started
+    print(f"combinations 루프: {old_time:8.3f}초, 엣지 {len(count):,}개")
+    print(f"\n속도 향상: {old_time / new_time:.1f}배")
+
+    names = projection.persons
+    same = len(count) == projection.num_edges and all(
+        count[(names[u], names[v])] == w and movies[(names[u], names[v])] == projection.edge_movies(e)
+        for e, (u, v, w) in enumerate(zip(projection.src, projection.dst, projection.weight))
+    )
+    print(f"weight/movies 일치: {'✅' if same else '❌'}")
+
+
+if __name__ == "__main__":
+    main()
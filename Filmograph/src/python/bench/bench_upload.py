@@ -0,0 +1,91 @@
+"""
+Firestore 업로드 벤치마크: 문서마다 set() vs BatchUploader (batch + 병렬 commit)
+
+가짜 클라이언트(firestore_fake.py)에 요청마다 왕복 지연을 주고
+합성 ego 문서를 올리는 데 걸린 시간과 문서/초를 비교함
+--fail-rate로 일시적 오류를 섞어 재시도 후에도 모든 문서가 써졌는지 확인
+
+사용법:
+    python bench_upload.py --docs 5000 --latency 0.03
+    python bench_upload.py --docs 20000 --latency 0.05 --workers 1 4 8 --fail-rate 0.05
+"""
+import argparse
+import os
+import sys
+import time
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(BENCH_DIR, "..", "scripts"))
+sys.path.insert(0, BENCH_DIR)
+
+from firestore_fake import FakeFirestoreClient  # noqa: E402
+from firestore_upload import BatchUploader  # noqa: E402
+
+
+def make_docs(num_docs, links_per_doc=30):
+    """ego 문서와 비슷한 모양의 합성 문서"""
+    docs = []
+    for i in range(num_docs):
+        doc_id = str(10000000 + i)
+        docs.append((doc_id, {
+            "ego": doc_id,
+            "label": f"영화인{i}",
+            "schema": 2,
+            "movies": [f"영화{j}" for j in range(links_per_doc // 3)],
+            "nodes": [{"id": str(10000000 + (i + k) % num_docs), "label": f"영화인{(i + k) % num_docs}",
+                       "community": k % 7, "degree": k, "movies_count": k + 1, "role": "배우"}
+                      for k in range(links_per_doc // 2)],
+            "links": [{"s": 0, "t": k % (links_per_doc // 2), "w": 1, "m": [k % (links_per_doc // 3)]}
+                      for k in range(links_per_doc)],
+        }))
+    return docs
+
+
+def sequential(docs, latency):
+    client = FakeFirestoreClient(latency=latency)
+    collection = client.collection("egoGraphs")
+    started = time.perf_counter()
+    for doc_id, data in docs:
+        collection.document(doc_id).set(data)
+    return time.perf_counter() - started, client
+
+
+def batched(docs, latency, workers, batch_size, fail_rate):
+    client = FakeFirestoreClient(latency=latency, fail_rate=fail_rate)
+    started = time.perf_counter()
+    with BatchUploader(client, "egoGraphs", batch_size=batch_size, max_workers=workers, backoff=0.01) as uploader:
+        for doc_id, data in docs:
+            uploader.add(doc_id, data)
+    return time.perf_counter() - started, client, uploader.stats.report()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Firestore 업로드 벤치마크 (가짜 클라이언트)")
+    parser.add_argument("--docs", type=int, default=5000)
+    parser.add_argument("--latency", type=float, default=0.03, help="요청 하나의 왕복 지연 (초)")
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 4, 8])
+    parser.add_argument("--batch-size", type=int, default=500)
+    parser.add_argument("--fail-rate", type=float, default=0.0)
+    parser.add_argument("--sequential-docs", type=int, default=500,
+                        help="문서마다 set()은 느리므로 이 수만큼만 재고 문서/초로 비교")
+    args = parser.parse_args()
+
+    docs = make_docs(args.docs)
+    print(f"문서 {len(docs):,}개, 왕복 지연 {args.latency * 1000:.0f}ms, 실패율 {args.fail_rate:.0%}\n")
+    print(f"{'방식':28s} {'시간':>9s} {'문서/초':>10s} {'요청':>7s} {'재시도':>6s}")
+
+    sample = docs[:args.sequential_docs]
+    elapsed, client = sequential(sample, args.latency)
+    print(f"{'문서마다 set() (' + str(len(sample)) + '개)':28s} {elapsed:8.2f}s {len(sample) / elapsed:10.1f} "
+          f"{client.requests:7d} {'-':>6s}")
+
+    for workers in args.workers:
+        elapsed, client, stats = batched(docs, args.latency, workers, args.batch_size, args.fail_rate)
+        written = len(client.documents.get("egoGraphs", {}))
+        status = "" if written == len(docs) else f"  ❌ {written}/{len(docs)}개만 저장"
+        print(f"{f'batch {args.batch_size} × 스레드 {workers}':28s} {elapsed:8.2f}s {len(docs) / elapsed:10.1f} "
+              f"{client.requests:7d} {stats['retries']:6d}{status}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,112 @@
+"""
+메모리 가짜 Firestore 클라이언트 (firebase_admin.firestore.client() 대신)
+
+업로드 엔진(firestore_upload.BatchUploader)과 05_export_ego.main(client)을
+실제 Firestore 없이 시험하기 위한 최소 구현
+- collection(name).document(id).set(data) / .get()
+- batch() → set(ref, data) / delete(ref) ... commit() (500개 초과 시 ValueError, 실제 한도와 같음)
+- 요청(set, commit)마다 latency초 대기 (왕복 지연 흉내)
+- fail_rate 확률로 ConnectionError (재시도 경로 시험), 실패한 commit은 아무것도 쓰지 않음
+"""
+import copy
+import random
+import threading
+import time
+
+MAX_BATCH_WRITES = 500
+
+
+class FakeSnapshot:
+    def __init__(self, doc_id, data):
+        self.id = doc_id
+        self._data = data
+
+    @property
+    def exists(self):
+        return self._data is not None
+
+    def to_dict(self):
+        return copy.deepcopy(self._data)
+
+
+class FakeDocument:
+    def __init__(self, client, collection, doc_id):
+        self.client = client
+        self.collection = collection
+        self.id = doc_id
+
+    def set(self, data):
+        self.client._request()
+        self.client._write([(self.collection, self.id, data)])
+
+    def delete(self):
+        self.client._request()
+        self.client._write([(self.collection, self.id, None)])
+
+    def get(self):
+        self.client._request()
+        return FakeSnapshot(self.id, self.client.documents.get(self.collection, {}).get(self.id))
+
+
+class FakeCollection:
+    def __init__(self, client, name):
+        self.client = client
+        self.name = name
+
+    def document(self, doc_id):
+        return FakeDocument(self.client, self.name, doc_id)
+
+
+class FakeBatch:
+    def __init__(self, client):
+        self.client = client
+        self.writes = []
+
+    def set(self, ref, data):
+        if len(self.writes) >= MAX_BATCH_WRITES:
+            raise ValueError(f"batch 하나에 쓰기는 최대 {MAX_BATCH_WRITES}개")
+        self.writes.append((ref.collection, ref.id, data))
+
+    def delete(self, ref):
+        self.set(ref, None)
+
+    def commit(self):
+        self.client._request()
+        self.client._write(self.writes)
+        self.client.commits += 1
+
+
+class FakeFirestoreClient:
+
+    def __init__(self, latency=0.0, fail_rate=0.0, seed=0):
+        self.latency = latency
+        self.fail_rate = fail_rate
+        self.documents = {}
+        self.requests = 0
+        self.commits = 0
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+
+    def collection(self, name):
+        return FakeCollection(self, name)
+
+    def batch(self):
+        return FakeBatch(self)
+
+    def _request(self):
+        with self._lock:
+            self.requests += 1
+            fail = self.fail_rate and self._rng.random() < self.fail_rate
+        if self.latency:
+            time.sleep(self.latency)
+        if fail:
+            raise ConnectionError("가짜 Firestore: 일시적 연결 오류")
+
+    def _write(self, writes):
+        with self._lock:
+            for collection, doc_id, data in writes:
+                docs = self.documents.setdefault(collection, {})
+                if data is None:
+                    docs.pop(doc_id, None)
+                else:
+                    docs[doc_id] = copy.deepcopy(data)
@@ -0,0 +1,222 @@
+"""
+로컬 Firestore REST 스탠드인 서버
+
+실제 Firestore 없이 firestore_fetch를 시험하기 위한 최소 구현
+- GET  .../documents/{collection}?pageSize=&pageToken=
+- POST .../documents:partitionQuery
+- POST .../documents:runQuery   (__name__ 정렬 + startAt/endAt/limit)
+- POST .../documents:batchGet
+- mask.fieldPaths (목록 조회 시 지정한 필드만 반환)
+- 목록 조회 응답에 ETag, If-None-Match가 같으면 304 (응답 캐시 재검증 시험용)
+
+사용법:
+    python firestore_standin.py --docs 20000 --page-size 300 --partitions 4
+"""
+import argparse
+import bisect
+import hashlib
+import json
+import os
+import sys
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "scripts"))
+
+DOCUMENTS_PATH = "projects/standin/databases/(default)/documents"
+
+
+class StandinFirestore:
+    """컬렉션별 문서를 __name__ 순으로 들고 있는 메모리 저장소"""
+
+    def __init__(self, collections, fail_every=0):
+        self.collections = {}
+        for name, documents in collections.items():
+            docs = sorted(documents, key=lambda d: d["name"])
+            self.collections[name] = (docs, [d["name"] for d in docs])
+        # n번째 요청마다 503을 돌려줘 재시도 경로를 시험
+        self.fail_every = fail_every
+        self.requests = 0
+        self._lock = threading.Lock()
+
+    def should_fail(self):
+        with self._lock:
+            self.requests += 1
+            return self.fail_every and self.requests % self.fail_every == 0
+
+
+def make_handler(store):
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def log_message(self, *args):
+            pass
+
+        def _send(self, status, payload, etag=False):
+            body = json.dumps(payload).encode("utf-8")
+            if etag:
+                tag = '"' + hashlib.sha1(body).hexdigest() + '"'
+                if self.headers.get("If-None-Match") == tag:
+                    self.send_response(304)
+                    self.send_header("ETag", tag)
+                    self.send_header("Content-Length", "0")
+                    self.end_headers()
+                    return
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            if etag:
+                self.send_header("ETag", tag)
+            self.end_headers()
+            self.wfile.write(body)
+
+        def _collection_from_query(self, structured):
+            return structured["from"][0]["collectionId"]
+
+        def do_GET(self):
+            if store.should_fail():
+                return self._send(503, {"error": "unavailable"})
+
+            url = urlparse(self.path)
+            collection = url.path.rstrip("/").rsplit("/", 1)[-1]
+            if collection not in store.collections:
+                return self._send(404, {"error": "not found"})
+
+            params = parse_qs(url.query)
+            page_size = int(params.get("pageSize", ["100"])[0])
+            offset = int(params.get("pageToken", ["0"])[0])
+            docs, _ = store.collections[collection]
+
+            page_docs = docs[offset:offset + page_size]
+            mask = params.get("mask.fieldPaths")
+            if mask:
+                page_docs = [
+                    dict(d, fields={k: v for k, v in d.get("fields", {}).items() if k in mask})
+                    for d in page_docs
+                ]
+
+            page = {"documents": page_docs}
+            if offset + page_size < len(docs):
+                page["nextPageToken"] = str(offset + page_size)
+            self._send(200, page, etag=True)
+
+        def do_POST(self):
+            # keep-alive 연결을 위해 실패 응답 전에도 본문은 읽어둠
+            length = int(self.headers.get("Content-Length", 0))
+            body = json.loads(self.rfile.read(length) or b"{}")
+            if store.should_fail():
+                return self._send(503, {"error": "unavailable"})
+
+            path = urlparse(self.path).path
+
+            if path.endswith(":partitionQuery"):
+                structured = body["structuredQuery"]
+                _, names = store.collections[self._collection_from_query(structured)]
+                count = int(body.get("partitionCount", 1)) + 1
+                step = max(len(names) // count, 1)
+                cursors = [
+                    {"values": [{"referenceValue": names[i]}]}
+                    for i in range(step, len(names), step)
+                ][:count - 1]
+                return self._send(200, {"partitions": cursors})
+
+            if path.endswith(":runQuery"):
+                structured = body["structuredQuery"]
+                docs, names = store.collections[self._collection_from_query(structured)]
+
+                lo, hi = 0, len(names)
+                if "startAt" in structured:
+                    cursor = structured["startAt"]["values"][0]["referenceValue"]
+                    before = structured["startAt"].get("before", False)
+                    lo = (bisect.bisect_left if before else bisect.bisect_right)(names, cursor)
+                if "endAt" in structured:
+                    cursor = structured["endAt"]["values"][0]["referenceValue"]
+                    before = structured["endAt"].get("before", False)
+                    hi = (bisect.bisect_left if before else bisect.bisect_right)(names, cursor)
+
+                limit = int(structured.get("limit", hi - lo))
+                results = [{"document": d, "readTime": d["updateTime"]} for d in docs[lo:min(hi, lo + limit)]]
+                if not results:
+                    results = [{"readTime": "1970-01-01T00:00:00Z"}]
+                return self._send(200, results)
+
+            if path.endswith(":batchGet"):
+                by_name = {
+                    d["name"]: d for docs, _ in store.collections.values() for d in docs
+                }
+                results = [
+                    {"found": by_name[name]} if name in by_name else {"missing": name}
+                    for name in body.get("documents", [])
+                ]
+                return self._send(200, results)
+
+            self._send(404, {"error": "unknown method"})
+
+    return Handler
+
+
+def serve(collections, port=0, fail_every=0):
+    """
+    스탠드인 서버를 백그라운드 스레드로 띄움
+    반환: (server, base_url) — 사용 후 server.shutdown()
+    """
+    store = StandinFirestore(collections, fail_every=fail_every)
+    server = ThreadingHTTPServer(("127.0.0.1", port), make_handler(store))
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base_url = f"http://127.0.0.1:{server.server_address[1]}/v1/{DOCUMENTS_PATH}"
+    return server, base_url
+
+
+def make_person_document(index, collection="persons"):
+    """영화인 문서 하나 (Firestore REST 형태)"""
+    person_id = str(10000000 + index)
+    return {
+        "name": f"{DOCUMENTS_PATH}/{collection}/{person_id}",
+        "fields": {
+            "id": {"stringValue": person_id},
+            "name": {"stringValue": f"영화인{index}"},
+            "repRoleNm": {"stringValue": "배우"},
+            "filmo": {"arrayValue": {"values": [
+                {"stringValue": f"영화{(index * 7 + k) % 5000}"} for k in range(5)
+            ]}},
+        },
+        "createTime": "2025-11-01T00:00:00.000000Z",
+        "updateTime": "2025-11-01T00:00:00.000000Z",
+    }
+
+
+def main():
+    from firestore_fetch import FirestoreFetcher
+
+    parser = argparse.ArgumentParser(description="Firestore 스탠드인 대상 가져오기 측정")
+    parser.add_argument("--docs", type=int, default=20000)
+    parser.add_argument("--page-size", type=int, default=300)
+    parser.add_argument("--partitions", type=int, default=4)
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--fail-every", type=int, default=0)
+    args = parser.parse_args()
+
+    docs = [make_person_document(i) for i in range(args.docs)]
+    server, base_url = serve({"persons": docs}, fail_every=args.fail_every)
+
+    try:
+        for label, partitions in [("순차 (nextPageToken)", 1), ("키 범위 분할", args.partitions)]:
+            fetcher = FirestoreFetcher(base_url, page_size=args.page_size,
+                                       max_workers=args.workers, backoff=0.01)
+            if partitions > 1:
+                names = [d["name"] for _, page in fetcher.fetch_partitioned("persons", partitions) for d in page]
+            else:
+                names = [d["name"] for page in fetcher.iter_pages("persons") for d in page]
+
+            assert sorted(names) == sorted(d["name"] for d in docs), "문서 누락/중복"
+            stats = fetcher.stats.report()
+            print(f"{label}: {stats['documents']}개 문서, {stats['pages']}페이지, "
+                  f"{stats['pages_per_sec']} pages/s, {stats['documents_per_sec']} docs/s, "
+                  f"재시도 {stats['retries']}회")
+    finally:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,188 @@
+"""
+합성 영화인(persons) 문서 생성기
+
+01_load_from_firestore.py가 받는 것과 같은 Firestore REST 모양의 문서를 만듦
+(fields / mapValue / arrayValue, characters 배열 + filmo 배열)
+
+- 필모그래피 길이: 멱법칙 (대부분 1~3편, 소수가 수백 편)
+- 영화 캐스트 크기: 멱법칙 (영화마다 인기 가중치를 멱법칙으로 뽑고 출연을 가중치에 비례해 배정)
+- 역할 구성: --roles 배우=0.7,감독=0.1,... (repRoleNm)
+
+같은 seed면 같은 문서가 나옴. 문서는 페이지 단위로 만들어 100만 명도 메모리 일정
+
+사용법:
+    python synthetic_persons.py --persons 100000                    # 분포 요약만 출력
+    python synthetic_persons.py --persons 100000 --out persons.json # 목록 응답 모양으로 저장
+    (firestore_standin.serve({"persons": list(documents(film))})로 01 단계 전체를 돌릴 수도 있음)
+"""
+import argparse
+import json
+import os
+import sys
+from dataclasses import dataclass
+
+import numpy as np
+
+DOCUMENTS_PATH = "projects/synthetic/databases/(default)/documents"
+DEFAULT_ROLES = {"배우": 0.7, "감독": 0.08, "촬영": 0.06, "음악": 0.06, "각본": 0.05, "미술": 0.05}
+FIRST_PERSON_ID = 10000000
+FIRST_MOVIE_ID = 20000000
+
+
+@dataclass
+class Filmography:
+    """영화인별 역할 + 출연 영화 (CSR: credit_ptr[i]:credit_ptr[i+1]이 i번째 영화인의 영화 번호)"""
+    roles: list
+    role_codes: np.ndarray
+    credit_ptr: np.ndarray
+    credit_movie: np.ndarray
+    num_movies: int
+
+    @property
+    def num_persons(self):
+        return len(self.role_codes)
+
+    @property
+    def num_credits(self):
+        return len(self.credit_movie)
+
+    def cast_sizes(self):
+        return np.bincount(self.credit_movie, minlength=self.num_movies)
+
+
+def power_law(rng, size, exponent, minimum=1, maximum=None):
+    """이산 멱법칙 표본 P(k) ∝ k^-exponent (k >= minimum, 역변환 표본추출 후 내림)"""
+    u = rng.random(size)
+    values = np.floor(minimum * (1.0 - u) ** (-1.0 / (exponent - 1.0))).astype(np.int64)
+    return np.minimum(values, maximum) if maximum else values
+
+
+def parse_roles(text):
+    """'배우=0.7,감독=0.1' → {'배우': 0.7, '감독': 0.1}"""
+    roles = {}
+    for item in text.split(","):
+        name, _, share = item.partition("=")
+        roles[name.strip()] = float(share)
+    return roles
+
+
+def generate(num_persons, seed=42, roles=None, filmo_exponent=2.3, max_filmo=200,
+             cast_exponent=2.8, avg_cast=8, max_cast=120):
+    """
+    영화인 num_persons명의 필모그래피 생성
+    filmo_exponent / max_filmo: 필모그래피 길이 분포, cast_exponent / avg_cast / max_cast: 캐스트 크기 분포
+    """
+    rng = np.random.default_rng(seed)
+    roles = roles or DEFAULT_ROLES
+    names = list(roles)
+    shares = np.asarray([roles[name] for name in names], dtype=np.float64)
+    role_codes = rng.choice(len(names), size=num_persons, p=shares / shares.sum()).astype(np.int8)
+
+    lengths = power_law(rng, num_persons, filmo_exponent, maximum=max_filmo)
+    credit_ptr = np.zeros(num_persons + 1, dtype=np.int64)
+    np.cumsum(lengths, out=credit_ptr[1:])
+    num_credits = int(credit_ptr[-1])
+
+    # 영화 인기 가중치 (멱법칙, 한 영화에 max_cast명 넘게 몰리지 않도록 상한)
+    num_movies = max(num_credits // avg_cast, 1)
+    popularity = power_law(rng, num_movies, cast_exponent).astype(np.float64)
+    for _ in range(10):   # 상한을 자르면 합이 줄어 다른 영화의 몫이 커지므로 몇 번 반복
+        popularity = np.minimum(popularity, max_cast * popularity.sum() / num_credits)
+    credit_movie = rng.choice(num_movies, size=num_credits, p=popularity / popularity.sum())
+
+    # 한 사람이 같은 영화를 두 번 뽑은 경우는 그대로 둠 (01의 정제 단계에서 중복 제거)
+    return Filmography(names, role_codes, credit_ptr, credit_movie.astype(np.int64), num_movies)
+
+
+# ===========================
+# Firestore REST 문서
+# ===========================
+
+
+def person_document(film, i):
+    """i번째 영화인 문서 (Firestore REST 모양)"""
+    person_id = str(FIRST_PERSON_ID + i)
+    movies = film.credit_movie[film.credit_ptr[i]:film.credit_ptr[i + 1]].tolist()
+    characters = [
+        {"mapValue": {"fields": {
+            "movieId": {"integerValue": str(FIRST_MOVIE_ID + m)},
+            "movieTitle": {"stringValue": f"영화{m}"},
+            "characterName": {"stringValue": f"역할{k}"},
+        }}}
+        for k, m in enumerate(movies)
+    ]
+    return {
+        "name": f"{DOCUMENTS_PATH}/persons/{person_id}",
+        "fields": {
+            "id": {"stringValue": person_id},
+            "name": {"stringValue": f"영화인{i}"},
+            "repRoleNm": {"stringValue": film.roles[film.role_codes[i]]},
+            "popularity": {"doubleValue": float(len(movies))},
+            "profileImage": {"nullValue": None},
+            "characters": {"arrayValue": {"values": characters}},
+            "filmo": {"arrayValue": {"values": [{"stringValue": f"영화{m}"} for m in movies]}},
+            "createdAt": {"timestampValue": "2025-11-23T09:52:41.554Z"},
+        },
+        "createTime": "2025-11-23T09:52:41.554Z",
+        "updateTime": "2025-11-23T09:52:41.554Z",
+    }
+
+
+def documents(film, start=0, stop=None):
+    """영화인 문서를 차례로 (필요할 때 만듦)"""
+    for i in range(start, film.num_persons if stop is None else stop):
+        yield person_document(film, i)
+
+
+def pages(film, page_size=300):
+    """목록 응답 페이지(JSON 바이트)를 차례로, 마지막 페이지에는 nextPageToken 없음"""
+    for start in range(0, film.num_persons, page_size):
+        stop = min(start + page_size, film.num_persons)
+        page = {"documents": list(documents(film, start, stop))}
+        if stop < film.num_persons:
+            page["nextPageToken"] = str(stop)
+        yield json.dumps(page, ensure_ascii=False).encode("utf-8")
+
+
+def describe(film):
+    """분포 요약 출력"""
+    lengths = np.diff(film.credit_ptr)
+    cast = film.cast_sizes()
+    cast = cast[cast > 0]
+    print(f"영화인 {film.num_persons:,}명, 영화 {len(cast):,}편, 출연 {film.num_credits:,}건")
+    print(f"   - 필모그래피: 평균 {lengths.mean():.1f}편, 중앙값 {np.median(lengths):.0f}편, 최대 {lengths.max():,}편")
+    print(f"   - 캐스트: 평균 {cast.mean():.1f}명, 중앙값 {np.median(cast):.0f}명, 최대 {cast.max():,}명")
+    print(f"   - (사람쌍, 영화) 조합: {int((cast * (cast - 1) // 2).sum()):,}개")
+    counts = np.bincount(film.role_codes, minlength=len(film.roles))
+    print("   - 역할: " + ", ".join(f"{name} {count:,}" for name, count in zip(film.roles, counts.tolist())))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="합성 영화인 문서 생성")
+    parser.add_argument("--persons", type=int, default=10000)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--roles", type=parse_roles, default=None, help="역할 구성 (예: 배우=0.7,감독=0.1,음악=0.2)")
+    parser.add_argument("--filmo-exponent", type=float, default=2.3)
+    parser.add_argument("--max-filmo", type=int, default=200)
+    parser.add_argument("--cast-exponent", type=float, default=2.8)
+    parser.add_argument("--avg-cast", type=int, default=8)
+    parser.add_argument("--max-cast", type=int, default=120)
+    parser.add_argument("--out", default=None, help="문서 전체를 목록 응답 모양 JSON 하나로 저장")
+    args = parser.parse_args()
+
+    film = generate(args.persons, seed=args.seed, roles=args.roles, filmo_exponent=args.filmo_exponent,
+                    max_filmo=args.max_filmo, cast_exponent=args.cast_exponent, avg_cast=args.avg_cast,
+                    max_cast=args.max_cast)
+    describe(film)
+
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as f:
+            f.write('{"documents": [')
+            for i, doc in enumerate(documents(film)):
+                f.write(("," if i else "") + json.dumps(doc, ensure_ascii=False))
+            f.write("]}")
+        print(f"✅ 저장: {args.out} ({os.path.getsize(args.out) / 1024 ** 2:.1f} MB)")
+
+
+if __name__ == "__main__":
+    sys.exit(main())
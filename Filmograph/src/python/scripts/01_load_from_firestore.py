@@ -4,7 +4,13 @@ import pyrebase
 import pandas as pd
 from datetime import datetime
 
-print("=== .env 파일 로드 ===\n")
+import metrics
+from firestore_cache import CachedSession, ResponseCache
+from firestore_fetch import FirestoreFetcher, FirestoreFetchError, make_session
+from snapshot_store import PersonSnapshot, save_changed_persons
+from firestore_decode import decode_document, PersonMovieColumns
+from artifacts import write_frame, RELATION_DICTIONARY_COLUMNS
+from paths import DATA_DIR, data_path
 
 # .env 파일 로드 (프로젝트 루트에서)
 load_dotenv()
@@ -20,262 +26,279 @@ firebase_config = {
     "databaseURL": ""
 }
 
-# 설정 확인
-print("Firebase 설정:")
-print(f"  Project ID: {firebase_config['projectId']}")
-print(f"  Auth Domain: {firebase_config['authDomain']}")
-print()
+# Firestore REST API 엔드포인트
+project_id = firebase_config['projectId']
+base_url = os.getenv(
+    "FIRESTORE_BASE_URL",
+    f"https://firestore.googleapis.com/v1/projects/{project_id}/databases/(default)/documents"
+)
+
+# 가져오기 설정 (.env로 조정 가능)
+PAGE_SIZE = int(os.getenv("FIRESTORE_PAGE_SIZE", "300"))      # 페이지당 문서 수
+MAX_WORKERS = int(os.getenv("FIRESTORE_MAX_WORKERS", "4"))     # 동시 요청 수
+PARTITIONS = int(os.getenv("FIRESTORE_PARTITIONS", "1"))       # 키 범위 분할 수
+
+SNAPSHOT_PATH = data_path('persons_snapshot.pkl')
+CHANGED_PERSONS_PATH = data_path('changed_persons.json')
+FULL_REFRESH = os.getenv("FIRESTORE_FULL_REFRESH") == "1"
 
-# Firebase 초기화
-firebase = pyrebase.initialize_app(firebase_config)
-db = firebase.database()
+RELATIONS_PATH = data_path('movies_data.arrow')
 
-print("✅ Firebase 연결 성공!\n")
+# REST 응답 디스크 캐시 (off | record | replay | auto, firestore_cache.py 참고)
+# replay면 네트워크 없이 캐시만 사용 (반복 실행, CI), auto면 FIRESTORE_CACHE_TTL초 안의 응답은 재사용
+CACHE_MODE = os.getenv("FIRESTORE_CACHE", "off")
+CACHE_DIR = data_path('http_cache')
+CACHE_TTL = int(os.getenv("FIRESTORE_CACHE_TTL", "3600"))
+CACHE_MAX_MB = int(os.getenv("FIRESTORE_CACHE_MAX_MB", "512"))
 
 # ===========================
-# Firestore 접근을 위해서는 REST API를 사용
+# Firebase 연결
 # ===========================
 
-print("=== Firestore REST API로 데이터 가져오기 ===\n")
+def connect():
+    """설정 확인 + Firebase 초기화, Firestore REST API 클라이언트 반환"""
+    print("=== .env 파일 로드 ===\n")
 
-import requests
+    # 설정 확인
+    print("Firebase 설정:")
+    print(f"  Project ID: {firebase_config['projectId']}")
+    print(f"  Auth Domain: {firebase_config['authDomain']}")
+    print()
 
-# Firestore REST API 엔드포인트
-project_id = firebase_config['projectId']
-base_url = f"https://firestore.googleapis.com/v1/projects/{project_id}/databases/(default)/documents"
+    # Firebase 초기화
+    firebase = pyrebase.initialize_app(firebase_config)
+    firebase.database()
 
-def get_firestore_collection(collection_name):
+    print("✅ Firebase 연결 성공!\n")
+
+    # Firestore 접근을 위해서는 REST API를 사용
+    session = make_session(pool_size=max(MAX_WORKERS, 1) * 2)
+    if CACHE_MODE != "off":
+        cache = ResponseCache(CACHE_DIR, max_bytes=CACHE_MAX_MB * 1024 ** 2)
+        session = CachedSession(session, cache, mode=CACHE_MODE, ttl=CACHE_TTL)
+        print(f"📦 응답 캐시: {CACHE_MODE} 모드 (data/http_cache, {cache.total_bytes / 1024 ** 2:.1f}MB)\n")
+    return FirestoreFetcher(base_url, page_size=PAGE_SIZE, max_workers=MAX_WORKERS, session=session)
+
+def get_firestore_collection(fetcher, collection_name):
     """
-    Firestore 컬렉션의 모든 문서를 가져오는 함수
+    Firestore 컬렉션의 모든 문서를 페이지 단위로 가져오는 제너레이터
+    (nextPageToken을 따라가며, 페이지가 도착할 때마다 문서 리스트를 넘겨줌)
     """
-    url = f"{base_url}/{collection_name}"
-    response = requests.get(url)
-    
-    if response.status_code == 200:
-        return response.json()
+    if PARTITIONS > 1:
+        for _, documents in fetcher.fetch_partitioned(collection_name, PARTITIONS):
+            yield documents
     else:
-        print(f"❌ 오류: {response.status_code}")
-        print(response.text)
-        return None
+        yield from fetcher.iter_pages(collection_name)
 
 def parse_firestore_document(doc):
     """
     Firestore 문서를 Python dict로 변환
+    (double, boolean, null, 중첩 map/array까지 모든 값 타입을 재귀적으로 처리)
     """
-    if 'fields' not in doc:
-        return {}
-    
-    result = {}
-    fields = doc['fields']
-    
-    for key, value in fields.items():
-        # Firestore의 타입별 처리
-        if 'stringValue' in value:
-            result[key] = value['stringValue']
-        elif 'integerValue' in value:
-            result[key] = int(value['integerValue'])
-        elif 'arrayValue' in value:
-            # 배열 처리
-            array_values = value['arrayValue'].get('values', [])
-            result[key] = []
-            for item in array_values:
-                if 'stringValue' in item:
-                    result[key].append(item['stringValue'])
-                elif 'mapValue' in item:
-                    # 배열 안의 객체 처리
-                    map_fields = item['mapValue'].get('fields', {})
-                    obj = {}
-                    for map_key, map_value in map_fields.items():
-                        if 'stringValue' in map_value:
-                            obj[map_key] = map_value['stringValue']
-                        elif 'integerValue' in map_value:
-                            obj[map_key] = int(map_value['integerValue'])
-                    result[key].append(obj)
-        elif 'timestampValue' in value:
-            result[key] = value['timestampValue']
-    
-    return result
+    return decode_document(doc)
 
+# ===========================
 # persons 컬렉션 가져오기
-print("영화인 데이터 로딩 중...")
-response = get_firestore_collection('persons')
-
-if not response or 'documents' not in response:
-    print("❌ 데이터를 가져올 수 없습니다.")
-    print("   Firebase 보안 규칙을 확인하세요:")
-    print("   → Firestore > 규칙 > allow read: if true;")
-    exit(1)
-
-# 문서 파싱
-persons_data = []
-for doc in response['documents']:
-    person = parse_firestore_document(doc)
-    if person:
-        persons_data.append(person)
-
-print(f"✅ 총 {len(persons_data)}명의 영화인 로드 완료!\n")
-
-# 데이터 미리보기
-if len(persons_data) > 0:
-    print("=== 첫 번째 영화인 데이터 예시 ===")
-    first_person = persons_data[0]
-    print(f"이름: {first_person.get('name', 'Unknown')}")
-    print(f"역할: {first_person.get('repRoleNm', 'Unknown')}")
-    print(f"참여 영화 수: {len(first_person.get('characters', []))}편")
-    print()
+# ===========================
+
+def load_persons(fetcher):
+    """스냅샷이 있으면 변경분만, 없으면 전체를 가져옴 (페이지가 도착하는 대로 파싱)"""
+    print("=== Firestore REST API로 데이터 가져오기 ===\n")
+    print("영화인 데이터 로딩 중...")
+
+    snapshot = PersonSnapshot.load(SNAPSHOT_PATH)
+
+    try:
+        with metrics.stage("fetch_persons") as record:
+            if FULL_REFRESH or snapshot.is_empty():
+                print("   → 전체 가져오기")
+                delta = snapshot.replace_all(get_firestore_collection(fetcher, 'persons'), parse_firestore_document)
+            else:
+                print("   → 변경분만 가져오기 (updateTime 비교)")
+                delta = snapshot.sync(fetcher, 'persons', parse_firestore_document)
+            fetch_stats = fetcher.stats.report()
+            record.count(pages=fetch_stats['pages'], documents=fetch_stats['documents'],
+                         retries=fetch_stats['retries'], persons=len(snapshot.persons()))
+    except FirestoreFetchError as e:
+        # pipeline.py에서 실행될 때도 기록이 남도록 프로세스를 끝내지 않고 예외로 올림
+        print(f"❌ 오류: {e.status_code}")
+        print(e.text)
+        raise
+
+    persons_data = snapshot.persons()
+
+    if not persons_data:
+        print("❌ 데이터를 가져올 수 없습니다.")
+        print("   Firebase 보안 규칙을 확인하세요:")
+        print("   → Firestore > 규칙 > allow read: if true;")
+        raise RuntimeError("Firestore에서 영화인 데이터를 가져오지 못했습니다")
+
+    snapshot.save()
+    changed = save_changed_persons(delta, CHANGED_PERSONS_PATH)
+
+    print(f"✅ 총 {len(persons_data)}명의 영화인 로드 완료!")
+    print(f"   - 페이지: {fetch_stats['pages']}개 ({fetch_stats['pages_per_sec']} pages/s)")
+    print(f"   - 문서: {fetch_stats['documents']}개 ({fetch_stats['documents_per_sec']} docs/s)")
+    print(f"   - 재시도: {fetch_stats['retries']}회, 소요 시간: {fetch_stats['elapsed_sec']}초")
+    if isinstance(fetcher.session, CachedSession):
+        cache_stats = fetcher.session.stats.report()
+        print(f"   - 캐시: 재사용 {cache_stats['hits']}개, 재검증 {cache_stats['revalidated']}개, "
+              f"네트워크 {cache_stats['fetched']}개, 삭제 {cache_stats['evicted']}개")
+    print(f"   - 변경: 추가 {len(delta['added'])}명, 수정 {len(delta['updated'])}명, 삭제 {len(delta['deleted'])}명")
+    print(f"   → 변경된 영화인 목록 저장: data/changed_persons.json ({len(changed['names'])}명)\n")
+
+    # 데이터 미리보기
+    if len(persons_data) > 0:
+        print("=== 첫 번째 영화인 데이터 예시 ===")
+        first_person = persons_data[0]
+        print(f"이름: {first_person.get('name', 'Unknown')}")
+        print(f"역할: {first_person.get('repRoleNm', 'Unknown')}")
+        print(f"참여 영화 수: {len(first_person.get('characters', []))}편")
+        print()
+
+    return persons_data
 
 # ===========================
 # 영화인-영화 관계 데이터 생성
 # ===========================
 
-print("=== 영화인-영화 관계 데이터 생성 중... ===\n")
-
-person_movie_list = []
-
-for person in persons_data:
-    person_id = person.get('id', 'Unknown')
-    person_name = person.get('name', 'Unknown')
-    person_role = person.get('repRoleNm', '기타')
-    
-    # characters 배열에서 영화 정보 추출
-    characters = person.get('characters', [])
-    
-    if not characters or len(characters) == 0:
-        # characters가 없으면 filmo 사용
-        filmo = person.get('filmo', [])
-        for movie_title in filmo:
-            if movie_title:
-                person_movie_list.append({
-                    'person_id': person_id,
-                    'person_name': person_name,
-                    'person_role': person_role,
-                    'movie_id': None,
-                    'movie_title': movie_title,
-                    'character_name': None
-                })
-    else:
-        # characters 배열 처리
-        for char in characters:
-            movie_id = char.get('movieId', None)
-            movie_title = char.get('movieTitle', 'Unknown')
-            character_name = char.get('characterName', None)
-            
-            if movie_title and movie_title != 'Unknown':
-                person_movie_list.append({
-                    'person_id': person_id,
-                    'person_name': person_name,
-                    'person_role': person_role,
-                    'movie_id': movie_id,
-                    'movie_title': movie_title,
-                    'character_name': character_name
-                })
-
-# DataFrame 생성
-df = pd.DataFrame(person_movie_list)
-
-print(f"✅ 총 {len(df)}개의 영화인-영화 관계 생성\n")
-
-if len(df) > 0:
-    print("=== 데이터 미리보기 ===")
-    print(df.head(10))
-    print()
+def build_relations(persons_data):
+    """영화인 목록 → 정제된 영화인-영화 관계 표"""
+    print("=== 영화인-영화 관계 데이터 생성 중... ===\n")
 
-# ===========================
-# 데이터 정제
-# ===========================
+    # 행마다 dict를 만들지 않고 컬럼 버퍼에 바로 쌓음
+    # (영화인 dict는 증분 가져오기 스냅샷에 저장하는 디코딩 결과를 그대로 씀, 원본 문서가 있으면 add_document)
+    with metrics.stage("build_relations", persons=len(persons_data)) as record:
+        columns = PersonMovieColumns()
+
+        for person in persons_data:
+            columns.add_person(person)
+
+        # DataFrame 생성
+        df = columns.to_frame()
+        record.count(rows=len(df))
+
+    print(f"✅ 총 {len(df)}개의 영화인-영화 관계 생성\n")
 
-print("=== 데이터 정제 중... ===\n")
+    if len(df) > 0:
+        print("=== 데이터 미리보기 ===")
+        print(df.head(10))
+        print()
 
-original_len = len(df)
+    # ===========================
+    # 데이터 정제
+    # ===========================
 
-# 1. 결측치 제거
-df = df.dropna(subset=['person_name', 'movie_title'])
-print(f"1. 결측치 제거: {original_len - len(df)}개 행 제거")
+    print("=== 데이터 정제 중... ===\n")
 
-# 2. 중복 제거
-original_len = len(df)
-df = df.drop_duplicates(subset=['person_name', 'movie_title'])
-print(f"2. 중복 제거: {original_len - len(df)}개 행 제거")
+    original_len = len(df)
 
-# 3. 이름/제목 공백 정리
-df['person_name'] = df['person_name'].str.strip()
-df['movie_title'] = df['movie_title'].str.strip()
-print(f"3. 공백 정리 완료")
+    # 1. 결측치 제거
+    df = df.dropna(subset=['person_name', 'movie_title'])
+    print(f"1. 결측치 제거: {original_len - len(df)}개 행 제거")
 
-# 4. 빈 문자열 제거
-original_len = len(df)
-df = df[df['person_name'] != '']
-df = df[df['movie_title'] != '']
-print(f"4. 빈 문자열 제거: {original_len - len(df)}개 행 제거")
+    # 2. 중복 제거
+    original_len = len(df)
+    df = df.drop_duplicates(subset=['person_name', 'movie_title'])
+    print(f"2. 중복 제거: {original_len - len(df)}개 행 제거")
 
-# 5. 'Unknown' 제거
-original_len = len(df)
-df = df[df['movie_title'] != 'Unknown']
-print(f"5. Unknown 제거: {original_len - len(df)}개 행 제거")
+    # 3. 이름/제목 공백 정리
+    df['person_name'] = df['person_name'].str.strip()
+    df['movie_title'] = df['movie_title'].str.strip()
+    print(f"3. 공백 정리 완료")
 
-print(f"\n✅ 최종 데이터: {len(df)}개 행")
+    # 4. 빈 문자열 제거
+    original_len = len(df)
+    df = df[df['person_name'] != '']
+    df = df[df['movie_title'] != '']
+    print(f"4. 빈 문자열 제거: {original_len - len(df)}개 행 제거")
+
+    # 5. 'Unknown' 제거
+    original_len = len(df)
+    df = df[df['movie_title'] != 'Unknown']
+    print(f"5. Unknown 제거: {original_len - len(df)}개 행 제거")
+
+    print(f"\n✅ 최종 데이터: {len(df)}개 행")
+    return df
 
 # ===========================
 # 통계 정보
 # ===========================
 
-print("\n=== 📊 데이터 통계 ===")
-print(f"총 영화 수: {df['movie_title'].nunique()}개")
-print(f"총 영화인 수: {df['person_name'].nunique()}명")
-
-# 역할별 통계
-if 'person_role' in df.columns:
-    print(f"\n=== 역할별 분포 ===")
-    role_counts = df['person_role'].value_counts()
-    for role, count in role_counts.items():
-        unique_persons = df[df['person_role'] == role]['person_name'].nunique()
-        print(f"  - {role}: {unique_persons}명")
-
-# 가장 많이 참여한 영화인 Top 10
-print("\n=== 🎬 가장 활발한 영화인 Top 10 ===")
-top_people = df['person_name'].value_counts().head(10)
-for i, (name, count) in enumerate(top_people.items(), 1):
-    role = df[df['person_name'] == name]['person_role'].iloc[0]
-    print(f"{i:2d}. {name} ({role}): {count}편")
-
-# 가장 많은 영화인이 참여한 영화 Top 10
-print("\n=== 🎥 참여 인원이 많은 영화 Top 10 ===")
-top_movies = df['movie_title'].value_counts().head(10)
-for i, (title, count) in enumerate(top_movies.items(), 1):
-    print(f"{i:2d}. {title}: {count}명")
-
-# 협업 가능성 확인
-print("\n=== 🔗 협업 네트워크 가능성 분석 ===")
-movies_with_multiple_people = df.groupby('movie_title')['person_name'].count()
-movies_with_collab = movies_with_multiple_people[movies_with_multiple_people >= 2]
-print(f"협업 관계가 있는 영화: {len(movies_with_collab)}개")
-print(f"평균 참여 인원: {movies_with_multiple_people.mean():.1f}명")
-
-if len(movies_with_collab) < 10:
-    print("\n⚠️  경고: 협업 관계가 있는 영화가 너무 적습니다!")
-    print("   → characters 배열이 제대로 채워져 있는지 확인하세요.")
+def print_stats(df):
+    print("\n=== 📊 데이터 통계 ===")
+    print(f"총 영화 수: {df['movie_title'].nunique()}개")
+    print(f"총 영화인 수: {df['person_name'].nunique()}명")
+
+    # 역할별 통계
+    if 'person_role' in df.columns:
+        print(f"\n=== 역할별 분포 ===")
+        role_counts = df['person_role'].value_counts()
+        for role, count in role_counts.items():
+            unique_persons = df[df['person_role'] == role]['person_name'].nunique()
+            print(f"  - {role}: {unique_persons}명")
+
+    # 가장 많이 참여한 영화인 Top 10
+    print("\n=== 🎬 가장 활발한 영화인 Top 10 ===")
+    top_people = df['person_name'].value_counts().head(10)
+    for i, (name, count) in enumerate(top_people.items(), 1):
+        role = df[df['person_name'] == name]['person_role'].iloc[0]
+        print(f"{i:2d}. {name} ({role}): {count}편")
+
+    # 가장 많은 영화인이 참여한 영화 Top 10
+    print("\n=== 🎥 참여 인원이 많은 영화 Top 10 ===")
+    top_movies = df['movie_title'].value_counts().head(10)
+    for i, (title, count) in enumerate(top_movies.items(), 1):
+        print(f"{i:2d}. {title}: {count}명")
+
+    # 협업 가능성 확인
+    print("\n=== 🔗 협업 네트워크 가능성 분석 ===")
+    movies_with_multiple_people = df.groupby('movie_title')['person_name'].count()
+    movies_with_collab = movies_with_multiple_people[movies_with_multiple_people >= 2]
+    print(f"협업 관계가 있는 영화: {len(movies_with_collab)}개")
+    print(f"평균 참여 인원: {movies_with_multiple_people.mean():.1f}명")
+
+    if len(movies_with_collab) < 10:
+        print("\n⚠️  경고: 협업 관계가 있는 영화가 너무 적습니다!")
+        print("   → characters 배열이 제대로 채워져 있는지 확인하세요.")
 
 # ===========================
 # 저장
 # ===========================
 
-# 폴더 생성
-os.makedirs('../data', exist_ok=True)
-
-# CSV로 저장
-df.to_csv('../data/movies_from_firestore.csv', index=False, encoding='utf-8-sig')
-print(f"\n✅ CSV 저장 완료: data/movies_from_firestore.csv")
-
-# Pickle로 저장
-df.to_pickle('../data/movies_data.pkl')
-print(f"✅ Pickle 저장 완료: data/movies_data.pkl")
-
-# 원본 persons 데이터도 저장
-persons_df = pd.DataFrame(persons_data)
-persons_df.to_pickle('../data/persons_raw.pkl')
-print(f"✅ 원본 영화인 데이터 저장: data/persons_raw.pkl")
-
-print("\n" + "="*50)
-print("🎉 Step 1 완료!")
-print("="*50)
-print("\n👉 다음 단계: python 02_build_network.py")
\ No newline at end of file
+def save(df, persons_data):
+    with metrics.stage("save_relations", rows=len(df), persons=len(persons_data)):
+        # 폴더 생성
+        os.makedirs(DATA_DIR, exist_ok=True)
+
+        # CSV로 저장
+        df.to_csv(data_path('movies_from_firestore.csv'), index=False, encoding='utf-8-sig')
+        print(f"\n✅ CSV 저장 완료: data/movies_from_firestore.csv")
+
+        # Arrow로 저장 (다음 단계에서 memory map으로 필요한 컬럼만 읽음)
+        write_frame(df, RELATIONS_PATH, dictionary_columns=RELATION_DICTIONARY_COLUMNS)
+        print(f"✅ Arrow 저장 완료: data/movies_data.arrow")
+
+        # 원본 persons 데이터도 저장
+        persons_df = pd.DataFrame(persons_data)
+        write_frame(persons_df, data_path('persons_raw.arrow'), dictionary_columns=("repRoleNm",))
+        print(f"✅ 원본 영화인 데이터 저장: data/persons_raw.arrow")
+
+
+# 정제된 관계 표를 반환 (pipeline.py가 다음 단계에 그대로 넘김)
+@metrics.record_run("01_load_from_firestore")
+def main():
+    fetcher = connect()
+    persons_data = load_persons(fetcher)
+    df = build_relations(persons_data)
+    print_stats(df)
+    save(df, persons_data)
+
+    print("\n" + "="*50)
+    print("🎉 Step 1 완료!")
+    print("="*50)
+    print("\n👉 다음 단계: python 02_build_network.py")
+    return df
+
+if __name__ == "__main__":
+    main()
@@ -1,179 +1,269 @@
-import pandas as pd
+import numpy as np
 import networkx as nx
-from itertools import combinations
-from collections import defaultdict
 import os
-import pickle
+import time
+import tracemalloc
 
-print("="*60)
-print("🔗 Step 2: 협업 네트워크 생성")
-print("="*60)
-print()
+import metrics
+from artifacts import read_relations, save_edges
+from csr_graph import CSRGraph
+from node_table import NodeTable
+from paths import OUTPUT_DIR, data_path, output_path
+from projection import project, stream_project, ProjectionStats
 
 # ===========================
-# 데이터 로드
+# 투영 옵션 (환경 변수로 조정)
 # ===========================
 
-print("=== 데이터 로딩 중... ===\n")
-
-# Step 1에서 생성한 Pickle 파일 로드
-df = pd.read_pickle('../data/movies_data.pkl')
+def env_int(name):
+    value = os.getenv(name)
+    return int(value) if value else None
+
+MAX_CAST = env_int("PROJECTION_MAX_CAST")                 # 캐스트가 이보다 큰 영화는 제외
+TOP_BILLED = env_int("PROJECTION_TOP_BILLED")             # 영화마다 상위 N명만 연결
+WEIGHTING = os.getenv("PROJECTION_WEIGHTING", "count")    # count | newman (1/(k-1) strength 추가)
+STREAM = os.getenv("PROJECTION_STREAM") == "1"            # 엣지를 블록 단위로 바로 파일에 씀
+CHUNK_PAIRS = int(os.getenv("PROJECTION_CHUNK_PAIRS", "5000000"))  # 블록당 (사람쌍, 영화) 조합 수
+COMPARE = os.getenv("PROJECTION_COMPARE") == "1"          # 제한 없는 엣지 수를 세어 리포트 (시간/메모리 비교는 bench_projection.py --modes)
+
+RELATIONS_PATH = data_path('movies_data.arrow')
+NODES_PATH = output_path('network.nodes.arrow')
+EDGES_PATH = output_path('network.edges.arrow')
+ADJACENCY_PATH = output_path('network.adjacency.arrow')
+GRAPHML_PATH = output_path('network.graphml')
+
+def measure(func, *args, **kwargs):
+    """실행 시간과 최대 메모리(tracemalloc 기준) 측정"""
+    # 프로파일 모드(PIPELINE_PROFILE=1)에서 이미 추적 중이면 끄지 않고 최대값만 다시 잼
+    tracing = tracemalloc.is_tracing()
+    if tracing:
+        tracemalloc.reset_peak()
+    else:
+        tracemalloc.start()
+    baseline = tracemalloc.get_traced_memory()[0]
+    started = time.perf_counter()
+    result = func(*args, **kwargs)
+    elapsed = time.perf_counter() - started
+    _, peak = tracemalloc.get_traced_memory()
+    if not tracing:
+        tracemalloc.stop()
+    return result, elapsed, peak - baseline
 
-print(f"✅ 로드 완료: {len(df)}개 행")
-print(f"   - 영화 수: {df['movie_title'].nunique()}개")
-print(f"   - 영화인 수: {df['person_name'].nunique()}명")
-print()
-
-# ===========================
-# 네트워크 그래프 생성
 # ===========================
-
-print("=== 네트워크 구축 시작 ===\n")
-
-# 빈 그래프 생성
-G = nx.Graph()
-
-# 영화별로 참여한 사람들 그룹화
-# 예: {"기생충": ["송강호", "이선균", "조여정", "봉준호"], ...}
-movies_dict = df.groupby('movie_title')['person_name'].apply(list).to_dict()
-
-print(f"총 {len(movies_dict)}개의 영화")
-
-# 협업 관계를 저장할 딕셔너리
-collaboration_count = defaultdict(int)  # 협업 횟수
-collaboration_movies = defaultdict(list)  # 함께 한 영화 리스트
-
-# ===========================
-# 각 영화마다 참여자들을 서로 연결
-# ===========================
-
-print("협업 관계 분석 중...")
-
-for movie_title, people in movies_dict.items():
-    # 한 영화에 2명 이상 참여했을 때만 협업 관계 성립
-    if len(people) >= 2:
-        # 모든 가능한 조합 생성
-        # 예: [A, B, C] → (A,B), (A,C), (B,C)
-        for person1, person2 in combinations(people, 2):
-            # 알파벳 순으로 정렬 (A-B와 B-A를 같게 취급)
-            edge = tuple(sorted([person1, person2]))
-            
-            # 협업 횟수 증가
-            collaboration_count[edge] += 1
-            
-            # 함께 한 영화 기록
-            collaboration_movies[edge].append(movie_title)
-
-print(f"✅ 총 {len(collaboration_count)}개의 협업 관계 발견\n")
-
-# ===========================
-# 그래프에 엣지(협업 관계) 추가
+# 데이터 로드
 # ===========================
 
-print("그래프 구조 생성 중...")
+def load_relations():
+    """Step 1에서 생성한 Arrow 파일 로드 (필요한 컬럼만 memory map으로 읽음)"""
+    print("=== 데이터 로딩 중... ===\n")
 
-for (person1, person2), count in collaboration_count.items():
-    G.add_edge(
-        person1, 
-        person2,
-        weight=count,  # 협업 횟수
-        movies=collaboration_movies[(person1, person2)]  # 영화 목록 (리스트)
+    df = read_relations(
+        RELATIONS_PATH,
+        columns=['person_id', 'person_name', 'person_role', 'movie_title'],
+        legacy_pickle=data_path('movies_data.pkl')
     )
 
-print(f"✅ 엣지 추가 완료\n")
+    print(f"✅ 로드 완료: {len(df)}개 행")
+    print(f"   - 영화 수: {df['movie_title'].nunique()}개")
+    print(f"   - 영화인 수: {df['person_name'].nunique()}명")
+    print()
+    return df
 
 # ===========================
-# 노드(영화인) 속성 추가
+# 네트워크 그래프 생성
 # ===========================
 
-print("노드 속성 추가 중...")
-
-for node in G.nodes():
-    # 각 사람이 참여한 영화 목록
-    person_movies = df[df['person_name'] == node]['movie_title'].tolist()
-    
-    # 역할 정보 (감독, 배우 등)
-    person_role = df[df['person_name'] == node]['person_role'].iloc[0] if len(df[df['person_name'] == node]) > 0 else '기타'
-
-    # KOBIS 사람 ID    
-    person_id = df[df['person_name'] == node]['person_id'].iloc[0] if len(df[df['person_name'] == node]) > 0 else node
-    
-    # 속성 추가
-    G.nodes[node]['movies_count'] = len(person_movies)  # 참여 영화 수
-    G.nodes[node]['degree'] = G.degree(node)  # 연결된 사람 수
-    G.nodes[node]['role'] = person_role  # 역할
-
-    G.nodes[node]['id'] = person_id
-
-print(f"✅ 노드 속성 추가 완료\n")
+def build_network(df):
+    """
+    관계 표 → (projection, nodes)
+    projection: 엣지가 있는 영화인만 0..n-1 id로 정리된 투영, nodes: 노드 테이블
+    """
+    print("=== 네트워크 구축 시작 ===\n")
+
+    # 영화인×영화 incidence 행렬을 만들고 희소 행렬 곱으로 협업 관계를 한 번에 계산
+    # (영화별 조합을 파이썬 루프로 도는 대신 numpy/scipy로 처리)
+    print(f"총 {df['movie_title'].nunique()}개의 영화")
+
+    mode = []
+    if MAX_CAST is not None:
+        mode.append(f"캐스트 {MAX_CAST}명 초과 영화 제외")
+    if TOP_BILLED is not None:
+        mode.append(f"영화별 상위 {TOP_BILLED}명")
+    if WEIGHTING != "count":
+        mode.append(f"{WEIGHTING} 가중치")
+    if STREAM:
+        mode.append(f"스트리밍 (블록당 조합 {CHUNK_PAIRS:,}개)")
+    print(f"투영 모드: {', '.join(mode) if mode else '전체'}")
+
+    print("협업 관계 분석 중...")
+
+    # dictionary 컬럼(Categorical)은 그대로 넘김 (투영은 카테고리 코드로 처리)
+    person_names = df['person_name'].array
+    movie_titles = df['movie_title'].array
+    options = dict(max_cast=MAX_CAST, top_billed=TOP_BILLED, weighting=WEIGHTING)
+    stats = ProjectionStats()
+
+    os.makedirs(OUTPUT_DIR, exist_ok=True)
+
+    with metrics.stage("projection", rows=len(df)) as record:
+        if STREAM:
+            # 엣지 파일을 바로 쓰고, 엣지가 있는 영화인만 0..n-1 id로 이미 정리되어 있음
+            projection, build_time, build_peak = measure(
+                stream_project, person_names, movie_titles, EDGES_PATH,
+                chunk_pairs=CHUNK_PAIRS, stats=stats, **options
+            )
+        else:
+            projection, build_time, build_peak = measure(
+                project, person_names, movie_titles, stats=stats, **options
+            )
+
+        print(f"✅ 총 {projection.num_edges}개의 협업 관계 발견\n")
+
+        # 엣지가 있는 영화인만 노드로 남기고 0..n-1 정수 id를 매김
+        projection = projection.compact()
+        record.count(nodes=len(projection.persons), edges=projection.num_edges, pairs=stats.pairs)
+
+    # 허브 영화 제한 리포트
+    print("=== 📉 투영 리포트 ===")
+    if stats.movies_capped:
+        print(f"제외된 대형 캐스트 영화: {stats.movies_capped}편")
+    if stats.credits_trimmed:
+        print(f"상위 출연자 제한으로 빠진 출연: {stats.credits_trimmed}건")
+    print(f"(사람쌍, 영화) 조합: {stats.pairs:,}개 / 제한 전 {stats.pairs_full:,}개")
+    if STREAM:
+        print(f"기록한 블록: {stats.chunks}개")
+    print(f"투영 시간: {build_time:.3f}초, 최대 메모리: {build_peak / 1024**2:.1f}MB")
+
+    if mode and stats.pairs_full:
+        saved = stats.pairs_full - stats.pairs
+        print(f"→ 줄어든 조합 {saved:,}개 ({saved / stats.pairs_full:.1%})")
+    if mode and COMPARE:
+        # 영화 목록 없이 엣지 수만 세는 제한 없는 투영 (사람쌍 행렬만 만듦)
+        full = project(person_names, movie_titles, with_movies=False)
+        removed = full.num_edges - projection.num_edges
+        print(f"제한 없는 투영: 엣지 {full.num_edges:,}개 → 제거된 엣지 {removed:,}개 "
+              f"({removed / max(full.num_edges, 1):.1%})")
+        del full
+    print()
+
+    # ===========================
+    # 노드(영화인) 속성 추가
+    # ===========================
+
+    print("노드 속성 추가 중...")
+
+    # 관계 표를 한 번만 훑어 노드별 속성(역할, KOBIS ID, 참여 영화 수)을 배열로 계산
+    with metrics.stage("node_attributes", rows=len(df), nodes=len(projection.persons)):
+        nodes = NodeTable.from_relations(df, projection.persons)
+        nodes.set_degree(projection.src, projection.dst)  # 연결된 사람 수
+
+    print(f"✅ 노드 속성 추가 완료\n")
+
+    print_stats(projection, nodes)
+    return projection, nodes
 
 # ===========================
 # 네트워크 통계
 # ===========================
 
-print("="*60)
-print("📊 네트워크 통계")
-print("="*60)
-print(f"노드 (영화인): {G.number_of_nodes()}명")
-print(f"엣지 (협업 관계): {G.number_of_edges()}개")
-print(f"평균 협업 횟수: {sum([d['weight'] for _, _, d in G.edges(data=True)]) / G.number_of_edges():.2f}회")
-print(f"평균 연결 수 (Degree): {sum(dict(G.degree()).values()) / G.number_of_nodes():.2f}명")
-print()
-
-# 가장 많이 협업한 사람 Top 5
-print("=== 🌟 가장 연결이 많은 영화인 Top 5 ===")
-degree_dict = dict(G.degree())
-top_people = sorted(degree_dict.items(), key=lambda x: x[1], reverse=True)[:5]
-for i, (person, degree) in enumerate(top_people, 1):
-    role = G.nodes[person]['role']
-    movies_count = G.nodes[person]['movies_count']
-    print(f"{i}. {person} ({role}): {degree}명과 협업, 총 {movies_count}편 참여")
-
-print()
-
-# 가장 많이 함께 작업한 듀오 Top 5
-print("=== 🤝 가장 많이 협업한 듀오 Top 5 ===")
-edges_with_weight = [(u, v, d['weight']) for u, v, d in G.edges(data=True)]
-top_edges = sorted(edges_with_weight, key=lambda x: x[2], reverse=True)[:5]
-for i, (person1, person2, weight) in enumerate(top_edges, 1):
-    movies = collaboration_movies[tuple(sorted([person1, person2]))]
-    print(f"{i}. {person1} ↔ {person2}: {weight}편")
-    print(f"   영화: {', '.join(movies[:3])}{'...' if len(movies) > 3 else ''}")
-
-print()
+def print_stats(projection, nodes):
+    num_nodes = len(nodes)
+    num_edges = projection.num_edges
+
+    print("="*60)
+    print("📊 네트워크 통계")
+    print("="*60)
+    print(f"노드 (영화인): {num_nodes}명")
+    print(f"엣지 (협업 관계): {num_edges}개")
+    print(f"평균 협업 횟수: {projection.weight.sum() / num_edges:.2f}회")
+    print(f"평균 연결 수 (Degree): {nodes.degree.sum() / num_nodes:.2f}명")
+    print()
+
+    # 가장 많이 협업한 사람 Top 5
+    print("=== 🌟 가장 연결이 많은 영화인 Top 5 ===")
+    top_people = np.argsort(-nodes.degree, kind='stable')[:5]
+    for i, node in enumerate(top_people, 1):
+        print(f"{i}. {nodes.label[node]} ({nodes.role[node]}): {nodes.degree[node]}명과 협업, 총 {nodes.movies_count[node]}편 참여")
+
+    print()
+
+    # 가장 많이 함께 작업한 듀오 Top 5
+    print("=== 🤝 가장 많이 협업한 듀오 Top 5 ===")
+    top_edges = np.argsort(-projection.weight, kind='stable')[:5]
+    for i, e in enumerate(top_edges, 1):
+        person1 = nodes.label[projection.src[e]]
+        person2 = nodes.label[projection.dst[e]]
+        movies = projection.edge_movies(e)
+        print(f"{i}. {person1} ↔ {person2}: {projection.weight[e]}편")
+        print(f"   영화: {', '.join(movies[:3])}{'...' if len(movies) > 3 else ''}")
+
+    print()
 
 # ===========================
 # 네트워크 저장
 # ===========================
 
-print("=== 저장 중... ===")
-
-# 폴더 생성
-os.makedirs('../output', exist_ok=True)
-
-# Pickle로 저장 (리스트 포함 가능)
-with open('../output/network.gpickle', 'wb') as f:
-    pickle.dump(G, f)
-print("✅ 네트워크 파일 저장: output/network.gpickle")
-
-# GraphML 저장 (리스트를 문자열로 변환 필요!)
-print("GraphML 변환 중...")
-
-# GraphML용 그래프 복사본 생성
-G_graphml = G.copy()
-
-# 엣지의 movies 속성을 문자열로 변환
-for u, v, data in G_graphml.edges(data=True):
-    if 'movies' in data and isinstance(data['movies'], list):
-        # 리스트를 쉼표로 구분된 문자열로 변환
-        data['movies'] = ', '.join(data['movies'])
-
-# 이제 GraphML로 저장 가능
-nx.write_graphml(G_graphml, '../output/network.graphml')
-print("✅ GraphML 저장: output/network.graphml")
-
-print()
-print("="*60)
-print("🎉 Step 2 완료!")
-print("="*60)
-print("\n👉 다음 단계: python3 03_detect_community.py")
\ No newline at end of file
+def save_network(projection, nodes):
+    print("=== 저장 중... ===")
+
+    # Arrow로 저장 (노드 테이블 + 엣지 표(영화 목록 포함) + CSR 인접 구조)
+    # 스트리밍 모드에서는 엣지 표를 이미 블록 단위로 기록했음
+    with metrics.stage("save_arrow", nodes=len(nodes), edges=projection.num_edges):
+        nodes.save(NODES_PATH)
+        if not STREAM:
+            save_edges(projection, EDGES_PATH)
+        CSRGraph.from_projection(projection).save_adjacency(ADJACENCY_PATH)
+    print("✅ 네트워크 파일 저장: output/network.nodes.arrow, output/network.edges.arrow, output/network.adjacency.arrow")
+
+    # GraphML 저장 (리스트를 문자열로 변환 필요!)
+    print("GraphML 변환 중...")
+
+    with metrics.stage("save_graphml", nodes=len(nodes), edges=projection.num_edges):
+        write_graphml(projection, nodes)
+    print("✅ GraphML 저장: output/network.graphml")
+
+
+def write_graphml(projection, nodes):
+    # GraphML용 그래프: export이므로 여기서 정수 id를 영화인 이름으로 바꿈
+    G_graphml = projection.to_networkx()
+
+    for node, attrs in G_graphml.nodes(data=True):
+        attrs['movies_count'] = int(nodes.movies_count[node])
+        attrs['degree'] = int(nodes.degree[node])
+        attrs['role'] = nodes.role[node]
+        attrs['id'] = nodes.person_id[node]
+
+    # 엣지의 movies 속성을 문자열로 변환
+    for u, v, data in G_graphml.edges(data=True):
+        if 'movies' in data and isinstance(data['movies'], list):
+            # 리스트를 쉼표로 구분된 문자열로 변환
+            data['movies'] = ', '.join(data['movies'])
+
+    G_graphml = nx.relabel_nodes(G_graphml, dict(enumerate(nodes.label.tolist())))
+
+    # 이제 GraphML로 저장 가능
+    nx.write_graphml(G_graphml, GRAPHML_PATH)
+
+
+# df: 관계 표 (없으면 Step 1의 Arrow 파일에서 읽음, pipeline.py는 메모리의 표를 넘김)
+@metrics.record_run("02_build_network")
+def main(df=None):
+    print("="*60)
+    print("🔗 Step 2: 협업 네트워크 생성")
+    print("="*60)
+    print()
+
+    if df is None:
+        df = load_relations()
+    projection, nodes = build_network(df)
+    save_network(projection, nodes)
+
+    print()
+    print("="*60)
+    print("🎉 Step 2 완료!")
+    print("="*60)
+    print("\n👉 다음 단계: python3 03_detect_community.py")
+    return nodes
+
+if __name__ == "__main__":
+    main()
@@ -1,189 +1,415 @@
-import networkx as nx
-import community as community_louvain
 import matplotlib.pyplot as plt
 import matplotlib
 matplotlib.use('Agg')
+from matplotlib.collections import LineCollection
 from collections import Counter
+import json
 import os
-import pickle
+import time
 
-print("="*60)
-print("🎨 Step 3: 커뮤니티 탐지")
-print("="*60)
-print()
+import numpy as np
+import pyarrow as pa
+
+import metrics
+from artifacts import read_table, write_table
+from centrality import compute as compute_centrality
+from community_backends import (
+    detect_communities, incremental_communities, stable_ids, modularity as partition_modularity, BACKENDS
+)
+from csr_graph import CSRGraph
+from layout import compute_layout
+from node_table import NodeTable
+from paths import OUTPUT_DIR, data_path, output_path
+
+# 커뮤니티 탐지 설정 (환경 변수로 조정)
+BACKEND = os.getenv("COMMUNITY_BACKEND", "python-louvain")   # python-louvain | networkx | igraph-louvain | igraph-leiden
+SEED = int(os.getenv("COMMUNITY_SEED")) if os.getenv("COMMUNITY_SEED") else None
+RESOLUTION = float(os.getenv("COMMUNITY_RESOLUTION", "1.0"))  # 클수록 작은 커뮤니티가 많아짐
+
+# 레이아웃 설정: 이전 실행 좌표가 있으면 그 위치에서 이어서 다듬음 (LAYOUT_WARM_START=0이면 새로 배치)
+LAYOUT_ITERATIONS = int(os.getenv("LAYOUT_ITERATIONS", "100"))
+LAYOUT_WARM_START = os.getenv("LAYOUT_WARM_START", "1") == "1"
+
+# 증분 탐지: 이전 커뮤니티에서 출발해 바뀐 영화인 주변만 다시 최적화 (COMMUNITY_INCREMENTAL=0이면 항상 전체 탐지)
+# 바뀐 노드 비율이 COMMUNITY_INCREMENTAL_MAX를 넘으면 전체 탐지, COMMUNITY_COMPARE=1이면 전체 탐지도 돌려 비교
+COMMUNITY_INCREMENTAL = os.getenv("COMMUNITY_INCREMENTAL", "1") == "1"
+COMMUNITY_INCREMENTAL_MAX = float(os.getenv("COMMUNITY_INCREMENTAL_MAX", "0.2"))
+COMMUNITY_COMPARE = os.getenv("COMMUNITY_COMPARE", "0") == "1"
+
+# 중심성: 가중치 PageRank / 고유벡터 중심성 + 매개 중심성 근사 (CENTRALITY=0이면 생략)
+# CENTRALITY_SAMPLES: 매개 중심성 출발점 표본 수 (0이면 전체 → 정확하지만 노드 수에 비례해 느림)
+CENTRALITY = os.getenv("CENTRALITY", "1") == "1"
+CENTRALITY_DAMPING = float(os.getenv("CENTRALITY_DAMPING", "0.85"))
+CENTRALITY_SAMPLES = int(os.getenv("CENTRALITY_SAMPLES", "256"))
+CENTRALITY_WORKERS = int(os.getenv("CENTRALITY_WORKERS", "0")) or metrics.default_workers()
+
+NODES_PATH = output_path('network.nodes.arrow')
+EDGES_PATH = output_path('network.edges.arrow')
+ADJACENCY_PATH = output_path('network.adjacency.arrow')
+PREVIOUS_PATH = output_path('network_with_community.nodes.arrow')
+CENTRALITY_PATH = output_path('centrality.arrow')
+CHANGED_PERSONS_PATH = data_path('changed_persons.json')
+VISUALIZATION_PATH = output_path('community_visualization.png')
 
 # ===========================
 # 네트워크 로드
 # ===========================
 
-print("=== 네트워크 로딩 중... ===\n")
+def load_network(nodes=None):
+    """
+    (nodes, graph, weight_key) 로드
+    nodes: Step 2의 노드 테이블 (없으면 파일에서 읽음), graph: 가중치 컬럼만 읽은 CSR 그래프
+    """
+    print("=== 네트워크 로딩 중... ===\n")
+
+    # 노드는 정수 id, 이름 등 속성은 노드 테이블에 있음
+    if nodes is None:
+        nodes = NodeTable.load(NODES_PATH)
 
-# ✅ 새로운 코드
-with open('../output/network.gpickle', 'rb') as f:
-    G = pickle.load(f)
+    # Newman 가중치로 투영했으면 strength(Σ 1/(k-1))를, 아니면 협업 횟수를 가중치로 사용
+    edge_columns = read_table(EDGES_PATH).column_names
+    weight_key = 'strength' if 'strength' in edge_columns else 'weight'
 
-print(f"✅ 로드 완료")
-print(f"   - 노드: {G.number_of_nodes()}개")
-print(f"   - 엣지: {G.number_of_edges()}개")
-print()
+    # 커뮤니티 탐지에는 가중치만 필요하므로 영화 목록 컬럼은 읽지 않음 (CSR 배열은 memory map)
+    graph = CSRGraph.load(ADJACENCY_PATH, EDGES_PATH, edge_columns=[weight_key])
+
+    print(f"✅ 로드 완료")
+    print(f"   - 노드: {graph.num_nodes}개")
+    print(f"   - 엣지: {graph.num_edges}개")
+    print()
+    return nodes, graph, weight_key
+
+
+def load_previous():
+    """이전 실행 결과 (커뮤니티 id 유지, 증분 탐지, 레이아웃 warm start에 사용)"""
+    return NodeTable.load(PREVIOUS_PATH) if os.path.exists(PREVIOUS_PATH) else None
+
+
+def changed_nodes(graph, nodes, previous_nodes):
+    """
+    다시 최적화할 노드: Step 1의 변경 목록에 있는 영화인 + 연결 수가 달라진 영화인
+    (삭제된 영화인의 이웃은 연결 수 변화로 잡힘, 새 영화인은 incremental_communities에서 처리)
+    전체 갱신이면 None
+    """
+    changed = np.zeros(graph.num_nodes, dtype=bool)
+    if os.path.exists(CHANGED_PERSONS_PATH):
+        with open(CHANGED_PERSONS_PATH, encoding='utf-8') as f:
+            delta = json.load(f)
+        if delta.get("full_refresh"):
+            return None
+        index = {label: i for i, label in enumerate(nodes.label)}
+        changed[[index[name] for name in delta.get("names", []) if name in index]] = True
+
+    matched = nodes.match(previous_nodes)
+    known = matched >= 0
+    changed[known] |= previous_nodes.degree[matched[known]] != graph.degree[known]
+    return np.flatnonzero(changed)
 
 # ===========================
-# Louvain 알고리즘으로 커뮤니티 탐지
+# 커뮤니티 탐지 (Louvain / Leiden)
 # ===========================
 
-print("=== 커뮤니티 탐지 시작 ===\n")
-print("Louvain 알고리즘 실행 중...")
+def detect(graph, nodes, previous_nodes, weight_key):
+    """노드별 커뮤니티 id 배열 (이전 실행이 있으면 증분 탐지 + id 유지)"""
+    print("=== 커뮤니티 탐지 시작 ===\n")
+    print(f"{BACKEND} 실행 중... (가능한 백엔드: {', '.join(BACKENDS)})")
+
+    resolution = RESOLUTION
+
+    previous_community = None
+    changed = None
+    if COMMUNITY_INCREMENTAL and previous_nodes is not None and previous_nodes.community is not None:
+        previous_community = nodes.communities_from(previous_nodes)
+        changed = changed_nodes(graph, nodes, previous_nodes)
+        if changed is not None:
+            ratio = (len(changed) + (previous_community < 0).sum()) / max(graph.num_nodes, 1)
+            if ratio > COMMUNITY_INCREMENTAL_MAX:
+                print(f"바뀐 노드가 {ratio:.1%}로 많아 전체 탐지로 진행")
+                changed = None
+
+    started = time.perf_counter()
+    with metrics.stage("community_detection", nodes=graph.num_nodes, edges=graph.num_edges) as record:
+        if changed is not None:
+            membership, stats = incremental_communities(
+                graph, previous_community, changed, weight=weight_key, resolution=resolution
+            )
+            elapsed = time.perf_counter() - started
+            print(f"✅ 증분 탐지 완료 ({elapsed:.2f}초)")
+            print(f"   - 바뀐 노드: {stats['seeds']}명, 재배치 대상(이웃 포함): {stats['frontier']}명")
+            print(f"   - 방문 {stats['visits']}회, 커뮤니티 이동 {stats['moves']}회")
+            record.count(seeds=stats['seeds'], frontier=stats['frontier'], moves=stats['moves'])
+        else:
+            membership = detect_communities(graph, BACKEND, weight=weight_key, resolution=resolution, seed=SEED)
+            elapsed = time.perf_counter() - started
+            # 전체 탐지여도 이전 실행과 겹치는 커뮤니티는 같은 id를 받도록 맞춤 (프론트엔드 색상 유지)
+            if previous_community is not None:
+                membership = stable_ids(membership, previous_community)
+            print(f"✅ 전체 탐지 완료 ({elapsed:.2f}초)")
+        record.count(communities=len(np.unique(membership)))
+
+    if changed is not None and COMMUNITY_COMPARE:
+        started = time.perf_counter()
+        full = detect_communities(graph, BACKEND, weight=weight_key, resolution=resolution, seed=SEED)
+        full_elapsed = time.perf_counter() - started
+        q_incremental = partition_modularity(graph, membership, weight=weight_key, resolution=resolution)
+        q_full = partition_modularity(graph, full, weight=weight_key, resolution=resolution)
+        print(f"   - 전체 탐지와 비교: {full_elapsed:.2f}초 ({full_elapsed / max(elapsed, 1e-9):.1f}배), "
+              f"모듈성 증분 {q_incremental:.4f} / 전체 {q_full:.4f}")
+
+    print(f"   (resolution={resolution})\n")
+    return membership
 
-resolution = 1.0
+# ===========================
+# 커뮤니티 통계
+# ===========================
 
-partition = community_louvain.best_partition(
-    G, 
-    weight='weight',
-    resolution=resolution
-)
+def report(graph, nodes, membership, weight_key):
+    """커뮤니티 통계 출력, 모듈성 반환 (주요 인물은 key_members)"""
+    partition = dict(enumerate(membership.tolist()))
+    num_communities = len(set(partition.values()))
 
-print(f"✅ 커뮤니티 탐지 완료 (resolution={resolution})\n")
+    print("="*60)
+    print("📊 커뮤니티 통계")
+    print("="*60)
+    print(f"탐지된 커뮤니티 수: {num_communities}개")
+    print()
 
-# ===========================
-# 커뮤니티 정보를 노드에 추가
-# ===========================
+    comm_counts = Counter(partition.values())
 
-print("노드에 커뮤니티 정보 추가 중...")
+    print("=== 커뮤니티별 인원 ===")
+    for comm_id in sorted(comm_counts.keys()):
+        count = comm_counts[comm_id]
+        percentage = (count / graph.num_nodes) * 100
+        print(f"커뮤니티 {comm_id:2d}: {count:4d}명 ({percentage:5.1f}%)")
 
-for node, comm_id in partition.items():
-    G.nodes[node]['community'] = comm_id
+    print()
 
-print("✅ 완료\n")
+    modularity = partition_modularity(graph, membership, weight=weight_key, resolution=RESOLUTION)
 
-# ===========================
-# 커뮤니티 통계
-# ===========================
+    print(f"📈 모듈성(Modularity): {modularity:.4f}")
+    print()
 
-num_communities = len(set(partition.values()))
+    if modularity < 0.3:
+        print("⚠️  모듈성이 낮습니다. 커뮤니티 구분이 약합니다.")
+    elif modularity < 0.7:
+        print("✅ 좋은 커뮤니티 구조입니다!")
+    else:
+        print("🌟 매우 명확한 커뮤니티 구조입니다!")
 
-print("="*60)
-print("📊 커뮤니티 통계")
-print("="*60)
-print(f"탐지된 커뮤니티 수: {num_communities}개")
-print()
+    print()
+    return modularity
 
-comm_counts = Counter(partition.values())
 
-print("=== 커뮤니티별 인원 ===")
-for comm_id in sorted(comm_counts.keys()):
-    count = comm_counts[comm_id]
-    percentage = (count / G.number_of_nodes()) * 100
-    print(f"커뮤니티 {comm_id:2d}: {count:4d}명 ({percentage:5.1f}%)")
+def key_members(graph, nodes, membership, scores=None):
+    """
+    큰 커뮤니티 5개의 주요 인물 3명 출력
+    scores: 중심성 ({"pagerank": ...}), 있으면 PageRank 순, 없으면 연결 수 순
+    """
+    print("=== 🌟 커뮤니티별 주요 인물 ===\n")
 
-print()
+    comm_counts = Counter(membership.tolist())
+    top_communities = sorted(comm_counts.items(), key=lambda x: x[1], reverse=True)[:5]
 
-modularity = community_louvain.modularity(partition, G, weight='weight')
+    degrees = graph.degree
+    importance = scores["pagerank"] if scores else degrees
+    for comm_id, size in top_communities:
+        print(f"커뮤니티 {comm_id} ({size}명):")
 
-print(f"📈 모듈성(Modularity): {modularity:.4f}")
-print()
+        members = np.flatnonzero(membership == comm_id)
+        top_members = members[np.argsort(-importance[members], kind='stable')[:3]]
 
-if modularity < 0.3:
-    print("⚠️  모듈성이 낮습니다. 커뮤니티 구분이 약합니다.")
-elif modularity < 0.7:
-    print("✅ 좋은 커뮤니티 구조입니다!")
-else:
-    print("🌟 매우 명확한 커뮤니티 구조입니다!")
+        for i, member in enumerate(top_members.tolist(), 1):
+            role = nodes.role[member]
+            movies_count = nodes.movies_count[member]
+            line = f"  {i}. {nodes.label[member]} ({role}) - {int(degrees[member])}명과 연결, {movies_count}편 참여"
+            if scores:
+                line += f", PageRank {scores['pagerank'][member]:.2e}, 매개 {scores['betweenness'][member]:.4f}"
+            print(line)
 
-print()
+        print()
 
 # ===========================
-# 각 커뮤니티의 대표 인물 찾기
+# 중심성
 # ===========================
 
-print("=== 🌟 커뮤니티별 주요 인물 ===\n")
-
-communities = {}
-for node, comm_id in partition.items():
-    if comm_id not in communities:
-        communities[comm_id] = []
-    communities[comm_id].append(node)
-
-top_communities = sorted(comm_counts.items(), key=lambda x: x[1], reverse=True)[:5]
-
-for comm_id, size in top_communities:
-    print(f"커뮤니티 {comm_id} ({size}명):")
-    
-    members = communities[comm_id]
-    members_with_degree = [(m, G.degree(m)) for m in members]
-    top_members = sorted(members_with_degree, key=lambda x: x[1], reverse=True)[:3]
-    
-    for i, (member, degree) in enumerate(top_members, 1):
-        role = G.nodes[member].get('role', '기타')
-        movies_count = G.nodes[member].get('movies_count', 0)
-        print(f"  {i}. {member} ({role}) - {degree}명과 연결, {movies_count}편 참여")
-    
+def centrality(graph, weight_key):
+    """
+    노드별 중심성 {"pagerank", "eigenvector", "betweenness"} (CENTRALITY=0이면 None)
+    매개 중심성은 작업 프로세스가 인접 구조 Arrow 파일을 각자 memory map으로 엶
+    """
+    if not CENTRALITY:
+        return None
+    print("=== 중심성 계산 중... ===\n")
+
+    with metrics.stage("centrality", nodes=graph.num_nodes, edges=graph.num_edges,
+                       samples=CENTRALITY_SAMPLES, workers=CENTRALITY_WORKERS):
+        # PageRank / 고유벡터 / 매개 중심성은 compute 안에서 각각 이 단계의 하위 단계로 기록됨
+        scores, info = compute_centrality(
+            graph, weight=getattr(graph, weight_key), damping=CENTRALITY_DAMPING, samples=CENTRALITY_SAMPLES,
+            seed=SEED, workers=CENTRALITY_WORKERS, paths=(ADJACENCY_PATH, EDGES_PATH)
+        )
+
+    print(f"✅ 중심성 완료 ({weight_key} 가중치)")
+    print(f"   - PageRank: {info['pagerank']['seconds']:.2f}초 ({info['pagerank']['iterations']}회 반복, "
+          f"damping={CENTRALITY_DAMPING})")
+    print(f"   - 고유벡터: {info['eigenvector']['seconds']:.2f}초 ({info['eigenvector']['iterations']}회 반복)")
+    between = info['betweenness']
+    if between['split_half'] is None:
+        print(f"   - 매개: {between['seconds']:.2f}초 (출발점 전체 {between['sources']}개, 정확한 값)")
+    else:
+        print(f"   - 매개: {between['seconds']:.2f}초 (출발점 {between['sources']}개 표본, "
+              f"프로세스 {CENTRALITY_WORKERS}개, 표본 절반끼리 상위 100명 일치 {between['split_half']:.0%})")
     print()
+    return scores
 
-# ===========================
-# 시각화
-# ===========================
 
-print("=== 시각화 생성 중... ===\n")
+def save_centrality(scores):
+    """중심성을 Arrow 파일로 (pipeline.py의 centrality 단계 출력), None이면 이전 파일을 지움"""
+    if scores is None:
+        if os.path.exists(CENTRALITY_PATH):
+            os.remove(CENTRALITY_PATH)
+        return
+    write_table(pa.table({name: pa.array(values, type=pa.float64()) for name, values in scores.items()}),
+                CENTRALITY_PATH)
 
-print("레이아웃 계산 중... (시간이 걸릴 수 있습니다)")
-pos = nx.spring_layout(G, k=0.5, iterations=50, seed=42)
 
-plt.figure(figsize=(24, 24))
+def load_centrality():
+    """저장한 중심성 (없으면 None)"""
+    if not os.path.exists(CENTRALITY_PATH):
+        return None
+    table = read_table(CENTRALITY_PATH)
+    return {name: table.column(name).to_numpy() for name in table.column_names}
 
-colors = [partition[node] for node in G.nodes()]
-node_sizes = [G.degree(node) * 10 for node in G.nodes()]
+# ===========================
+# 레이아웃
+# ===========================
 
-nx.draw_networkx_nodes(
-    G, pos,
-    node_color=colors,
-    node_size=node_sizes,
-    cmap=plt.cm.tab20,
-    alpha=0.8
-)
+def warm_positions(nodes, previous_nodes):
+    """이전 실행의 좌표 (같은 영화인끼리 매칭, 새 영화인은 NaN), 쓸 수 없으면 None"""
+    if not LAYOUT_WARM_START or previous_nodes is None:
+        return None
+    previous = nodes.positions_from(previous_nodes)
+    warm = int(np.isfinite(previous).all(1).sum())
+    print(f"이전 좌표 재사용: {warm}/{len(nodes)}명")
+    return previous if warm else None
+
+
+def layout(graph, nodes, previous_nodes, weight_key, membership=None):
+    """
+    노드 좌표 (n, 2)
+    이전 좌표가 있으면 그 위치에서 이어서 다듬어 커뮤니티가 필요 없고,
+    없으면 membership으로 커뮤니티 다단계 초기 배치
+    """
+    print("=== 레이아웃 계산 중... ===\n")
+
+    previous = warm_positions(nodes, previous_nodes)
+
+    started = time.perf_counter()
+    with metrics.stage("compute_layout", nodes=graph.num_nodes, edges=graph.num_edges,
+                       iterations=LAYOUT_ITERATIONS):
+        positions = compute_layout(
+            graph.src, graph.dst, graph.num_nodes,
+            weight=getattr(graph, weight_key),
+            membership=membership,
+            previous=previous,
+            iterations=LAYOUT_ITERATIONS,
+            seed=SEED if SEED is not None else 42
+        )
+    print(f"✅ 레이아웃 완료 ({time.perf_counter() - started:.2f}초, {'warm start' if previous is not None else '커뮤니티 다단계'})\n")
+    return positions
 
-nx.draw_networkx_edges(
-    G, pos,
-    alpha=0.1,
-    width=0.5
-)
+# ===========================
+# 시각화
+# ===========================
 
-degree_dict = dict(G.degree())
-top_nodes = sorted(degree_dict.items(), key=lambda x: x[1], reverse=True)[:30]
-labels = {node: node for node, _ in top_nodes}
+@metrics.timed("draw")
+def visualize(graph, nodes, positions, membership, modularity, scores=None):
+    print("=== 시각화 생성 중... ===\n")
+
+    num_communities = len(np.unique(membership))
+    degrees = graph.degree
+
+    plt.figure(figsize=(24, 24))
+
+    # 엣지: 선분 모음으로 한 번에 그림
+    segments = np.stack([positions[graph.src], positions[graph.dst]], axis=1)
+    plt.gca().add_collection(LineCollection(segments, colors='black', alpha=0.1, linewidths=0.5))
+
+    plt.scatter(
+        positions[:, 0], positions[:, 1],
+        c=membership,
+        s=degrees * 10,
+        cmap=plt.cm.tab20,
+        alpha=0.8
+    )
+
+    # PageRank가 높은 30명만 이름 표시 (중심성이 없으면 연결 수 순)
+    importance = scores["pagerank"] if scores else degrees
+    top_nodes = np.argsort(-importance, kind='stable')[:30]
+    for node in top_nodes:
+        plt.text(
+            positions[node, 0], positions[node, 1], nodes.label[node],
+            fontsize=8, fontfamily='AppleGothic', ha='center', va='center'
+        )
+
+    plt.title(
+        f"영화인 협업 네트워크 - {num_communities}개 커뮤니티\n"
+        f"(Modularity: {modularity:.3f})",
+        fontsize=20,
+        pad=20
+    )
+    plt.axis('off')
+    plt.tight_layout()
+
+    os.makedirs(OUTPUT_DIR, exist_ok=True)
+    plt.savefig(VISUALIZATION_PATH, dpi=150, bbox_inches='tight')
+    print("✅ 시각화 저장: output/community_visualization.png")
+
+    plt.close()
 
-nx.draw_networkx_labels(
-    G, pos,
-    labels,
-    font_size=8,
-    font_family='AppleGothic'
-)
+# ===========================
+# 네트워크 저장
+# ===========================
 
-plt.title(
-    f"영화인 협업 네트워크 - {num_communities}개 커뮤니티\n"
-    f"(Modularity: {modularity:.3f})",
-    fontsize=20,
-    pad=20
-)
-plt.axis('off')
-plt.tight_layout()
+def save_nodes(nodes, membership, positions, scores=None):
+    """커뮤니티, 좌표, 중심성을 노드 테이블에 넣어 저장 (다음 실행의 이전 결과가 됨)"""
+    nodes.community = membership
+    nodes.x, nodes.y = positions[:, 0], positions[:, 1]
+    for name, values in (scores or {}).items():
+        setattr(nodes, name, values)
 
-os.makedirs('../output', exist_ok=True)
-plt.savefig('../output/community_visualization.png', dpi=150, bbox_inches='tight')
-print("✅ 시각화 저장: output/community_visualization.png")
+    # 엣지는 Step 2와 같으므로 커뮤니티가 추가된 노드 테이블만 저장
+    nodes.save(PREVIOUS_PATH)
 
-plt.close()
+    print("✅ 네트워크 저장: output/network_with_community.nodes.arrow")
+    return nodes
 
-# ===========================
-# 네트워크 저장
-# ===========================
 
-with open('../output/network_with_community.gpickle', 'wb') as f:
-    pickle.dump(G, f)
+# nodes: Step 2의 노드 테이블 (없으면 파일에서 읽음, pipeline.py는 메모리의 테이블을 넘김)
+@metrics.record_run("03_detect_community")
+def main(nodes=None):
+    print("="*60)
+    print("🎨 Step 3: 커뮤니티 탐지")
+    print("="*60)
+    print()
+
+    nodes, graph, weight_key = load_network(nodes)
+    previous_nodes = load_previous()
 
-print("✅ 네트워크 저장: output/network_with_community.gpickle")
+    membership = detect(graph, nodes, previous_nodes, weight_key)
+    modularity = report(graph, nodes, membership, weight_key)
+    scores = centrality(graph, weight_key)
+    key_members(graph, nodes, membership, scores)
+    positions = layout(graph, nodes, previous_nodes, weight_key, membership)
+    visualize(graph, nodes, positions, membership, modularity, scores)
+    nodes = save_nodes(nodes, membership, positions, scores)
 
-print()
-print("="*60)
-print("🎉 Step 3 완료!")
-print("="*60)
-print("\n👉 다음 단계: python 04_export_json.py")
\ No newline at end of file
+    print()
+    print("="*60)
+    print("🎉 Step 3 완료!")
+    print("="*60)
+    print("\n👉 다음 단계: python 04_export_json.py")
+    return nodes
+
+if __name__ == "__main__":
+    main()
@@ -1,176 +1,389 @@
-import networkx as nx
+import numpy as np
+import pyarrow.compute as pc
 import json
 from datetime import datetime
 import os
-import pickle 
-
-print("="*60)
-print("📦 Step 4: JSON 생성")
-print("="*60)
-print()
-
-# ===========================
-# 네트워크 로드 (커뮤니티 정보 포함)
-# ===========================
-
-print("=== 네트워크 로딩 중... ===\n")
-
-with open('../output/network_with_community.gpickle', 'rb') as f:
-    G = pickle.load(f)
-
-print(f"✅ 로드 완료")
-print(f"   - 노드: {G.number_of_nodes()}개")
-print(f"   - 엣지: {G.number_of_edges()}개")
-print()
-
-# ===========================
-# 노드 데이터 생성
-# ===========================
-
-print("=== 노드 데이터 생성 중... ===\n")
-
-nodes_data = []
-
-for node in G.nodes(data=True):
-    node_id = node[0]  # 영화인 이름
-    node_attrs = node[1]  # 속성들
-    
-    nodes_data.append({
-        "id": node_id,
-        "label": node_id,
-        "community": node_attrs.get('community', 0),
-        "degree": node_attrs.get('degree', G.degree(node_id)),
-        "movies_count": node_attrs.get('movies_count', 0),
-        "role": node_attrs.get('role', '기타')
-    })
-
-print(f"✅ {len(nodes_data)}개 노드 생성 완료")
-
-# ===========================
-# 링크(엣지) 데이터 생성
-# ===========================
-
-print("=== 링크 데이터 생성 중... ===\n")
-
-links_data = []
-
-for edge in G.edges(data=True):
-    source, target, attrs = edge
-    
-    # 함께 작업한 영화 목록 (최대 5개만)
-    movies = attrs.get('movies', [])
-    movies_sample = movies[:5] if len(movies) > 5 else movies
-    
-    links_data.append({
-        "source": source,
-        "target": target,
-        "weight": attrs.get('weight', 1),
-        "movies": movies_sample,
-        "total_movies": len(movies)
-    })
-
-print(f"✅ {len(links_data)}개 링크 생성 완료")
-
-# ===========================
-# 메타데이터 생성
-# ===========================
-
-print("\n=== 메타데이터 생성 중... ===\n")
-
-# 커뮤니티 수 계산
-communities = set(nx.get_node_attributes(G, 'community').values())
-num_communities = len(communities)
-
-# 통계 계산
-total_collaborations = sum([d['weight'] for _, _, d in G.edges(data=True)])
-avg_collaboration = total_collaborations / G.number_of_edges() if G.number_of_edges() > 0 else 0
-
-metadata = {
-    "total_nodes": G.number_of_nodes(),
-    "total_links": G.number_of_edges(),
-    "communities": num_communities,
-    "total_collaborations": total_collaborations,
-    "avg_collaboration_per_link": round(avg_collaboration, 2),
-    "generated_at": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
-    "version": "1.0"
-}
-
-print("✅ 메타데이터 생성 완료")
-
-# ===========================
-# 최종 JSON 객체 생성
-# ===========================
-
-print("\n=== 최종 JSON 생성 중... ===\n")
-
-final_data = {
-    "metadata": metadata,
-    "nodes": nodes_data,
-    "links": links_data
-}
-
-# ===========================
-# JSON 파일로 저장
-# ===========================
-
-os.makedirs('../output', exist_ok=True)
-output_path = '../output/network_data.json'
-
-with open(output_path, 'w', encoding='utf-8') as f:
-    json.dump(final_data, f, ensure_ascii=False, indent=2)
-
-# 파일 크기 계산
-file_size_bytes = os.path.getsize(output_path)
-file_size_kb = file_size_bytes / 1024
-file_size_mb = file_size_kb / 1024
-
-print("="*60)
-print("📊 생성된 JSON 정보")
-print("="*60)
-print(f"파일 위치: {output_path}")
-print(f"파일 크기: {file_size_kb:.2f} KB ({file_size_mb:.2f} MB)")
-print()
-print(f"노드: {len(nodes_data)}개")
-print(f"링크: {len(links_data)}개")
-print(f"커뮤니티: {num_communities}개")
-print(f"총 협업 횟수: {total_collaborations}회")
-print(f"평균 협업 횟수: {avg_collaboration:.2f}회")
-print()
-
-# JSON 구조 미리보기
-print("=== JSON 구조 미리보기 ===\n")
-print("metadata:")
-print(f"  {json.dumps(metadata, ensure_ascii=False, indent=2)}")
-print()
-print("nodes[0]:")
-print(f"  {json.dumps(nodes_data[0], ensure_ascii=False, indent=2)}")
-print()
-print("links[0]:")
-print(f"  {json.dumps(links_data[0], ensure_ascii=False, indent=2)}")
-print()
-
-# ===========================
-# 파일 크기 경고
-# ===========================
-
-if file_size_mb > 5:
-    print("⚠️  경고: JSON 파일이 5MB를 초과합니다!")
-    print(f"   현재 크기: {file_size_mb:.2f} MB")
-    print("   → 프론트엔드 로딩이 느릴 수 있습니다.")
-    print("   → 05_filter_network.py로 데이터를 줄이는 것을 권장합니다.")
+
+from artifacts import edge_arrays, read_table
+from export_formats import (
+    SCHEMA_VERSIONS, compress_file, file_digest, format_report, json_size, write_binary, write_json_stream
+)
+import metrics
+from node_table import CENTRALITY_KEYS, NodeTable
+from paths import OUTPUT_DIR, output_path
+
+# 출력 형식 (환경 변수로 조정)
+# EXPORT_COMPRESS: 사전 압축 형식 (gz, br / 빈 값이면 생략), EXPORT_BINARY=0이면 .bin 생략
+EXPORT_COMPRESS = [f for f in os.getenv("EXPORT_COMPRESS", "gz,br").split(",") if f]
+EXPORT_BINARY = os.getenv("EXPORT_BINARY", "1") == "1"
+# EXPORT_SCHEMA: network_data.json 형식 (2: 노드 번호/영화 문자열 표 참조, 1: 이름과 제목을 링크마다 반복하는 기존 형식)
+EXPORT_SCHEMA = int(os.getenv("EXPORT_SCHEMA", "2"))
+if EXPORT_SCHEMA not in SCHEMA_VERSIONS:
+    raise ValueError(f"EXPORT_SCHEMA는 {SCHEMA_VERSIONS} 중 하나여야 합니다: {EXPORT_SCHEMA}")
+# EXPORT_SHARDS=0이면 커뮤니티별 분할 파일(network_shards/) 생략
+EXPORT_SHARDS = os.getenv("EXPORT_SHARDS", "1") == "1"
+# EXPORT_REPORT=1이면 형식별 파싱 시간도 잼 (파일마다 압축 해제 + 파싱 3번, 기본은 크기만)
+EXPORT_REPORT = os.getenv("EXPORT_REPORT", "0") == "1"
+SHARD_DIR = output_path('network_shards')
+LINK_CHUNK = 100000  # 링크를 파이썬 객체로 바꾸는 단위
+
+
+# nodes: 커뮤니티/좌표가 들어간 노드 테이블 (없으면 Step 3의 Arrow 파일에서 읽음, pipeline.py는 메모리의 테이블을 넘김)
+@metrics.record_run("04_export_json")
+def main(nodes=None):
+    print("="*60)
+    print("📦 Step 4: JSON 생성")
+    print("="*60)
+    print()
+
+    # ===========================
+    # 네트워크 로드 (커뮤니티 정보 포함)
+    # ===========================
+
+    print("=== 네트워크 로딩 중... ===\n")
+
+    # 노드 테이블 (정수 id → 이름/속성)과 엣지 표
+    if nodes is None:
+        nodes = NodeTable.load(output_path('network_with_community.nodes.arrow'))
+    edges = read_table(output_path('network.edges.arrow'))
+
+    num_nodes = len(nodes)
+    num_edges = edges.num_rows
+
+    print(f"✅ 로드 완료")
+    print(f"   - 노드: {num_nodes}개")
+    print(f"   - 엣지: {num_edges}개")
     print()
-elif file_size_mb > 2:
-    print("💡 파일 크기가 2MB를 초과합니다.")
-    print(f"   현재 크기: {file_size_mb:.2f} MB")
-    print("   → 필요시 05_filter_network.py로 최적화할 수 있습니다.")
+
+    # ===========================
+    # 노드 데이터 생성
+    # ===========================
+
+    print("=== 노드 데이터 생성 중... ===\n")
+
+    def node_items(indices=None, schema=1):
+        """노드 JSON (indices: 내보낼 노드 id, 없으면 전체)"""
+        for node in (range(num_nodes) if indices is None else indices.tolist()):
+            node_json = nodes.node_json(node)
+            if schema == 1:
+                # 협업 네트워크 JSON은 영화인 이름을 id로 사용
+                node_json["id"] = node_json["label"]
+            else:
+                # v2는 배열 위치가 곧 노드 번호 (id = label은 프론트엔드에서 복원)
+                del node_json["id"]
+            # Step 3에서 계산한 레이아웃 좌표 (프론트엔드가 시뮬레이션 없이 바로 그림)
+            if nodes.x is not None:
+                node_json["x"] = round(float(nodes.x[node]), 1)
+                node_json["y"] = round(float(nodes.y[node]), 1)
+            yield node_json
+
+    print(f"✅ {num_nodes}개 노드 (파일에 쓰면서 생성)")
+
+    # ===========================
+    # 링크(엣지) 데이터 생성
+    # ===========================
+
+    print("=== 링크 데이터 생성 중... ===\n")
+
+    # export 시점에 정수 id를 영화인 이름으로 바꿈
+    labels = nodes.label
+    edge = edge_arrays(edges)
+    weights = edge["weight"]
+
+    # 함께 작업한 영화 목록 (최대 5개만) + 전체 개수
+    movie_counts = np.diff(edge["movie_ptr"])
+    sample_counts = np.minimum(movie_counts, 5)
+    sample_ptr = np.zeros(num_edges + 1, dtype=np.int64)
+    np.cumsum(sample_counts, out=sample_ptr[1:])
+    sample_slots = np.repeat(edge["movie_ptr"][:-1] - sample_ptr[:-1], sample_counts) + np.arange(sample_ptr[-1])
+    sample_ids = edge["movie_ids"][sample_slots]
+
+    # v2 / 바이너리용 공유 영화 제목 표 (샘플에 쓰인 제목만)
+    used_titles, title_codes = np.unique(sample_ids, return_inverse=True)
+    movie_titles = edge["movies"][used_titles].tolist()
+
+    def link_items(edge_ids=None, schema=1):
+        """
+        링크 JSON (edge_ids: 내보낼 엣지 id, 없으면 전체), LINK_CHUNK개씩 파이썬 값으로 바꿔 바로 씀
+        schema 1: {source, target, weight, movies, total_movies} (이름/제목 문자열)
+        schema 2: {s, t, w, m, n} (노드 번호, 영화 제목 표 번호)
+        """
+        edge_ids = np.arange(num_edges) if edge_ids is None else edge_ids
+        for lo in range(0, len(edge_ids), LINK_CHUNK):
+            chunk = edge_ids[lo:lo + LINK_CHUNK]
+            chunk_weights = weights[chunk].tolist()
+            totals = movie_counts[chunk].tolist()
+
+            # 각 링크의 샘플 영화 구간을 한 번에 펼침
+            starts, counts = sample_ptr[chunk], sample_counts[chunk]
+            ptr = np.zeros(len(chunk) + 1, dtype=np.int64)
+            np.cumsum(counts, out=ptr[1:])
+            slots = np.repeat(starts - ptr[:-1], counts) + np.arange(ptr[-1])
+            ptr = ptr.tolist()
+
+            if schema == 1:
+                sources = labels[edge["src"][chunk]].tolist()
+                targets = labels[edge["dst"][chunk]].tolist()
+                titles = edge["movies"][sample_ids[slots]].tolist()
+                for i in range(len(chunk)):
+                    yield {
+                        "source": sources[i],
+                        "target": targets[i],
+                        "weight": chunk_weights[i],
+                        "movies": titles[ptr[i]:ptr[i + 1]],
+                        "total_movies": totals[i]
+                    }
+            else:
+                sources = edge["src"][chunk].tolist()
+                targets = edge["dst"][chunk].tolist()
+                codes = title_codes[slots].tolist()
+                for i in range(len(chunk)):
+                    yield {
+                        "s": sources[i],
+                        "t": targets[i],
+                        "w": chunk_weights[i],
+                        "m": codes[ptr[i]:ptr[i + 1]],
+                        "n": totals[i]
+                    }
+
+    print(f"✅ {num_edges}개 링크 (파일에 쓰면서 생성)")
+
+    # ===========================
+    # 메타데이터 생성
+    # ===========================
+
+    print("\n=== 메타데이터 생성 중... ===\n")
+
+    # 커뮤니티 수 계산
+    num_communities = len(np.unique(nodes.community))
+
+    # 통계 계산
+    total_collaborations = int(pc.sum(edges.column('weight')).as_py() or 0)
+    avg_collaboration = total_collaborations / num_edges if num_edges > 0 else 0
+
+    metadata = {
+        "total_nodes": num_nodes,
+        "total_links": num_edges,
+        "communities": num_communities,
+        "total_collaborations": total_collaborations,
+        "avg_collaboration_per_link": round(avg_collaboration, 2),
+        "generated_at": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+        "version": "1.0"
+    }
+    if EXPORT_SCHEMA == 2:
+        metadata.update(version="2.0", schema=2)
+
+    print("✅ 메타데이터 생성 완료")
+
+    # ===========================
+    # JSON 파일로 저장 (스트리밍, compact)
+    # ===========================
+
+    print("\n=== JSON 저장 중... ===\n")
+
+    os.makedirs(OUTPUT_DIR, exist_ok=True)
+    json_path = output_path('network_data.json')
+
+    with metrics.stage("write_json", nodes=num_nodes, edges=num_edges):
+        if EXPORT_SCHEMA == 2:
+            write_json_stream(json_path, metadata, node_items(schema=2), link_items(schema=2),
+                              extra={"movies": movie_titles})
+            # 기존 형식(v1)으로 썼을 때와 크기 비교 (파일은 만들지 않음)
+            v1_metadata = {k: v for k, v in metadata.items() if k != "schema"}
+            v1_metadata["version"] = "1.0"
+            v1_size = json_size(v1_metadata, node_items(), link_items())
+            v2_size = os.path.getsize(json_path)
+            print(f"✅ 저장: {json_path} (schema v2)")
+            print(f"   - v1 {v1_size / 1024:.2f} KB → v2 {v2_size / 1024:.2f} KB "
+                  f"({(1 - v2_size / max(v1_size, 1)) * 100:.1f}% 감소, 영화 제목 {len(movie_titles)}개 공유)")
+        else:
+            write_json_stream(json_path, metadata, node_items(), link_items())
+            print(f"✅ 저장: {json_path} (schema v1)")
+    outputs = [json_path]
+
+    # ===========================
+    # 바이너리 (열 단위 typed array)
+    # ===========================
+
+    if EXPORT_BINARY:
+        with metrics.stage("write_binary", nodes=num_nodes, edges=num_edges):
+            binary_path = output_path('network_data.bin')
+            columns = {
+                "node.label": labels.tolist(),
+                "node.role": [role if role is not None else '기타' for role in nodes.role],
+                "node.community": np.asarray(nodes.community, dtype=np.int32),
+                "node.degree": np.asarray(nodes.degree, dtype=np.int32),
+                "node.movies_count": np.asarray(nodes.movies_count, dtype=np.int32),
+                "link.source": edge["src"].astype(np.uint32),
+                "link.target": edge["dst"].astype(np.uint32),
+                "link.weight": weights.astype(np.int32),
+                "link.total_movies": movie_counts.astype(np.int32),
+                "link.movies.offsets": sample_ptr.astype(np.uint32),
+                "link.movies.ids": title_codes.astype(np.uint32),
+                "movie.title": movie_titles,
+            }
+            if nodes.x is not None:
+                # JSON과 같은 값이 되도록 소수점 한 자리로 맞춤
+                columns["node.x"] = np.round(nodes.x.astype(np.float64), 1).astype(np.float32)
+                columns["node.y"] = np.round(nodes.y.astype(np.float64), 1).astype(np.float32)
+            # 중심성 (Step 3에서 계산한 경우만)
+            for key in CENTRALITY_KEYS:
+                if getattr(nodes, key) is not None:
+                    columns[f"node.{key}"] = np.asarray(getattr(nodes, key), dtype=np.float32)
+            write_binary(binary_path, metadata, columns)
+            outputs.append(binary_path)
+            print(f"✅ 저장: {binary_path}")
+
+    # ===========================
+    # 커뮤니티별 분할 + 개요 그래프 (점진적 로딩용)
+    # ===========================
+
+    if EXPORT_SHARDS:
+        with metrics.stage("write_shards", nodes=num_nodes, edges=num_edges):
+            print("\n=== 커뮤니티별 분할 파일 생성 중... ===\n")
+            os.makedirs(SHARD_DIR, exist_ok=True)
+            # 이전 실행의 분할 파일 정리 (사라진 커뮤니티)
+            for name in os.listdir(SHARD_DIR):
+                if name.startswith('community_') and name.endswith('.json'):
+                    os.remove(os.path.join(SHARD_DIR, name))
+
+            community = np.asarray(nodes.community, dtype=np.int64)
+            ca, cb = community[edge["src"]], community[edge["dst"]]
+            num_slots = int(community.max()) + 1 if num_nodes else 0
+
+            # 각 커뮤니티 파일에는 소속 노드 + 한쪽이라도 소속 노드에 닿는 링크
+            # (커뮤니티 사이 링크는 양쪽 파일에 모두 들어감, 클라이언트가 양쪽 노드가 모두 로드됐을 때 한 번만 그림)
+            node_order = np.argsort(community, kind='stable')
+            node_bounds = np.searchsorted(community[node_order], np.arange(num_slots + 1))
+            cross = ca != cb
+            link_owner = np.concatenate([ca, cb[cross]])
+            link_id = np.concatenate([np.arange(num_edges), np.flatnonzero(cross)])
+            link_order = np.lexsort((link_id, link_owner))
+            link_bounds = np.searchsorted(link_owner[link_order], np.arange(num_slots + 1))
+
+            shards = []
+            for c in range(num_slots):
+                members = node_order[node_bounds[c]:node_bounds[c + 1]]
+                if not len(members):
+                    continue
+                shard_links = link_id[link_order[link_bounds[c]:link_bounds[c + 1]]]
+                path = os.path.join(SHARD_DIR, f'community_{c}.json')
+                write_json_stream(path, {"community": c}, node_items(members), link_items(shard_links))
+                shards.append({
+                    "community": c,
+                    "file": os.path.basename(path),
+                    "nodes": int(len(members)),
+                    "links": int(len(shard_links)),
+                    "bytes": os.path.getsize(path),
+                    "hash": file_digest(path),
+                })
+
+            # 개요 그래프: 커뮤니티 하나를 노드 하나로 (크기 = 인원), 커뮤니티 사이 협업 가중치 합
+            a, b = np.minimum(ca, cb)[cross], np.maximum(ca, cb)[cross]
+            pairs, pair_index = np.unique(np.column_stack([a, b]).reshape(-1, 2), axis=0, return_inverse=True)
+            pair_index = pair_index.ravel()
+            pair_weight = np.bincount(pair_index, weights[cross], minlength=len(pairs))
+            pair_links = np.bincount(pair_index, minlength=len(pairs))
+            # 개요 노드의 degree = 협업이 있는 다른 커뮤니티 수
+            community_degree = np.bincount(pairs.ravel(), minlength=num_slots)
+
+            overview_nodes = []
+            for shard in shards:
+                c = shard["community"]
+                members = node_order[node_bounds[c]:node_bounds[c + 1]]
+                hub = members[np.argmax(nodes.degree[members])]
+                overview_node = {
+                    "id": f"community:{c}",
+                    "label": nodes.label[hub],
+                    "community": c,
+                    "members": shard["nodes"],
+                    "degree": int(community_degree[c]),
+                }
+                if nodes.x is not None:
+                    overview_node["x"] = round(float(nodes.x[members].mean()), 1)
+                    overview_node["y"] = round(float(nodes.y[members].mean()), 1)
+                overview_nodes.append(overview_node)
+
+            overview_links = [
+                {"source": f"community:{s}", "target": f"community:{t}", "weight": int(w), "links": int(n)}
+                for (s, t), w, n in zip(pairs.tolist(), pair_weight.tolist(), pair_links.tolist())
+            ]
+            overview_path = os.path.join(SHARD_DIR, 'overview.json')
+            # 생성 시각은 빼서 내용이 같으면 해시도 같게 함 (분할 파일은 v1 모양)
+            overview_metadata = {k: v for k, v in metadata.items() if k not in ("generated_at", "schema")}
+            overview_metadata["version"] = "1.0"
+            write_json_stream(overview_path, overview_metadata, overview_nodes, overview_links)
+
+            # 매니페스트: 파일 크기와 내용 해시 (해시가 바뀐 파일만 다시 받도록 ?v=hash로 요청)
+            manifest = {
+                "metadata": metadata,
+                "overview": {
+                    "file": 'overview.json',
+                    "bytes": os.path.getsize(overview_path),
+                    "hash": file_digest(overview_path),
+                },
+                "shards": shards,
+            }
+            manifest_path = os.path.join(SHARD_DIR, 'manifest.json')
+            with open(manifest_path, 'w', encoding='utf-8') as f:
+                json.dump(manifest, f, ensure_ascii=False, indent=2)
+
+            shard_bytes = sum(shard["bytes"] for shard in shards)
+            print(f"✅ 저장: {SHARD_DIR}/ (커뮤니티 {len(shards)}개, 개요 {manifest['overview']['bytes'] / 1024:.2f} KB)")
+            if shards:
+                largest = max(shard["bytes"] for shard in shards)
+                print(f"   - 분할 파일 합계 {shard_bytes / 1024:.2f} KB, 가장 큰 파일 {largest / 1024:.2f} KB")
+
+    # 정적 서빙용 사전 압축본
+    with metrics.stage("compress", files=len(outputs)):
+        for path in list(outputs):
+            written = compress_file(path, EXPORT_COMPRESS)
+            outputs.extend(written.values())
+            if "br" in EXPORT_COMPRESS and "br" not in written:
+                print(f"⚠️  brotli 미설치로 {os.path.basename(path)}.br 생략 (pip install brotli)")
+
+    # ===========================
+    # 형식별 크기 / 파싱 시간
+    # ===========================
+
+    print()
+    print("="*60)
+    print("📊 형식별 크기 / 파싱 시간" if EXPORT_REPORT else "📊 형식별 크기 (파싱 시간: EXPORT_REPORT=1)")
+    print("="*60)
+    print(f"{'파일':32s} {'크기':>12s}" + (f" {'파싱':>10s}" if EXPORT_REPORT else ""))
+    for path, size, seconds in format_report(outputs, repeat=3 if EXPORT_REPORT else 0):
+        parse = f" {seconds * 1000:8.2f}ms" if seconds is not None else ""
+        print(f"{os.path.basename(path):32s} {size / 1024:9.2f} KB{parse}")
+    print()
+    print(f"노드: {num_nodes}개")
+    print(f"링크: {num_edges}개")
+    print(f"커뮤니티: {num_communities}개")
+    print(f"총 협업 횟수: {total_collaborations}회")
+    print(f"평균 협업 횟수: {avg_collaboration:.2f}회")
+    print()
+
+    # JSON 구조 미리보기
+    print("=== JSON 구조 미리보기 ===\n")
+    print("metadata:")
+    print(f"  {json.dumps(metadata, ensure_ascii=False, indent=2)}")
     print()
-else:
-    print("✅ 파일 크기가 적당합니다!")
+    if num_nodes:
+        print("nodes[0]:")
+        print(f"  {json.dumps(next(node_items(schema=EXPORT_SCHEMA)), ensure_ascii=False, indent=2)}")
+        print()
+    if num_edges:
+        print("links[0]:")
+        print(f"  {json.dumps(next(link_items(schema=EXPORT_SCHEMA)), ensure_ascii=False, indent=2)}")
+        print()
+
+    print("="*60)
+    print("🎉 Step 4 완료!")
+    print("="*60)
     print()
+    print("👉 이 파일들을 프론트엔드 팀원에게 전달하세요! (public/graph/)")
+    for path in outputs:
+        print(f"   파일 위치: {path}")
+    return outputs
 
-print("="*60)
-print("🎉 Step 4 완료!")
-print("="*60)
-print()
-print("👉 이 파일을 프론트엔드 팀원에게 전달하세요!")
-print(f"   파일 위치: {output_path}")
\ No newline at end of file
+if __name__ == "__main__":
+    main()
@@ -1,71 +1,218 @@
-import networkx as nx
-import pickle
-import json
+import os
 import firebase_admin
 from firebase_admin import credentials, firestore
-from datetime import datetime
-
-# Firestore 초기화
-cred = credentials.Certificate("../../../filmograph-admin-key.json")
-firebase_admin.initialize_app(cred)
-db = firestore.client()
-
-# Ego JSON 생성 함수
-def ego_to_json(G, ego):
-    ego_graph = nx.ego_graph(G, ego, radius=1)
-
-    nodes = []
-    for node, attrs in ego_graph.nodes(data=True):
-        nodes.append({
-            "id": attrs.get("id", node),
-            "label": node,
-            "community": attrs.get("community", 0),
-            "degree": ego_graph.degree(node),
-            "movies_count": attrs.get("movies_count", 0),
-            "role": attrs.get("role", "기타")
-        })
-
-    links = []
-    for u, v, attrs in ego_graph.edges(data=True):
-        links.append({
-            "source": G.nodes[u].get("id", u),
-            "target": G.nodes[v].get("id", v),
-            "weight": attrs.get("weight", 1),
-            "movies": attrs.get("movies", [])
-        })
 
+import numpy as np
+
+import metrics
+from ego_extract import EgoExtractor, doc_size
+from ego_index import INDEX_SHARD_SIZE, build_index
+from ego_publish import PublishJournal, PublishManifest, content_hash
+from export_formats import SCHEMA_VERSIONS
+from firestore_upload import BatchUploader, FirestoreUploadError
+from paths import SCRIPTS_DIR, output_path
+
+# 문서 형식 (2: 링크가 nodes 위치와 문서의 movies 표를 참조, 1: id와 영화 제목을 링크마다 반복하는 기존 형식)
+EXPORT_SCHEMA = int(os.getenv("EXPORT_SCHEMA", "2"))
+if EXPORT_SCHEMA not in SCHEMA_VERSIONS:
+    raise ValueError(f"EXPORT_SCHEMA는 {SCHEMA_VERSIONS} 중 하나여야 합니다: {EXPORT_SCHEMA}")
+# v2일 때 v1 문서 크기도 계산해 비교 출력
+EXPORT_SIZE_COMPARE = os.getenv("EXPORT_SIZE_COMPARE", "1") == "1"
+
+# 업로드 설정: batch 하나에 최대 500개, UPLOAD_WORKERS개 batch를 동시에 commit
+UPLOAD_BATCH_SIZE = int(os.getenv("UPLOAD_BATCH_SIZE", "500"))
+UPLOAD_WORKERS = int(os.getenv("UPLOAD_WORKERS", "4"))
+UPLOAD_RETRIES = int(os.getenv("UPLOAD_RETRIES", "5"))
+
+# 바뀐 문서만 업로드: 마지막 업로드 내용 해시와 같으면 건너뜀 (EGO_PUBLISH_FORCE=1이면 전부 다시 올림)
+# 중간에 멈추면 journal에 남은 진행 상황부터 이어서 함
+EGO_MANIFEST_PATH = output_path("ego_manifest.json")
+EGO_JOURNAL_PATH = output_path("ego_publish.journal")
+EGO_PUBLISH_FORCE = os.getenv("EGO_PUBLISH_FORCE", "0") == "1"
+
+
+# Firestore 초기화 (FIRESTORE_EMULATOR_HOST가 있으면 인증 키 없이 에뮬레이터에 연결)
+def firestore_client():
+    if os.getenv("FIRESTORE_EMULATOR_HOST"):
+        firebase_admin.initialize_app(options={"projectId": os.getenv("FIRESTORE_PROJECT_ID", "filmograph")})
+    else:
+        cred = credentials.Certificate(os.path.join(SCRIPTS_DIR, "..", "..", "..", "filmograph-admin-key.json"))
+        firebase_admin.initialize_app(cred)
+    return firestore.client()
+
+
+# 문서 크기 제한: ego와 협업 weight가 큰 이웃 EGO_TOP_K명만 본 문서에 넣고
+# 나머지는 EGO_PAGE_SIZE명씩 하위 문서 egoGraphs/{id}/pages/{n}으로 (0이면 제한 없음)
+EGO_TOP_K = int(os.getenv("EGO_TOP_K", "100"))
+EGO_PAGE_SIZE = int(os.getenv("EGO_PAGE_SIZE", "200"))
+FIRESTORE_DOC_LIMIT = 1024 * 1024   # Firestore 문서 하나의 최대 크기 (1 MiB)
+
+# ego 문서 생성 프로세스 수 (기본: CPU 수, 1이면 현재 프로세스에서)
+EGO_WORKERS = int(os.getenv("EGO_WORKERS", "0")) or metrics.default_workers()
+
+
+# 검색 색인: 영화인 목록(id, 이름, 연결 수, 역할, 커뮤니티)만 담은 egoIndex 컬렉션
+# (화면에서 목록/검색용으로 egoGraphs 전체를 읽지 않도록), EGO_INDEX_PREFIX=1이면 이름 첫 글자별 버킷도
+EGO_INDEX = os.getenv("EGO_INDEX", "1") == "1"
+EGO_INDEX_SHARD_SIZE = int(os.getenv("EGO_INDEX_SHARD_SIZE", str(INDEX_SHARD_SIZE)))
+EGO_INDEX_PREFIX = os.getenv("EGO_INDEX_PREFIX", "1") == "1"
+EGO_INDEX_MANIFEST_PATH = output_path("ego_index_manifest.json")
+
+
+# 문서 크기 분포 구간 상한 (바이트)
+SIZE_BUCKETS = (10 * 1024, 50 * 1024, 100 * 1024, 500 * 1024, FIRESTORE_DOC_LIMIT)
+
+
+def print_size_histogram(sizes, bounds=SIZE_BUCKETS, width=40):
+    """문서 크기 분포 출력 (마지막 구간은 Firestore 한도 초과)"""
+    sizes = np.asarray(sizes)
+    counts = np.bincount(np.searchsorted(bounds, sizes, side="right"), minlength=len(bounds) + 1)
+    labels = [f"< {b // 1024} KB" for b in bounds] + [f">= {bounds[-1] // 1024} KB"]
+    print("\n📊 문서 크기 분포")
+    for label, count in zip(labels, counts.tolist()):
+        bar = "█" * int(np.ceil(count / max(counts.max(), 1) * width)) if count else ""
+        print(f"   {label:>10} | {count:6d} {bar}")
+    if len(sizes):
+        print(f"   최대 {sizes.max() / 1024:.1f} KB, 중앙값 {np.median(sizes) / 1024:.1f} KB")
+
+
+def publish_index(client, target, nodes):
+    """검색 색인 문서를 egoIndex에 업로드 (내용이 바뀐 문서만), 크기 요약 반환"""
+    manifest = PublishManifest(EGO_INDEX_MANIFEST_PATH, target)
+    docs = build_index(nodes, shard_size=EGO_INDEX_SHARD_SIZE, prefixes=EGO_INDEX_PREFIX)
+    committed = []
+
+    # 문서 수가 적으므로 journal 없이 끝난 뒤 매니페스트에 반영 (실패하면 다음 실행에서 다시 올림)
+    sizes = {}
+    with BatchUploader(client, "egoIndex", batch_size=UPLOAD_BATCH_SIZE, max_workers=UPLOAD_WORKERS,
+                       max_retries=UPLOAD_RETRIES, on_commit=committed.extend) as uploader:
+        for doc_id, doc in docs:
+            size = sizes[doc_id] = doc_size(doc)
+            digest = content_hash(doc)
+            if EGO_PUBLISH_FORCE or not manifest.unchanged(doc_id, digest):
+                uploader.add(doc_id, doc, size, tag=digest)
+
+        # 인원이 줄어 없어진 shard / 버킷 삭제
+        current = {doc_id for doc_id, _ in docs}
+        for doc_id in manifest.hashes:
+            if doc_id not in current:
+                uploader.delete(doc_id)
+
+    manifest.apply(committed)
+    manifest.save()
+
+    meta = docs[0][1]
+    print(f"\n🔎 검색 색인 (egoIndex): {meta['count']}명, shard {meta['shards']}개, "
+          f"접두 버킷 {len(meta['prefixes'])}개, 업로드 {uploader.stats.documents}개")
+    # 목록 화면은 meta + shard만 읽음 (검색은 meta + 접두 버킷 하나)
     return {
-        "ego": G.nodes[ego].get("id", ego),
-        "label": ego,
-        "nodes": nodes,
-        "links": links,
-        "meta": {
-            "nodeCount": len(nodes),
-            "linkCount": len(links),
-            "generatedAt": datetime.now().isoformat()
-        }
+        "documents": len(sizes),
+        "bytes": sum(sizes.values()),
+        "list_bytes": sizes["meta"] + sum(sizes[f"shard-{n}"] for n in range(meta["shards"])),
     }
 
-# Firestore 업로드 함수
-def upload_ego_graph(ego_json):
-    doc_id = ego_json["ego"]
-    db.collection("egoGraphs").document(doc_id).set(ego_json)
-    print(f" 업로드 완료 → egoGraphs/{doc_id}")
 
-def main():
-    # 전체 네트워크 로드
-    with open("../output/network_with_community.gpickle", "rb") as f:
-        G = pickle.load(f)
+# client: firestore.client()와 같은 모양 (없으면 새로 연결, 시험할 때는 가짜 클라이언트)
+# target: 매니페스트를 구분할 업로드 대상 이름 (기본: 에뮬레이터 주소 또는 "firestore")
+@metrics.record_run("05_export_ego")
+def main(client=None, target=None):
+    client = client or firestore_client()
+    target = target or os.getenv("FIRESTORE_EMULATOR_HOST") or "firestore"
+
+    # 지난 업로드 기록 + 중단된 실행의 진행 기록 반영
+    manifest = PublishManifest(EGO_MANIFEST_PATH, target)
+    journal = PublishJournal(EGO_JOURNAL_PATH, target)
+    resumed = journal.replay()
+    if resumed:
+        manifest.apply(resumed)
+        manifest.save()
+        print(f"이전 실행에서 올라간 문서 {len(resumed)}개 이어받음")
+
+    # 전체 네트워크 로드 (memory map, 작업 프로세스도 같은 파일을 엶)
+    compare = EXPORT_SCHEMA == 2 and EXPORT_SIZE_COMPARE
+    extractor = EgoExtractor(
+        output_path("network_with_community.nodes.arrow"), output_path("network.adjacency.arrow"),
+        output_path("network.edges.arrow"), workers=EGO_WORKERS, schema=EXPORT_SCHEMA, top_k=EGO_TOP_K,
+        page_size=EGO_PAGE_SIZE, compare_v1=compare,
+    )
+    graph = extractor.graph
 
     print("전체 네트워크 로드 완료")
-    print("노드 수:", G.number_of_nodes())
-    print("엣지 수:", G.number_of_edges(), "\n")
+    print("노드 수:", graph.num_nodes)
+    print("엣지 수:", graph.num_edges)
+    print(f"ego 문서 생성 프로세스: {EGO_WORKERS}개\n")
+
+    total_size = v1_size = 0
+    sizes = []
+    paged = 0
+    unchanged = 0
+    current = set()
+
+    journal.open()
+    uploader = BatchUploader(
+        client, "egoGraphs", batch_size=UPLOAD_BATCH_SIZE, max_workers=UPLOAD_WORKERS, max_retries=UPLOAD_RETRIES,
+        on_commit=journal.record
+    )
+    try:
+        with uploader:
+            # 노드 순서대로 (본 문서 + 넘친 이웃 페이지), 문서 크기/해시는 작업 프로세스에서 계산
+            for _, entries, ego_v1_size in extractor:
+                paged += len(entries) > 1
+                v1_size += ego_v1_size
+
+                for doc_id, doc, size, digest in entries:
+                    current.add(doc_id)
+                    sizes.append(size)
+                    total_size += size
+
+                    if not EGO_PUBLISH_FORCE and manifest.unchanged(doc_id, digest):
+                        unchanged += 1
+                        continue
+                    uploader.add(doc_id, doc, size, tag=digest)   # batch로 묶어 Firestore 업로드
+
+            # 네트워크에서 빠진 영화인의 문서 삭제
+            removed = [doc_id for doc_id in manifest.hashes if doc_id not in current]
+            for doc_id in removed:
+                uploader.delete(doc_id)
+    except FirestoreUploadError as e:
+        # 성공한 batch는 journal에 남아 있으므로 다음 실행은 실패한 문서부터
+        journal.close(remove=False)
+        print(f"\n⚠️  {e}")
+        print(f"   실패한 문서 예: {', '.join(e.failed_ids[:10])}")
+        print(f"   다시 실행하면 이어서 올립니다 ({EGO_JOURNAL_PATH})")
+        raise
 
-    for person_name in G.nodes():
-        ego_json = ego_to_json(G, person_name)   # JSON 생성
-        upload_ego_graph(ego_json)               # Firestore 업로드
+    # 이번 실행 결과를 매니페스트에 합치고 journal 정리
+    journal.close(remove=False)
+    manifest.apply(journal.replay())
+    manifest.save()
+    journal.close()
 
+    stats = uploader.stats.report()
+    index = None
+    if EGO_INDEX:
+        with metrics.stage("publish_index") as record:
+            index = publish_index(client, target, extractor.nodes)
+            record.count(documents=index["documents"], bytes=index["bytes"])
+    # ego 추출과 업로드는 겹쳐서 진행되므로 한 단계로 기록
+    metrics.count(nodes=graph.num_nodes, edges=graph.num_edges, documents=len(sizes),
+                  uploaded=stats['documents'], unchanged=unchanged, retries=stats['retries'], bytes=total_size)
     print("\n모든 Ego Graph Firestore 업로드 완료!")
+    print(f"변경 없음 {unchanged}개 건너뜀, 업로드 {stats['documents'] - len(removed)}개, 삭제 {len(removed)}개")
+    print(f"업로드: 문서 {stats['documents']}개, batch {stats['batches']}개, 재시도 {stats['retries']}회, "
+          f"{stats['elapsed_sec']}초 ({stats['documents_per_sec']} 문서/초)")
+    print(f"문서 크기 합계 (schema v{EXPORT_SCHEMA}): {total_size / 1024:.1f} KB")
+    if index:
+        print(f"   - 검색 색인: 문서 {index['documents']}개, {index['bytes'] / 1024:.1f} KB "
+              f"(목록 불러오기 {index['list_bytes'] / 1024:.1f} KB, "
+              f"egoGraphs 전체의 {index['list_bytes'] / max(total_size, 1) * 100:.2f}%)")
+    if compare:
+        print(f"   - v1이었다면 {v1_size / 1024:.1f} KB ({(1 - total_size / max(v1_size, 1)) * 100:.1f}% 감소)")
+    print(f"이웃이 {EGO_TOP_K}명을 넘어 페이지로 나뉜 ego: {paged}개 (페이지 문서 {len(sizes) - graph.num_nodes}개)")
+    print_size_histogram(sizes)
+    oversized = sum(size >= FIRESTORE_DOC_LIMIT for size in sizes)
+    if oversized:
+        print(f"⚠️  1 MiB를 넘는 문서 {oversized}개: EGO_TOP_K / EGO_PAGE_SIZE를 줄이세요")
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -0,0 +1,212 @@
+"""
+단계 간 데이터 전달용 Arrow IPC 아티팩트
+
+- 표 데이터는 Arrow IPC(Feather v2, 비압축) 파일로 저장
+  → 다음 단계에서 memory map으로 열어 필요한 컬럼만 복사 없이 읽음
+- person_name, person_role, movie_title 같은 반복 문자열은 dictionary 인코딩
+- 그래프는 노드 표(*.nodes.arrow, node_table.py), 엣지 표(*.edges.arrow),
+  CSR 인접 구조(*.adjacency.arrow, csr_graph.py)로 나눠 저장
+  (노드는 정수 id, 커뮤니티 탐지 후에는 노드 표만 다시 씀)
+
+pickle과 달리 파이썬 버전에 묶이지 않고, 부분 로드가 가능함
+"""
+import json
+import os
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.ipc as ipc
+
+# 01 → 02 관계 표에서 dictionary 인코딩할 컬럼
+RELATION_DICTIONARY_COLUMNS = ["person_name", "person_role", "movie_title"]
+
+
+# ===========================
+# 표 저장/로드
+# ===========================
+
+
+def _column_to_arrow(series):
+    """pandas 컬럼 → Arrow 배열 (타입 추론이 안 되면 JSON 문자열로 저장)"""
+    try:
+        return pa.array(series, from_pandas=True)
+    except (pa.ArrowInvalid, pa.ArrowTypeError, TypeError):
+        return pa.array(
+            [None if v is None or (isinstance(v, float) and v != v)
+             else json.dumps(v, ensure_ascii=False) for v in series],
+            type=pa.string(),
+        )
+
+
+def frame_to_table(df, dictionary_columns=()):
+    arrays, names = [], []
+    for name in df.columns:
+        array = _column_to_arrow(df[name])
+        if name in dictionary_columns and not pa.types.is_dictionary(array.type):
+            array = array.dictionary_encode()
+        arrays.append(array)
+        names.append(str(name))
+    return pa.Table.from_arrays(arrays, names=names)
+
+
+def write_table(table, path):
+    """Arrow 표를 IPC 파일로 저장 (임시 파일에 쓴 뒤 교체)"""
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    tmp_path = path + ".tmp"
+    with pa.OSFile(tmp_path, "wb") as sink:
+        with ipc.new_file(sink, table.schema) as writer:
+            writer.write_table(table)
+    os.replace(tmp_path, path)
+    return path
+
+
+def write_frame(df, path, dictionary_columns=()):
+    return write_table(frame_to_table(df, dictionary_columns), path)
+
+
+def read_table(path, columns=None):
+    """
+    IPC 파일을 memory map으로 열어 필요한 컬럼만 반환
+    (버퍼는 파일 매핑을 그대로 가리키므로 복사가 일어나지 않음)
+    """
+    source = pa.memory_map(path, "r")
+    table = ipc.open_file(source).read_all()
+    if columns is not None:
+        table = table.select(columns)
+    return table
+
+
+def read_frame(path, columns=None):
+    """
+    필요한 컬럼만 DataFrame으로 읽기
+    dictionary 컬럼은 pandas Categorical로 변환됨 (문자열 중복 없이)
+    """
+    return read_table(path, columns).to_pandas(split_blocks=True, self_destruct=True)
+
+
+def read_relations(path, columns=None, legacy_pickle=None):
+    """
+    01의 영화인-영화 관계 표 로드
+    Arrow 파일이 아직 없으면 이전 형식(pickle)을 읽음
+    """
+    if not os.path.exists(path) and legacy_pickle and os.path.exists(legacy_pickle):
+        df = pd.read_pickle(legacy_pickle)
+        return df[columns] if columns is not None else df
+
+    # dictionary 컬럼은 Categorical 그대로 (projection.py, node_table.py가 카테고리 코드로 처리)
+    # 카테고리(고유값)만 파이썬 문자열로 한 번 풀어 둠, 행마다 풀지 않음
+    # groupby는 observed=True로, 문자열 비교가 필요한 곳에서만 풀어 쓸 것
+    df = read_frame(path, columns)
+    for name in df.columns:
+        if isinstance(df[name].dtype, pd.CategoricalDtype):
+            categories = pd.Index(np.asarray(df[name].cat.categories, dtype=object), dtype=object)
+            df[name] = pd.Categorical.from_codes(df[name].cat.codes, categories=categories)
+    return df
+
+
+# ===========================
+# 그래프 엣지 저장/로드
+# ===========================
+
+
+def _edge_columns(src, dst, weight, movie_ptr=None, movie_ids=None, titles=None, strength=None):
+    columns = {
+        "source": pa.array(src, type=pa.int32()),
+        "target": pa.array(dst, type=pa.int32()),
+        "weight": pa.array(weight, type=pa.int32()),
+    }
+    if strength is not None:
+        columns["strength"] = pa.array(strength, type=pa.float64())
+    if movie_ids is not None:
+        movies = pa.DictionaryArray.from_arrays(pa.array(movie_ids, type=pa.int32()), titles)
+        offsets = pa.array(movie_ptr, type=pa.int64())
+        columns["movies"] = pa.LargeListArray.from_arrays(offsets, movies)
+    return columns
+
+
+def edge_table(projection):
+    """
+    투영 결과 → 엣지 표 (source, target은 노드 테이블의 정수 id)
+    movies는 list<dictionary<string>>: 엣지별 offset + 영화 id, 제목은 한 번만 저장
+    strength는 Newman 가중치 투영일 때만 있음
+    """
+    titles = pa.array(projection.movies, type=pa.string())
+    return pa.table(_edge_columns(
+        projection.src, projection.dst, projection.weight,
+        projection.movie_ptr, projection.movie_ids, titles, projection.strength,
+    ))
+
+
+def save_edges(projection, path):
+    write_table(edge_table(projection), path)
+
+
+class EdgeWriter:
+    """
+    엣지를 블록 단위로 IPC 파일에 이어 쓰기 (edge_table과 같은 스키마)
+    영화 제목 dictionary는 모든 블록이 같은 배열을 공유하므로 파일에 한 번만 기록됨
+    """
+
+    def __init__(self, path, movies=None, with_strength=False):
+        self.path = path
+        self.titles = pa.array(movies, type=pa.string()) if movies is not None else None
+        fields = [("source", pa.int32()), ("target", pa.int32()), ("weight", pa.int32())]
+        if with_strength:
+            fields.append(("strength", pa.float64()))
+        if movies is not None:
+            fields.append(("movies", pa.large_list(pa.dictionary(pa.int32(), pa.string()))))
+        self.schema = pa.schema(fields)
+        self._sink = None
+        self._writer = None
+
+    def __enter__(self):
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        self._sink = pa.OSFile(self.path + ".tmp", "wb")
+        self._writer = ipc.new_file(self._sink, self.schema)
+        return self
+
+    def write(self, src, dst, weight, movie_ptr=None, movie_ids=None, strength=None):
+        columns = _edge_columns(src, dst, weight, movie_ptr, movie_ids, self.titles, strength)
+        self._writer.write_batch(pa.record_batch(list(columns.values()), schema=self.schema))
+
+    def __exit__(self, exc_type, exc, tb):
+        self._writer.close()
+        self._sink.close()
+        if exc_type is None:
+            os.replace(self.path + ".tmp", self.path)
+        else:
+            os.remove(self.path + ".tmp")
+        return False
+
+
+def _column_numpy(column):
+    """한 청크면 버퍼를 그대로 가리키는 numpy 배열, 여러 청크(스트리밍 기록)면 합쳐서 반환"""
+    if column.num_chunks == 1:
+        return column.chunk(0).to_numpy()
+    return column.combine_chunks().to_numpy()
+
+
+def edge_arrays(table):
+    """
+    엣지 표 → numpy 배열 dict (src, dst, weight, strength, movie_ptr, movie_ids, movies)
+    없는 컬럼은 None, movies는 영화 제목 배열 (movie_ids가 가리키는 dictionary)
+    """
+    arrays = {
+        "src": _column_numpy(table.column("source")),
+        "dst": _column_numpy(table.column("target")),
+        "weight": _column_numpy(table.column("weight")) if "weight" in table.column_names else None,
+        "strength": _column_numpy(table.column("strength")) if "strength" in table.column_names else None,
+        "movie_ptr": None,
+        "movie_ids": None,
+        "movies": None,
+    }
+    if "movies" in table.column_names:
+        column = table.column("movies")
+        lists = column.chunk(0) if column.num_chunks == 1 else column.combine_chunks()
+        offsets = lists.offsets.to_numpy()
+        values = lists.values.slice(offsets[0], offsets[-1] - offsets[0]) if len(offsets) else lists.values
+        arrays["movie_ptr"] = offsets - offsets[0] if len(offsets) and offsets[0] else offsets
+        arrays["movie_ids"] = values.indices.to_numpy()
+        arrays["movies"] = values.dictionary.to_numpy(zero_copy_only=False)
+    return arrays
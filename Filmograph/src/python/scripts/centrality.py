@@ -0,0 +1,255 @@
+"""
+협업 그래프 중심성 (03_detect_community.py의 centrality 단계)
+
+- pagerank: 가중치 PageRank, 희소 행렬 곱 반복 (networkx.pagerank와 같은 정의/수렴 조건)
+  연결이 없는 영화인(dangling)의 몫은 전체에 고르게 나눔
+- eigenvector: 가중치 고유벡터 중심성, (A + I)x 반복 후 L2 정규화 (networkx.eigenvector_centrality와 같음)
+- betweenness: 매개 중심성 근사 (Brandes), 출발점 samples개를 뽑아 합한 뒤 n / samples배
+  경로 길이는 협업 단계 수 (가중치 없음), 값은 networkx.betweenness_centrality(normalized=True)와 같은 척도
+  출발점 하나의 BFS / 의존도 누적을 단계(거리)마다 배열 연산으로 처리하고,
+  출발점 묶음을 프로세스 풀에 나눔 (작업 프로세스는 Arrow 파일을 memory map으로 엶, ego_extract.py와 같은 방식)
+
+그래프는 CSRGraph (정수 노드 id), 반환 값은 노드 순서의 float64 배열
+"""
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import scipy.sparse as sp
+
+import metrics
+from csr_graph import CSRGraph
+
+DAMPING = 0.85
+TOLERANCE = 1e-6     # 노드당 L1 변화량 (networkx 기본값과 같음)
+MAX_ITER = 1000
+SAMPLES = 256
+# 작업 하나가 처리할 출발점 수 (작업 프로세스끼리 고르게 나눠지고 표본 절반 비교가 가능하도록
+# samples / (workers * 4) 이하로 줄임)
+CHUNK = 32
+
+
+def adjacency_matrix(graph, weight=None):
+    """CSR 인접 구조 → scipy 희소 행렬 (weight: 엣지 가중치 배열, 없으면 1)"""
+    n = graph.num_nodes
+    data = np.ones(len(graph.neighbors)) if weight is None else np.asarray(weight, dtype=np.float64)[graph.edge_ids]
+    return sp.csr_matrix((data, graph.neighbors, graph.indptr), shape=(n, n))
+
+
+# ===========================
+# PageRank / 고유벡터 중심성
+# ===========================
+
+
+def pagerank(graph, weight=None, damping=DAMPING, tol=TOLERANCE, max_iter=MAX_ITER):
+    """
+    가중치 PageRank (합 1), 반환: (점수, 반복 횟수)
+    무방향 그래프라 W가 대칭이므로 x·D⁻¹W = W(x / strength)로 전치 없이 곱함
+    """
+    n = graph.num_nodes
+    if n == 0:
+        return np.zeros(0), 0
+    matrix = adjacency_matrix(graph, weight)
+    strength = np.asarray(matrix.sum(axis=1)).ravel()
+    dangling = strength == 0
+    inverse = np.divide(1.0, strength, out=np.zeros(n), where=~dangling)
+
+    x = np.full(n, 1.0 / n)
+    for iteration in range(1, max_iter + 1):
+        previous = x
+        x = damping * (matrix @ (previous * inverse))
+        x += (damping * previous[dangling].sum() + 1.0 - damping) / n
+        if np.abs(x - previous).sum() < n * tol:
+            return x, iteration
+    raise RuntimeError(f"PageRank가 {max_iter}회 안에 수렴하지 않았습니다")
+
+
+def eigenvector(graph, weight=None, tol=TOLERANCE, max_iter=MAX_ITER):
+    """
+    가중치 고유벡터 중심성 (L2 노름 1), 반환: (점수, 반복 횟수)
+    A 대신 A + I를 반복해 이분 그래프 같은 경우에도 진동하지 않고 수렴 (고유벡터는 같음)
+    """
+    n = graph.num_nodes
+    if n == 0:
+        return np.zeros(0), 0
+    matrix = adjacency_matrix(graph, weight)
+
+    x = np.full(n, 1.0 / n)
+    for iteration in range(1, max_iter + 1):
+        previous = x
+        x = previous + matrix @ previous
+        norm = np.linalg.norm(x)
+        x = x / norm if norm else x
+        if np.abs(x - previous).sum() < n * tol:
+            return x, iteration
+    raise RuntimeError(f"고유벡터 중심성이 {max_iter}회 안에 수렴하지 않았습니다")
+
+
+# ===========================
+# 매개 중심성 (표본 Brandes)
+# ===========================
+
+
+def source_dependencies(graph, source, out):
+    """
+    출발점 하나의 Brandes 의존도 δ_s(v)를 out에 더함 (출발점 자신은 제외)
+    BFS는 거리 단계마다 frontier 전체의 인접 구간을 한 번에 펼침
+    """
+    n = graph.num_nodes
+    dist = np.full(n, -1, dtype=np.int32)
+    sigma = np.zeros(n)
+    dist[source] = 0
+    sigma[source] = 1.0
+
+    frontier = np.array([source], dtype=np.int64)
+    levels = []
+    depth = 0
+    while len(frontier):
+        slots, counts = graph.slots(frontier)
+        above = np.repeat(np.arange(len(frontier)), counts)
+        below = graph.neighbors[slots].astype(np.int64)
+        reached = np.unique(below[dist[below] < 0])
+        dist[reached] = depth + 1
+
+        # 최단 경로 DAG 엣지 (거리 d → d + 1)
+        on_path = dist[below] == depth + 1
+        above, below = above[on_path], below[on_path]
+        position = np.searchsorted(reached, below)
+        sigma[reached] = np.bincount(position, weights=sigma[frontier[above]], minlength=len(reached))
+        levels.append((frontier, above, reached, position))
+        frontier = reached
+        depth += 1
+
+    # 먼 단계부터 의존도 누적: δ(v) = Σ_w σ(v) / σ(w) · (1 + δ(w))
+    delta = np.zeros(n)
+    for frontier, above, reached, position in reversed(levels):
+        parents = frontier[above]
+        share = sigma[parents] / sigma[reached[position]] * (1.0 + delta[reached[position]])
+        delta[frontier] += np.bincount(above, weights=share, minlength=len(frontier))
+    delta[source] = 0.0
+    out += delta
+
+
+def dependencies(graph, sources):
+    """출발점들의 의존도 합"""
+    total = np.zeros(graph.num_nodes)
+    for source in np.asarray(sources).tolist():
+        source_dependencies(graph, source, total)
+    return total
+
+
+def sample_sources(num_nodes, samples=SAMPLES, seed=None):
+    """출발점 표본 (samples가 0이거나 노드 수 이상이면 전체 → 정확한 값)"""
+    if not samples or samples >= num_nodes:
+        return np.arange(num_nodes)
+    rng = np.random.default_rng(seed)
+    return np.sort(rng.choice(num_nodes, size=samples, replace=False))
+
+
+def scale_betweenness(total, num_nodes, num_sources):
+    """출발점 합 → networkx normalized 척도 (무방향: 쌍마다 양쪽에서 세므로 1 / ((n-1)(n-2)))"""
+    if num_nodes <= 2 or not num_sources:
+        return np.zeros_like(total)
+    return total * (num_nodes / num_sources) / ((num_nodes - 1) * (num_nodes - 2))
+
+
+_worker = {}
+
+
+def _init_worker(paths):
+    adjacency_path, edges_path = paths
+    # 인접 구조만 필요 (엣지 속성은 읽지 않음)
+    _worker["graph"] = CSRGraph.load(adjacency_path, edges_path, edge_columns=[])
+
+
+def _dependencies_task(sources):
+    return dependencies(_worker["graph"], sources)
+
+
+def betweenness(graph, samples=SAMPLES, seed=None, workers=1, paths=None, chunk=CHUNK):
+    """
+    표본 매개 중심성, 반환: (점수, 출발점 묶음별 의존도 합 목록, 출발점 수)
+    workers > 1이면 paths (adjacency, edges Arrow 파일)를 작업 프로세스가 각자 열어 계산
+    묶음별 합은 표본 안정성 확인용 (split_half)
+    """
+    n = graph.num_nodes
+    sources = sample_sources(n, samples, seed)
+    chunk = max(1, min(chunk, -(-len(sources) // (max(workers, 1) * 4))))
+    chunks = [sources[i:i + chunk] for i in range(0, len(sources), chunk)]
+
+    if workers > 1 and paths is not None and len(chunks) > 1:
+        with ProcessPoolExecutor(min(workers, len(chunks)), initializer=_init_worker,
+                                 initargs=(paths,)) as executor:
+            parts = list(executor.map(_dependencies_task, chunks))
+    else:
+        parts = [dependencies(graph, sources) for sources in chunks]
+
+    total = np.sum(parts, axis=0) if parts else np.zeros(n)
+    return scale_betweenness(total, n, len(sources)), parts, len(sources)
+
+
+# ===========================
+# 정확도
+# ===========================
+
+
+def top_overlap(estimate, exact, k=100):
+    """두 점수의 상위 k명이 겹치는 비율"""
+    k = min(k, len(exact))
+    if k == 0:
+        return 1.0
+    top = lambda values: set(np.argsort(-values, kind="stable")[:k].tolist())
+    return len(top(estimate) & top(exact)) / k
+
+
+def rank_correlation(estimate, exact):
+    """스피어만 순위 상관계수"""
+    from scipy.stats import spearmanr
+
+    if len(exact) < 2 or np.ptp(exact) == 0 or np.ptp(estimate) == 0:
+        return 1.0 if np.allclose(estimate, exact) else 0.0
+    return float(spearmanr(estimate, exact).statistic)
+
+
+def split_half(parts, k=100):
+    """
+    출발점 묶음을 절반씩 나눠 만든 두 추정치의 상위 k명 일치율 (정확한 값 없이 표본 수가 충분한지 가늠)
+    묶음이 2개 미만이면 None
+    """
+    if len(parts) < 2:
+        return None
+    first = np.sum(parts[0::2], axis=0)
+    second = np.sum(parts[1::2], axis=0)
+    return top_overlap(first, second, k)
+
+
+def compute(graph, weight=None, damping=DAMPING, samples=SAMPLES, seed=None, workers=1, paths=None):
+    """
+    세 가지 중심성을 한 번에, 반환: ({이름: 점수}, {이름: 실행 정보})
+    실행 정보: seconds, iterations(PageRank/고유벡터) 또는 sources/split_half(매개 중심성)
+    기록 중인 실행이 있으면 셋 다 그 안의 단계로도 기록됨 (metrics.stage)
+    """
+    scores, info = {}, {}
+
+    with metrics.stage("pagerank") as record:
+        started = time.perf_counter()
+        scores["pagerank"], iterations = pagerank(graph, weight, damping)
+        info["pagerank"] = {"seconds": time.perf_counter() - started, "iterations": iterations}
+        record.count(iterations=iterations)
+
+    with metrics.stage("eigenvector") as record:
+        started = time.perf_counter()
+        scores["eigenvector"], iterations = eigenvector(graph, weight)
+        info["eigenvector"] = {"seconds": time.perf_counter() - started, "iterations": iterations}
+        record.count(iterations=iterations)
+
+    with metrics.stage("betweenness") as record:
+        started = time.perf_counter()
+        scores["betweenness"], parts, num_sources = betweenness(graph, samples, seed, workers, paths)
+        info["betweenness"] = {
+            "seconds": time.perf_counter() - started,
+            "sources": num_sources,
+            "split_half": split_half(parts) if num_sources < graph.num_nodes else None,
+        }
+        record.count(sources=num_sources)
+    return scores, info
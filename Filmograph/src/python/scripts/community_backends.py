@@ -0,0 +1,228 @@
+"""
+커뮤니티 탐지 백엔드
+
+모든 백엔드는 CSRGraph를 받아 노드별 커뮤니티 id 배열(0부터)을 반환
+- python-louvain: 기존 community_louvain.best_partition (networkx 그래프, 순수 파이썬)
+- networkx: networkx 내장 louvain_communities
+- igraph-louvain / igraph-leiden: igraph의 C 구현 (정수 엣지 리스트를 그대로 넘김)
+
+modularity()는 백엔드와 관계없이 같은 식(가중치, resolution 포함)으로 numpy에서 계산
+igraph는 선택 의존성이라 해당 백엔드를 고를 때만 import 함
+
+증분 모드 (incremental_communities)
+- 이전 실행의 커뮤니티에서 출발해 바뀐 노드와 그 이웃만 Louvain 지역 이동으로 다시 최적화
+- stable_ids()로 새 커뮤니티 id를 이전 id와 최대한 겹치게 맞춤 (프론트엔드 색상 유지)
+"""
+import random
+from collections import deque
+from contextlib import contextmanager
+
+import numpy as np
+
+DEFAULT_BACKEND = "python-louvain"
+
+
+def _weights(graph, weight):
+    values = getattr(graph, weight)
+    return np.ones(graph.num_edges) if values is None else np.asarray(values, dtype=np.float64)
+
+
+def _python_louvain(graph, weight, resolution, seed):
+    import community as community_louvain
+
+    G = graph.to_networkx(edge_attrs=[weight])
+    partition = community_louvain.best_partition(G, weight=weight, resolution=resolution, random_state=seed)
+    membership = np.zeros(graph.num_nodes, dtype=np.int32)
+    for node, comm_id in partition.items():
+        membership[node] = comm_id
+    return membership
+
+
+def _networkx_louvain(graph, weight, resolution, seed):
+    import networkx as nx
+
+    G = graph.to_networkx(edge_attrs=[weight])
+    communities = nx.community.louvain_communities(G, weight=weight, resolution=resolution, seed=seed)
+    membership = np.zeros(graph.num_nodes, dtype=np.int32)
+    for comm_id, members in enumerate(communities):
+        membership[list(members)] = comm_id
+    return membership
+
+
+def _igraph(graph, weight):
+    try:
+        import igraph as ig
+    except ImportError as e:
+        raise ImportError("igraph 백엔드를 쓰려면 'pip install igraph'가 필요합니다") from e
+
+    g = ig.Graph(n=graph.num_nodes, edges=np.column_stack([graph.src, graph.dst]).tolist())
+    return ig, g, _weights(graph, weight).tolist()
+
+
+@contextmanager
+def _igraph_seed(ig, seed):
+    """seed가 있으면 그동안만 igraph 난수 생성기를 고정 (끝나면 기본값 random 모듈로 되돌림)"""
+    if seed is None:
+        yield
+        return
+    ig.set_random_number_generator(random.Random(seed))
+    try:
+        yield
+    finally:
+        ig.set_random_number_generator(random)
+
+
+def _igraph_louvain(graph, weight, resolution, seed):
+    ig, g, weights = _igraph(graph, weight)
+    with _igraph_seed(ig, seed):
+        clustering = g.community_multilevel(weights=weights, resolution=resolution)
+    return np.asarray(clustering.membership, dtype=np.int32)
+
+
+def _igraph_leiden(graph, weight, resolution, seed):
+    ig, g, weights = _igraph(graph, weight)
+    with _igraph_seed(ig, seed):
+        clustering = g.community_leiden(
+            objective_function="modularity", weights=weights, resolution=resolution, n_iterations=-1
+        )
+    return np.asarray(clustering.membership, dtype=np.int32)
+
+
+BACKENDS = {
+    "python-louvain": _python_louvain,
+    "networkx": _networkx_louvain,
+    "igraph-louvain": _igraph_louvain,
+    "igraph-leiden": _igraph_leiden,
+}
+
+
+def detect_communities(graph, backend=DEFAULT_BACKEND, weight="weight", resolution=1.0, seed=None):
+    """CSRGraph → 노드별 커뮤니티 id (int32 배열)"""
+    if backend not in BACKENDS:
+        raise ValueError(f"알 수 없는 커뮤니티 백엔드: {backend!r} (가능: {', '.join(BACKENDS)})")
+    return BACKENDS[backend](graph, weight, resolution, seed)
+
+
+def modularity(graph, membership, weight="weight", resolution=1.0):
+    """
+    가중 모듈성 Q = Σ_c [ L_c / m - resolution * (d_c / 2m)^2 ]
+    (L_c: 커뮤니티 내부 가중치 합, d_c: 커뮤니티 노드 strength 합, m: 전체 가중치 합)
+    """
+    weights = _weights(graph, weight)
+    total = weights.sum()
+    if total == 0:
+        return 0.0
+    inside = weights[membership[graph.src] == membership[graph.dst]].sum()
+    strength = (np.bincount(graph.src, weights, minlength=graph.num_nodes)
+                + np.bincount(graph.dst, weights, minlength=graph.num_nodes))
+    community_strength = np.bincount(membership, strength)
+    return float(inside / total - resolution * ((community_strength / (2 * total)) ** 2).sum())
+
+
+# ===========================
+# 증분 탐지
+# ===========================
+
+
+def stable_ids(membership, previous):
+    """
+    커뮤니티 id를 이전 실행과 최대한 같게 다시 매김
+    겹치는 노드가 많은 (새, 이전) 쌍부터 이전 id를 물려주고, 남은 커뮤니티는 새 id를 받음
+    previous: 이전 커뮤니티 id (이전에 없던 노드는 -1)
+    """
+    membership = np.asarray(membership)
+    _, membership = np.unique(membership, return_inverse=True)
+    num_new = int(membership.max()) + 1 if len(membership) else 0
+
+    known = previous >= 0
+    pairs, overlap = np.unique(
+        np.column_stack([membership[known], previous[known]]), axis=0, return_counts=True
+    )
+    relabel = np.full(num_new, -1, dtype=np.int64)
+    used = set()
+    for i in np.argsort(-overlap, kind="stable"):
+        new_id, old_id = pairs[i]
+        if relabel[new_id] < 0 and old_id not in used:
+            relabel[new_id] = old_id
+            used.add(old_id)
+
+    next_id = int(previous.max()) + 1 if known.any() else 0
+    for new_id in np.flatnonzero(relabel < 0):
+        relabel[new_id] = next_id
+        next_id += 1
+    return relabel[membership].astype(np.int32)
+
+
+def local_moves(graph, membership, frontier, weight="weight", resolution=1.0, max_visits=None):
+    """
+    Louvain 1단계(노드 이동)를 frontier 노드에서만 실행
+    노드가 커뮤니티를 옮기면 그 이웃을 다시 큐에 넣음 (전체 방문 수는 max_visits로 제한)
+    반환: (membership, 이동 횟수, 방문 횟수)
+    """
+    membership = np.array(membership, dtype=np.int64)
+    weights = _weights(graph, weight)
+    slot_weight = weights[graph.edge_ids]
+    strength = np.bincount(graph.src, weights, minlength=graph.num_nodes) + \
+        np.bincount(graph.dst, weights, minlength=graph.num_nodes)
+    total = np.bincount(membership, strength, minlength=int(membership.max()) + 1)
+    m2 = 2 * weights.sum()
+    if m2 == 0:
+        return membership, 0, 0
+
+    queue = deque(dict.fromkeys(np.asarray(frontier).tolist()))
+    queued = set(queue)
+    max_visits = max_visits or 20 * max(len(queue), 1)
+    moves = visits = 0
+
+    while queue and visits < max_visits:
+        u = queue.popleft()
+        queued.discard(u)
+        visits += 1
+
+        lo, hi = graph.indptr[u], graph.indptr[u + 1]
+        if lo == hi:
+            continue
+        neighbors = graph.neighbors[lo:hi]
+        current = membership[u]
+        total[current] -= strength[u]
+
+        # 이웃 커뮤니티별 연결 가중치 → 모듈성 증가량
+        candidates, inverse = np.unique(membership[neighbors], return_inverse=True)
+        links = np.bincount(inverse, slot_weight[lo:hi])
+        gain = links - resolution * total[candidates] * strength[u] / m2
+
+        own = np.flatnonzero(candidates == current)
+        stay = gain[own[0]] if len(own) else -resolution * total[current] * strength[u] / m2
+        best = int(np.argmax(gain))
+        target = candidates[best] if gain[best] > stay + 1e-12 else current
+
+        total[target] += strength[u]
+        if target != current:
+            membership[u] = target
+            moves += 1
+            for v in neighbors.tolist():
+                if v not in queued:
+                    queue.append(v)
+                    queued.add(v)
+
+    return membership, moves, visits
+
+
+def incremental_communities(graph, previous, changed, weight="weight", resolution=1.0):
+    """
+    이전 커뮤니티에서 출발하는 증분 탐지
+    previous: 이전 커뮤니티 id (새 노드는 -1), changed: 바뀐 노드 id 배열
+    새 노드는 각자 새 커뮤니티에서 시작하고, 바뀐 노드와 그 이웃만 다시 배치함
+    반환: (안정된 id의 membership, 통계 dict)
+    """
+    start = np.array(previous, dtype=np.int64)
+    new_nodes = np.flatnonzero(start < 0)
+    next_id = int(start.max()) + 1 if (start >= 0).any() else 0
+    start[new_nodes] = np.arange(next_id, next_id + len(new_nodes))
+
+    seeds = np.union1d(np.asarray(changed, dtype=np.int64), new_nodes)
+    frontier = graph.neighborhood(seeds)
+
+    membership, moves, visits = local_moves(graph, start, frontier, weight, resolution)
+    stats = {"seeds": len(seeds), "frontier": len(frontier), "moves": moves, "visits": visits}
+    return stable_ids(membership, previous), stats
@@ -0,0 +1,202 @@
+"""
+협업 그래프의 CSR 인접 구조 (networkx.Graph 대체)
+
+- neighbors[indptr[u]:indptr[u+1]]: 노드 u의 이웃 (오름차순)
+- edge_ids[indptr[u]:indptr[u+1]]: 각 이웃과의 엣지 id (엣지 표의 행 번호)
+- 엣지 속성(weight, strength, 공유 영화 offset/id)은 엣지 표(*.edges.arrow)의 배열을 그대로 사용
+
+인접 구조는 *.adjacency.arrow에 노드마다 list<struct<neighbor, edge>> 한 행으로 저장
+(list의 offsets가 곧 indptr). 두 파일 모두 memory map으로 열어 복사 없이 numpy 배열로 씀
+Louvain/레이아웃처럼 networkx가 필요한 곳은 to_networkx()로 변환
+"""
+import numpy as np
+import pyarrow as pa
+
+from artifacts import edge_arrays, read_table, write_table
+
+
+class CSRGraph:
+
+    def __init__(self, indptr, neighbors, edge_ids, src, dst, weight=None, strength=None,
+                 movie_ptr=None, movie_ids=None, movies=None):
+        self.indptr = indptr
+        self.neighbors = neighbors
+        self.edge_ids = edge_ids
+        self.src = src
+        self.dst = dst
+        self.weight = weight
+        self.strength = strength
+        self.movie_ptr = movie_ptr
+        self.movie_ids = movie_ids
+        self.movies = movies
+        self._keys = None
+
+    @property
+    def num_nodes(self):
+        return len(self.indptr) - 1
+
+    @property
+    def num_edges(self):
+        return len(self.src)
+
+    @property
+    def degree(self):
+        return np.diff(self.indptr)
+
+    def neighbors_of(self, u):
+        return self.neighbors[self.indptr[u]:self.indptr[u + 1]]
+
+    def edge_movies(self, e):
+        """엣지 e의 영화 제목 리스트"""
+        ids = self.movie_ids[self.movie_ptr[e]:self.movie_ptr[e + 1]]
+        return self.movies[ids].tolist()
+
+    def edges_movie_ids(self, edges):
+        """
+        여러 엣지의 영화 id를 한 번에: (offsets, ids)
+        엣지 edges[i]의 영화는 ids[offsets[i]:offsets[i+1]]
+        """
+        edges = np.asarray(edges, dtype=np.int64)
+        starts = self.movie_ptr[edges]
+        counts = self.movie_ptr[edges + 1] - starts
+        offsets = np.zeros(len(edges) + 1, dtype=np.int64)
+        np.cumsum(counts, out=offsets[1:])
+        slots = np.repeat(starts - offsets[:-1], counts) + np.arange(offsets[-1])
+        return offsets, self.movie_ids[slots]
+
+    # ===========================
+    # 생성
+    # ===========================
+
+    @staticmethod
+    def build_adjacency(src, dst, num_nodes):
+        """엣지 배열 → (indptr, neighbors, edge_ids), 양방향으로 펼쳐 (노드, 이웃) 순 정렬"""
+        edge = np.arange(len(src), dtype=np.int32)
+        rows = np.concatenate([src, dst])
+        cols = np.concatenate([dst, src]).astype(np.int32)
+        order = np.lexsort((cols, rows))
+        indptr = np.zeros(num_nodes + 1, dtype=np.int64)
+        np.cumsum(np.bincount(rows, minlength=num_nodes), out=indptr[1:])
+        return indptr, cols[order], np.concatenate([edge, edge])[order]
+
+    @classmethod
+    def from_projection(cls, projection):
+        indptr, neighbors, edge_ids = cls.build_adjacency(
+            projection.src, projection.dst, len(projection.persons)
+        )
+        return cls(
+            indptr, neighbors, edge_ids, projection.src, projection.dst, projection.weight,
+            projection.strength, projection.movie_ptr, projection.movie_ids, projection.movies,
+        )
+
+    # ===========================
+    # 저장/로드
+    # ===========================
+
+    def adjacency_table(self):
+        entries = pa.StructArray.from_arrays(
+            [pa.array(self.neighbors, type=pa.int32()), pa.array(self.edge_ids, type=pa.int32())],
+            names=["neighbor", "edge"],
+        )
+        return pa.table({"adjacency": pa.LargeListArray.from_arrays(pa.array(self.indptr, type=pa.int64()), entries)})
+
+    def save_adjacency(self, path):
+        write_table(self.adjacency_table(), path)
+
+    @classmethod
+    def load(cls, adjacency_path, edges_path, edge_columns=None):
+        """
+        인접 구조 + 엣지 표를 memory map으로 열기
+        edge_columns로 필요한 엣지 속성만 읽을 수 있음 (예: ["weight"])
+        """
+        adjacency = read_table(adjacency_path).column("adjacency").combine_chunks()
+        entries = adjacency.values
+
+        wanted = ["source", "target"] + list(edge_columns if edge_columns is not None else ["weight", "strength", "movies"])
+        edges_table = read_table(edges_path)
+        edges = edge_arrays(edges_table.select([c for c in wanted if c in edges_table.column_names]))
+
+        return cls(
+            adjacency.offsets.to_numpy(),
+            entries.field("neighbor").to_numpy(),
+            entries.field("edge").to_numpy(),
+            edges["src"], edges["dst"], edges["weight"], edges["strength"],
+            edges["movie_ptr"], edges["movie_ids"], edges["movies"],
+        )
+
+    # ===========================
+    # 조회
+    # ===========================
+
+    def slots(self, nodes):
+        """노드들의 인접 구간을 이어 붙인 위치 배열 (neighbors/edge_ids 인덱스), 각 노드의 이웃 수"""
+        nodes = np.asarray(nodes, dtype=np.int64)
+        starts = self.indptr[nodes]
+        counts = self.indptr[nodes + 1] - starts
+        offsets = np.repeat(starts - np.cumsum(counts) + counts, counts) + np.arange(counts.sum())
+        return offsets, counts
+
+    def find(self, rows, cols):
+        """(rows[i], cols[i])의 인접 구간 위치 (neighbors/edge_ids 인덱스), 이웃이 아니면 -1"""
+        if self._keys is None:
+            # (노드, 이웃)을 정수 하나로: 인접 구조가 (노드, 이웃) 순 정렬이라 전체가 오름차순
+            self._keys = np.repeat(np.arange(self.num_nodes, dtype=np.int64), self.degree) * self.num_nodes
+            self._keys += self.neighbors
+        query = np.asarray(rows, dtype=np.int64) * self.num_nodes + cols
+        if not len(self._keys):
+            return np.full(len(query), -1)
+        position = np.searchsorted(self._keys, query).clip(max=len(self._keys) - 1)
+        return np.where(self._keys[position] == query, position, -1)
+
+    def neighborhood(self, nodes):
+        """노드들과 그 이웃 전체 (오름차순)"""
+        offsets, _ = self.slots(nodes)
+        return np.union1d(np.asarray(nodes, dtype=np.int64), self.neighbors[offsets])
+
+    def ego(self, u):
+        """
+        반경 1 ego 네트워크 (nx.ego_graph(G, u, radius=1)과 같은 노드/엣지)
+        반환: members (오름차순 노드 id), edges (엣지 id, (src, dst) 순)
+        """
+        members = np.union1d(self.neighbors_of(u), [u])
+        return members, self.subgraph_edges(members)
+
+    def subgraph_edges(self, members):
+        """오름차순 노드 members 사이의 엣지 id ((src, dst) 순)"""
+        members = np.asarray(members, dtype=np.int64)
+        if not len(members):
+            return np.zeros(0, dtype=self.edge_ids.dtype)
+
+        # 멤버들의 인접 구간을 한 번에 펼침
+        offsets, counts = self.slots(members)
+        owners = np.repeat(members, counts)
+        others = self.neighbors[offsets]
+
+        # 각 엣지를 한 번만 (owner < other), 상대도 멤버인 것만
+        position = np.searchsorted(members, others).clip(max=len(members) - 1)
+        inside = (members[position] == others) & (others > owners)
+        return self.edge_ids[offsets[inside]]
+
+    def to_networkx(self, edge_attrs=("weight",)):
+        """
+        networkx가 필요한 코드용 변환 (정수 노드 id)
+        edge_attrs: 붙일 엣지 속성 ("weight", "strength", "movies")
+        """
+        import networkx as nx
+
+        G = nx.Graph()
+        G.add_nodes_from(range(self.num_nodes))
+
+        attrs = [{} for _ in range(self.num_edges)]
+        for key in edge_attrs:
+            if key == "movies":
+                titles = self.movies[self.movie_ids].tolist()
+                ptr = self.movie_ptr.tolist()
+                values = [titles[ptr[e]:ptr[e + 1]] for e in range(self.num_edges)]
+            else:
+                values = getattr(self, key).tolist()
+            for data, value in zip(attrs, values):
+                data[key] = value
+
+        G.add_edges_from(zip(self.src.tolist(), self.dst.tolist(), attrs))
+        return G
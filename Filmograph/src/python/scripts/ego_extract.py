@@ -0,0 +1,311 @@
+"""
+ego 문서 추출 엔진 (05_export_ego.py)
+
+- ego_to_json: 노드 하나의 ego 문서 (본 문서 + 넘친 이웃 페이지)
+- batch_egos: 연속한 노드 구간의 ego 네트워크를 한 번에 추출
+  정렬된 인접 배열에서 ego u와 이웃 v의 이웃 목록 교집합(N(u) ∩ N(v))을 구간 전체에 대해
+  searchsorted 한 번으로 구함 (노드별 파이썬 반복 없음, 쌍마다 짧은 쪽 목록만 펼침)
+- EgoExtractor: 노드 구간을 프로세스 풀에 나눠 문서 id/크기/해시까지 계산, 노드 순서대로 돌려줌
+  작업 프로세스는 Arrow 파일(nodes/adjacency/edges)을 각자 memory map으로 열어
+  같은 페이지 캐시를 공유함 (그래프를 프로세스마다 복사하거나 pickle로 보내지 않음)
+"""
+import json
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+
+import numpy as np
+
+from csr_graph import CSRGraph
+from ego_publish import content_hash
+from node_table import NodeTable
+
+TOP_K = 100
+PAGE_SIZE = 200
+# batch 하나에서 펼치는 인접 구간 길이 합의 상한 (메모리: 대략 이 값 × 40바이트)
+MAX_BATCH_WORK = 2_000_000
+
+
+# ===========================
+# 문서 생성
+# ===========================
+
+
+def ego_groups(graph, ego, members, top_k=TOP_K, page_size=PAGE_SIZE):
+    """
+    members 각각이 들어갈 문서 번호 (0: 본 문서, n: n번째 페이지)
+    이웃 순위: ego와의 weight 내림차순, 같으면 노드 번호 순
+    """
+    groups = np.zeros(len(members), dtype=np.int64)
+    offsets, _ = graph.slots([ego])
+    neighbors = graph.neighbors[offsets]
+    if not top_k or len(neighbors) <= top_k:
+        return groups
+
+    weights = graph.weight[graph.edge_ids[offsets]]
+    ranked = neighbors[np.lexsort((neighbors, -weights))]
+    overflow = ranked[top_k:]
+    pages = np.arange(len(overflow)) // page_size if page_size else np.zeros(len(overflow), dtype=np.int64)
+    groups[np.searchsorted(members, overflow)] = pages + 1
+    return groups
+
+
+# Ego JSON 생성 함수
+# graph: CSR 그래프 (정수 노드 id), nodes: 노드 테이블 (이름/속성은 여기서 붙임)
+# 반환: (본 문서, [페이지 문서]) - 이웃이 top_k명 이하면 페이지 없음
+# 노드는 본 문서 → 1페이지 → ... 순으로 이어 붙인 위치가 번호 (v2 링크의 s/t)
+# 링크는 양 끝 중 뒤쪽 문서에 들어감 (본 문서 + 1~n페이지 = 전체 ego 네트워크)
+def ego_to_json(graph, nodes, ego, schema=2, top_k=TOP_K, page_size=PAGE_SIZE):
+    members, edges = graph.ego(ego)
+    return ego_document(graph, nodes, ego, members, edges, schema, top_k, page_size)
+
+
+def ego_document(graph, nodes, ego, members, edges, schema=2, top_k=TOP_K, page_size=PAGE_SIZE):
+    """이미 추출한 ego 네트워크(members, edges)로 ego_to_json과 같은 문서 생성"""
+    src = np.searchsorted(members, graph.src[edges])
+    dst = np.searchsorted(members, graph.dst[edges])
+
+    # ego 네트워크 안에서의 연결 수 (페이지로 나뉘어도 전체 기준)
+    ego_degree = np.bincount(np.concatenate([src, dst]), minlength=len(members))
+
+    groups = ego_groups(graph, ego, members, top_k, page_size)
+    order = np.argsort(groups, kind="stable")   # 문서 안에서는 노드 번호 순
+    position = np.empty(len(members), dtype=np.int64)
+    position[order] = np.arange(len(members))
+    edge_groups = np.maximum(groups[src], groups[dst])
+    num_pages = int(groups.max())
+    bounds = np.searchsorted(groups[order], np.arange(num_pages + 2))
+
+    person_id = nodes.person_id[ego]
+    docs = []
+    for page in range(num_pages + 1):
+        page_members = order[bounds[page]:bounds[page + 1]]
+        page_edges = np.flatnonzero(edge_groups == page)
+
+        node_list = []
+        for i, degree in zip(page_members.tolist(), ego_degree[page_members].tolist()):
+            node_json = nodes.node_json(int(members[i]))
+            node_json["degree"] = degree
+            node_list.append(node_json)
+
+        if page == 0:
+            doc = {"ego": person_id, "label": nodes.label[ego], "nodes": node_list}
+        else:
+            doc = {"ego": person_id, "page": page, "offset": int(bounds[page]), "nodes": node_list}
+
+        if schema == 2:
+            # 링크 끝점은 이어 붙인 nodes 위치, 영화는 문서 안 movies 표의 번호
+            sources = position[src[page_edges]].tolist()
+            targets = position[dst[page_edges]].tolist()
+            offsets, movie_ids = graph.edges_movie_ids(edges[page_edges])
+            used, codes = np.unique(movie_ids, return_inverse=True)
+            codes, offsets = codes.ravel().tolist(), offsets.tolist()
+            weights = graph.weight[edges[page_edges]].tolist()
+            links = [
+                {"s": sources[i], "t": targets[i], "w": int(weights[i]), "m": codes[offsets[i]:offsets[i + 1]]}
+                for i in range(len(page_edges))
+            ]
+            doc["schema"] = 2
+            doc["movies"] = graph.movies[used].tolist()
+        else:
+            links = []
+            for e in edges[page_edges].tolist():
+                links.append({
+                    "source": nodes.person_id[graph.src[e]],
+                    "target": nodes.person_id[graph.dst[e]],
+                    "weight": int(graph.weight[e]),
+                    "movies": graph.edge_movies(e)
+                })
+
+        doc["links"] = links
+        docs.append(doc)
+
+    ego_json = docs[0]
+    ego_json["meta"] = {
+        "nodeCount": len(ego_json["nodes"]),
+        "linkCount": len(ego_json["links"]),
+        "totalNodeCount": len(members),
+        "totalLinkCount": len(edges),
+        "pages": num_pages,
+        "generatedAt": datetime.now().isoformat()
+    }
+    return ego_json, docs[1:]
+
+
+def page_id(page):
+    """페이지 문서 경로 (egoGraphs 기준 하위 컬렉션)"""
+    return f"{page['ego']}/pages/{page['page']}"
+
+
+def doc_size(ego_json):
+    """문서 크기 추정 (compact JSON 바이트 수)"""
+    return len(json.dumps(ego_json, ensure_ascii=False, separators=(",", ":")).encode("utf-8"))
+
+
+# ===========================
+# 구간 단위 ego 추출
+# ===========================
+
+
+def ego_work(graph):
+    """노드별 ego 추출 비용: 자신 + 이웃마다 (둘 중 작은 인접 구간 길이)"""
+    degree = graph.degree
+    owners = np.repeat(np.arange(graph.num_nodes), degree)
+    pair_cost = np.minimum(degree[owners], degree[graph.neighbors])
+    return degree + np.bincount(owners, weights=pair_cost, minlength=graph.num_nodes).astype(np.int64) + 1
+
+
+def ego_ranges(graph, max_work=MAX_BATCH_WORK):
+    """비용 합이 max_work 안팎이 되도록 노드를 [start, stop) 구간으로 자름"""
+    cumulative = np.cumsum(ego_work(graph))
+    ranges, start = [], 0
+    while start < graph.num_nodes:
+        done = cumulative[start - 1] if start else 0
+        stop = max(int(np.searchsorted(cumulative, done + max_work, side="right")), start + 1)
+        ranges.append((start, stop))
+        start = stop
+    return ranges
+
+
+def batch_egos(graph, start, stop):
+    """
+    start~stop-1번 노드의 ego 네트워크를 한 번에 추출
+    반환: (ego, members, edges) 반복 (각각 graph.ego(ego)와 같은 값/순서)
+
+    ego u의 엣지 = u-이웃 엣지 + 이웃 v, w (v < w) 사이 엣지
+    v-w 엣지는 N(u) ∩ N(v)를 (u, v) 쌍마다 작은 쪽 목록을 펼쳐 큰 쪽에서 찾음
+    (허브 이웃의 긴 인접 구간을 매번 훑지 않음)
+    """
+    egos = np.arange(start, stop, dtype=np.int64)
+    degree = graph.degree
+    offsets, counts = graph.slots(egos)
+    pair_ego = np.repeat(egos, counts)
+    pair_other = graph.neighbors[offsets].astype(np.int64)
+
+    # 멤버 = 이웃 + 자기 자신, ego별 오름차순
+    owners = np.concatenate([pair_ego, egos])
+    members = np.concatenate([pair_other, egos])
+    order = np.lexsort((members, owners))
+    members = members[order]
+    member_ptr = np.zeros(len(egos) + 1, dtype=np.int64)
+    np.cumsum(counts + 1, out=member_ptr[1:])
+
+    # (1) ego-이웃 엣지
+    parts = [(pair_ego, np.minimum(pair_ego, pair_other), np.maximum(pair_ego, pair_other), graph.edge_ids[offsets])]
+
+    # (2) 이웃 v의 인접 구간이 더 짧으면 N(v)를 펼쳐 N(u)에서 찾음
+    short = degree[pair_other] <= degree[pair_ego]
+    slots, slot_counts = graph.slots(pair_other[short])
+    v = np.repeat(pair_other[short], slot_counts)
+    w = graph.neighbors[slots].astype(np.int64)
+    u = np.repeat(pair_ego[short], slot_counts)
+    forward = np.flatnonzero(w > v)
+    found = forward[graph.find(u[forward], w[forward]) >= 0]
+    parts.append((u[found], v[found], w[found], graph.edge_ids[slots[found]]))
+
+    # (3) N(u)가 더 짧으면 N(u)를 펼쳐 N(v)에서 찾음
+    slots, slot_counts = graph.slots(pair_ego[~short])
+    v = np.repeat(pair_other[~short], slot_counts)
+    w = graph.neighbors[slots].astype(np.int64)
+    u = np.repeat(pair_ego[~short], slot_counts)
+    forward = np.flatnonzero(w > v)
+    position = graph.find(v[forward], w[forward])
+    found = position >= 0
+    forward = forward[found]
+    parts.append((u[forward], v[forward], w[forward], graph.edge_ids[position[found]]))
+
+    # 세 부분 모두 ego 순이라 안정 정렬은 병합만 함
+    edge_ego, low, high, edges = (np.concatenate(column) for column in zip(*parts))
+    order = np.argsort(edge_ego, kind="stable")
+    edges = edges[order]
+    keys = (low * graph.num_nodes + high)[order]
+    edge_ptr = np.zeros(len(egos) + 1, dtype=np.int64)
+    np.cumsum(np.bincount(edge_ego - start, minlength=len(egos)), out=edge_ptr[1:])
+
+    for i, ego in enumerate(egos.tolist()):
+        # ego 안에서 (작은 끝, 큰 끝) 순 (graph.ego와 같은 순서)
+        lo, hi = edge_ptr[i], edge_ptr[i + 1]
+        yield ego, members[member_ptr[i]:member_ptr[i + 1]], edges[lo:hi][np.argsort(keys[lo:hi])]
+
+
+def extract_range(graph, nodes, start, stop, schema=2, top_k=TOP_K, page_size=PAGE_SIZE, compare_v1=False):
+    """
+    start~stop-1번 노드의 ego 문서
+    반환: [(ego, [(문서 id, 문서, 크기, 내용 해시), ...], v1 크기 합)] (본 문서가 맨 앞)
+    """
+    results = []
+    for ego, members, edges in batch_egos(graph, start, stop):
+        ego_json, pages = ego_document(graph, nodes, ego, members, edges, schema, top_k, page_size)
+        docs = [(ego_json["ego"], ego_json)] + [(page_id(page), page) for page in pages]
+        entries = [(doc_id, doc, doc_size(doc), content_hash(doc)) for doc_id, doc in docs]
+
+        v1_size = 0
+        if compare_v1:
+            v1_main, v1_pages = ego_document(graph, nodes, ego, members, edges, 1, top_k, page_size)
+            v1_size = sum(doc_size(doc) for doc in [v1_main, *v1_pages])
+        results.append((ego, entries, v1_size))
+    return results
+
+
+# ===========================
+# 프로세스 풀
+# ===========================
+
+_worker = {}
+
+
+def _init_worker(paths, options):
+    nodes_path, adjacency_path, edges_path = paths
+    _worker["nodes"] = NodeTable.load(nodes_path)
+    _worker["graph"] = CSRGraph.load(adjacency_path, edges_path)
+    _worker["options"] = options
+
+
+def _extract_task(start, stop):
+    return extract_range(_worker["graph"], _worker["nodes"], start, stop, **_worker["options"])
+
+
+class EgoExtractor:
+    """
+    전체 노드의 ego 문서를 노드 순서대로 생성
+
+    extractor = EgoExtractor(nodes_path, adjacency_path, edges_path, workers=4)
+    for ego, entries, v1_size in extractor:
+        ...
+
+    workers가 1이면 현재 프로세스에서 바로 계산
+    대기 중인 구간 결과는 workers * 2개까지만 (소비가 느려도 메모리 일정)
+    """
+
+    def __init__(self, nodes_path, adjacency_path, edges_path, workers=1, schema=2, top_k=TOP_K,
+                 page_size=PAGE_SIZE, compare_v1=False, max_work=MAX_BATCH_WORK):
+        self.paths = (nodes_path, adjacency_path, edges_path)
+        self.nodes = NodeTable.load(nodes_path)
+        self.graph = CSRGraph.load(adjacency_path, edges_path)
+        self.workers = max(1, workers)
+        self.max_work = max_work
+        self.options = {"schema": schema, "top_k": top_k, "page_size": page_size, "compare_v1": compare_v1}
+
+    def ranges(self):
+        # 작업 프로세스끼리 고르게 나눠지도록 구간을 workers * 8개 이상으로
+        work = self.max_work
+        if self.workers > 1:
+            total = int(ego_work(self.graph).sum())
+            work = max(1, min(work, total // (self.workers * 8)))
+        return ego_ranges(self.graph, work)
+
+    def __iter__(self):
+        if self.workers == 1:
+            for start, stop in self.ranges():
+                yield from extract_range(self.graph, self.nodes, start, stop, **self.options)
+            return
+
+        with ProcessPoolExecutor(self.workers, initializer=_init_worker,
+                                 initargs=(self.paths, self.options)) as executor:
+            pending = deque()
+            for start, stop in self.ranges():
+                pending.append(executor.submit(_extract_task, start, stop))
+                if len(pending) >= self.workers * 2:
+                    yield from pending.popleft().result()
+            while pending:
+                yield from pending.popleft().result()
@@ -0,0 +1,77 @@
+"""
+ego 그래프 검색 색인 (05_export_ego.py → Firestore egoIndex 컬렉션)
+
+영화인 목록(id, 이름, 연결 수, 역할, 커뮤니티)만 담은 작은 문서들
+→ 화면에서 목록/검색을 위해 egoGraphs 전체(노드, 링크 포함)를 읽지 않아도 됨
+
+- egoIndex/meta: 전체 인원, 색인 문서 수, 접두 버킷 목록
+- egoIndex/shard-{n}: 연결 수 내림차순으로 INDEX_SHARD_SIZE명씩 (0번이 가장 많이 연결된 사람들)
+- egoIndex/prefix-{코드}: 이름 첫 글자별 버킷 (검색어 첫 글자로 문서 하나만 읽음)
+  코드는 첫 글자(소문자) 유니코드 값의 16진수 (문서 id에 쓸 수 없는 문자를 피함)
+  버킷이 INDEX_SHARD_SIZE명을 넘으면 연결 수 상위만 넣고 truncated 표시
+
+문서는 열 배열 형식 (키를 사람마다 반복하지 않음, 역할은 roles 표의 번호)
+{"ids": [...], "labels": [...], "degree": [...], "community": [...], "roles": ["배우", ...], "role": [0, ...]}
+"""
+import numpy as np
+
+INDEX_SCHEMA = 1
+INDEX_SHARD_SIZE = 5000
+
+
+def prefix_key(label):
+    """접두 버킷 이름 (빈 이름이면 None), 프런트엔드 utils/egoIndex.ts와 같은 규칙"""
+    first = label.strip().lower()[:1]
+    return f"{ord(first):x}" if first else None
+
+
+def index_columns(nodes, members):
+    """노드 번호 목록 → 열 배열 문서"""
+    roles = [nodes.role[i] if nodes.role[i] is not None else '기타' for i in members.tolist()]
+    names, codes = np.unique(np.asarray(roles, dtype=object), return_inverse=True) if roles else ([], [])
+    return {
+        "ids": [nodes.person_id[i] for i in members.tolist()],
+        "labels": [nodes.label[i] for i in members.tolist()],
+        "degree": nodes.degree[members].tolist() if nodes.degree is not None else [0] * len(members),
+        "community": nodes.community[members].tolist() if nodes.community is not None else [0] * len(members),
+        "roles": list(names),
+        "role": np.asarray(codes).ravel().tolist(),
+    }
+
+
+def build_index(nodes, shard_size=INDEX_SHARD_SIZE, prefixes=True):
+    """
+    노드 테이블 → [(문서 id, 문서)] (meta가 맨 앞)
+    모든 노드가 egoGraphs 문서를 가지므로 색인에도 전부 들어감
+    """
+    degree = nodes.degree if nodes.degree is not None else np.zeros(len(nodes), dtype=np.int32)
+    order = np.argsort(-degree, kind="stable")   # 연결 수 내림차순, 같으면 노드 번호 순
+
+    docs = []
+    for n, start in enumerate(range(0, len(order), shard_size)):
+        doc = index_columns(nodes, order[start:start + shard_size])
+        doc["shard"] = n
+        docs.append((f"shard-{n}", doc))
+
+    buckets = {}
+    if prefixes:
+        keys = [prefix_key(nodes.label[i]) for i in order.tolist()]
+        grouped = {}
+        for node, key in zip(order.tolist(), keys):
+            if key is not None:
+                grouped.setdefault(key, []).append(node)
+        for key, members in sorted(grouped.items()):
+            doc = index_columns(nodes, np.asarray(members[:shard_size], dtype=np.int64))
+            doc["prefix"] = key
+            doc["truncated"] = len(members) > shard_size
+            docs.append((f"prefix-{key}", doc))
+            buckets[key] = len(members)
+
+    meta = {
+        "schema": INDEX_SCHEMA,
+        "count": len(nodes),
+        "shards": (len(order) + shard_size - 1) // shard_size,
+        "shardSize": shard_size,
+        "prefixes": buckets,
+    }
+    return [("meta", meta)] + docs
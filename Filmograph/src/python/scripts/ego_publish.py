@@ -0,0 +1,109 @@
+"""
+ego 그래프 게시 상태 (바뀐 문서만 업로드 + 중단 후 이어서 하기)
+
+- content_hash: 생성 시각(meta.generatedAt)을 뺀 문서 내용의 sha256
+- PublishManifest: 마지막으로 올린 ego id → 내용 해시 (output/ego_manifest.json)
+  해시가 같은 ego는 건너뛰고, 매니페스트에는 있는데 이번에 없는 ego는 삭제
+- PublishJournal: 이번 실행에서 commit이 끝난 문서를 한 줄씩 덧붙이는 기록
+  (output/ego_publish.journal) 중간에 죽으면 다음 실행 시작할 때 매니페스트에 반영해
+  이미 올라간 문서를 다시 올리지 않음. 정상 종료하면 매니페스트에 합치고 지움
+
+매니페스트는 업로드 대상(에뮬레이터 / 실제 Firestore)별로 따로 취급함
+"""
+import hashlib
+import json
+import os
+import threading
+
+
+def content_hash(ego_json):
+    """meta.generatedAt을 뺀 문서 내용의 해시 (키 순서와 무관)"""
+    doc = dict(ego_json)
+    meta = {k: v for k, v in doc.get("meta", {}).items() if k != "generatedAt"}
+    doc["meta"] = meta
+    encoded = json.dumps(doc, ensure_ascii=False, sort_keys=True, separators=(",", ":")).encode("utf-8")
+    return hashlib.sha256(encoded).hexdigest()
+
+
+class PublishManifest:
+
+    def __init__(self, path, target):
+        self.path = path
+        self.target = target
+        self.hashes = {}
+        if os.path.exists(path):
+            with open(path, encoding="utf-8") as f:
+                data = json.load(f)
+            # 다른 대상(에뮬레이터 ↔ 실제)에 올린 기록이면 쓰지 않음
+            if data.get("target") == target:
+                self.hashes = data.get("hashes", {})
+
+    def __len__(self):
+        return len(self.hashes)
+
+    def unchanged(self, doc_id, digest):
+        return self.hashes.get(doc_id) == digest
+
+    def apply(self, entries):
+        """journal 항목 반영: (id, 해시) 또는 (id, None = 삭제)"""
+        for doc_id, digest in entries:
+            if digest is None:
+                self.hashes.pop(doc_id, None)
+            else:
+                self.hashes[doc_id] = digest
+
+    def save(self):
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({"target": self.target, "hashes": self.hashes}, f, ensure_ascii=False)
+        os.replace(tmp_path, self.path)
+
+
+class PublishJournal:
+    """
+    commit된 문서를 JSON 한 줄씩 기록 ({"id", "hash"}, 삭제는 hash가 null)
+    업로드 스레드들이 동시에 기록하므로 잠금 사용, 줄마다 flush
+    """
+
+    def __init__(self, path, target):
+        self.path = path
+        self.target = target
+        self._lock = threading.Lock()
+        self._file = None
+
+    def replay(self):
+        """이전 실행이 남긴 항목 (대상이 다르거나 마지막 줄이 잘렸으면 그 부분은 버림)"""
+        if not os.path.exists(self.path):
+            return []
+        entries = []
+        with open(self.path, encoding="utf-8") as f:
+            for i, line in enumerate(f):
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError:
+                    break
+                if i == 0:
+                    if record.get("target") != self.target:
+                        return []
+                    continue
+                entries.append((record["id"], record["hash"]))
+        return entries
+
+    def open(self):
+        self._file = open(self.path, "w", encoding="utf-8")
+        self._file.write(json.dumps({"target": self.target}) + "\n")
+        self._file.flush()
+
+    def record(self, entries):
+        lines = "".join(json.dumps({"id": doc_id, "hash": digest}) + "\n" for doc_id, digest in entries)
+        with self._lock:
+            self._file.write(lines)
+            self._file.flush()
+            os.fsync(self._file.fileno())
+
+    def close(self, remove=True):
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+        if remove and os.path.exists(self.path):
+            os.remove(self.path)
@@ -0,0 +1,279 @@
+"""
+network_data export 형식
+
+- JSON: 공백 없는 compact JSON을 항목 단위로 바로 파일에 씀 (전체 dict를 메모리에 만들지 않음)
+- .gz / .br: 정적 서빙용 사전 압축본 (brotli는 설치되어 있을 때만)
+- .bin: 프론트엔드가 JSON 파싱 없이 typed array로 바로 읽는 열 단위 바이너리
+
+바이너리 구조 (little-endian)
+    "FGNB" | uint32 헤더 길이 | 헤더 JSON (UTF-8) | 0 패딩 (8바이트 정렬) | 열 버퍼들 (각 8바이트 정렬)
+헤더: {"format", "version", "metadata", "columns": {이름: {"type", "offset", "length"}}}
+- offset은 본문(패딩 직후) 기준 바이트 위치, length는 원소 수
+- type "utf8" 열은 offset/length가 uint32 offsets(length + 1개)를, data_offset/data_length가 UTF-8 바이트를 가리킴
+디코더: src/utils/networkBinary.ts
+
+JSON schema v2 (network_data.json / egoGraphs 문서, 디코더: src/utils/graphSchema.ts)
+- nodes: 배열 위치가 노드 번호
+- links: {"s": source 번호, "t": target 번호, "w": weight, "m": [영화 번호], "n": 전체 영화 수(네트워크만)}
+- movies: 링크가 참조하는 영화 제목 표 (한 번씩만)
+- egoGraphs/{id}/pages/{n} (이웃이 많아 넘친 부분): s/t는 본 문서부터 이어 붙인 노드 위치,
+  offset은 이 문서 첫 노드의 위치, movies 표는 문서마다 따로
+Firestore는 배열 안의 배열을 저장할 수 없어 링크는 짧은 키의 map으로 둠
+"""
+import gzip
+import hashlib
+import json
+import os
+import time
+
+import numpy as np
+
+SCHEMA_VERSIONS = (1, 2)
+
+BINARY_MAGIC = b"FGNB"
+BINARY_VERSION = 1
+ALIGN = 8
+
+COLUMN_TYPES = {
+    "int32": np.int32,
+    "uint32": np.uint32,
+    "float32": np.float32,
+    "uint8": np.uint8,
+}
+
+
+def _dumps(value):
+    return json.dumps(value, ensure_ascii=False, separators=(",", ":"))
+
+
+# ===========================
+# JSON
+# ===========================
+
+
+class _ByteCounter:
+    """write()로 받은 문자열의 UTF-8 바이트 수만 셈 (파일을 쓰지 않고 크기 측정)"""
+
+    def __init__(self):
+        self.size = 0
+
+    def write(self, text):
+        self.size += len(text.encode("utf-8"))
+
+
+def _write_json(f, metadata, nodes, links, extra, buffer_items):
+    f.write('{"metadata":' + _dumps(metadata))
+    for key, value in (extra or {}).items():
+        f.write(f',"{key}":' + _dumps(value))
+    for key, items in (("nodes", nodes), ("links", links)):
+        f.write(f',"{key}":[')
+        chunk = []
+        first = True
+        for item in items:
+            chunk.append(_dumps(item))
+            if len(chunk) >= buffer_items:
+                f.write(("" if first else ",") + ",".join(chunk))
+                chunk, first = [], False
+        if chunk:
+            f.write(("" if first else ",") + ",".join(chunk))
+        f.write("]")
+    f.write("}")
+
+
+def write_json_stream(path, metadata, nodes, links, extra=None, buffer_items=10000):
+    """
+    {"metadata", (extra 키들), "nodes", "links"} 형식의 compact JSON을 스트리밍으로 저장
+    nodes, links: dict를 내는 iterable (generator면 전체 목록을 메모리에 두지 않음)
+    임시 파일에 쓴 뒤 교체하므로 중간에 실패해도 이전 파일이 남음
+    """
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        _write_json(f, metadata, nodes, links, extra, buffer_items)
+    os.replace(tmp_path, path)
+    return path
+
+
+def json_size(metadata, nodes, links, extra=None, buffer_items=10000):
+    """write_json_stream으로 썼을 때의 바이트 수 (파일은 만들지 않음)"""
+    counter = _ByteCounter()
+    _write_json(counter, metadata, nodes, links, extra, buffer_items)
+    return counter.size
+
+
+# ===========================
+# 사전 압축
+# ===========================
+
+
+def _brotli():
+    try:
+        import brotli
+    except ImportError:
+        return None
+    return brotli
+
+
+def compress_file(path, formats=("gz", "br"), chunk_size=1 << 20):
+    """
+    path 옆에 path.gz / path.br 생성 (스트리밍 압축)
+    반환: {형식: 경로}, brotli가 없으면 br은 건너뜀
+    """
+    written = {}
+    if "gz" in formats:
+        with open(path, "rb") as src, gzip.open(path + ".gz.tmp", "wb", compresslevel=9) as dst:
+            while block := src.read(chunk_size):
+                dst.write(block)
+        os.replace(path + ".gz.tmp", path + ".gz")
+        written["gz"] = path + ".gz"
+
+    brotli = _brotli()
+    if "br" in formats and brotli is not None:
+        compressor = brotli.Compressor(quality=11)
+        with open(path, "rb") as src, open(path + ".br.tmp", "wb") as dst:
+            while block := src.read(chunk_size):
+                dst.write(compressor.process(block))
+            dst.write(compressor.finish())
+        os.replace(path + ".br.tmp", path + ".br")
+        written["br"] = path + ".br"
+    return written
+
+
+# ===========================
+# 열 단위 바이너리
+# ===========================
+
+
+def _utf8_column(values):
+    encoded = [value.encode("utf-8") for value in values]
+    offsets = np.zeros(len(encoded) + 1, dtype=np.uint32)
+    np.cumsum([len(b) for b in encoded], out=offsets[1:])
+    return offsets, b"".join(encoded)
+
+
+def _padding(size):
+    return -size % ALIGN
+
+
+def write_binary(path, metadata, columns):
+    """
+    columns: {이름: numpy 배열 (COLUMN_TYPES 중 하나) 또는 문자열 리스트}
+    """
+    buffers = []
+    spec = {}
+    position = 0
+
+    def add(raw):
+        nonlocal position
+        offset = position
+        buffers.append(raw)
+        position += len(raw)
+        pad = _padding(position)
+        if pad:
+            buffers.append(b"\0" * pad)
+            position += pad
+        return offset
+
+    for name, values in columns.items():
+        if isinstance(values, np.ndarray):
+            type_name = next(t for t, dtype in COLUMN_TYPES.items() if values.dtype == dtype)
+            spec[name] = {"type": type_name, "offset": add(values.astype("<" + values.dtype.str[1:]).tobytes()),
+                          "length": len(values)}
+        else:
+            offsets, data = _utf8_column(values)
+            spec[name] = {"type": "utf8", "offset": add(offsets.astype("<u4").tobytes()), "length": len(values)}
+            spec[name].update(data_offset=add(data), data_length=len(data))
+
+    header = json.dumps(
+        {"format": "filmograph-network", "version": BINARY_VERSION, "metadata": metadata, "columns": spec},
+        ensure_ascii=False,
+    ).encode("utf-8")
+
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(BINARY_MAGIC)
+        f.write(np.uint32(len(header)).astype("<u4").tobytes())
+        f.write(header)
+        f.write(b"\0" * _padding(8 + len(header)))
+        for raw in buffers:
+            f.write(raw)
+    os.replace(tmp_path, path)
+    return path
+
+
+def read_binary(source):
+    """
+    write_binary 결과 읽기 (경로 또는 bytes)
+    반환: (헤더 dict, {이름: numpy 배열 또는 문자열 리스트})
+    """
+    if isinstance(source, (bytes, bytearray, memoryview)):
+        data = bytes(source)
+    else:
+        with open(source, "rb") as f:
+            data = f.read()
+    if data[:4] != BINARY_MAGIC:
+        raise ValueError("network 바이너리 형식이 아닙니다 (magic 불일치)")
+
+    header_length = int(np.frombuffer(data, dtype="<u4", count=1, offset=4)[0])
+    header = json.loads(data[8:8 + header_length].decode("utf-8"))
+    if header.get("version") != BINARY_VERSION:
+        raise ValueError(f"지원하지 않는 network 바이너리 버전: {header.get('version')}")
+    body = 8 + header_length + _padding(8 + header_length)
+
+    columns = {}
+    for name, column in header["columns"].items():
+        if column["type"] == "utf8":
+            offsets = np.frombuffer(data, dtype="<u4", count=column["length"] + 1, offset=body + column["offset"])
+            start = body + column["data_offset"]
+            text = data[start:start + column["data_length"]]
+            columns[name] = [text[a:b].decode("utf-8") for a, b in zip(offsets[:-1].tolist(), offsets[1:].tolist())]
+        else:
+            dtype = np.dtype(COLUMN_TYPES[column["type"]]).newbyteorder("<")
+            columns[name] = np.frombuffer(data, dtype=dtype, count=column["length"], offset=body + column["offset"])
+    return header, columns
+
+
+# ===========================
+# 해시
+# ===========================
+
+
+def file_digest(path, length=16, chunk_size=1 << 20):
+    """파일 내용의 sha256 (앞 length자리, 매니페스트의 캐시 무효화용)"""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        while block := f.read(chunk_size):
+            digest.update(block)
+    return digest.hexdigest()[:length]
+
+
+# ===========================
+# 크기 / 파싱 시간
+# ===========================
+
+
+def _parse(path):
+    with open(path, "rb") as f:
+        raw = f.read()
+    if path.endswith(".gz"):
+        raw = gzip.decompress(raw)
+    elif path.endswith(".br"):
+        raw = _brotli().decompress(raw)
+    if path.endswith((".bin", ".bin.gz", ".bin.br")):
+        return read_binary(raw)
+    return json.loads(raw)
+
+
+def format_report(paths, repeat=1):
+    """
+    형식별 파일 크기와 파싱 시간 (압축본은 압축 해제 포함, repeat번 중 최솟값)
+    반환: [(경로, 바이트, 파싱 초)], repeat=0이면 파싱하지 않고 파싱 초는 None
+    """
+    rows = []
+    for path in paths:
+        best = float("inf") if repeat else None
+        for _ in range(repeat):
+            started = time.perf_counter()
+            _parse(path)
+            best = min(best, time.perf_counter() - started)
+        rows.append((path, os.path.getsize(path), best))
+    return rows
@@ -0,0 +1,282 @@
+"""
+Firestore REST 응답 디스크 캐시 (기록 / 오프라인 재생 / 재검증)
+
+FirestoreFetcher(session=CachedSession(...))로 끼우면 가져오기 코드는 그대로 두고
+같은 요청(메서드 + URL + 쿼리(pageToken 포함) + 본문)의 응답을 디스크에서 돌려줌
+
+모드
+- record: 항상 네트워크로 요청하고 응답을 저장 (캐시를 새로 채움)
+- replay: 네트워크 없이 캐시만 사용, 없는 요청은 CacheMissError (CI / 반복 실행)
+- auto:   ttl초 안에 저장한 응답은 그대로 사용, 오래된 응답은 ETag / Last-Modified가 있으면
+          조건부 요청(If-None-Match / If-Modified-Since)으로 재검증 (304면 저장본 사용), 없으면 다시 받음
+- off:    캐시 없이 그대로 요청
+
+저장: root/<해시 앞 2자리>/<해시>.body (응답 본문) + .json (URL, 검증자, 저장 시각)
+총 크기가 max_bytes를 넘으면 가장 오래 쓰지 않은 응답부터 지움 (사용할 때마다 mtime 갱신)
+200 응답만 저장하고, 스트리밍 응답은 끝까지 읽었을 때만 저장 (중간에 끊기면 버림)
+"""
+import hashlib
+import json
+import os
+import threading
+import time
+
+from requests.structures import CaseInsensitiveDict
+
+from firestore_fetch import FirestoreFetchError
+from paths import data_path
+
+CACHE_MODES = ("off", "record", "replay", "auto")
+VALIDATORS = ("ETag", "Last-Modified")
+
+
+class CacheMissError(FirestoreFetchError):
+    """replay 모드에서 캐시에 없는 요청"""
+
+    def __init__(self, method, url):
+        super().__init__(-1, f"캐시에 없는 요청 (replay 모드): {method} {url}")
+        self.method = method
+        self.url = url
+
+
+def request_key(method, url, params=None, body=None):
+    """요청을 구분하는 해시 (쿼리 파라미터 순서와 무관)"""
+    params = sorted((str(k), str(v)) for k, v in (params or {}).items())
+    raw = json.dumps([method.upper(), url, params, body], ensure_ascii=False, sort_keys=True)
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+class CacheStats:
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.hits = 0          # 저장본을 그대로 사용
+        self.revalidated = 0   # 조건부 요청 → 304, 저장본 사용
+        self.fetched = 0       # 네트워크로 받음
+        self.misses = 0        # replay 모드에서 없음
+        self.stored = 0
+        self.evicted = 0
+
+    def add(self, name):
+        with self._lock:
+            setattr(self, name, getattr(self, name) + 1)
+
+    def report(self):
+        return {
+            "hits": self.hits,
+            "revalidated": self.revalidated,
+            "fetched": self.fetched,
+            "misses": self.misses,
+            "stored": self.stored,
+            "evicted": self.evicted,
+        }
+
+
+class ResponseCache:
+    """응답 본문 + 메타데이터 파일 저장소 (여러 스레드에서 동시에 씀)"""
+
+    def __init__(self, root, max_bytes=512 * 1024 ** 2):
+        self.root = root
+        self.max_bytes = max_bytes
+        self.stats = CacheStats()
+        self._lock = threading.Lock()
+        os.makedirs(root, exist_ok=True)
+        # 키 → (본문 + 메타 바이트 수), 시작할 때 한 번 훑음
+        self._sizes = {}
+        for dirpath, _, filenames in os.walk(root):
+            for name in filenames:
+                if name.endswith(".body"):
+                    key = name[:-5]
+                    self._sizes[key] = self._entry_size(key)
+
+    def _paths(self, key):
+        folder = os.path.join(self.root, key[:2])
+        return os.path.join(folder, key + ".body"), os.path.join(folder, key + ".json")
+
+    def _entry_size(self, key):
+        size = 0
+        for path in self._paths(key):
+            try:
+                size += os.path.getsize(path)
+            except OSError:
+                pass
+        return size
+
+    @property
+    def total_bytes(self):
+        with self._lock:
+            return sum(self._sizes.values())
+
+    def get(self, key):
+        """(메타데이터, 본문) 또는 None, 읽으면 최근 사용으로 표시"""
+        body_path, meta_path = self._paths(key)
+        try:
+            with open(meta_path, encoding="utf-8") as f:
+                meta = json.load(f)
+            with open(body_path, "rb") as f:
+                body = f.read()
+            os.utime(body_path)
+        except (OSError, ValueError):
+            return None
+        return meta, body
+
+    def touch(self, key, meta):
+        """재검증 성공: 저장 시각만 갱신"""
+        meta = dict(meta, stored_at=time.time())
+        _, meta_path = self._paths(key)
+        self._write(meta_path, json.dumps(meta, ensure_ascii=False).encode("utf-8"))
+        return meta
+
+    def put(self, key, meta, body):
+        body_path, meta_path = self._paths(key)
+        os.makedirs(os.path.dirname(body_path), exist_ok=True)
+        # 본문을 먼저 쓰고 메타를 나중에 (메타가 있으면 본문도 완전함)
+        self._write(body_path, body)
+        self._write(meta_path, json.dumps(dict(meta, stored_at=time.time()), ensure_ascii=False).encode("utf-8"))
+        self.stats.add("stored")
+        with self._lock:
+            self._sizes[key] = self._entry_size(key)
+        self.evict()
+
+    def _write(self, path, data):
+        tmp_path = f"{path}.{threading.get_ident()}.tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+
+    def _last_used(self, key):
+        try:
+            return os.path.getmtime(self._paths(key)[0])
+        except OSError:
+            return 0
+
+    def evict(self):
+        """총 크기가 max_bytes 이하가 될 때까지 가장 오래 쓰지 않은 응답 삭제"""
+        with self._lock:
+            total = sum(self._sizes.values())
+            if total <= self.max_bytes:
+                return
+            for key in sorted(self._sizes, key=self._last_used):
+                if total <= self.max_bytes:
+                    break
+                for path in self._paths(key):
+                    try:
+                        os.remove(path)
+                    except OSError:
+                        pass
+                total -= self._sizes.pop(key)
+                self.stats.add("evicted")
+
+
+class CachedResponse:
+    """저장된 응답 (requests.Response에서 FirestoreFetcher가 쓰는 부분만)"""
+
+    def __init__(self, meta, body):
+        self.status_code = meta.get("status", 200)
+        self.headers = CaseInsensitiveDict(meta.get("headers", {}))
+        self.url = meta.get("url")
+        self.content = body
+        self.from_cache = True
+
+    @property
+    def text(self):
+        return self.content.decode("utf-8")
+
+    def json(self):
+        return json.loads(self.content)
+
+    def iter_content(self, chunk_size=1):
+        for start in range(0, len(self.content), chunk_size):
+            yield self.content[start:start + chunk_size]
+
+    def close(self):
+        pass
+
+
+class RecordingResponse:
+    """
+    스트리밍 응답을 넘겨주면서 본문을 모아 두었다가 끝까지 읽으면 캐시에 저장
+    (iter_content 외의 속성은 원래 응답 그대로)
+    """
+
+    def __init__(self, response, on_complete):
+        self._response = response
+        self._on_complete = on_complete
+
+    def __getattr__(self, name):
+        return getattr(self._response, name)
+
+    def iter_content(self, chunk_size=1):
+        chunks = []
+        for chunk in self._response.iter_content(chunk_size):
+            chunks.append(chunk)
+            yield chunk
+        self._on_complete(b"".join(chunks))
+
+
+class CachedSession:
+    """
+    requests.Session 대신 FirestoreFetcher에 넘기는 캐시 세션 (request()만 사용)
+
+    session = CachedSession(make_session(), ResponseCache(data_path("http_cache")), mode="auto", ttl=3600)
+    fetcher = FirestoreFetcher(base_url, session=session)
+    """
+
+    def __init__(self, session, cache, mode="auto", ttl=3600):
+        if mode not in CACHE_MODES:
+            raise ValueError(f"캐시 모드는 {CACHE_MODES} 중 하나여야 합니다: {mode!r}")
+        self.session = session
+        self.cache = cache
+        self.mode = mode
+        self.ttl = ttl
+
+    @property
+    def stats(self):
+        return self.cache.stats
+
+    def request(self, method, url, params=None, json=None, stream=False, **kwargs):
+        if self.mode == "off":
+            return self.session.request(method, url, params=params, json=json, stream=stream, **kwargs)
+
+        key = request_key(method, url, params, json)
+        cached = self.cache.get(key) if self.mode != "record" else None
+
+        headers = dict(kwargs.pop("headers", None) or {})
+        if cached is not None:
+            meta, body = cached
+            if self.mode == "replay" or time.time() - meta.get("stored_at", 0) < self.ttl:
+                self.stats.add("hits")
+                return CachedResponse(meta, body)
+            # 오래된 응답: 검증자가 있으면 조건부 요청
+            validators = meta.get("headers", {})
+            if "ETag" in validators:
+                headers["If-None-Match"] = validators["ETag"]
+            if "Last-Modified" in validators:
+                headers["If-Modified-Since"] = validators["Last-Modified"]
+        elif self.mode == "replay":
+            self.stats.add("misses")
+            raise CacheMissError(method, url)
+
+        response = self.session.request(method, url, params=params, json=json, stream=stream,
+                                        headers=headers or None, **kwargs)
+        if response.status_code == 304 and cached is not None:
+            response.close()
+            self.stats.add("revalidated")
+            return CachedResponse(self.cache.touch(key, cached[0]), cached[1])
+
+        self.stats.add("fetched")
+        if response.status_code != 200:
+            return response
+
+        meta = {
+            "method": method.upper(),
+            "url": url,
+            "params": {str(k): str(v) for k, v in (params or {}).items()},
+            "status": 200,
+            "headers": {name: response.headers[name] for name in VALIDATORS + ("Content-Type",)
+                        if name in response.headers},
+        }
+        if stream:
+            return RecordingResponse(response, lambda body: self.cache.put(key, meta, body))
+        self.cache.put(key, meta, response.content)
+        return response
@@ -0,0 +1,347 @@
+"""
+Firestore REST 문서 디코더
+
+- decode_value: 모든 Firestore 값 타입을 재귀적으로 Python 값으로 변환
+  (string, integer, double, boolean, null, timestamp, reference, geoPoint, bytes, map, array)
+- iter_page_stream: 페이지 JSON을 바이트 조각 단위로 읽으며 문서를 하나씩 꺼냄
+  (응답 전체를 response.json()으로 한 번에 파싱하지 않음)
+- PersonMovieColumns: 영화인→영화 관계 행을 컬럼별 버퍼에 바로 쌓음
+  (행마다 dict를 만들지 않고 DataFrame으로 넘김, add_document는 Firestore 문서에서 바로 읽어
+  영화인/배역 dict도 만들지 않음)
+"""
+import codecs
+import json
+
+import pandas as pd
+
+# ===========================
+# 값 디코딩
+# ===========================
+
+
+def _decode_map(value):
+    return {k: decode_value(v) for k, v in value.get("fields", {}).items()}
+
+
+def _decode_array(value):
+    return [decode_value(v) for v in value.get("values", [])]
+
+
+_DECODERS = {
+    "stringValue": lambda v: v,
+    "integerValue": int,
+    "doubleValue": float,
+    "booleanValue": bool,
+    "nullValue": lambda v: None,
+    "timestampValue": lambda v: v,
+    "referenceValue": lambda v: v,
+    "bytesValue": lambda v: v,
+    "geoPointValue": lambda v: {
+        "latitude": v.get("latitude", 0.0),
+        "longitude": v.get("longitude", 0.0),
+    },
+    "mapValue": _decode_map,
+    "arrayValue": _decode_array,
+}
+
+
+def decode_value(value):
+    """
+    Firestore 값 하나를 Python 값으로 변환
+    예: {"arrayValue": {"values": [{"stringValue": "기생충"}]}} → ["기생충"]
+    """
+    for type_name, raw in value.items():
+        decoder = _DECODERS.get(type_name)
+        if decoder is not None:
+            return decoder(raw)
+    return None
+
+
+def decode_document(doc):
+    """
+    Firestore 문서를 Python dict로 변환 (fields가 없으면 빈 dict)
+    """
+    return {k: decode_value(v) for k, v in doc.get("fields", {}).items()}
+
+
+# ===========================
+# 페이지 JSON 스트리밍 파서
+# ===========================
+
+_WHITESPACE = " \t\n\r"
+
+
+class _NeedMoreData(Exception):
+    pass
+
+
+class PageStreamParser:
+    """
+    {"documents": [...], "nextPageToken": "..."} 형태의 응답을
+    조각(chunk) 단위로 받아 문서 객체를 하나씩 돌려줌
+
+    사용:
+        parser = PageStreamParser()
+        for chunk in response.iter_content(65536):
+            for doc in parser.feed(chunk):
+                ...
+        parser.close()
+        parser.next_page_token
+    """
+
+    def __init__(self):
+        self._decoder = json.JSONDecoder()
+        self._utf8 = codecs.getincrementaldecoder("utf-8")()
+        self._buf = ""
+        self._pos = 0
+        # start → key → colon → value / doc_sep / doc → (key_sep) → ... → end
+        self._state = "start"
+        self._key = None
+        self.next_page_token = None
+        self.extra = {}
+
+    def _skip_ws(self):
+        buf, pos = self._buf, self._pos
+        while pos < len(buf) and buf[pos] in _WHITESPACE:
+            pos += 1
+        self._pos = pos
+        if pos >= len(buf):
+            raise _NeedMoreData()
+        return buf[pos]
+
+    def _expect(self, char):
+        if self._skip_ws() != char:
+            raise ValueError(f"잘못된 페이지 JSON: '{char}' 위치에 '{self._buf[self._pos]}'")
+        self._pos += 1
+
+    def _decode_next(self):
+        self._skip_ws()
+        try:
+            value, end = self._decoder.raw_decode(self._buf, self._pos)
+        except json.JSONDecodeError:
+            raise _NeedMoreData()
+        # 버퍼 끝에서 끊긴 숫자/리터럴은 다음 조각을 봐야 확정됨
+        if end >= len(self._buf) and not isinstance(value, (dict, list, str)):
+            raise _NeedMoreData()
+        self._pos = end
+        return value
+
+    def _step(self):
+        state = self._state
+
+        if state == "start":
+            self._expect("{")
+            self._state = "key_or_end"
+
+        elif state == "key_or_end":
+            if self._skip_ws() == "}":
+                self._pos += 1
+                self._state = "end"
+            else:
+                self._state = "key"
+
+        elif state == "key":
+            self._key = self._decode_next()
+            self._state = "colon"
+
+        elif state == "colon":
+            self._expect(":")
+            self._state = "docs_open" if self._key == "documents" else "value"
+
+        elif state == "value":
+            value = self._decode_next()
+            if self._key == "nextPageToken":
+                self.next_page_token = value
+            else:
+                self.extra[self._key] = value
+            self._state = "key_sep"
+
+        elif state == "docs_open":
+            self._expect("[")
+            self._state = "doc_or_close"
+
+        elif state == "doc_or_close":
+            if self._skip_ws() == "]":
+                self._pos += 1
+                self._state = "key_sep"
+            else:
+                self._state = "doc"
+
+        elif state == "doc":
+            doc = self._decode_next()
+            self._state = "doc_sep"
+            return doc
+
+        elif state == "doc_sep":
+            char = self._skip_ws()
+            self._pos += 1
+            if char == ",":
+                self._state = "doc"
+            elif char == "]":
+                self._state = "key_sep"
+            else:
+                raise ValueError(f"잘못된 페이지 JSON: documents 배열 구분자 '{char}'")
+
+        elif state == "key_sep":
+            char = self._skip_ws()
+            self._pos += 1
+            if char == ",":
+                self._state = "key"
+            elif char == "}":
+                self._state = "end"
+            else:
+                raise ValueError(f"잘못된 페이지 JSON: 객체 구분자 '{char}'")
+
+        elif state == "end":
+            raise _NeedMoreData()
+
+        return None
+
+    def feed(self, chunk):
+        """바이트(또는 문자열) 조각을 넣고, 완성된 문서들을 yield"""
+        text = self._utf8.decode(chunk) if isinstance(chunk, bytes) else chunk
+        if self._pos > 65536 and self._pos > len(self._buf) // 2:
+            # 이미 소비한 앞부분은 버림
+            self._buf = self._buf[self._pos:]
+            self._pos = 0
+        self._buf += text
+
+        while True:
+            checkpoint = (self._pos, self._state)
+            try:
+                doc = self._step()
+            except _NeedMoreData:
+                self._pos, self._state = checkpoint
+                return
+            if doc is not None:
+                yield doc
+
+    def close(self):
+        if self._state != "end":
+            raise ValueError("페이지 JSON이 중간에 끊겼습니다.")
+
+
+def iter_page_stream(chunks, parser=None):
+    """
+    바이트 조각 제너레이터에서 문서를 하나씩 yield
+    끝나면 parser.next_page_token에 다음 페이지 토큰이 들어 있음
+    """
+    parser = parser or PageStreamParser()
+    for chunk in chunks:
+        yield from parser.feed(chunk)
+    parser.close()
+
+
+# ===========================
+# 영화인-영화 관계 컬럼 버퍼
+# ===========================
+
+COLUMNS = ["person_id", "person_name", "person_role", "movie_id", "movie_title", "character_name"]
+
+
+def _field(fields, name, default):
+    """Firestore fields에서 값 하나 (없거나 null이면 default)"""
+    value = fields.get(name)
+    value = None if value is None else decode_value(value)
+    return default if value is None else value
+
+
+def _get(person, name, default):
+    """디코딩된 dict에서 값 하나 (없거나 null이면 default, 기존 파서는 null 필드를 버렸으므로 같은 결과)"""
+    value = person.get(name)
+    return default if value is None else value
+
+
+class PersonMovieColumns:
+    """
+    영화인→영화 관계를 컬럼별 리스트에 바로 쌓는 버퍼
+    characters가 있으면 characters, 없으면 filmo를 사용 (기존 규칙 그대로)
+    """
+
+    def __init__(self):
+        self.person_id = []
+        self.person_name = []
+        self.person_role = []
+        self.movie_id = []
+        self.movie_title = []
+        self.character_name = []
+
+    def __len__(self):
+        return len(self.movie_title)
+
+    def _append(self, count, person_id, person_name, person_role):
+        self.person_id.extend([person_id] * count)
+        self.person_name.extend([person_name] * count)
+        self.person_role.extend([person_role] * count)
+
+    def add_document(self, doc):
+        """
+        Firestore 문서 하나의 관계 행을 값 트리에서 바로 추가 (decode_document + add_person과 같은 결과)
+        characters/filmo가 배열이 아닌 문서만 디코딩해서 add_person으로 처리
+        """
+        fields = doc.get("fields", {})
+        characters = fields.get("characters")
+        filmo = fields.get("filmo")
+        if (characters is not None and "arrayValue" not in characters) or \
+                (filmo is not None and "arrayValue" not in filmo):
+            self.add_person(decode_document(doc))
+            return
+
+        person_id = _field(fields, "id", "Unknown")
+        person_name = _field(fields, "name", "Unknown")
+        person_role = _field(fields, "repRoleNm", "기타")
+        characters = characters["arrayValue"].get("values") if characters is not None else None
+
+        if not characters:
+            values = filmo["arrayValue"].get("values", []) if filmo is not None else []
+            titles = [t for t in map(decode_value, values) if t]
+            self.movie_title.extend(titles)
+            self.movie_id.extend([None] * len(titles))
+            self.character_name.extend([None] * len(titles))
+            self._append(len(titles), person_id, person_name, person_role)
+            return
+
+        count = 0
+        for char in characters:
+            char = char.get("mapValue")
+            if char is None:
+                continue
+            char = char.get("fields", {})
+            movie_title = _field(char, "movieTitle", "Unknown")
+            if movie_title and movie_title != "Unknown":
+                self.movie_title.append(movie_title)
+                self.movie_id.append(_field(char, "movieId", None))
+                self.character_name.append(_field(char, "characterName", None))
+                count += 1
+        self._append(count, person_id, person_name, person_role)
+
+    def add_person(self, person):
+        """디코딩된 영화인 dict 하나의 관계 행을 추가"""
+        person_id = _get(person, "id", "Unknown")
+        person_name = _get(person, "name", "Unknown")
+        person_role = _get(person, "repRoleNm", "기타")
+
+        characters = person.get("characters") or []
+
+        if not characters:
+            titles = [t for t in person.get("filmo") or [] if t]
+            self.movie_title.extend(titles)
+            self.movie_id.extend([None] * len(titles))
+            self.character_name.extend([None] * len(titles))
+            self._append(len(titles), person_id, person_name, person_role)
+            return
+
+        count = 0
+        for char in characters:
+            if not isinstance(char, dict):
+                continue
+            movie_title = _get(char, "movieTitle", "Unknown")
+            if movie_title and movie_title != "Unknown":
+                self.movie_title.append(movie_title)
+                self.movie_id.append(char.get("movieId", None))
+                self.character_name.append(char.get("characterName", None))
+                count += 1
+        self._append(count, person_id, person_name, person_role)
+
+    def to_frame(self):
+        return pd.DataFrame({name: getattr(self, name) for name in COLUMNS}, columns=COLUMNS)
@@ -0,0 +1,379 @@
+"""
+Firestore REST API 페이지 단위 가져오기 엔진
+
+- nextPageToken을 따라가며 컬렉션 전체를 pageSize 단위로 가져옴
+- 하나의 커넥션 풀(requests.Session)을 재사용
+- 429/5xx, 네트워크 오류는 지수 백오프로 재시도
+- 여러 컬렉션 또는 문서 키 범위(partition)를 동시에 가져옴
+- 페이지 응답을 스트리밍으로 읽으며 문서가 완성되는 대로 넘겨줌
+  (전체 응답을 response.json()으로 한 번에 파싱하지 않음)
+
+base_url만 바꾸면 로컬 HTTP 서버(스탠드인)를 대상으로도 그대로 동작함
+"""
+import queue
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from firestore_decode import PageStreamParser
+
+DEFAULT_PAGE_SIZE = 300
+STREAM_CHUNK_SIZE = 64 * 1024
+STREAM_BATCH_SIZE = 100  # 스트리밍 중 한 번에 넘겨줄 문서 수
+RETRY_STATUS = {429, 500, 502, 503, 504}
+
+
+class FirestoreFetchError(Exception):
+    """재시도 후에도 Firestore 요청이 실패했을 때"""
+
+    def __init__(self, status_code, text):
+        super().__init__(f"Firestore 요청 실패 ({status_code}): {text[:200]}")
+        self.status_code = status_code
+        self.text = text
+
+
+class FetchStats:
+    """
+    가져오기 통계 (페이지/문서/바이트 수, 처리 속도)
+    여러 스레드에서 동시에 갱신됨
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.pages = 0
+        self.documents = 0
+        self.bytes = 0
+        self.retries = 0
+        self.started_at = time.perf_counter()
+
+    def add_page(self, num_documents, num_bytes):
+        with self._lock:
+            self.pages += 1
+            self.documents += num_documents
+            self.bytes += num_bytes
+
+    def add_retry(self):
+        with self._lock:
+            self.retries += 1
+
+    def report(self):
+        elapsed = max(time.perf_counter() - self.started_at, 1e-9)
+        return {
+            "pages": self.pages,
+            "documents": self.documents,
+            "bytes": self.bytes,
+            "retries": self.retries,
+            "elapsed_sec": round(elapsed, 3),
+            "pages_per_sec": round(self.pages / elapsed, 2),
+            "documents_per_sec": round(self.documents / elapsed, 2),
+        }
+
+
+def make_session(pool_size=8):
+    """커넥션 풀을 가진 세션 생성 (TLS 연결 재사용)"""
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
+class FirestoreFetcher:
+    """
+    Firestore REST 컬렉션 가져오기
+
+    base_url: .../v1/projects/{project}/databases/(default)/documents
+    """
+
+    def __init__(self, base_url, page_size=DEFAULT_PAGE_SIZE, session=None,
+                 max_workers=4, max_retries=5, backoff=0.5, timeout=30):
+        self.base_url = base_url.rstrip("/")
+        self.page_size = page_size
+        self.max_workers = max_workers
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.timeout = timeout
+        self.session = session or make_session(pool_size=max(max_workers, 1) * 2)
+        self.stats = FetchStats()
+
+        # 문서 이름(referenceValue)에 쓰이는 경로: projects/.../documents
+        marker = "/v1/"
+        self.documents_path = (
+            self.base_url.split(marker, 1)[1] if marker in self.base_url else self.base_url
+        )
+
+    # ===========================
+    # 저수준 요청 (재시도 포함)
+    # ===========================
+
+    def _request(self, method, url, params=None, body=None, stream=False):
+        attempt = 0
+        while True:
+            try:
+                response = self.session.request(
+                    method, url, params=params, json=body, timeout=self.timeout, stream=stream
+                )
+            except (requests.ConnectionError, requests.Timeout) as e:
+                if attempt >= self.max_retries:
+                    raise FirestoreFetchError(-1, str(e)) from e
+            else:
+                if response.status_code == 200:
+                    return response
+                if response.status_code not in RETRY_STATUS or attempt >= self.max_retries:
+                    raise FirestoreFetchError(response.status_code, response.text)
+
+                retry_after = response.headers.get("Retry-After")
+                if retry_after and retry_after.isdigit():
+                    self.stats.add_retry()
+                    attempt += 1
+                    time.sleep(int(retry_after))
+                    continue
+
+            self.stats.add_retry()
+            # 지수 백오프 + 지터
+            time.sleep(self.backoff * (2 ** attempt) * (0.5 + random.random()))
+            attempt += 1
+
+    # ===========================
+    # 컬렉션 전체 (nextPageToken)
+    # ===========================
+
+    def _stream_documents(self, url, params):
+        """
+        한 페이지 응답을 스트리밍으로 읽으며 문서 묶음을 yield
+        중간에 연결이 끊기면 이미 넘겨준 문서 수만큼 건너뛰며 다시 요청
+        반환값(StopIteration.value): nextPageToken
+        """
+        delivered, attempt = 0, 0
+        while True:
+            response = self._request("GET", url, params=params, stream=True)
+            parser = PageStreamParser()
+            seen, num_bytes, batch = 0, 0, []
+            try:
+                for chunk in response.iter_content(STREAM_CHUNK_SIZE):
+                    num_bytes += len(chunk)
+                    for doc in parser.feed(chunk):
+                        seen += 1
+                        if seen <= delivered:
+                            continue
+                        batch.append(doc)
+                        if len(batch) >= STREAM_BATCH_SIZE:
+                            delivered += len(batch)
+                            yield batch
+                            batch = []
+                parser.close()
+            except (requests.ConnectionError, requests.exceptions.ChunkedEncodingError) as e:
+                response.close()
+                if batch:
+                    delivered += len(batch)
+                    yield batch
+                if attempt >= self.max_retries:
+                    raise FirestoreFetchError(-1, str(e)) from e
+                self.stats.add_retry()
+                time.sleep(self.backoff * (2 ** attempt) * (0.5 + random.random()))
+                attempt += 1
+                continue
+
+            if batch:
+                yield batch
+            self.stats.add_page(seen, num_bytes)
+            return parser.next_page_token
+
+    def iter_pages(self, collection_name, params=None):
+        """
+        컬렉션의 문서를 도착하는 대로 문서 리스트 단위로 yield
+        nextPageToken이 없을 때까지 계속 따라감
+        """
+        url = f"{self.base_url}/{collection_name}"
+        query = {"pageSize": self.page_size}
+        if params:
+            query.update(params)
+
+        while True:
+            token = yield from self._stream_documents(url, query)
+            if not token:
+                break
+            query["pageToken"] = token
+
+    def iter_documents(self, collection_name, params=None):
+        """문서 하나씩 yield (내부적으로는 페이지 단위 요청)"""
+        for documents in self.iter_pages(collection_name, params):
+            yield from documents
+
+    # ===========================
+    # 증분 가져오기용 (이름 + updateTime, batchGet)
+    # ===========================
+
+    def list_versions(self, collection_name, mask_field="id"):
+        """
+        컬렉션 문서의 {name: updateTime}만 가져옴
+        mask로 작은 필드 하나만 받아 본문 파싱 비용 없이 변경 여부를 판단
+        """
+        versions = {}
+        for documents in self.iter_pages(collection_name, {"mask.fieldPaths": mask_field}):
+            for doc in documents:
+                versions[doc["name"]] = doc.get("updateTime")
+        return versions
+
+    def batch_get(self, names, chunk_size=100):
+        """
+        문서 이름 목록을 batchGet으로 chunk_size씩 동시에 가져옴
+        반환: 문서 리스트 제너레이터 (없어진 문서는 건너뜀)
+        """
+        url = f"{self.base_url}:batchGet"
+
+        def fetch_chunk(chunk):
+            response = self._request("POST", url, body={"documents": chunk})
+            documents = [item["found"] for item in response.json() if "found" in item]
+            self.stats.add_page(len(documents), len(response.content))
+            if documents:
+                yield documents
+
+        chunks = [list(names[i:i + chunk_size]) for i in range(0, len(names), chunk_size)]
+        jobs = {i: (lambda chunk=chunk: fetch_chunk(chunk)) for i, chunk in enumerate(chunks)}
+        for _, documents in self.iter_concurrent(jobs):
+            yield documents
+
+    # ===========================
+    # 키 범위 분할 (partitionQuery + runQuery)
+    # ===========================
+
+    def _name_query(self, collection_name):
+        return {
+            "from": [{"collectionId": collection_name}],
+            "orderBy": [{"field": {"fieldPath": "__name__"}, "direction": "ASCENDING"}],
+        }
+
+    def split_partitions(self, collection_name, count):
+        """
+        partitionQuery로 컬렉션을 count개의 키 범위로 나눔
+        반환: [(start_name, end_name), ...]  (None은 처음/끝)
+        """
+        if count <= 1:
+            return [(None, None)]
+
+        url = f"{self.base_url}:partitionQuery"
+        body = {
+            "structuredQuery": self._name_query(collection_name),
+            "partitionCount": count - 1,
+        }
+
+        cursors = []
+        while True:
+            result = self._request("POST", url, body=body).json()
+            for cursor in result.get("partitions", []):
+                values = cursor.get("values", [])
+                if values and "referenceValue" in values[0]:
+                    cursors.append(values[0]["referenceValue"])
+            token = result.get("nextPageToken")
+            if not token:
+                break
+            body["pageToken"] = token
+
+        cursors.sort()
+        bounds = [None] + cursors + [None]
+        return list(zip(bounds[:-1], bounds[1:]))
+
+    def iter_range_pages(self, collection_name, start=None, end=None):
+        """
+        문서 이름 기준 [start, end) 범위를 pageSize씩 runQuery로 가져옴
+        마지막 문서 이름을 커서로 삼아 다음 페이지를 요청
+        """
+        url = f"{self.base_url}:runQuery"
+        cursor, inclusive = start, True
+
+        while True:
+            query = self._name_query(collection_name)
+            query["limit"] = self.page_size
+            if cursor is not None:
+                query["startAt"] = {"values": [{"referenceValue": cursor}], "before": inclusive}
+            if end is not None:
+                query["endAt"] = {"values": [{"referenceValue": end}], "before": True}
+
+            response = self._request("POST", url, body={"structuredQuery": query})
+            documents = [item["document"] for item in response.json() if "document" in item]
+            self.stats.add_page(len(documents), len(response.content))
+
+            if documents:
+                yield documents
+            if len(documents) < self.page_size:
+                break
+            cursor, inclusive = documents[-1]["name"], False
+
+    # ===========================
+    # 동시 가져오기
+    # ===========================
+
+    def iter_concurrent(self, jobs, max_buffered_pages=16):
+        """
+        여러 작업을 스레드 풀에서 동시에 실행하고 페이지가 도착하는 순서대로 yield
+
+        jobs: {key: 페이지 제너레이터를 만드는 함수}
+        반환: (key, documents) 제너레이터
+        """
+        pages = queue.Queue(maxsize=max_buffered_pages)
+        done = object()
+        stop = threading.Event()
+
+        def run(key, make_pages):
+            try:
+                for documents in make_pages():
+                    if stop.is_set():
+                        return
+                    pages.put((key, documents))
+            except Exception as e:
+                pages.put((key, e))
+            finally:
+                pages.put((key, done))
+
+        if not jobs:
+            return
+
+        workers = max(1, min(self.max_workers, len(jobs)))
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            for key, make_pages in jobs.items():
+                pool.submit(run, key, make_pages)
+
+            remaining = len(jobs)
+            try:
+                while remaining:
+                    key, item = pages.get()
+                    if item is done:
+                        remaining -= 1
+                    elif isinstance(item, Exception):
+                        raise item
+                    else:
+                        yield key, item
+            finally:
+                # 소비자가 중간에 멈추거나 오류가 나면 남은 작업을 정리
+                stop.set()
+                while remaining:
+                    _, item = pages.get()
+                    if item is done:
+                        remaining -= 1
+
+    def fetch_collections(self, collection_names):
+        """여러 컬렉션을 동시에 가져옴 → (collection_name, documents)"""
+        jobs = {
+            name: (lambda name=name: self.iter_pages(name))
+            for name in collection_names
+        }
+        return self.iter_concurrent(jobs)
+
+    def fetch_partitioned(self, collection_name, partitions):
+        """
+        한 컬렉션을 키 범위 partitions개로 나눠 동시에 가져옴 → (range, documents)
+        """
+        ranges = self.split_partitions(collection_name, partitions)
+        if len(ranges) == 1:
+            jobs = {ranges[0]: lambda: self.iter_pages(collection_name)}
+        else:
+            jobs = {
+                (start, end): (lambda s=start, e=end: self.iter_range_pages(collection_name, s, e))
+                for start, end in ranges
+            }
+        return self.iter_concurrent(jobs)
@@ -0,0 +1,210 @@
+"""
+Firestore 일괄 업로드 엔진
+
+- 문서를 최대 500개(Firestore batch 한도)씩 묶어 batch.commit() 한 번으로 씀
+- 여러 batch를 제한된 스레드 풀에서 동시에 commit (대기 중인 batch 수도 제한해 메모리 일정)
+- 실패한 batch는 지수 백오프로 통째로 다시 commit (set은 멱등이라 안전)
+- 문서/초 등 처리 통계
+- 삭제도 같은 batch에 섞어 보낼 수 있음, on_commit으로 commit이 끝난 문서를 알려줌 (진행 기록용)
+
+client는 firestore.client()와 같은 모양이면 됨 (batch(), collection().document())
+→ FIRESTORE_EMULATOR_HOST로 에뮬레이터에 붙이거나 가짜 클라이언트(bench/firestore_fake.py)로 시험 가능
+"""
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+MAX_BATCH_SIZE = 500                   # Firestore batch 하나의 최대 쓰기 수
+MAX_BATCH_BYTES = 9 * 1024 * 1024      # 요청 크기 한도(10 MiB)보다 조금 작게
+
+
+def _retryable_errors():
+    """재시도할 예외 (google-api-core가 있으면 일시적 오류 종류 포함)"""
+    errors = [ConnectionError, TimeoutError]
+    try:
+        from google.api_core import exceptions
+    except ImportError:
+        return tuple(errors)
+    return tuple(errors + [
+        exceptions.ServiceUnavailable, exceptions.DeadlineExceeded, exceptions.Aborted,
+        exceptions.TooManyRequests, exceptions.ResourceExhausted, exceptions.InternalServerError,
+    ])
+
+
+class FirestoreUploadError(Exception):
+    """재시도 후에도 commit하지 못한 batch가 있을 때"""
+
+    def __init__(self, failed_ids, cause):
+        super().__init__(f"Firestore 업로드 실패: 문서 {len(failed_ids)}개 ({cause})")
+        self.failed_ids = failed_ids
+        self.cause = cause
+
+
+class UploadStats:
+    """
+    업로드 통계 (batch/문서 수, 재시도, 처리 속도)
+    여러 스레드에서 동시에 갱신됨
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.batches = 0
+        self.documents = 0
+        self.bytes = 0
+        self.retries = 0
+        self.failed = 0
+        self.started_at = time.perf_counter()
+
+    def add_batch(self, num_documents, num_bytes):
+        with self._lock:
+            self.batches += 1
+            self.documents += num_documents
+            self.bytes += num_bytes
+
+    def add_retry(self):
+        with self._lock:
+            self.retries += 1
+
+    def add_failed(self, num_documents):
+        with self._lock:
+            self.failed += num_documents
+
+    def report(self):
+        elapsed = max(time.perf_counter() - self.started_at, 1e-9)
+        return {
+            "batches": self.batches,
+            "documents": self.documents,
+            "bytes": self.bytes,
+            "retries": self.retries,
+            "failed": self.failed,
+            "elapsed_sec": round(elapsed, 3),
+            "documents_per_sec": round(self.documents / elapsed, 2),
+        }
+
+
+class BatchUploader:
+    """
+    컬렉션 하나에 문서를 batch로 묶어 병렬 업로드
+
+    with BatchUploader(db, "egoGraphs") as uploader:
+        for doc_id, data in docs:
+            uploader.add(doc_id, data)
+    print(uploader.stats.report())
+
+    with 블록을 빠져나가면 남은 batch를 commit하고 모두 끝날 때까지 기다림
+    재시도 후에도 실패한 batch가 있으면 FirestoreUploadError (failed_ids에 문서 id)
+    """
+
+    def __init__(self, client, collection, batch_size=MAX_BATCH_SIZE, max_workers=4,
+                 max_pending=None, max_retries=5, backoff=0.5, max_batch_bytes=MAX_BATCH_BYTES,
+                 on_commit=None):
+        if not 1 <= batch_size <= MAX_BATCH_SIZE:
+            raise ValueError(f"batch_size는 1~{MAX_BATCH_SIZE} 사이여야 합니다: {batch_size}")
+        self.client = client
+        self.collection = client.collection(collection)
+        self.batch_size = batch_size
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.max_batch_bytes = max_batch_bytes
+        # commit 성공 시 [(doc_id, tag), ...]로 호출 (업로드 스레드에서 불림)
+        self.on_commit = on_commit
+        self.stats = UploadStats()
+        self.retryable = _retryable_errors()
+
+        self._executor = ThreadPoolExecutor(max_workers=max_workers)
+        # 실행 중 + 대기 중인 batch 수 제한 (넘으면 add()가 기다림)
+        self._slots = threading.BoundedSemaphore(max_pending or max_workers * 2)
+        self._futures = []
+        self._items = []
+        self._bytes = 0
+        self._failed_ids = []
+        self._first_error = None
+        self._lock = threading.Lock()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close(raise_errors=exc_type is None)
+        return False
+
+    # ===========================
+    # 문서 추가
+    # ===========================
+
+    def add(self, doc_id, data, size=0, tag=None):
+        """
+        문서 하나 추가 (size: 대략적인 바이트 수, 주면 batch 요청 크기 한도를 지킴)
+        tag: commit 후 on_commit에 문서 id와 함께 넘길 값
+        """
+        if self._items and (len(self._items) >= self.batch_size or self._bytes + size > self.max_batch_bytes):
+            self.flush()
+        self._items.append((doc_id, data, tag))
+        self._bytes += size
+
+    def delete(self, doc_id, tag=None):
+        """문서 삭제 (같은 batch에 섞어 보냄)"""
+        self.add(doc_id, None, tag=tag)
+
+    def flush(self):
+        """모아둔 문서를 batch 하나로 commit 예약"""
+        if not self._items:
+            return
+        items, num_bytes = self._items, self._bytes
+        self._items, self._bytes = [], 0
+
+        self._slots.acquire()
+        future = self._executor.submit(self._commit, items, num_bytes)
+        future.add_done_callback(lambda _: self._slots.release())
+        self._futures.append(future)
+
+    def close(self, raise_errors=True):
+        """남은 문서를 commit하고 모든 batch가 끝날 때까지 기다림"""
+        self.flush()
+        for future in self._futures:
+            future.result()
+        self._futures = []
+        self._executor.shutdown(wait=True)
+        if raise_errors and self._failed_ids:
+            raise FirestoreUploadError(self._failed_ids, self._first_error)
+
+    # ===========================
+    # commit (재시도 포함)
+    # ===========================
+
+    def _commit(self, items, num_bytes):
+        attempt = 0
+        while True:
+            try:
+                batch = self.client.batch()
+                for doc_id, data, _ in items:
+                    if data is None:
+                        batch.delete(self.collection.document(doc_id))
+                    else:
+                        batch.set(self.collection.document(doc_id), data)
+                batch.commit()
+            except self.retryable as e:
+                if attempt >= self.max_retries:
+                    self._fail(items, e)
+                    return
+                self.stats.add_retry()
+                # 지수 백오프 + 지터
+                time.sleep(self.backoff * (2 ** attempt) * (0.5 + random.random()))
+                attempt += 1
+            except Exception as e:
+                # 재시도해도 소용없는 오류 (권한, 잘못된 데이터 등)
+                self._fail(items, e)
+                return
+            else:
+                self.stats.add_batch(len(items), num_bytes)
+                if self.on_commit is not None:
+                    self.on_commit([(doc_id, tag) for doc_id, _, tag in items])
+                return
+
+    def _fail(self, items, error):
+        self.stats.add_failed(len(items))
+        with self._lock:
+            self._failed_ids.extend(doc_id for doc_id, _, _ in items)
+            if self._first_error is None:
+                self._first_error = error
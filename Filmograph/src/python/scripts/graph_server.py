@@ -0,0 +1,459 @@
+"""
+협업 네트워크 조회 서버 (asyncio HTTP, 로컬용)
+
+05_export_ego.py처럼 모든 영화인의 ego 문서를 미리 만들지 않고, Step 2/3 결과 파일을
+한 번 memory map으로 열어 두고 요청이 올 때 계산함
+
+- GET /ego/{id}?radius=1&limit=100&schema=2
+  ego_to_json 본 문서와 같은 모양 (ego, label, nodes, links, schema/movies, meta)
+  radius=2면 이웃의 이웃까지, limit: ego를 뺀 노드 수 상한 (1단계 이웃은 weight 순, 2단계는 1단계 이웃과의 weight 합 순)
+  meta에 radius, truncated(상한 때문에 잘렸는지)가 더 있고 잘렸으면 totalLinkCount는 null
+- GET /neighbors/{id}?limit=50&offset=0: weight 내림차순 이웃 (노드 속성 + weight, 함께한 영화 최대 5편, total_movies)
+- GET /community/{id}?limit=100&offset=0: 커뮤니티 구성원 (PageRank 순, 중심성이 없으면 연결 수 순)
+- GET /stats: 그래프 크기, 캐시 적중률, 요청 수
+
+{id}는 ego 문서와 같은 영화인 id (KOBIS ID)
+응답은 compact JSON 바이트 그대로 LRU 캐시에 보관 (같은 요청은 계산/직렬화 없이 바로 보냄)
+캐시에 없는 요청은 스레드 풀에서 계산 (이벤트 루프는 그동안 다른 연결의 캐시 응답을 보냄),
+같은 요청이 동시에 여러 번 오면 한 번만 계산함
+
+사용법:
+    python graph_server.py                          # http://127.0.0.1:8765
+    python graph_server.py --port 9000 --cache-mb 256
+    curl "http://127.0.0.1:8765/ego/10000000?radius=2&limit=150"
+    python ../bench/bench_graph_server.py           # 부하 시험 (p50/p99, 초당 요청 수)
+"""
+import argparse
+import asyncio
+import json
+import os
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import parse_qsl, unquote, urlsplit
+
+import numpy as np
+
+from csr_graph import CSRGraph
+from ego_extract import TOP_K, ego_document
+from export_formats import SCHEMA_VERSIONS
+from node_table import NodeTable
+from paths import output_path
+
+HOST = os.getenv("GRAPH_SERVER_HOST", "127.0.0.1")
+PORT = int(os.getenv("GRAPH_SERVER_PORT", "8765"))
+CACHE_MB = int(os.getenv("GRAPH_SERVER_CACHE_MB", "128"))      # 응답 캐시 크기 (0이면 캐시 없음)
+WORKERS = int(os.getenv("GRAPH_SERVER_WORKERS", "4"))          # 계산 스레드 수
+MAX_LIMIT = int(os.getenv("GRAPH_SERVER_MAX_LIMIT", "1000"))   # limit 상한 (응답 크기 제한)
+
+NODES_PATH = output_path('network_with_community.nodes.arrow')
+ADJACENCY_PATH = output_path('network.adjacency.arrow')
+EDGES_PATH = output_path('network.edges.arrow')
+
+MOVIE_SAMPLE = 5   # /neighbors에서 링크마다 보여줄 영화 수 (network_data.json과 같음)
+
+
+class QueryError(Exception):
+    """잘못된 요청 (status: HTTP 상태 코드)"""
+
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+
+
+# ===========================
+# 조회
+# ===========================
+
+
+class GraphQueries:
+    """
+    memory map으로 연 그래프 + 노드 테이블에서 ego / 이웃 / 커뮤니티 조회
+    (읽기만 하므로 여러 스레드에서 동시에 불러도 됨)
+    """
+
+    def __init__(self, nodes_path=NODES_PATH, adjacency_path=ADJACENCY_PATH, edges_path=EDGES_PATH):
+        self.nodes = NodeTable.load(nodes_path)
+        self.graph = CSRGraph.load(adjacency_path, edges_path)
+        self._index = {str(pid): i for i, pid in enumerate(self.nodes.person_id.tolist())}
+
+        # 커뮤니티별 구성원: (커뮤니티, 중요도 내림차순) 정렬 + 커뮤니티 경계
+        self._community_order = self._community_bounds = None
+        if self.nodes.community is not None and len(self.nodes):
+            community = self.nodes.community.astype(np.int64)
+            importance = self.nodes.pagerank if self.nodes.pagerank is not None else self.graph.degree
+            self._community_order = np.lexsort((-importance, community))
+            self._community_bounds = np.searchsorted(community[self._community_order],
+                                                     np.arange(int(community.max()) + 2))
+
+    def node(self, person_id):
+        """영화인 id → 노드 번호 (없으면 404)"""
+        index = self._index.get(person_id)
+        if index is None:
+            raise QueryError(404, f"없는 영화인입니다: {person_id}")
+        return index
+
+    def ranked_neighbors(self, u):
+        """u의 이웃과 엣지 id (weight 내림차순, 같으면 노드 번호 순 - ego_groups와 같은 순위)"""
+        graph = self.graph
+        lo, hi = graph.indptr[u], graph.indptr[u + 1]
+        neighbors = graph.neighbors[lo:hi].astype(np.int64)
+        edges = graph.edge_ids[lo:hi]
+        order = np.lexsort((neighbors, -graph.weight[edges]))
+        return neighbors[order], edges[order]
+
+    def ego_members(self, ego, radius, limit):
+        """
+        (members 오름차순, 반경 안 전체 노드 수) - members는 ego + 최대 limit명
+        2단계 후보는 1단계 이웃 전체와의 weight 합이 큰 순 (같으면 노드 번호 순)
+        """
+        graph = self.graph
+        first, _ = self.ranked_neighbors(ego)
+        chosen = first[:limit]
+        total = len(first) + 1
+
+        if radius == 2:
+            offsets, _ = graph.slots(first)
+            candidates = graph.neighbors[offsets].astype(np.int64)
+            weights = graph.weight[graph.edge_ids[offsets]].astype(np.float64)
+            # ego 자신과 1단계 이웃은 제외
+            known = np.union1d(first, [ego])
+            position = np.searchsorted(known, candidates).clip(max=len(known) - 1)
+            outside = known[position] != candidates
+            second, inverse = np.unique(candidates[outside], return_inverse=True)
+            score = np.bincount(inverse.ravel(), weights=weights[outside], minlength=len(second))
+            total += len(second)
+            room = limit - len(chosen)
+            if room > 0:
+                chosen = np.concatenate([chosen, second[np.lexsort((second, -score))[:room]]])
+
+        return np.union1d(chosen, [ego]), total
+
+    def ego(self, person_id, radius=1, limit=TOP_K, schema=2):
+        """ego_to_json 본 문서와 같은 모양의 ego 네트워크 (이웃 limit명까지, 페이지 없음)"""
+        ego = self.node(person_id)
+        members, total = self.ego_members(ego, radius, limit)
+        edges = self.graph.subgraph_edges(members)
+        doc, _ = ego_document(self.graph, self.nodes, ego, members, edges, schema, top_k=0, page_size=0)
+        truncated = len(members) < total
+        doc["meta"].update(
+            radius=radius,
+            truncated=truncated,
+            totalNodeCount=total,
+            totalLinkCount=None if truncated else len(edges),
+        )
+        return doc
+
+    def neighbors(self, person_id, limit=50, offset=0):
+        """weight 내림차순 이웃 목록"""
+        u = self.node(person_id)
+        graph = self.graph
+        neighbors, edges = self.ranked_neighbors(u)
+        page_nodes, page_edges = neighbors[offset:offset + limit], edges[offset:offset + limit]
+
+        ptr, movie_ids = graph.edges_movie_ids(page_edges)
+        ptr = ptr.tolist()
+        items = []
+        for i, (v, e) in enumerate(zip(page_nodes.tolist(), page_edges.tolist())):
+            item = self.nodes.node_json(v)
+            item["weight"] = int(graph.weight[e])
+            item["movies"] = graph.movies[movie_ids[ptr[i]:min(ptr[i + 1], ptr[i] + MOVIE_SAMPLE)]].tolist()
+            item["total_movies"] = ptr[i + 1] - ptr[i]
+            items.append(item)
+        return {
+            "id": person_id,
+            "label": self.nodes.label[u],
+            "total": len(neighbors),
+            "offset": offset,
+            "neighbors": items,
+        }
+
+    def community(self, community, limit=100, offset=0):
+        """커뮤니티 구성원 (PageRank 순, 중심성이 없으면 연결 수 순)"""
+        if self._community_order is None:
+            raise QueryError(404, "커뮤니티 정보가 없습니다 (Step 3 결과 파일이 필요합니다)")
+        if not 0 <= community < len(self._community_bounds) - 1:
+            raise QueryError(404, f"없는 커뮤니티입니다: {community}")
+        lo, hi = self._community_bounds[community], self._community_bounds[community + 1]
+        if lo == hi:
+            raise QueryError(404, f"없는 커뮤니티입니다: {community}")
+        members = self._community_order[lo:hi]
+        return {
+            "community": community,
+            "size": int(hi - lo),
+            "offset": offset,
+            "members": [self.nodes.node_json(i) for i in members[offset:offset + limit].tolist()],
+        }
+
+    # ===========================
+    # 요청 해석
+    # ===========================
+
+    def resolve(self, target):
+        """
+        요청 경로 → (캐시 키, 계산 함수)
+        같은 뜻의 요청(파라미터 순서, 기본값 생략)은 같은 키가 되도록 값을 정규화함
+        """
+        url = urlsplit(target)
+        parts = [unquote(part) for part in url.path.strip("/").split("/") if part]
+        query = dict(parse_qsl(url.query))
+
+        def integer(name, default, low, high):
+            text = query.get(name)
+            if text is None:
+                return default
+            try:
+                value = int(text)
+            except ValueError:
+                raise QueryError(400, f"{name}은(는) 정수여야 합니다: {text}")
+            if not low <= value <= high:
+                raise QueryError(400, f"{name}은(는) {low}~{high} 사이여야 합니다: {value}")
+            return value
+
+        if len(parts) == 2 and parts[0] == "ego":
+            radius = integer("radius", 1, 1, 2)
+            limit = integer("limit", TOP_K, 1, MAX_LIMIT)
+            schema = integer("schema", 2, min(SCHEMA_VERSIONS), max(SCHEMA_VERSIONS))
+            key = f"ego/{parts[1]}?radius={radius}&limit={limit}&schema={schema}"
+            return key, lambda: self.ego(parts[1], radius, limit, schema)
+        if len(parts) == 2 and parts[0] == "neighbors":
+            limit = integer("limit", 50, 1, MAX_LIMIT)
+            offset = integer("offset", 0, 0, 1 << 31)
+            return f"neighbors/{parts[1]}?limit={limit}&offset={offset}", \
+                lambda: self.neighbors(parts[1], limit, offset)
+        if len(parts) == 2 and parts[0] == "community":
+            try:
+                community = int(parts[1])
+            except ValueError:
+                raise QueryError(400, f"커뮤니티 id는 정수여야 합니다: {parts[1]}")
+            limit = integer("limit", 100, 1, MAX_LIMIT)
+            offset = integer("offset", 0, 0, 1 << 31)
+            return f"community/{community}?limit={limit}&offset={offset}", \
+                lambda: self.community(community, limit, offset)
+        raise QueryError(404, f"없는 경로입니다: {url.path}")
+
+
+# ===========================
+# 응답 캐시
+# ===========================
+
+
+class ResponseLRU:
+    """직렬화한 응답 바이트의 LRU 캐시 (이벤트 루프 스레드에서만 사용)"""
+
+    def __init__(self, max_bytes):
+        self.max_bytes = max_bytes
+        self.entries = OrderedDict()
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evicted = 0
+
+    def get(self, key):
+        body = self.entries.get(key)
+        if body is None:
+            self.misses += 1
+            return None
+        self.entries.move_to_end(key)
+        self.hits += 1
+        return body
+
+    def put(self, key, body):
+        if len(body) > self.max_bytes:
+            return
+        if key in self.entries:
+            self.bytes -= len(self.entries.pop(key))
+        self.entries[key] = body
+        self.bytes += len(body)
+        while self.bytes > self.max_bytes:
+            _, old = self.entries.popitem(last=False)
+            self.bytes -= len(old)
+            self.evicted += 1
+
+    def report(self):
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self.entries),
+            "bytes": self.bytes,
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0,
+            "evicted": self.evicted,
+        }
+
+
+# ===========================
+# HTTP 서버
+# ===========================
+
+
+def _dumps(value):
+    return json.dumps(value, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+REASONS = {200: "OK", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed",
+           500: "Internal Server Error"}
+
+
+class GraphServer:
+    """
+    server = GraphServer(GraphQueries())
+    await server.start(host, port)   # server.port: 실제 포트 (port=0이면 빈 포트)
+    """
+
+    def __init__(self, queries, cache_mb=CACHE_MB, workers=WORKERS):
+        self.queries = queries
+        self.cache = ResponseLRU(cache_mb * 1024 ** 2)
+        self.executor = ThreadPoolExecutor(max_workers=max(1, workers), thread_name_prefix="graph-query")
+        self._pending = {}   # 계산 중인 캐시 키 → future (같은 요청 합치기)
+        self.requests = 0
+        self.coalesced = 0
+        self.errors = 0
+        self.started = time.time()
+        self.server = None
+        self.port = None
+
+    async def start(self, host=HOST, port=PORT):
+        self.server = await asyncio.start_server(self._connection, host, port)
+        self.port = self.server.sockets[0].getsockname()[1]
+        return self
+
+    async def close(self):
+        if self.server is not None:
+            self.server.close()
+            await self.server.wait_closed()
+        self.executor.shutdown(wait=False)
+
+    def stats(self):
+        return {
+            "nodes": self.queries.graph.num_nodes,
+            "edges": self.queries.graph.num_edges,
+            "requests": self.requests,
+            "errors": self.errors,
+            "coalesced": self.coalesced,
+            "uptime_sec": round(time.time() - self.started, 1),
+            "cache": self.cache.report(),
+        }
+
+    async def respond(self, target):
+        """요청 경로 → (상태 코드, 본문 바이트, 캐시 적중 여부)"""
+        self.requests += 1
+        if urlsplit(target).path.rstrip("/") == "/stats":
+            return 200, _dumps(self.stats()), False
+        try:
+            key, compute = self.queries.resolve(target)
+        except QueryError as e:
+            self.errors += 1
+            return e.status, _dumps({"error": str(e)}), False
+
+        body = self.cache.get(key)
+        if body is not None:
+            return 200, body, True
+
+        pending = self._pending.get(key)
+        if pending is not None:
+            self.coalesced += 1
+        else:
+            loop = asyncio.get_running_loop()
+            pending = self._pending[key] = loop.run_in_executor(self.executor, lambda: _dumps(compute()))
+        try:
+            body = await asyncio.shield(pending)
+        except QueryError as e:
+            self.errors += 1
+            return e.status, _dumps({"error": str(e)}), False
+        except Exception as e:   # 계산 중 예상 못 한 오류도 연결은 유지
+            self.errors += 1
+            return 500, _dumps({"error": f"{type(e).__name__}: {e}"}), False
+        finally:
+            if self._pending.get(key) is pending:
+                del self._pending[key]
+                if pending.done() and not pending.cancelled() and pending.exception() is None:
+                    self.cache.put(key, pending.result())
+        return 200, body, False
+
+    async def _connection(self, reader, writer):
+        """HTTP/1.1 연결 하나 (keep-alive, GET만)"""
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+                try:
+                    method, target, version = request_line.decode("latin-1").split()
+                except ValueError:
+                    break
+
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b"\r\n", b"\n", b""):
+                        break
+                    name, _, value = line.decode("latin-1").partition(":")
+                    headers[name.strip().lower()] = value.strip()
+                length = int(headers.get("content-length") or 0)
+                if length:
+                    await reader.readexactly(length)
+
+                keep_alive = (version == "HTTP/1.1" and headers.get("connection", "").lower() != "close") \
+                    or headers.get("connection", "").lower() == "keep-alive"
+
+                if method == "OPTIONS":
+                    status, body, hit = 200, b"", False
+                elif method != "GET":
+                    status, body, hit = 405, _dumps({"error": f"GET만 지원합니다: {method}"}), False
+                else:
+                    status, body, hit = await self.respond(target)
+
+                head = (
+                    f"HTTP/1.1 {status} {REASONS.get(status, '')}\r\n"
+                    "Content-Type: application/json; charset=utf-8\r\n"
+                    f"Content-Length: {len(body)}\r\n"
+                    "Access-Control-Allow-Origin: *\r\n"
+                    f"X-Cache: {'hit' if hit else 'miss'}\r\n"
+                    f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n"
+                )
+                writer.write(head.encode("latin-1") + body)
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+
+async def serve(queries, host=HOST, port=PORT, cache_mb=CACHE_MB, workers=WORKERS):
+    server = await GraphServer(queries, cache_mb, workers).start(host, port)
+    # 부하 시험 스크립트가 이 줄에서 주소를 읽음
+    print(f"🚀 그래프 조회 서버: http://{host}:{server.port} (캐시 {cache_mb}MB, 계산 스레드 {workers}개)",
+          flush=True)
+    try:
+        await server.server.serve_forever()
+    finally:
+        await server.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="협업 네트워크 ego / 이웃 / 커뮤니티 조회 서버")
+    parser.add_argument("--host", default=HOST)
+    parser.add_argument("--port", type=int, default=PORT, help="0이면 빈 포트")
+    parser.add_argument("--cache-mb", type=int, default=CACHE_MB)
+    parser.add_argument("--workers", type=int, default=WORKERS)
+    parser.add_argument("--nodes", default=NODES_PATH)
+    parser.add_argument("--adjacency", default=ADJACENCY_PATH)
+    parser.add_argument("--edges", default=EDGES_PATH)
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    queries = GraphQueries(args.nodes, args.adjacency, args.edges)
+    print(f"✅ 네트워크 로드 ({time.perf_counter() - started:.2f}초): "
+          f"노드 {queries.graph.num_nodes}개, 엣지 {queries.graph.num_edges}개", flush=True)
+    try:
+        asyncio.run(serve(queries, args.host, args.port, args.cache_mb, args.workers))
+    except KeyboardInterrupt:
+        print("\n서버 종료")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,187 @@
+"""
+벡터화된 numpy 힘 기반 레이아웃 (Fruchterman-Reingold 방식)
+
+- 척력: 노드가 적으면 모든 쌍을 직접 계산, 많으면 격자에 노드 밀도를 모은 뒤
+  FFT 합성곱으로 모든 쌍의 척력을 한 번에 근사 (반복당 O(n + G² log G), spring_layout은 O(n²))
+- 인력: 엣지 배열을 bincount로 누적 (반복당 O(m))
+- 다단계: 커뮤니티를 한 노드로 묶은 그래프를 먼저 배치하고, 각 노드를 자기 커뮤니티 위치에서 출발시켜 다듬음
+- warm start: 이전 실행 좌표를 초기값으로 쓰고 낮은 온도에서 조금만 움직임
+  (새 노드는 좌표가 있는 이웃들의 평균 위치에서 시작)
+
+좌표는 마지막에 중심을 (0, 0)으로, 엣지 길이 중앙값을 edge_length로 맞춤
+"""
+import numpy as np
+import scipy.fft
+
+EXACT_MAX_NODES = 1500   # 이 이하면 척력을 모든 쌍으로 직접 계산
+GRAVITY = 3.0            # 연결 요소들이 흩어지지 않도록 중심으로 당기는 힘 (/ sqrt(n))
+
+_kernel_cache = {}
+
+
+def _grid_kernel(size):
+    """격자 칸 단위 척력 커널 d / |d|² 의 FFT (선형 합성곱을 위해 2배 크기)"""
+    if size not in _kernel_cache:
+        offsets = np.fft.fftfreq(2 * size, 1.0 / (2 * size))
+        dx, dy = np.meshgrid(offsets, offsets, indexing="ij")
+        r2 = dx ** 2 + dy ** 2
+        r2[0, 0] = np.inf
+        _kernel_cache[size] = (scipy.fft.rfft2(dx / r2), scipy.fft.rfft2(dy / r2))
+    return _kernel_cache[size]
+
+
+def _exact_repulsion(pos, k):
+    delta = pos[:, None, :] - pos[None, :, :]
+    d2 = np.maximum((delta ** 2).sum(-1), 1e-4)
+    np.fill_diagonal(d2, np.inf)
+    return (delta * (k * k / d2)[:, :, None]).sum(1)
+
+
+def _grid_repulsion(pos, k, grid_size):
+    """노드를 격자에 모아 FFT로 척력장 계산 후 각 노드 칸에서 읽음"""
+    lo = pos.min(0)
+    cell = max((pos.max(0) - lo).max(), 1e-9) / (grid_size - 1)
+    idx = np.floor((pos - lo) / cell).astype(np.int64).clip(0, grid_size - 1)
+    flat = idx[:, 0] * grid_size + idx[:, 1]
+
+    density = np.zeros((2 * grid_size, 2 * grid_size))
+    density[:grid_size, :grid_size] = np.bincount(flat, minlength=grid_size * grid_size).reshape(grid_size, grid_size)
+    kx, ky = _grid_kernel(grid_size)
+    spectrum = scipy.fft.rfft2(density, workers=-1)
+    fx = scipy.fft.irfft2(spectrum * kx, density.shape, workers=-1)[:grid_size, :grid_size].ravel()
+    fy = scipy.fft.irfft2(spectrum * ky, density.shape, workers=-1)[:grid_size, :grid_size].ravel()
+
+    # 커널 단위: 칸 거리 → 실제 거리 (k² / d)
+    return np.column_stack([fx[flat], fy[flat]]) * (k * k / cell)
+
+
+def force_layout(src, dst, num_nodes, weight=None, init=None, iterations=100, temperature=None,
+                 k=1.0, grid_size=None, seed=42):
+    """
+    정수 엣지 배열 → (num_nodes, 2) 좌표
+    init: 초기 좌표 (없으면 무작위), temperature: 첫 반복의 최대 이동 거리
+    """
+    rng = np.random.default_rng(seed)
+    if num_nodes == 0:
+        return np.zeros((0, 2))
+    if init is None:
+        pos = rng.uniform(-1, 1, (num_nodes, 2)) * np.sqrt(num_nodes) * k
+    else:
+        pos = np.array(init, dtype=np.float64)
+    if num_nodes == 1:
+        return pos
+
+    weight = np.ones(len(src)) if weight is None else np.asarray(weight, dtype=np.float64)
+    if grid_size is None:
+        grid_size = int(np.clip(2 ** np.ceil(np.log2(np.sqrt(num_nodes))), 64, 1024))
+
+    # 중심 쪽 인력이 전체 척력과 군집 반경(~sqrt(n)·k) 근처에서 균형을 이루도록 n에 맞춰 줄임
+    gravity = GRAVITY / np.sqrt(num_nodes)
+    span = np.ptp(pos, axis=0).max()
+    temperature = span * 0.1 if temperature is None else temperature
+
+    for i in range(iterations):
+        if num_nodes <= EXACT_MAX_NODES:
+            disp = _exact_repulsion(pos, k)
+        else:
+            disp = _grid_repulsion(pos, k, grid_size)
+
+        delta = pos[dst] - pos[src]
+        dist = np.sqrt((delta ** 2).sum(1)) + 1e-9
+        pull = delta * (dist * weight / k)[:, None]
+        for axis in range(2):
+            disp[:, axis] += np.bincount(src, pull[:, axis], minlength=num_nodes)
+            disp[:, axis] -= np.bincount(dst, pull[:, axis], minlength=num_nodes)
+
+        disp -= gravity * pos * np.sqrt((pos ** 2).sum(1, keepdims=True)) / k
+
+        # 온도(최대 이동 거리)를 선형으로 낮춤
+        step = temperature * (1 - i / iterations)
+        length = np.sqrt((disp ** 2).sum(1, keepdims=True)) + 1e-9
+        pos += disp / length * np.minimum(length, step)
+
+    return pos
+
+
+def _coarse_graph(src, dst, weight, membership):
+    """커뮤니티 간 엣지만 남겨 가중치를 합친 축약 그래프"""
+    a, b = membership[src], membership[dst]
+    outside = a != b
+    a, b = np.minimum(a, b)[outside], np.maximum(a, b)[outside]
+    num = int(membership.max()) + 1
+    keys, inverse = np.unique(a.astype(np.int64) * num + b, return_inverse=True)
+    w = np.ones(len(a)) if weight is None else np.asarray(weight, dtype=np.float64)[outside]
+    return (keys // num).astype(np.int64), (keys % num).astype(np.int64), np.bincount(inverse, w), num
+
+
+def _fill_missing(pos, known, src, dst, rng, k):
+    """좌표가 없는 노드: 좌표가 있는 이웃 평균 (이웃도 없으면 전체 중심 근처) + 약간의 흔들림"""
+    total = np.zeros_like(pos)
+    count = np.zeros(len(pos))
+    for a, b in ((src, dst), (dst, src)):
+        usable = known[b]
+        for axis in range(2):
+            total[:, axis] += np.bincount(a[usable], pos[b[usable], axis], minlength=len(pos))
+        count += np.bincount(a[usable], minlength=len(pos))
+    center = pos[known].mean(0) if known.any() else np.zeros(2)
+    missing = ~known
+    has_neighbor = missing & (count > 0)
+    pos[has_neighbor] = total[has_neighbor] / count[has_neighbor, None]
+    pos[missing & (count == 0)] = center
+    pos[missing] += rng.normal(0, k, (missing.sum(), 2))
+    return pos
+
+
+def compute_layout(src, dst, num_nodes, weight=None, membership=None, previous=None,
+                   iterations=100, edge_length=50.0, seed=42):
+    """
+    레이아웃 단계 진입점
+    membership: 커뮤니티 id (다단계 초기 배치용), previous: 이전 좌표 (없는 노드는 NaN)
+    반환: (num_nodes, 2) float32 좌표 (중심 (0, 0), 엣지 길이 중앙값 = edge_length)
+    """
+    rng = np.random.default_rng(seed)
+    src = np.asarray(src, dtype=np.int64)
+    dst = np.asarray(dst, dtype=np.int64)
+
+    if previous is not None and np.isfinite(previous).all(1).any():
+        # warm start: 이전 좌표를 k 단위로 되돌려 시작, 온도를 낮춰 조금만 다듬음
+        known = np.isfinite(previous).all(1)
+        pos = np.where(known[:, None], previous, 0.0) / edge_length
+        pos = _fill_missing(pos, known, src, dst, rng, 1.0)
+        pos = force_layout(src, dst, num_nodes, weight, init=pos, iterations=max(iterations // 2, 1),
+                           temperature=2.0, seed=seed)
+    elif membership is not None and len(membership) and membership.max() > 0:
+        # 1단계: 커뮤니티 축약 그래프 배치 (커뮤니티 크기만큼 간격을 둠)
+        c_src, c_dst, c_weight, num = _coarse_graph(src, dst, weight, membership)
+        sizes = np.bincount(membership, minlength=num)
+        coarse = force_layout(c_src, c_dst, num, np.log1p(c_weight), iterations=iterations,
+                              k=2.0 * np.sqrt(sizes.mean()), seed=seed)
+        # 2단계: 각 노드를 커뮤니티 위치 근처에서 출발시켜 전체 그래프로 다듬음
+        radius = np.sqrt(sizes[membership])[:, None]
+        pos = coarse[membership] + rng.normal(0, 0.5, (num_nodes, 2)) * radius
+        pos = force_layout(src, dst, num_nodes, weight, init=pos, iterations=iterations,
+                           temperature=np.sqrt(sizes.max()), seed=seed)
+    else:
+        pos = force_layout(src, dst, num_nodes, weight, iterations=iterations, seed=seed)
+
+    return normalize_layout(pos, src, dst, edge_length)
+
+
+def normalize_layout(pos, src, dst, edge_length=50.0):
+    """중심을 (0, 0)으로 옮기고 엣지 길이 중앙값이 edge_length가 되도록 확대/축소"""
+    pos = pos - pos.mean(0)
+    if len(src):
+        median = np.median(np.sqrt(((pos[src] - pos[dst]) ** 2).sum(1)))
+        if median > 0:
+            pos = pos * (edge_length / median)
+    return pos.astype(np.float32)
+
+
+def edge_length_ratio(pos, src, dst, samples=100000, seed=0):
+    """레이아웃 품질 지표: 평균 엣지 길이 / 임의 노드쌍 평균 거리 (작을수록 연결된 노드가 가까움)"""
+    rng = np.random.default_rng(seed)
+    a = rng.integers(0, len(pos), samples)
+    b = rng.integers(0, len(pos), samples)
+    edge = np.sqrt(((pos[src] - pos[dst]) ** 2).sum(1)).mean()
+    pair = np.sqrt(((pos[a] - pos[b]) ** 2).sum(1)).mean()
+    return float(edge / pair) if pair > 0 else 0.0
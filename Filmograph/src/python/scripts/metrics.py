@@ -0,0 +1,364 @@
+"""
+단계별 성능 기록 (실행마다 output/metrics/<시각>_<이름>.json 하나)
+
+- 단계마다 wall 시간, CPU 시간(단계를 돈 스레드 + 끝난 작업 프로세스), 최대 RSS, 처리한 행/노드/엣지 수
+- 단계 안의 단계는 parent로 묶임 (pipeline.py의 단계 → 스크립트 안의 projection, 커뮤니티 탐지 등)
+- PIPELINE_PROFILE=1이면 단계마다 cProfile(.prof)과 tracemalloc 스냅샷(.tracemalloc)을
+  output/profile/<시각>_<이름>/에 저장 (snakeviz, pstats, tracemalloc.Snapshot.load로 비교)
+
+@record_run("02_build_network")
+def main():
+    with stage("projection") as record:
+        ...
+        record.count(nodes=n, edges=m)
+    count(rows=len(df))   # 지금 진행 중인 단계 (여기서는 02_build_network)
+
+이미 기록 중인 실행이 있으면 record_run은 그 실행에 이어서 기록함 (pipeline.py가 스크립트 함수를 부를 때)
+기록 중인 실행이 없으면 stage는 아무것도 저장하지 않음 (bench에서 함수만 부를 때)
+
+최대 RSS는 /proc/self/statm을 주기적으로 읽은 값 (Linux). 없으면 프로세스 시작 후 최대값(ru_maxrss)
+동시에 도는 단계가 있으면 서로의 메모리가 섞임
+cpu_sec는 단계를 돈 스레드의 CPU 시간 (RUSAGE_THREAD, 없으면 time.thread_time)
+  → 동시에 도는 단계끼리는 안 섞이지만, 단계 안에서 띄운 다른 스레드의 CPU 시간은 빠짐
+cpu_children_sec는 그동안 끝난 작업 프로세스 전체 (프로세스 단위라 동시에 도는 단계끼리 섞임)
+
+두 실행 비교:
+    python metrics.py ../output/metrics/A.json ../output/metrics/B.json
+"""
+import cProfile
+import functools
+import json
+import os
+import resource
+import sys
+import threading
+import time
+import tracemalloc
+from contextlib import contextmanager
+from datetime import datetime
+
+from paths import output_path
+
+METRICS_DIR = output_path('metrics')
+PROFILE_DIR = output_path('profile')
+PROFILE = os.getenv("PIPELINE_PROFILE", "0") == "1"
+RSS_INTERVAL = 0.02   # RSS 샘플링 간격 (초)
+
+try:
+    _PAGE_SIZE = os.sysconf("SC_PAGE_SIZE")
+except (AttributeError, ValueError, OSError):
+    _PAGE_SIZE = 4096
+
+
+def current_rss():
+    """지금 RSS (바이트, /proc이 없으면 None)"""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * _PAGE_SIZE
+    except (OSError, ValueError, IndexError):
+        return None
+
+
+def max_rss():
+    """프로세스 시작 후 최대 RSS (바이트, ru_maxrss는 Linux에서 KB 단위)"""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+def default_workers():
+    """사용 가능한 CPU 수 (작업 프로세스 수 기본값)"""
+    try:
+        return len(os.sched_getaffinity(0))
+    except AttributeError:
+        return os.cpu_count() or 1
+
+
+def _thread_cpu():
+    """지금 스레드의 CPU 시간 (초)"""
+    if hasattr(resource, "RUSAGE_THREAD"):
+        own = resource.getrusage(resource.RUSAGE_THREAD)
+        return own.ru_utime + own.ru_stime
+    return time.thread_time()
+
+
+def _cpu_times():
+    children = resource.getrusage(resource.RUSAGE_CHILDREN)
+    return _thread_cpu(), children.ru_utime + children.ru_stime
+
+
+class StageRecord:
+
+    def __init__(self, name, parent=None, **counts):
+        self.name = name
+        self.parent = parent   # 바깥 단계 StageRecord
+        self.profiled = False
+        self.counts = dict(counts)
+        self.wall_sec = 0.0
+        self.cpu_sec = 0.0
+        self.cpu_children_sec = 0.0
+        self.peak_rss = current_rss() or 0
+        self.error = None
+
+    def count(self, **counts):
+        """처리한 양 기록 (rows=, nodes=, edges=, documents= 등, 같은 이름은 덮어씀)"""
+        self.counts.update({name: int(value) for name, value in counts.items() if value is not None})
+
+    def observe_rss(self, rss):
+        if rss is not None and rss > self.peak_rss:
+            self.peak_rss = rss
+
+    def to_json(self):
+        return {
+            "name": self.name,
+            "parent": self.parent.name if self.parent else None,
+            "wall_sec": round(self.wall_sec, 4),
+            "cpu_sec": round(self.cpu_sec, 4),
+            "cpu_children_sec": round(self.cpu_children_sec, 4),
+            "peak_rss_mb": round(self.peak_rss / 1024 ** 2, 1),
+            "counts": self.counts,
+            "error": self.error,
+        }
+
+
+class RunMetrics:
+    """
+    한 번의 실행 기록 (단계 목록 + RSS 샘플러)
+    여러 스레드의 단계가 동시에 기록할 수 있음 (단계 중첩은 스레드별로 추적)
+    """
+
+    def __init__(self, name, profile=PROFILE, metrics_dir=METRICS_DIR, profile_dir=PROFILE_DIR):
+        self.name = name
+        self.started_at = datetime.now()
+        self.run_id = f"{self.started_at.strftime('%Y%m%d-%H%M%S')}_{name}"
+        self.metrics_dir = metrics_dir
+        self.profile_dir = os.path.join(profile_dir, self.run_id) if profile else None
+        self.records = []
+        self._active = set()
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._started = time.perf_counter()
+        self._sampler = None
+        if current_rss() is not None:
+            self._sampler = threading.Thread(target=self._sample, daemon=True)
+            self._sampler.start()
+        if self.profile_dir:
+            os.makedirs(self.profile_dir, exist_ok=True)
+            if not tracemalloc.is_tracing():
+                tracemalloc.start()
+
+    def _sample(self):
+        while not self._stop.wait(RSS_INTERVAL):
+            rss = current_rss()
+            with self._lock:
+                for record in self._active:
+                    record.observe_rss(rss)
+
+    def _stack(self):
+        if not hasattr(self._local, "stack"):
+            self._local.stack = []
+        return self._local.stack
+
+    @contextmanager
+    def stage(self, name, **counts):
+        stack = self._stack()
+        record = StageRecord(name, stack[-1] if stack else None, **counts)
+        with self._lock:
+            self.records.append(record)
+            self._active.add(record)
+
+        # cProfile은 스레드마다 하나만 켤 수 있으므로 가장 바깥 단계에서만
+        profiler = None
+        if self.profile_dir and not any(r.profiled for r in stack):
+            profiler = cProfile.Profile()
+            try:
+                profiler.enable()
+                record.profiled = True
+            except ValueError:
+                # Python 3.12부터는 프로세스에 하나만 (동시에 도는 다른 단계가 이미 켬)
+                profiler = None
+        stack.append(record)
+
+        cpu, cpu_children = _cpu_times()
+        started = time.perf_counter()
+        try:
+            yield record
+        except BaseException as e:
+            record.error = f"{type(e).__name__}: {e}"
+            raise
+        finally:
+            if profiler is not None:
+                profiler.disable()
+            record.wall_sec = time.perf_counter() - started
+            cpu_end, cpu_children_end = _cpu_times()
+            record.cpu_sec = cpu_end - cpu
+            record.cpu_children_sec = cpu_children_end - cpu_children
+            record.observe_rss(current_rss() if self._sampler else max_rss())
+            stack.pop()
+            with self._lock:
+                self._active.discard(record)
+            if profiler is not None:
+                self._dump_profile(record, profiler)
+
+    def _dump_profile(self, record, profiler):
+        index = self.records.index(record)
+        base = os.path.join(self.profile_dir, f"{index:02d}_{record.name}")
+        profiler.dump_stats(base + ".prof")
+        if tracemalloc.is_tracing():
+            tracemalloc.take_snapshot().dump(base + ".tracemalloc")
+
+    def to_json(self):
+        return {
+            "run": self.name,
+            "run_id": self.run_id,
+            "started_at": self.started_at.strftime("%Y-%m-%d %H:%M:%S"),
+            "wall_sec": round(time.perf_counter() - self._started, 4),
+            "python": sys.version.split()[0],
+            "profile_dir": self.profile_dir,
+            "stages": [record.to_json() for record in self.records],
+        }
+
+    def close(self):
+        """샘플러를 멈추고 기록 파일 저장, 경로 반환"""
+        self._stop.set()
+        if self._sampler is not None:
+            self._sampler.join()
+        os.makedirs(self.metrics_dir, exist_ok=True)
+        path = os.path.join(self.metrics_dir, f"{self.run_id}.json")
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(self.to_json(), f, ensure_ascii=False, indent=2)
+        return path
+
+    def print_summary(self):
+        print(f"\n⏱️  단계별 성능 ({self.run_id})")
+        print(f"   {'단계':26s} {'wall':>8s} {'CPU':>8s} {'RSS':>9s}  처리량")
+
+        # 동시에 돈 단계의 하위 단계가 섞여 기록되므로 바깥 단계 아래로 모아 출력
+        def show(parent, depth):
+            for record in self.records:
+                if record.parent is not parent:
+                    continue
+                name = "  " * depth + record.name
+                counts = ", ".join(f"{k} {v:,}" for k, v in record.counts.items())
+                print(f"   {name:28s} {record.wall_sec:7.2f}s {record.cpu_sec + record.cpu_children_sec:7.2f}s "
+                      f"{record.peak_rss / 1024 ** 2:7.1f}MB  {counts}")
+                show(record, depth + 1)
+
+        show(None, 0)
+
+# ===========================
+# 현재 실행
+# ===========================
+
+_current = None
+_current_lock = threading.Lock()
+
+
+def current_run():
+    return _current
+
+
+@contextmanager
+def run(name, profile=None):
+    """실행 기록 시작 (이미 기록 중이면 그 실행을 그대로 씀), 끝나면 파일로 저장"""
+    global _current
+    with _current_lock:
+        if _current is not None:
+            owner = False
+            metrics = _current
+        else:
+            owner = True
+            metrics = _current = RunMetrics(name, profile=PROFILE if profile is None else profile)
+    try:
+        yield metrics
+    finally:
+        if owner:
+            with _current_lock:
+                _current = None
+            path = metrics.close()
+            metrics.print_summary()
+            print(f"   → 기록: {path}")
+            if metrics.profile_dir:
+                print(f"   → 프로파일: {metrics.profile_dir}")
+
+
+def record_run(name):
+    """스크립트 main()을 하나의 실행(+ 같은 이름의 단계)으로 기록하는 데코레이터"""
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with run(name), stage(name):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def timed(name):
+    """함수 한 번 호출을 단계 하나로 기록하는 데코레이터"""
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with stage(name):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+class _NullRecord:
+    def count(self, **counts):
+        pass
+
+
+@contextmanager
+def stage(name, **counts):
+    """현재 실행에 단계 기록 (기록 중인 실행이 없으면 아무것도 안 함)"""
+    metrics = _current
+    if metrics is None:
+        yield _NullRecord()
+        return
+    with metrics.stage(name, **counts) as record:
+        yield record
+
+def count(**counts):
+    """지금 스레드에서 진행 중인 가장 안쪽 단계에 처리량 기록"""
+    metrics = _current
+    if metrics is not None and metrics._stack():
+        metrics._stack()[-1].count(**counts)
+
+# ===========================
+# 두 실행 비교
+# ===========================
+
+
+def compare(before_path, after_path):
+    """같은 이름 단계의 wall/CPU/RSS 변화 출력"""
+    with open(before_path, encoding="utf-8") as f:
+        before = json.load(f)
+    with open(after_path, encoding="utf-8") as f:
+        after = json.load(f)
+
+    # 단계 이름으로 맞춤 (스크립트 단독 실행과 pipeline.py 실행은 바깥 단계 이름이 다름)
+    def by_name(metrics):
+        stages = {}
+        for record in metrics["stages"]:
+            stages.setdefault(record["name"], record)
+        return stages
+
+    old, new = by_name(before), by_name(after)
+    print(f"{before['run_id']} → {after['run_id']}")
+    print(f"{'단계':26s} {'wall':>17s} {'CPU':>17s} {'RSS(MB)':>15s}")
+    for key, record in new.items():
+        if key not in old:
+            continue
+        prev = old[key]
+        cpu, prev_cpu = record["cpu_sec"] + record["cpu_children_sec"], prev["cpu_sec"] + prev["cpu_children_sec"]
+        ratio = record["wall_sec"] / max(prev["wall_sec"], 1e-9)
+        print(f"{key:28s} {prev['wall_sec']:7.2f}→{record['wall_sec']:7.2f}s "
+              f"{prev_cpu:7.2f}→{cpu:7.2f}s {prev['peak_rss_mb']:6.0f}→{record['peak_rss_mb']:6.0f}  ({ratio:.2f}x)")
+
+
+if __name__ == "__main__":
+    if len(sys.argv) != 3:
+        print("사용법: python metrics.py <이전 기록.json> <새 기록.json>")
+        sys.exit(1)
+    compare(sys.argv[1], sys.argv[2])
@@ -0,0 +1,197 @@
+"""
+그래프 노드 테이블
+
+영화인마다 0..n-1의 정수 id를 주고, 노드 속성을 배열로 보관
+- label: 영화인 이름 (export 시점에만 사용)
+- person_id: KOBIS 영화인 ID
+- role: 대표 역할
+- movies_count: 참여 영화 수
+- degree: 연결된 영화인 수
+- community: 커뮤니티 id (Step 3 이후)
+- x, y: 레이아웃 좌표 (Step 3 이후)
+- pagerank, eigenvector, betweenness: 중심성 (Step 3 centrality 이후, centrality.py)
+
+관계 표를 한 번 factorize/bincount하는 것으로 모든 속성을 계산함
+(노드마다 df[df['person_name'] == node]로 전체를 다시 훑지 않음)
+"""
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+
+from artifacts import read_table, write_table
+
+CENTRALITY_KEYS = ("pagerank", "eigenvector", "betweenness")
+
+
+class NodeTable:
+
+    def __init__(self, label, person_id, role, movies_count, degree=None, community=None, x=None, y=None,
+                 pagerank=None, eigenvector=None, betweenness=None):
+        self.label = label
+        self.person_id = person_id
+        self.role = role
+        self.movies_count = movies_count
+        self.degree = degree
+        self.community = community
+        self.x = x
+        self.y = y
+        self.pagerank = pagerank
+        self.eigenvector = eigenvector
+        self.betweenness = betweenness
+        self._index = None
+
+    def __len__(self):
+        return len(self.label)
+
+    def index_of(self, name):
+        """영화인 이름 → 정수 id (없으면 None)"""
+        if self._index is None:
+            self._index = {name: i for i, name in enumerate(self.label.tolist())}
+        return self._index.get(name)
+
+    @classmethod
+    def from_relations(cls, df, names):
+        """
+        관계 표(person_name, person_id, person_role)에서 한 번에 노드 속성 계산
+        names: 노드 id 순서의 영화인 이름 배열 (그래프에 없는 영화인의 행은 무시)
+        """
+        person_names = df['person_name']
+        if isinstance(person_names.dtype, pd.CategoricalDtype):
+            # dictionary 컬럼: 카테고리만 노드 id로 바꾸고 행은 정수 코드로 (결측 코드 -1 → -1)
+            lookup = np.append(pd.Index(names).get_indexer(person_names.cat.categories), -1)
+            codes = lookup[person_names.cat.codes.to_numpy()]
+        else:
+            codes = pd.Index(names).get_indexer(person_names.to_numpy())
+        in_graph = codes >= 0
+        codes = codes[in_graph]
+
+        # 참여 영화 수 = 영화인별 행 수
+        movies_count = np.bincount(codes, minlength=len(names)).astype(np.int32)
+
+        # 역할/ID는 영화인의 첫 번째 행 기준 (기존 .iloc[0]과 동일)
+        _, first = np.unique(codes, return_index=True)
+        row_of = np.flatnonzero(in_graph)[first]
+
+        role = np.full(len(names), '기타', dtype=object)
+        role[codes[first]] = df['person_role'].take(row_of).to_numpy(dtype=object)
+        role[pd.isna(role)] = '기타'   # 역할이 비어 있는 영화인
+
+        person_id = np.asarray(names, dtype=object).copy()
+        ids = df['person_id'].take(row_of).to_numpy(dtype=object)
+        valid = pd.notna(ids)
+        person_id[codes[first][valid]] = ids[valid]
+
+        return cls(np.asarray(names, dtype=object), person_id, role, movies_count)
+
+    def match(self, previous):
+        """
+        이전 실행 노드 테이블에서 같은 영화인(KOBIS ID)의 행 번호 (없으면 -1)
+        ID가 여러 행에 있는 영화인(누락 ID 'Unknown' 등)은 누구인지 알 수 없으므로 새 영화인으로 봄
+        """
+        previous_ids = pd.Index(previous.person_id)
+        unique = ~previous_ids.duplicated(keep=False)
+        rows = np.flatnonzero(unique)
+        codes = previous_ids[unique].get_indexer(self.person_id)
+        found = codes >= 0
+        codes[found] = rows[codes[found]]
+        codes[pd.Index(self.person_id).duplicated(keep=False)] = -1
+        return codes
+
+    def positions_from(self, previous):
+        """
+        이전 실행의 노드 테이블에서 같은 영화인의 좌표를 가져옴
+        반환: (n, 2) 배열, 이전에 없던 영화인은 NaN
+        """
+        positions = np.full((len(self), 2), np.nan, dtype=np.float32)
+        if previous.x is None:
+            return positions
+        codes = self.match(previous)
+        found = codes >= 0
+        positions[found, 0] = previous.x[codes[found]]
+        positions[found, 1] = previous.y[codes[found]]
+        return positions
+
+    def communities_from(self, previous):
+        """이전 실행의 커뮤니티 id (이전에 없던 영화인은 -1)"""
+        community = np.full(len(self), -1, dtype=np.int32)
+        if previous.community is None:
+            return community
+        codes = self.match(previous)
+        found = codes >= 0
+        community[found] = previous.community[codes[found]]
+        return community
+
+    def set_degree(self, src, dst):
+        """엣지 배열로 degree 계산"""
+        n = len(self)
+        self.degree = (np.bincount(src, minlength=n) + np.bincount(dst, minlength=n)).astype(np.int32)
+
+    def node_json(self, i):
+        """export용 노드 dict (network_data.json / egoGraphs 공통 형식)"""
+        node_json = {
+            "id": self.person_id[i],
+            "label": self.label[i],
+            "community": int(self.community[i]) if self.community is not None else 0,
+            "degree": int(self.degree[i]) if self.degree is not None else 0,
+            "movies_count": int(self.movies_count[i]),
+            "role": self.role[i] if self.role[i] is not None else '기타',
+        }
+        # 중심성은 유효숫자 4자리 (계산한 경우만)
+        for key in CENTRALITY_KEYS:
+            values = getattr(self, key)
+            if values is not None:
+                node_json[key] = float(f"{values[i]:.4g}")
+        return node_json
+
+    # ===========================
+    # 저장/로드
+    # ===========================
+
+    def to_table(self):
+        columns = {
+            "node": pa.array(np.arange(len(self), dtype=np.int32)),
+            "label": pa.array(self.label, type=pa.string()),
+            "id": pa.array(self.person_id.astype(str), type=pa.string()),
+            "role": pa.array(self.role, type=pa.string()).dictionary_encode(),
+            "movies_count": pa.array(self.movies_count, type=pa.int32()),
+        }
+        if self.degree is not None:
+            columns["degree"] = pa.array(self.degree, type=pa.int32())
+        if self.community is not None:
+            columns["community"] = pa.array(self.community, type=pa.int32())
+        if self.x is not None:
+            columns["x"] = pa.array(self.x, type=pa.float32())
+            columns["y"] = pa.array(self.y, type=pa.float32())
+        for key in CENTRALITY_KEYS:
+            if getattr(self, key) is not None:
+                columns[key] = pa.array(getattr(self, key), type=pa.float64())
+        return pa.table(columns)
+
+    def save(self, path):
+        write_table(self.to_table(), path)
+
+    @classmethod
+    def load(cls, path):
+        table = read_table(path)
+
+        def column(name, dtype=None):
+            if name not in table.column_names:
+                return None
+            values = table.column(name)
+            if dtype is not None:
+                return values.to_numpy().astype(dtype)
+            return np.asarray(values.to_pylist(), dtype=object)
+
+        return cls(
+            label=column("label"),
+            person_id=column("id"),
+            role=column("role"),
+            movies_count=column("movies_count", np.int32),
+            degree=column("degree", np.int32),
+            community=column("community", np.int32),
+            x=column("x", np.float32),
+            y=column("y", np.float32),
+            pagerank=column("pagerank", np.float64),
+            eigenvector=column("eigenvector", np.float64),
+            betweenness=column("betweenness", np.float64),
+        )
@@ -0,0 +1,24 @@
+"""
+스크립트가 읽고 쓰는 폴더 (실행 위치와 무관하게 이 파일 기준으로 정함)
+
+- data/: Step 1 결과 (관계 표, 스냅샷, 응답 캐시)
+- output/: Step 2~5 결과 (그래프, 시각화, export, 기록)
+
+둘 다 scripts/의 상위 폴더 아래, FILMOGRAPH_ROOT를 주면 그 폴더 아래 (벤치마크 임시 폴더 등)
+"""
+import os
+
+SCRIPTS_DIR = os.path.dirname(os.path.abspath(__file__))
+ROOT_DIR = os.path.abspath(os.getenv("FILMOGRAPH_ROOT") or os.path.join(SCRIPTS_DIR, ".."))
+DATA_DIR = os.path.join(ROOT_DIR, "data")
+OUTPUT_DIR = os.path.join(ROOT_DIR, "output")
+
+
+def data_path(*parts):
+    """data/ 아래 경로"""
+    return os.path.join(DATA_DIR, *parts)
+
+
+def output_path(*parts):
+    """output/ 아래 경로"""
+    return os.path.join(OUTPUT_DIR, *parts)
@@ -0,0 +1,595 @@
+"""
+파이프라인 실행기: Step 1~5를 한 프로세스에서 실행 (단계 사이는 메모리의 객체로 전달)
+
+단계 (괄호는 입력 단계)
+- fetch: Firestore → data/movies_data.arrow (--fetch일 때만 실행, 아니면 기존 파일이 입력)
+- network (fetch): 02 협업 네트워크
+- community (network): 03 커뮤니티 탐지 → output/community.arrow
+- layout (network, LAYOUT_WARM_START=0이면 community도): 03 레이아웃 → output/layout.arrow
+  warm start인데 이전 좌표가 없으면(처음 실행) community를 기다려 쓰지만 키에는 넣지 않음
+- centrality (network): 03 PageRank / 고유벡터 / 매개 중심성 → output/centrality.arrow
+- visualize (community, layout, centrality): 03 주요 인물 + 시각화 + network_with_community.nodes.arrow
+- export (visualize): 04 JSON/바이너리/분할 파일
+- ego (visualize): 05 Firestore 업로드 (--publish일 때만, 업로드 기록 ego_manifest*.json이 출력)
+
+단계마다 키 = sha256(단계 이름, 설정 값, 단계 코드 파일 내용, 입력 단계의 키)
+- 키가 마지막 실행과 같고 출력 파일도 그대로면 건너뜀
+- 예전에 같은 키로 만든 출력이 캐시(output/cache/<단계>/<키>/)에 있으면 복사해 복원
+- 아니면 실행하고 출력 파일을 캐시에 복사 (단계마다 최근 PIPELINE_CACHE_KEEP개 유지)
+  ego는 업로드가 결과라 복원하지 않음 (업로드 기록이 바뀌었으면 다시 실행)
+건너뛴 단계의 결과는 다음 단계가 실제로 필요할 때만 파일에서 읽음
+서로 의존하지 않는 단계(centrality와 community/layout, warm start일 때 community와 layout,
+export와 ego)는 동시에 실행
+
+이전 실행 결과(커뮤니티 id 유지, 좌표 warm start)는 키에 넣지 않음
+→ 입력과 설정이 같으면 지난번 결과를 그대로 다시 씀
+
+사용법:
+    python pipeline.py                          # 바뀐 단계만 실행
+    python pipeline.py --fetch --publish        # Firestore에서 가져오기부터 ego 업로드까지
+    python pipeline.py --set RESOLUTION=1.5     # 설정 바꿔 실행 (커뮤니티부터 다시)
+    python pipeline.py --force layout           # 캐시 무시하고 다시 실행 (--from: 그 단계부터 끝까지)
+    python pipeline.py --to community           # 그 단계까지만
+    python pipeline.py --list                   # 단계별 키와 상태만 출력
+    python pipeline.py --profile                # 단계별 cProfile/tracemalloc 저장 (metrics.py)
+
+    from pipeline import Pipeline
+    nodes = Pipeline(params={"RESOLUTION": 1.5}).run().value("visualize")
+"""
+import argparse
+import hashlib
+import importlib
+import json
+import os
+import shutil
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pyarrow as pa
+
+import metrics
+from artifacts import read_table, write_table
+from export_formats import file_digest
+from node_table import NodeTable
+from paths import SCRIPTS_DIR, data_path, output_path
+
+CACHE_DIR = output_path('cache')
+CACHE_KEEP = int(os.getenv("PIPELINE_CACHE_KEEP", "3"))   # 단계마다 남길 캐시 항목 수
+
+RELATIONS_PATH = data_path('movies_data.arrow')
+NODES_PATH = output_path('network.nodes.arrow')
+COMMUNITY_PATH = output_path('community.arrow')
+CENTRALITY_PATH = output_path('centrality.arrow')
+LAYOUT_PATH = output_path('layout.arrow')
+PREVIOUS_PATH = output_path('network_with_community.nodes.arrow')
+
+# 단계 상태
+RUN, CURRENT, RESTORED, SOURCE = "실행", "최신", "캐시 복원", "원본"
+
+
+class Stage:
+    """
+    name: 단계 이름, script: 단계 코드 모듈 (파이썬 파일 이름)
+    deps: 입력 단계 (pipeline을 받아 고르는 함수도 가능)
+    params: 키에 넣을 모듈 설정 이름, code: 키에 넣을 보조 모듈 파일
+    outputs: 캐시할 출력 파일/폴더, run/load: pipeline을 받아 결과 객체를 돌려줌 (load는 건너뛴 경우)
+    restorable: False면 출력 파일을 캐시에 복사하지 않고 최신인지만 확인 (외부에 쓰는 단계)
+    """
+
+    def __init__(self, name, script, deps=(), params=(), code=(), outputs=(), run=None, load=None,
+                 restorable=True):
+        self.name = name
+        self.script = script
+        self.deps = deps
+        self.params = params
+        self.code = code
+        self.outputs = outputs
+        self.run = run
+        self.load = load
+        self.restorable = restorable
+
+    def inputs(self, pipeline):
+        return self.deps(pipeline) if callable(self.deps) else self.deps
+
+# ===========================
+# 단계 정의
+# ===========================
+
+NETWORK = "02_build_network"
+COMMUNITY = "03_detect_community"
+
+
+def _graph(p):
+    """community/layout/visualize가 함께 쓰는 (nodes, graph, weight_key)"""
+    return p.memo("graph", lambda: p.module(COMMUNITY).load_network(p.value("network")))
+
+
+def _previous(p):
+    """이전 실행의 노드 테이블 (visualize가 덮어쓰기 전에 읽음)"""
+    return p.memo("previous", lambda: p.module(COMMUNITY).load_previous())
+
+
+def _warm_layout(p):
+    """layout 키/입력 단계 결정용 (설정 값만 봄, 이전 결과 파일이 있는지는 키에 넣지 않음)"""
+    return bool(p.module(COMMUNITY).LAYOUT_WARM_START)
+
+
+def _network(p):
+    module = p.module(NETWORK)
+    projection, nodes = module.build_network(p.value("fetch"))
+    module.save_network(projection, nodes)
+    return nodes
+
+
+def _community(p):
+    nodes, graph, weight_key = _graph(p)
+    module = p.module(COMMUNITY)
+    membership = module.detect(graph, nodes, _previous(p), weight_key)
+    modularity = module.report(graph, nodes, membership, weight_key)
+    table = pa.table({"community": np.asarray(membership, dtype=np.int32)})
+    write_table(table.replace_schema_metadata({"modularity": repr(float(modularity))}), COMMUNITY_PATH)
+    return membership, modularity
+
+
+def _load_community(p):
+    table = read_table(COMMUNITY_PATH)
+    membership = table.column("community").to_numpy().astype(np.int64)
+    return membership, float(table.schema.metadata[b"modularity"])
+
+
+def _layout(p):
+    nodes, graph, weight_key = _graph(p)
+    # 이전 좌표에서 이어서 다듬을 때는 커뮤니티가 필요 없어 community와 동시에 실행됨
+    # (warm start여도 이전 좌표가 없으면 community를 기다려 커뮤니티 다단계 배치)
+    membership = None
+    if not _warm_layout(p) or (not os.path.exists(PREVIOUS_PATH) and "community" in p.selected):
+        membership = p.value("community")[0]
+    positions = p.module(COMMUNITY).layout(graph, nodes, _previous(p), weight_key, membership)
+    write_table(pa.table({"x": positions[:, 0], "y": positions[:, 1]}), LAYOUT_PATH)
+    return positions
+
+
+def _load_layout(p):
+    table = read_table(LAYOUT_PATH)
+    return np.column_stack([table.column("x").to_numpy(), table.column("y").to_numpy()])
+
+
+def _centrality(p):
+    _, graph, weight_key = _graph(p)
+    module = p.module(COMMUNITY)
+    scores = module.centrality(graph, weight_key)
+    module.save_centrality(scores)
+    return scores
+
+
+def _visualize(p):
+    nodes, graph, weight_key = _graph(p)
+    module = p.module(COMMUNITY)
+    membership, modularity = p.value("community")
+    positions = p.value("layout")
+    scores = p.value("centrality")
+    module.key_members(graph, nodes, membership, scores)
+    module.visualize(graph, nodes, positions, membership, modularity, scores)
+    return module.save_nodes(nodes, membership, positions, scores)
+
+
+STAGES = [
+    Stage(
+        "fetch", "01_load_from_firestore",
+        run=lambda p: p.module("01_load_from_firestore").main(),
+        load=lambda p: p.module(NETWORK).load_relations(),
+    ),
+    Stage(
+        "network", NETWORK, deps=("fetch",),
+        params=("MAX_CAST", "TOP_BILLED", "WEIGHTING", "STREAM", "CHUNK_PAIRS"),
+        code=("projection.py", "node_table.py", "csr_graph.py", "artifacts.py"),
+        outputs=(NODES_PATH, output_path('network.edges.arrow'), output_path('network.adjacency.arrow'),
+                 output_path('network.graphml')),
+        run=_network,
+        load=lambda p: NodeTable.load(NODES_PATH),
+    ),
+    Stage(
+        "community", COMMUNITY, deps=("network",),
+        params=("BACKEND", "SEED", "RESOLUTION", "COMMUNITY_INCREMENTAL", "COMMUNITY_INCREMENTAL_MAX"),
+        code=("community_backends.py",),
+        outputs=(COMMUNITY_PATH,),
+        run=_community,
+        load=_load_community,
+    ),
+    Stage(
+        "layout", COMMUNITY,
+        deps=lambda p: ("network",) if _warm_layout(p) else ("network", "community"),
+        params=("SEED", "LAYOUT_ITERATIONS", "LAYOUT_WARM_START"),
+        code=("layout.py",),
+        outputs=(LAYOUT_PATH,),
+        run=_layout,
+        load=_load_layout,
+    ),
+    Stage(
+        "centrality", COMMUNITY, deps=("network",),
+        params=("CENTRALITY", "CENTRALITY_DAMPING", "CENTRALITY_SAMPLES", "SEED"),
+        code=("centrality.py",),
+        outputs=(CENTRALITY_PATH,),
+        run=_centrality,
+        load=lambda p: p.module(COMMUNITY).load_centrality(),
+    ),
+    Stage(
+        "visualize", COMMUNITY, deps=("community", "layout", "centrality"),
+        outputs=(PREVIOUS_PATH, output_path('community_visualization.png')),
+        run=_visualize,
+        load=lambda p: NodeTable.load(PREVIOUS_PATH),
+    ),
+    Stage(
+        "export", "04_export_json", deps=("visualize",),
+        params=("EXPORT_COMPRESS", "EXPORT_BINARY", "EXPORT_SCHEMA", "EXPORT_SHARDS"),
+        code=("export_formats.py",),
+        outputs=tuple(output_path(f'network_data.{ext}') for ext in
+                      ("json", "json.gz", "json.br", "bin", "bin.gz", "bin.br")) + (output_path('network_shards'),),
+        run=lambda p: p.module("04_export_json").main(p.value("visualize")),
+    ),
+    Stage(
+        "ego", "05_export_ego", deps=("visualize",),
+        params=("EXPORT_SCHEMA", "EGO_TOP_K", "EGO_PAGE_SIZE", "EGO_INDEX", "EGO_INDEX_SHARD_SIZE", "EGO_INDEX_PREFIX"),
+        code=("ego_extract.py", "ego_index.py", "ego_publish.py", "firestore_upload.py", "export_formats.py"),
+        # 업로드 기록 + 중간에 멈춘 업로드의 journal (밖에서 다시 올렸거나 멈췄으면 최신이 아님)
+        outputs=(output_path('ego_manifest.json'), output_path('ego_index_manifest.json'),
+                 output_path('ego_publish.journal')),
+        run=lambda p: p.module("05_export_ego").main(),
+        restorable=False,
+    ),
+]
+
+STAGE_NAMES = [stage.name for stage in STAGES]
+
+# ===========================
+# 캐시
+# ===========================
+
+
+def _stat(path):
+    """출력 파일(폴더면 안의 파일 전체)의 크기/수정 시각 (밖에서 바뀌었는지 확인용)"""
+    if os.path.isdir(path):
+        files = [os.path.join(root, name) for root, _, names in os.walk(path) for name in names]
+        stats = [os.stat(f) for f in files]
+        return [len(files), sum(s.st_size for s in stats), max((s.st_mtime_ns for s in stats), default=0)]
+    if os.path.exists(path):
+        stat = os.stat(path)
+        return [1, stat.st_size, stat.st_mtime_ns]
+    return None
+
+
+def _copy(src, dst):
+    if os.path.isdir(dst):
+        shutil.rmtree(dst)
+    elif os.path.exists(dst):
+        os.remove(dst)
+    if os.path.isdir(src):
+        shutil.copytree(src, dst)
+    elif os.path.exists(src):
+        # 다음 실행에서 제자리 수정해도 캐시가 바뀌지 않도록 링크가 아니라 복사
+        shutil.copy2(src, dst)
+
+
+class StageCache:
+    """
+    단계별 출력 캐시 (output/cache/<단계>/<키>/) + 지금 출력 파일이 어떤 키의 결과인지 (state.json)
+    """
+
+    def __init__(self, root=CACHE_DIR, keep=CACHE_KEEP):
+        self.root = root
+        self.keep = keep
+        self.state_path = os.path.join(root, "state.json")
+        self._lock = threading.Lock()
+        self.state = {}
+        if os.path.exists(self.state_path):
+            with open(self.state_path, encoding="utf-8") as f:
+                self.state = json.load(f)
+
+    def entry(self, stage, key):
+        return os.path.join(self.root, stage.name, key)
+
+    def is_current(self, stage, key):
+        """출력 파일이 이 키로 만든 그대로인지"""
+        state = self.state.get(stage.name)
+        if not state or state["key"] != key:
+            return False
+        return all(_stat(path) == recorded for path, recorded in state["files"].items())
+
+    def has(self, stage, key):
+        return os.path.exists(os.path.join(self.entry(stage, key), "outputs.json"))
+
+    def store(self, stage, key):
+        """실행 직후 출력 파일을 캐시에 복사"""
+        if not stage.restorable:
+            self.mark(stage, key)
+            return
+        entry = self.entry(stage, key)
+        tmp = entry + ".tmp"
+        if os.path.exists(tmp):
+            shutil.rmtree(tmp)
+        os.makedirs(tmp)
+        written = []
+        for i, path in enumerate(stage.outputs):
+            if os.path.exists(path):
+                _copy(path, os.path.join(tmp, f"{i}_{os.path.basename(path)}"))
+                written.append(path)
+        with open(os.path.join(tmp, "outputs.json"), "w", encoding="utf-8") as f:
+            json.dump(written, f, ensure_ascii=False)
+        if os.path.exists(entry):
+            shutil.rmtree(entry)
+        os.replace(tmp, entry)
+        self._prune(stage)
+        self.mark(stage, key)
+
+    def restore(self, stage, key):
+        """캐시의 출력 파일을 제자리로 복사 (캐시에 없는 출력은 지움)"""
+        entry = self.entry(stage, key)
+        with open(os.path.join(entry, "outputs.json"), encoding="utf-8") as f:
+            written = set(json.load(f))
+        os.utime(entry)   # 최근에 쓴 항목으로 (정리 순서)
+        for i, path in enumerate(stage.outputs):
+            if path in written:
+                _copy(os.path.join(entry, f"{i}_{os.path.basename(path)}"), path)
+            elif os.path.isdir(path):
+                shutil.rmtree(path)
+            elif os.path.exists(path):
+                os.remove(path)
+        self.mark(stage, key)
+
+    def mark(self, stage, key):
+        with self._lock:
+            self.state[stage.name] = {"key": key, "files": {path: _stat(path) for path in stage.outputs}}
+            os.makedirs(self.root, exist_ok=True)
+            tmp_path = self.state_path + ".tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(self.state, f, ensure_ascii=False, indent=2)
+            os.replace(tmp_path, self.state_path)
+
+    def _prune(self, stage):
+        directory = os.path.join(self.root, stage.name)
+        entries = sorted(
+            (os.path.join(directory, name) for name in os.listdir(directory) if not name.endswith(".tmp")),
+            key=os.path.getmtime, reverse=True
+        )
+        for entry in entries[self.keep:]:
+            shutil.rmtree(entry)
+
+# ===========================
+# 실행기
+# ===========================
+
+
+def _coerce(current, text):
+    """명령행 문자열을 모듈의 기존 설정 값 타입에 맞춤"""
+    if isinstance(current, bool):
+        return text.lower() in ("1", "true", "yes")
+    if isinstance(current, list):
+        return [item for item in text.split(",") if item]
+    if isinstance(current, (int, float)):
+        return type(current)(text)
+    if current is None:
+        # 기본값이 없는 숫자 설정 (MAX_CAST, SEED 등)
+        if text.lower() in ("", "none"):
+            return None
+        try:
+            return int(text)
+        except ValueError:
+            return float(text)
+    return text
+
+
+class Pipeline:
+    """
+    fetch/publish: Firestore에서 가져오기 / ego 업로드 포함 여부
+    params: 단계 모듈 설정 덮어쓰기 ({"RESOLUTION": 1.5}, 그 이름을 가진 모든 단계 모듈에 적용)
+    force: 캐시를 무시하고 다시 실행할 단계, until: 이 단계까지만 (입력 단계 포함)
+    profile: 단계별 cProfile/tracemalloc 저장 (None이면 PIPELINE_PROFILE)
+    단계별 시간/메모리 기록은 output/metrics/에 실행마다 하나씩 남음
+    """
+
+    def __init__(self, fetch=False, publish=False, params=None, force=(), until=None,
+                 cache_dir=CACHE_DIR, keep=CACHE_KEEP, profile=None):
+        self.fetch = fetch
+        self.profile = profile
+        self.force = set(force)
+        self.cache = StageCache(cache_dir, keep)
+        self.stages = {stage.name: stage for stage in STAGES}
+        self.keys = {}
+        self.status = {}
+        self.elapsed = {}
+        self._modules = {}
+        self._futures = {}
+        self._values = {}
+        self._memo = {}
+        self._locks = {}
+        self._lock = threading.Lock()
+        self.selected = self._select(fetch, publish, until)
+        for name, value in (params or {}).items():
+            self.set_param(name, value)
+
+    def _select(self, fetch, publish, until):
+        names = [name for name in STAGE_NAMES if publish or name != "ego"]
+        if until is not None:
+            needed, stack = set(), [until]
+            while stack:
+                name = stack.pop()
+                if name not in needed:
+                    needed.add(name)
+                    stack.extend(self.stages[name].inputs(self))
+            names = [name for name in names if name in needed]
+        return names
+
+    def module(self, script):
+        with self._lock:
+            if script not in self._modules:
+                self._modules[script] = importlib.import_module(script)
+            return self._modules[script]
+
+    def set_param(self, name, value):
+        modules = [
+            self.module(stage.script) for stage in STAGES
+            if stage.name in self.selected and (stage.name != "fetch" or self.fetch)
+        ]
+        targets = [module for module in modules if hasattr(module, name)]
+        if not targets:
+            raise ValueError(f"단계 모듈에 없는 설정입니다: {name}")
+        for module in targets:
+            setattr(module, name, _coerce(getattr(module, name), value) if isinstance(value, str) else value)
+
+    # ===========================
+    # 키 / 계획
+    # ===========================
+
+    def key(self, name):
+        """단계 이름 + 설정 값 + 코드 + 입력 단계 키의 해시"""
+        if name in self.keys:
+            return self.keys[name]
+        stage = self.stages[name]
+        if name == "fetch":
+            # 원본: 관계 표 파일 내용
+            if not os.path.exists(RELATIONS_PATH):
+                raise FileNotFoundError(f"{RELATIONS_PATH}가 없습니다. --fetch로 Firestore에서 가져오세요")
+            self.keys[name] = file_digest(RELATIONS_PATH, length=64)
+            return self.keys[name]
+
+        module = self.module(stage.script)
+        digest = hashlib.sha256(name.encode())
+        for path in (f"{stage.script}.py",) + stage.code:
+            digest.update(file_digest(os.path.join(SCRIPTS_DIR, path), length=64).encode())
+        for param in stage.params:
+            digest.update(json.dumps([param, repr(getattr(module, param))], ensure_ascii=False).encode())
+        for dep in stage.inputs(self):
+            digest.update(f"{dep}={self.key(dep)}".encode())
+        self.keys[name] = digest.hexdigest()
+        return self.keys[name]
+
+    def plan(self):
+        """[(단계, 키, 상태)] (상태: 실행 / 최신 / 캐시 복원 / 원본)"""
+        plan = []
+        for name in self.selected:
+            stage, key = self.stages[name], self.key(name)
+            if name == "fetch":
+                status = SOURCE
+            elif name in self.force:
+                status = RUN
+            elif self.cache.is_current(stage, key):
+                status = CURRENT
+            elif stage.restorable and stage.outputs and self.cache.has(stage, key):
+                status = RESTORED
+            else:
+                status = RUN
+            plan.append((name, key, status))
+        return plan
+
+    # ===========================
+    # 실행
+    # ===========================
+
+    def run(self):
+        with metrics.run("pipeline", profile=self.profile):
+            return self._run()
+
+    def _run(self):
+        started = time.perf_counter()
+        if self.fetch:
+            # 가져온 관계 표의 내용이 다음 단계들의 키가 되므로 먼저 실행
+            self._execute("fetch", RUN)
+
+        plan = self.plan()
+        print("=" * 60)
+        print("🚦 파이프라인 계획")
+        print("=" * 60)
+        for name, key, status in plan:
+            print(f"   {name:10s} {key[:12]}  {self.status.get(name, status)}")
+        print()
+
+        with ThreadPoolExecutor(max_workers=len(plan)) as executor:
+            for name, _, status in plan:
+                if name not in self.status:
+                    self._futures[name] = executor.submit(self._execute, name, status)
+            for future in list(self._futures.values()):
+                future.result()
+
+        print()
+        print("=" * 60)
+        print(f"🎉 파이프라인 완료 ({time.perf_counter() - started:.2f}초)")
+        print("=" * 60)
+        for name, _, _ in plan:
+            print(f"   {name:10s} {self.status[name]:8s} {self.elapsed.get(name, 0.0):8.2f}초")
+        return self
+
+    def _execute(self, name, status):
+        stage = self.stages[name]
+        # 입력 단계가 끝나야 실행/복원 (visualize 복원은 community/layout이 읽는 이전 노드 테이블을 덮어씀)
+        if status in (RUN, RESTORED):
+            for dep in stage.inputs(self):
+                if dep in self._futures:
+                    self._futures[dep].result()
+
+        started = time.perf_counter()
+        if status == RESTORED:
+            with metrics.stage(f"{name} ({status})"):
+                self.cache.restore(stage, self.key(name))
+        elif status == RUN:
+            print(f"\n▶ {name} 실행\n")
+            with metrics.stage(name):
+                self._values[name] = stage.run(self)
+                if name != "fetch":
+                    self.cache.store(stage, self.key(name))
+        self.status[name] = status
+        self.elapsed[name] = time.perf_counter() - started
+
+    def value(self, name):
+        """단계 결과 객체 (건너뛴 단계는 처음 필요할 때 출력 파일에서 읽음)"""
+        future = self._futures.get(name)
+        if future is not None:
+            future.result()
+        if name not in self._values:
+            self._values[name] = self.memo(f"value:{name}", lambda: self.stages[name].load(self))
+        return self._values[name]
+
+    def memo(self, key, factory):
+        """여러 단계가 동시에 요청해도 한 번만 만드는 공유 객체"""
+        with self._lock:
+            lock = self._locks.setdefault(key, threading.Lock())
+        with lock:
+            if key not in self._memo:
+                self._memo[key] = factory()
+            return self._memo[key]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Filmograph 데이터 파이프라인 (Step 1~5)")
+    parser.add_argument("--fetch", action="store_true", help="Firestore에서 가져오기부터 (Step 1)")
+    parser.add_argument("--publish", action="store_true", help="ego 그래프 Firestore 업로드까지 (Step 5)")
+    parser.add_argument("--set", action="append", default=[], metavar="NAME=VALUE",
+                        help="단계 모듈 설정 덮어쓰기 (예: RESOLUTION=1.5, 여러 번 가능)")
+    parser.add_argument("--force", default="", help="캐시를 무시하고 다시 실행할 단계 (쉼표 구분)")
+    parser.add_argument("--from", dest="start", choices=STAGE_NAMES, help="이 단계부터 끝까지 다시 실행")
+    parser.add_argument("--to", dest="until", choices=STAGE_NAMES, help="이 단계까지만 실행")
+    parser.add_argument("--list", action="store_true", help="단계별 키와 상태만 출력")
+    parser.add_argument("--profile", action="store_true", default=None,
+                        help="단계별 cProfile/tracemalloc 스냅샷 저장 (output/profile/)")
+    args = parser.parse_args()
+
+    params = dict(item.split("=", 1) for item in args.set)
+    force = {name for name in args.force.split(",") if name}
+    if args.start:
+        force.update(STAGE_NAMES[STAGE_NAMES.index(args.start):])
+    unknown = force - set(STAGE_NAMES)
+    if unknown:
+        parser.error(f"없는 단계: {', '.join(sorted(unknown))}")
+
+    pipeline = Pipeline(fetch=args.fetch, publish=args.publish, params=params, force=force, until=args.until,
+                        profile=args.profile)
+    if args.list:
+        for name, key, status in pipeline.plan():
+            print(f"{name:10s} {key[:12]}  {status}")
+        return
+    pipeline.run()
+
+
+if __name__ == "__main__":
+    main()
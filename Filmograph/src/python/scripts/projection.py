@@ -0,0 +1,395 @@
+"""
+영화인×영화 이분 그래프 → 영화인 협업 그래프 투영 (희소 행렬)
+
+- 영화인/영화를 정렬된 정수 id로 바꾼 뒤 영화×영화인 incidence 행렬 B를 만듦
+- 협업 횟수(weight) = B^T B 의 상삼각 (희소 행렬 곱)
+- 함께 한 영화 목록은 캐스트 크기별로 묶어 numpy로 (사람쌍, 영화) 조합을 한 번에 만든 뒤
+  엣지별 offset(movie_ptr) + 공유 영화 id 배열(movie_ids)로 보관
+
+영화인 id는 이름 정렬 순서이므로 (i < j)가 기존의 tuple(sorted([a, b]))와 같고,
+영화 id는 제목 정렬 순서이므로 엣지별 영화 목록 순서도 기존 groupby 결과와 같음
+
+캐스트가 k명인 영화 하나가 k(k-1)/2개의 엣지를 만들기 때문에 허브 영화 대응 옵션을 둠
+- max_cast: 캐스트가 너무 큰 영화는 협업 관계에서 제외
+- top_billed: 영화마다 상위 K명만 남김
+- weighting="newman": 공유 영화마다 1/(k-1)을 더한 strength를 함께 계산
+- stream_project: 영화인 블록 단위로 엣지를 계산해 바로 파일에 씀
+"""
+import numpy as np
+import pandas as pd
+import scipy.sparse as sp
+
+from artifacts import EdgeWriter, edge_arrays, read_table
+
+WEIGHTING_MODES = ("count", "newman")
+
+
+class Projection:
+    """
+    투영 결과
+    persons[i], movies[m]: 정수 id → 이름/제목
+    src[e] < dst[e], weight[e]: 엣지 (src, dst 순으로 정렬)
+    movie_ids[movie_ptr[e]:movie_ptr[e+1]]: 엣지 e의 공유 영화 id
+    """
+
+    def __init__(self, persons, movies, src, dst, weight, movie_ptr=None, movie_ids=None, strength=None):
+        self.persons = persons
+        self.movies = movies
+        self.src = src
+        self.dst = dst
+        self.weight = weight
+        self.movie_ptr = movie_ptr
+        self.movie_ids = movie_ids
+        self.strength = strength  # weighting="newman"일 때만 (Σ 1/(k-1))
+
+    @classmethod
+    def from_edges(cls, table, persons, movies):
+        """엣지 표(edge_table / EdgeWriter 형식) → Projection"""
+        arrays = edge_arrays(table)
+        return cls(
+            persons, movies, arrays["src"], arrays["dst"], arrays["weight"],
+            arrays["movie_ptr"], arrays["movie_ids"], arrays["strength"],
+        )
+
+    @property
+    def num_edges(self):
+        return len(self.src)
+
+    def edge_movies(self, e):
+        """엣지 e의 영화 제목 리스트"""
+        ids = self.movie_ids[self.movie_ptr[e]:self.movie_ptr[e + 1]]
+        return self.movies[ids].tolist()
+
+    def compact(self):
+        """
+        엣지가 하나도 없는 영화인을 빼고 id를 0..n-1로 다시 매김
+        (그래프 노드 id = 반환된 persons의 인덱스)
+        """
+        used = np.zeros(len(self.persons), dtype=bool)
+        used[self.src] = True
+        used[self.dst] = True
+        remap = (np.cumsum(used) - 1).astype(np.int32)
+        return Projection(
+            self.persons[used], self.movies, remap[self.src], remap[self.dst],
+            self.weight, self.movie_ptr, self.movie_ids, self.strength,
+        )
+
+    def to_networkx(self):
+        """
+        기존과 같은 엣지 속성(weight, movies, 있으면 strength)을 가진 networkx 그래프로 변환
+        노드는 정수 id (이름은 노드 테이블에서 export 시점에 붙임)
+        """
+        import networkx as nx
+
+        G = nx.Graph()
+        G.add_nodes_from(range(len(self.persons)))
+
+        src, dst, weights = self.src.tolist(), self.dst.tolist(), self.weight.tolist()
+        attrs = [{"weight": w} for w in weights]
+        if self.strength is not None:
+            for data, value in zip(attrs, self.strength.tolist()):
+                data["strength"] = value
+        if self.movie_ids is not None:
+            titles = self.movies[self.movie_ids].tolist()
+            ptr = self.movie_ptr.tolist()
+            for e, data in enumerate(attrs):
+                data["movies"] = titles[ptr[e]:ptr[e + 1]]
+        G.add_edges_from(zip(src, dst, attrs))
+        return G
+
+
+class ProjectionStats:
+    """
+    투영 통계: 허브 제한으로 빠진 영화/출연 수와 (사람쌍, 영화) 조합 수
+    조합 수 = Σ k(k-1)/2 = 영화 목록에 들어가는 항목 수 (메모리/시간에 비례)
+    """
+
+    def __init__(self):
+        self.movies_capped = 0    # max_cast를 넘어 제외된 영화 수
+        self.credits_trimmed = 0  # top_billed로 빠진 (영화인, 영화) 수
+        self.pairs_full = 0       # 제한 전 조합 수
+        self.pairs = 0            # 실제 조합 수
+        self.edges = 0
+        self.chunks = 0           # stream_project에서 기록한 블록 수
+
+    def report(self):
+        return {
+            "movies_capped": self.movies_capped,
+            "credits_trimmed": self.credits_trimmed,
+            "pairs_full": self.pairs_full,
+            "pairs": self.pairs,
+            "edges": self.edges,
+            "chunks": self.chunks,
+        }
+
+
+def _factorize_sorted(values):
+    """
+    값 배열 → (정렬 순서 코드, 정렬된 고유값)
+    pandas Categorical(Arrow dictionary 컬럼)은 카테고리만 정렬하고 행은 정수 코드로 처리
+    (행마다 문자열 객체를 만들지 않음)
+    """
+    if not isinstance(values, pd.Categorical):
+        # 해시 기반 factorize 후 정렬 → 코드가 이름/제목 정렬 순서가 됨
+        codes, uniques = pd.factorize(np.asarray(values, dtype=object), sort=True)
+        return codes, np.asarray(uniques, dtype=object)
+
+    categories = np.asarray(values.categories, dtype=object)
+    order = np.argsort(categories, kind="stable")
+    rank = np.empty(len(order), dtype=np.int64)
+    rank[order] = np.arange(len(order))
+    # 행에 없는 카테고리는 빼고 다시 0..k-1 (결측은 factorize와 같이 -1)
+    valid = values.codes >= 0
+    codes = np.full(len(values), -1, dtype=np.int64)
+    codes[valid], used = pd.factorize(rank[values.codes[valid]], sort=True)
+    return codes, categories[order][used]
+
+
+def build_incidence(person_names, movie_titles):
+    """
+    (영화인, 영화) 관계 → 정렬된 id 테이블과 영화×영화인 CSR incidence 행렬
+    같은 (영화인, 영화) 쌍이 여러 번 나와도 한 번만 셈
+    """
+    person_idx, persons = _factorize_sorted(person_names)
+    movie_idx, movies = _factorize_sorted(movie_titles)
+
+    num_persons = len(persons)
+    keys = np.unique(movie_idx.astype(np.int64) * num_persons + person_idx)
+    rows = (keys // num_persons).astype(np.int32)
+    cols = (keys % num_persons).astype(np.int32)
+
+    B = sp.csr_matrix(
+        (np.ones(len(keys), dtype=np.int32), (rows, cols)),
+        shape=(len(movies), num_persons),
+    )
+    B.sort_indices()
+    return persons, movies, B
+
+
+def limit_cast(B, max_cast=None, top_billed=None, stats=None):
+    """
+    허브 영화 제한
+    - max_cast: 캐스트가 max_cast명을 넘는 영화는 협업 관계에서 제외
+    - top_billed: 영화마다 상위 top_billed명만 남김
+      (데이터에 크레딧 순서가 없으므로 전체 참여 영화 수가 많은 순, 같으면 이름 순)
+    """
+    sizes = np.diff(B.indptr)
+    movies_count = np.bincount(B.indices, minlength=B.shape[1])
+    if stats is not None:
+        stats.pairs_full = int((sizes.astype(np.int64) * (sizes - 1) // 2).sum())
+
+    if max_cast is not None:
+        keep = sizes <= max_cast
+        if stats is not None:
+            stats.movies_capped = int((~keep).sum())
+        B = sp.diags(keep.astype(np.int32), dtype=np.int32) @ B
+        B.eliminate_zeros()
+        sizes = np.diff(B.indptr)
+
+    if top_billed is not None and len(B.indices):
+        rows = np.repeat(np.arange(B.shape[0]), sizes)
+        order = np.lexsort((B.indices, -movies_count[B.indices], rows))
+        rank = np.arange(len(order)) - np.repeat(B.indptr[:-1], sizes)
+        kept = order[rank < top_billed]
+        if stats is not None:
+            stats.credits_trimmed = len(order) - len(kept)
+        B = sp.csr_matrix(
+            (np.ones(len(kept), dtype=np.int32), (rows[kept], B.indices[kept])),
+            shape=B.shape,
+        )
+
+    B.sort_indices()
+    return B
+
+
+def _newman_scale(B):
+    """영화별 1/(k-1) (캐스트 1명인 영화는 협업이 없으므로 0)"""
+    sizes = np.diff(B.indptr)
+    scale = np.zeros(len(sizes))
+    np.divide(1.0, sizes - 1, out=scale, where=sizes >= 2)
+    return scale
+
+
+def _drop_isolated(persons, B):
+    """캐스트 2명 이상인 영화에 없는 영화인(엣지가 없을 영화인)을 미리 제거"""
+    sizes = np.diff(B.indptr)
+    used = np.zeros(B.shape[1], dtype=bool)
+    used[B.indices[np.repeat(sizes >= 2, sizes)]] = True
+    B = B[:, np.flatnonzero(used)].tocsr()
+    B.sort_indices()
+    return persons[used], B
+
+
+def _pair_movies(B):
+    """
+    캐스트 크기가 같은 영화끼리 묶어 (a, b, movie) 조합을 벡터로 생성
+    반환: a, b, movie (a < b)
+    """
+    indptr, indices = B.indptr, B.indices
+    sizes = np.diff(indptr)
+
+    a_parts, b_parts, m_parts = [], [], []
+    for k in np.unique(sizes[sizes >= 2]):
+        movie_ids = np.flatnonzero(sizes == k)
+        members = indices[indptr[movie_ids][:, None] + np.arange(k)]
+        iu, ju = np.triu_indices(k, 1)
+        a_parts.append(members[:, iu].ravel())
+        b_parts.append(members[:, ju].ravel())
+        m_parts.append(np.repeat(movie_ids.astype(np.int32), len(iu)))
+
+    if not a_parts:
+        empty = np.empty(0, dtype=np.int32)
+        return empty, empty, empty
+    return np.concatenate(a_parts), np.concatenate(b_parts), np.concatenate(m_parts)
+
+
+def _check_weighting(weighting):
+    if weighting not in WEIGHTING_MODES:
+        raise ValueError(f"weighting은 {WEIGHTING_MODES} 중 하나여야 함: {weighting!r}")
+
+
+def project(person_names, movie_titles, with_movies=True, max_cast=None, top_billed=None,
+            weighting="count", stats=None):
+    """
+    협업 그래프 투영
+    with_movies=False면 weight만 계산 (공유 영화 목록 생략)
+    """
+    _check_weighting(weighting)
+    persons, movies, B = build_incidence(person_names, movie_titles)
+    B = limit_cast(B, max_cast, top_billed, stats)
+
+    # 협업 횟수: 영화인×영화인 공동 출연 행렬의 상삼각 (CSR이라 이미 (src, dst) 순)
+    Bt = B.T.tocsr()
+    co = sp.triu(Bt @ B, k=1, format="csr")
+    co.sort_indices()
+    src = np.repeat(np.arange(co.shape[0], dtype=np.int32), np.diff(co.indptr))
+    dst = co.indices.astype(np.int32)
+    weight = co.data.astype(np.int32)
+
+    if stats is not None:
+        stats.pairs = int(weight.sum())
+        stats.edges = len(src)
+
+    if not with_movies:
+        strength = None
+        if weighting == "newman":
+            weighted = sp.triu(Bt @ (sp.diags(_newman_scale(B)) @ B), k=1, format="csr")
+            weighted.sort_indices()
+            assert np.array_equal(weighted.indices, co.indices)
+            strength = weighted.data
+        return Projection(persons, movies, src, dst, weight, strength=strength)
+
+    # 공유 영화 목록: (사람쌍, 영화) 순으로 정렬 → 엣지별 offset
+    a, b, m = _pair_movies(B)
+    num_persons = np.int64(len(persons))
+    pair_key = a.astype(np.int64) * num_persons + b
+    order = np.lexsort((m, pair_key))
+    pair_key = pair_key[order]
+    movie_ids = m[order]
+
+    boundaries = np.flatnonzero(pair_key[1:] != pair_key[:-1]) + 1
+    movie_ptr = np.zeros(len(src) + 1, dtype=np.int64)
+    if len(pair_key):
+        movie_ptr[1:-1] = boundaries
+        movie_ptr[-1] = len(pair_key)
+
+    # 희소 행렬 곱의 weight와 조합 개수가 같아야 함
+    assert np.array_equal(np.diff(movie_ptr), weight)
+    assert np.array_equal(pair_key[movie_ptr[:-1]], src.astype(np.int64) * num_persons + dst)
+
+    strength = None
+    if weighting == "newman":
+        strength = _edge_strength(_newman_scale(B), movie_ids, movie_ptr)
+
+    return Projection(persons, movies, src, dst, weight, movie_ptr, movie_ids, strength)
+
+
+def _edge_strength(scale, movie_ids, movie_ptr):
+    """엣지별 Σ 1/(k-1) (공유 영화 목록 순서대로 더함)"""
+    if len(movie_ids) == 0:
+        return np.zeros(len(movie_ptr) - 1)
+    return np.add.reduceat(scale[movie_ids], movie_ptr[:-1])
+
+
+# ===========================
+# 스트리밍 투영
+# ===========================
+
+
+def _block_bounds(cost, chunk_pairs):
+    """영화인별 조합 생성 비용을 누적해 chunk_pairs 안팎의 [lo, hi) 블록으로 자름"""
+    cumulative = np.cumsum(cost)
+    blocks, lo = [], 0
+    while lo < len(cost):
+        done = cumulative[lo - 1] if lo else 0
+        hi = max(int(np.searchsorted(cumulative, done + chunk_pairs, side="right")), lo + 1)
+        blocks.append((lo, hi))
+        lo = hi
+    return blocks
+
+
+def _project_block(B, Bt, lo, hi):
+    """
+    src가 [lo, hi)인 엣지만 계산
+    반환: src, dst, weight, movie_ptr, movie_ids ((src, dst) 순, 블록 내 offset)
+    """
+    sizes = np.diff(B.indptr)
+
+    # 블록 영화인 a의 (a, 영화) 출연마다 그 영화의 캐스트 전체를 펼친 뒤 b > a만 남김
+    start, end = Bt.indptr[lo], Bt.indptr[hi]
+    m = Bt.indices[start:end]
+    a = np.repeat(np.arange(lo, hi, dtype=np.int32), np.diff(Bt.indptr[lo:hi + 1]))
+    counts = sizes[m]
+    firsts = np.repeat(B.indptr[m], counts)
+    within = np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts)
+    b = B.indices[firsts + within]
+    a = np.repeat(a, counts)
+    m = np.repeat(m, counts).astype(np.int32)
+    keep = b > a
+    a, b, m = a[keep], b[keep], m[keep]
+
+    pair_key = a.astype(np.int64) * B.shape[1] + b
+    order = np.lexsort((m, pair_key))
+    pair_key = pair_key[order]
+    movie_ids = m[order]
+
+    starts = np.flatnonzero(np.diff(pair_key, prepend=-1) != 0)
+    movie_ptr = np.append(starts, len(pair_key)).astype(np.int64)
+    src = (pair_key[starts] // B.shape[1]).astype(np.int32)
+    dst = (pair_key[starts] % B.shape[1]).astype(np.int32)
+    weight = np.diff(movie_ptr).astype(np.int32)
+    return src, dst, weight, movie_ptr, movie_ids
+
+
+def stream_project(person_names, movie_titles, path, chunk_pairs=5_000_000, max_cast=None,
+                   top_billed=None, weighting="count", stats=None):
+    """
+    엣지 전체를 메모리에 만들지 않고 영화인 블록 단위로 계산해 바로 엣지 파일에 씀
+    - 엣지가 없을 영화인을 먼저 빼므로 id는 project(...).compact()와 같음
+    - 블록은 src 순서라 파일의 엣지 순서/내용도 project()와 같음
+    - 블록당 (사람쌍, 영화) 조합은 대략 chunk_pairs개 이하 (영화인 한 명이 넘기면 그 한 명만)
+    반환: 기록한 파일을 memory map으로 읽은 Projection
+    """
+    _check_weighting(weighting)
+    persons, movies, B = build_incidence(person_names, movie_titles)
+    B = limit_cast(B, max_cast, top_billed, stats)
+    persons, B = _drop_isolated(persons, B)
+    Bt = B.T.tocsr()
+    Bt.sort_indices()
+
+    scale = _newman_scale(B) if weighting == "newman" else None
+    # 영화인 a의 조합 생성 비용 = 참여 영화들의 캐스트 크기 합
+    cost = Bt @ np.diff(B.indptr).astype(np.int64)
+
+    blocks = _block_bounds(cost, chunk_pairs)
+    with EdgeWriter(path, movies, with_strength=scale is not None) as writer:
+        for lo, hi in blocks:
+            src, dst, weight, movie_ptr, movie_ids = _project_block(B, Bt, lo, hi)
+            strength = _edge_strength(scale, movie_ids, movie_ptr) if scale is not None else None
+            writer.write(src, dst, weight, movie_ptr, movie_ids, strength)
+            if stats is not None:
+                stats.pairs += len(movie_ids)
+                stats.edges += len(src)
+                stats.chunks += 1
+
+    return Projection.from_edges(read_table(path), persons, movies)
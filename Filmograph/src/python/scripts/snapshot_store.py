@@ -0,0 +1,145 @@
+"""
+persons 컬렉션 로컬 스냅샷 (증분 가져오기)
+
+Firestore 문서 name을 키로 updateTime과 파싱된 영화인 데이터를 저장
+다음 실행부터는 (name, updateTime) 목록만 받아 비교한 뒤
+추가/수정된 문서만 batchGet으로 가져오고, 삭제된 문서는 스냅샷에서 제거함
+"""
+import json
+import os
+import pickle
+from datetime import datetime
+
+SNAPSHOT_VERSION = 2  # 디코더가 바뀌면 올려서 스냅샷을 새로 만듦
+
+
+def _person_key(person):
+    return {"id": person.get("id"), "name": person.get("name")}
+
+
+class PersonSnapshot:
+    """
+    {문서 name: (updateTime, 파싱된 영화인 dict)}
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.entries = {}
+
+    @classmethod
+    def load(cls, path):
+        snapshot = cls(path)
+        if os.path.exists(path):
+            with open(path, "rb") as f:
+                saved = pickle.load(f)
+            if saved.get("version") == SNAPSHOT_VERSION:
+                snapshot.entries = saved["entries"]
+        return snapshot
+
+    def save(self):
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, "wb") as f:
+            pickle.dump({"version": SNAPSHOT_VERSION, "entries": self.entries}, f)
+        os.replace(tmp_path, self.path)
+
+    def is_empty(self):
+        return not self.entries
+
+    def persons(self):
+        """문서 name 순서(= Firestore 목록 순서)의 영화인 리스트"""
+        return [self.entries[name][1] for name in sorted(self.entries)]
+
+    # ===========================
+    # 동기화
+    # ===========================
+
+    def _apply_documents(self, pages, parse, delta):
+        for documents in pages:
+            for doc in documents:
+                person = parse(doc)
+                if not person:
+                    continue
+                name = doc["name"]
+                old = self.entries.get(name)
+                self.entries[name] = (doc.get("updateTime"), person)
+                if old is None:
+                    delta["added"].append(_person_key(person))
+                else:
+                    delta["updated"].append(_person_key(person))
+                    if old[1].get("name") != person.get("name"):
+                        # 이름이 바뀌면 이전 이름의 노드도 영향을 받음
+                        delta["deleted"].append(_person_key(old[1]))
+
+    def replace_all(self, pages, parse):
+        """
+        전체 가져오기 결과로 스냅샷을 다시 만듦
+        pages: 문서 리스트 제너레이터 (get_firestore_collection 결과)
+        """
+        previous = self.entries
+        self.entries = {}
+        delta = new_delta(full_refresh=True)
+        self._apply_documents(pages, parse, delta)
+
+        # 이전 스냅샷 대비 변화만 기록
+        delta["added"], delta["updated"] = [], []
+        for name, (update_time, person) in self.entries.items():
+            old = previous.get(name)
+            if old is None:
+                delta["added"].append(_person_key(person))
+            elif old[0] != update_time:
+                delta["updated"].append(_person_key(person))
+        delta["deleted"] = [
+            _person_key(old[1]) for name, old in previous.items() if name not in self.entries
+        ]
+        return delta
+
+    def sync(self, fetcher, collection_name, parse):
+        """
+        변경분만 가져와 스냅샷에 반영
+        1) 목록(name, updateTime)만 조회
+        2) 새로 생기거나 updateTime이 바뀐 문서만 batchGet
+        3) 목록에서 사라진 문서는 삭제
+        """
+        versions = fetcher.list_versions(collection_name)
+
+        changed = [
+            name for name, update_time in versions.items()
+            if name not in self.entries or self.entries[name][0] != update_time
+        ]
+        removed = [name for name in self.entries if name not in versions]
+
+        delta = new_delta(full_refresh=False)
+        delta["listed"] = len(versions)
+
+        for name in removed:
+            _, person = self.entries.pop(name)
+            delta["deleted"].append(_person_key(person))
+
+        self._apply_documents(fetcher.batch_get(changed), parse, delta)
+        return delta
+
+
+def new_delta(full_refresh):
+    return {"full_refresh": full_refresh, "added": [], "updated": [], "deleted": []}
+
+
+def changed_person_names(delta):
+    """변경의 영향을 받는 영화인 이름 집합 (그래프 노드 기준)"""
+    return sorted({
+        p["name"] for kind in ("added", "updated", "deleted") for p in delta[kind] if p.get("name")
+    })
+
+
+def save_changed_persons(delta, path):
+    """
+    다음 단계들이 사용할 변경된 영화인 목록 저장
+    """
+    payload = dict(delta)
+    payload["names"] = changed_person_names(delta)
+    payload["generated_at"] = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(payload, f, ensure_ascii=False, indent=2)
+    return payload
@@ -48,6 +48,10 @@ export interface EgoNode extends BaseNode, NodeObject {
   community?: number;
   degree?: number;
   movies_count?: number;
+  // 중심성 (03_detect_community.py centrality 단계)
+  pagerank?: number;
+  eigenvector?: number;
+  betweenness?: number;
 }
 
 export interface EgoLink extends BaseLink<EgoNode>, LinkObject<EgoNode> {
@@ -69,7 +73,11 @@ export interface CollabNode extends BaseNode, NodeObject {
   community?: number;
   degree?: number;
   movies_count?: number;
+  pagerank?: number;
+  eigenvector?: number;
+  betweenness?: number;
   neighbors?: Set<string | number>;
+  members?: number; // 개요 그래프의 커뮤니티 노드 (소속 인원)
 }
 
 export interface CollabLink
@@ -78,6 +86,8 @@ export interface CollabLink
   source: string | number | CollabNode;
   target: string | number | CollabNode;
   weight?: number;
+  movies?: string[];
+  total_movies?: number;
 }
 
 export type GraphCollabT = GraphData<CollabNode, CollabLink>;
@@ -0,0 +1,98 @@
+// src/utils/egoIndex.ts
+// ego 그래프 검색 색인 (생성: src/python/scripts/05_export_ego.py, ego_index.py)
+// - egoIndex/meta: 전체 인원, shard 수, 접두 버킷 목록 ({코드: 인원})
+// - egoIndex/shard-{n}: 연결 수 내림차순 영화인 목록 (열 배열)
+// - egoIndex/prefix-{코드}: 이름 첫 글자별 버킷 (검색어 첫 글자로 문서 하나만 읽음)
+// egoGraphs 전체(노드/링크 포함)를 읽지 않고 목록/검색
+import { collection, doc, getDoc, getDocs } from "firebase/firestore";
+import { db } from "../services/data/firebaseConfig";
+
+export type EgoIndexEntry = {
+  id: string;
+  label: string;
+  degree: number;
+  role: string;
+  community: number;
+};
+
+type EgoIndexColumns = {
+  ids: string[];
+  labels: string[];
+  degree: number[];
+  community: number[];
+  roles: string[];
+  role: number[];
+};
+
+type EgoIndexMeta = {
+  schema: number;
+  count: number;
+  shards: number;
+  prefixes: Record<string, number>;
+};
+
+const INDEX = "egoIndex";
+
+const toEntries = (columns: EgoIndexColumns): EgoIndexEntry[] =>
+  columns.ids.map((id, i) => ({
+    id,
+    label: columns.labels[i] ?? "",
+    degree: columns.degree[i] ?? 0,
+    role: columns.roles[columns.role[i]] ?? "기타",
+    community: columns.community[i] ?? 0,
+  }));
+
+// 접두 버킷 이름: 첫 글자(소문자) 유니코드 값의 16진수 (ego_index.prefix_key와 같은 규칙)
+export const prefixKey = (term: string): string | null => {
+  const first = term.trim().toLowerCase().codePointAt(0);
+  return first === undefined ? null : first.toString(16);
+};
+
+let metaPromise: Promise<EgoIndexMeta | null> | null = null;
+
+const fetchMeta = () => {
+  metaPromise ??= getDoc(doc(db, INDEX, "meta")).then((snap) =>
+    snap.exists() ? (snap.data() as EgoIndexMeta) : null
+  );
+  return metaPromise;
+};
+
+// 전체 영화인 목록 (연결 수 내림차순)
+// 색인이 아직 없으면 예전처럼 egoGraphs 전체에서 id/이름만 뽑음
+export async function loadEgoIndex(): Promise<EgoIndexEntry[]> {
+  const meta = await fetchMeta();
+  if (!meta) {
+    const snap = await getDocs(collection(db, "egoGraphs"));
+    return snap.docs.map((d) => {
+      const raw = d.data() as any;
+      return { id: d.id, label: raw.label ?? "", degree: 0, role: "", community: 0 };
+    });
+  }
+
+  const shards = await Promise.all(
+    Array.from({ length: meta.shards }, (_, n) =>
+      getDoc(doc(db, INDEX, `shard-${n}`))
+    )
+  );
+  return shards.flatMap((snap) =>
+    snap.exists() ? toEntries(snap.data() as EgoIndexColumns) : []
+  );
+}
+
+// 이름이 term으로 시작하는 영화인 (버킷 하나만 읽음, 색인/버킷이 없으면 null)
+export async function lookupEgoPrefix(
+  term: string
+): Promise<EgoIndexEntry[] | null> {
+  const key = prefixKey(term);
+  const meta = await fetchMeta();
+  if (!key || !meta?.prefixes) return null;
+  if (!(key in meta.prefixes)) return [];
+
+  const snap = await getDoc(doc(db, INDEX, `prefix-${key}`));
+  if (!snap.exists()) return null;
+
+  const keyword = term.trim().toLowerCase();
+  return toEntries(snap.data() as EgoIndexColumns).filter((p) =>
+    p.label.toLowerCase().startsWith(keyword)
+  );
+}
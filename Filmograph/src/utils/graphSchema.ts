@@ -0,0 +1,72 @@
+// src/utils/graphSchema.ts
+// export schema v2 → 기존(v1) 그래프 모양으로 변환
+// v2: 노드는 배열 위치가 번호, 링크는 { s, t, w, m, n } (노드 번호, 영화 제목 표 번호)
+// v1 데이터는 그대로 반환하므로 기존 타입(GraphCollabT, GraphEgoT)을 그대로 씀
+// (생성: src/python/scripts/04_export_json.py, 05_export_ego.py)
+import type {
+  CollabLink,
+  CollabNode,
+  EgoLink,
+  EgoNode,
+  GraphCollabT,
+  GraphEgoT,
+} from "../types/graph";
+
+type LinkV2 = {
+  s: number;
+  t: number;
+  w: number;
+  m: number[];
+  n?: number;
+};
+
+type GraphV2<N> = {
+  metadata?: { schema?: number };
+  schema?: number;
+  movies: string[];
+  nodes: N[];
+  links: LinkV2[];
+};
+
+const isV2 = (raw: any): raw is GraphV2<unknown> =>
+  (raw?.schema ?? raw?.metadata?.schema) === 2;
+
+// network_data.json (v1/v2) → GraphCollabT
+export const expandNetwork = (raw: any): GraphCollabT => {
+  if (!isV2(raw)) return raw as GraphCollabT;
+
+  const { movies } = raw;
+  const nodes = (raw.nodes as CollabNode[]).map((node) => ({
+    ...node,
+    id: node.label,
+  }));
+  const links: CollabLink[] = raw.links.map((link) => ({
+    source: nodes[link.s].id,
+    target: nodes[link.t].id,
+    weight: link.w,
+    movies: link.m.map((id) => movies[id]),
+    total_movies: link.n,
+  }));
+  return { nodes, links };
+};
+
+// egoGraphs 문서 (v1/v2) → GraphEgoT
+// 넘친 이웃 페이지(egoGraphs/{id}/pages/{n})는 s/t가 앞 문서들 노드까지 이어 붙인 위치이므로
+// 이미 받은 노드를 previous로 넘김 (반환 nodes는 이 문서의 노드만)
+export const expandEgoGraph = (
+  raw: any,
+  previous: EgoNode[] = []
+): GraphEgoT => {
+  if (!isV2(raw)) return { nodes: raw.nodes, links: raw.links };
+
+  const { movies } = raw;
+  const nodes = raw.nodes as EgoNode[];
+  const all = previous.length ? [...previous, ...nodes] : nodes;
+  const links: (EgoLink & { movies: string[] })[] = raw.links.map((link) => ({
+    source: all[link.s].id,
+    target: all[link.t].id,
+    weight: link.w,
+    movies: link.m.map((id) => movies[id]),
+  }));
+  return { nodes, links };
+};
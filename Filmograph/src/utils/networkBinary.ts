@@ -0,0 +1,146 @@
+// src/utils/networkBinary.ts
+// network_data.bin (열 단위 바이너리) 디코더
+// 구조: "FGNB" | uint32 헤더 길이 | 헤더 JSON | 8바이트 정렬 패딩 | 열 버퍼들
+// (생성: src/python/scripts/export_formats.py의 write_binary)
+import type { CollabLink, CollabNode, GraphCollabT } from "../types/graph";
+
+const MAGIC = "FGNB";
+const VERSION = 1;
+
+type ColumnSpec = {
+  type: "int32" | "uint32" | "float32" | "uint8" | "utf8";
+  offset: number;
+  length: number;
+  data_offset?: number;
+  data_length?: number;
+};
+
+type NetworkBinaryHeader = {
+  format: string;
+  version: number;
+  metadata: Record<string, unknown>;
+  columns: Record<string, ColumnSpec>;
+};
+
+type NumericColumn = Int32Array | Uint32Array | Float32Array | Uint8Array;
+
+// 헤더와 열 읽기 (숫자 열은 복사 없이 buffer 위의 typed array)
+export const readNetworkBinary = (buffer: ArrayBuffer) => {
+  const bytes = new Uint8Array(buffer);
+  if (
+    bytes.length < 8 ||
+    new TextDecoder().decode(bytes.subarray(0, 4)) !== MAGIC
+  ) {
+    throw new Error("network 바이너리 형식이 아닙니다");
+  }
+
+  const headerLength = new DataView(buffer).getUint32(4, true);
+  const decoder = new TextDecoder();
+  const header: NetworkBinaryHeader = JSON.parse(
+    decoder.decode(bytes.subarray(8, 8 + headerLength))
+  );
+  if (header.version !== VERSION) {
+    throw new Error(`지원하지 않는 network 바이너리 버전: ${header.version}`);
+  }
+  const body = Math.ceil((8 + headerLength) / 8) * 8;
+
+  const numeric = (name: string): NumericColumn => {
+    const spec = header.columns[name];
+    const offset = body + spec.offset;
+    switch (spec.type) {
+      case "int32":
+        return new Int32Array(buffer, offset, spec.length);
+      case "uint32":
+        return new Uint32Array(buffer, offset, spec.length);
+      case "float32":
+        return new Float32Array(buffer, offset, spec.length);
+      case "uint8":
+        return new Uint8Array(buffer, offset, spec.length);
+      default:
+        throw new Error(`숫자 열이 아닙니다: ${name}`);
+    }
+  };
+
+  const strings = (name: string): string[] => {
+    const spec = header.columns[name];
+    const offsets = new Uint32Array(buffer, body + spec.offset, spec.length + 1);
+    const data = bytes.subarray(
+      body + (spec.data_offset ?? 0),
+      body + (spec.data_offset ?? 0) + (spec.data_length ?? 0)
+    );
+    const values: string[] = new Array(spec.length);
+    for (let i = 0; i < spec.length; i++) {
+      values[i] = decoder.decode(data.subarray(offsets[i], offsets[i + 1]));
+    }
+    return values;
+  };
+
+  const has = (name: string) => name in header.columns;
+
+  return { header, numeric, strings, has };
+};
+
+// network_data.json과 같은 모양({ nodes, links })으로 변환
+export const decodeNetworkBinary = (buffer: ArrayBuffer): GraphCollabT => {
+  const { numeric, strings, has } = readNetworkBinary(buffer);
+
+  const labels = strings("node.label");
+  const roles = strings("node.role");
+  const community = numeric("node.community");
+  const degree = numeric("node.degree");
+  const moviesCount = numeric("node.movies_count");
+  const xs = has("node.x") ? numeric("node.x") : null;
+  const ys = has("node.y") ? numeric("node.y") : null;
+  // 중심성 (있는 열만, 04_export_json.py)
+  const centrality = (["pagerank", "eigenvector", "betweenness"] as const)
+    .filter((key) => has(`node.${key}`))
+    .map((key) => [key, numeric(`node.${key}`)] as const);
+
+  // JSON과 같이 소수점 한 자리 (float32 오차 제거)
+  const round1 = (value: number) => Math.round(value * 10) / 10;
+
+  const nodes: CollabNode[] = labels.map((label, i) => {
+    const node: CollabNode = {
+      id: label,
+      label,
+      community: community[i],
+      degree: degree[i],
+      movies_count: moviesCount[i],
+      role: roles[i],
+    };
+    if (xs && ys) {
+      node.x = round1(xs[i]);
+      node.y = round1(ys[i]);
+    }
+    for (const [key, values] of centrality) {
+      // JSON과 같이 유효숫자 4자리
+      node[key] = Number(values[i].toPrecision(4));
+    }
+    return node;
+  });
+
+  const source = numeric("link.source");
+  const target = numeric("link.target");
+  const weight = numeric("link.weight");
+  const totalMovies = numeric("link.total_movies");
+  const movieOffsets = numeric("link.movies.offsets");
+  const movieIds = numeric("link.movies.ids");
+  const titles = strings("movie.title");
+
+  const links: CollabLink[] = new Array(source.length);
+  for (let i = 0; i < source.length; i++) {
+    const movies: string[] = [];
+    for (let j = movieOffsets[i]; j < movieOffsets[i + 1]; j++) {
+      movies.push(titles[movieIds[j]]);
+    }
+    links[i] = {
+      source: labels[source[i]],
+      target: labels[target[i]],
+      weight: weight[i],
+      movies,
+      total_movies: totalMovies[i],
+    };
+  }
+
+  return { nodes, links };
+};
@@ -0,0 +1,129 @@
+// src/utils/networkShards.ts
+// 커뮤니티별 분할 파일 점진적 로딩 (생성: src/python/scripts/04_export_json.py)
+// - manifest.json: 개요/분할 파일 목록과 크기, 내용 해시 (?v=hash로 캐시 무효화)
+// - overview.json: 커뮤니티 하나를 노드 하나로 묶은 개요 그래프 (먼저 그림)
+// - community_<id>.json: 커뮤니티 소속 노드 + 소속 노드에 닿는 링크
+import type { CollabLink, CollabNode, GraphCollabT } from "../types/graph";
+import { expandNetwork } from "./graphSchema";
+
+const SHARD_BASE = "/graph/network_shards";
+
+export type ShardFile = {
+  file: string;
+  bytes: number;
+  hash: string;
+};
+
+export type ShardEntry = ShardFile & {
+  community: number;
+  nodes: number;
+  links: number;
+};
+
+export type ShardManifest = {
+  metadata: Record<string, unknown>;
+  overview: ShardFile;
+  shards: ShardEntry[];
+};
+
+const fetchJson = async <T>(file: string, hash?: string): Promise<T> => {
+  const res = await fetch(
+    `${SHARD_BASE}/${file}${hash ? `?v=${hash}` : ""}`,
+    hash ? undefined : { cache: "no-cache" }
+  );
+  if (!res.ok) throw new Error(`HTTP ${res.status}`);
+  return res.json() as Promise<T>;
+};
+
+export const fetchManifest = () => fetchJson<ShardManifest>("manifest.json");
+
+export const fetchOverview = (manifest: ShardManifest) =>
+  fetchJson<unknown>(manifest.overview.file, manifest.overview.hash).then(
+    expandNetwork
+  );
+
+export const fetchShard = (entry: ShardEntry) =>
+  fetchJson<unknown>(entry.file, entry.hash).then(expandNetwork);
+
+const endpointId = (endpoint: CollabLink["source"]) =>
+  typeof endpoint === "object" ? (endpoint as CollabNode).id : endpoint;
+
+// 로드된 커뮤니티는 실제 노드로, 아직인 커뮤니티는 개요 노드로 그림
+// 링크는 양 끝 노드가 모두 있을 때만 (커뮤니티 사이 링크는 두 파일에 있으므로 한 번만)
+export const mergeShards = (
+  overview: GraphCollabT,
+  loaded: Map<number, GraphCollabT>
+): GraphCollabT => {
+  const nodes: CollabNode[] = overview.nodes.filter(
+    (node) => !loaded.has(node.community ?? -1)
+  );
+  loaded.forEach((shard) => nodes.push(...shard.nodes));
+  const present = new Set(nodes.map((node) => node.id));
+
+  const links: CollabLink[] = overview.links.filter(
+    (link) =>
+      present.has(endpointId(link.source)) &&
+      present.has(endpointId(link.target))
+  );
+  const seen = new Set<string>();
+  loaded.forEach((shard) =>
+    shard.links.forEach((link) => {
+      const source = endpointId(link.source);
+      const target = endpointId(link.target);
+      const key = `${source}\u0000${target}`;
+      if (seen.has(key) || !present.has(source) || !present.has(target)) {
+        return;
+      }
+      seen.add(key);
+      links.push(link);
+    })
+  );
+
+  return { nodes, links };
+};
+
+// 개요를 먼저 보여주고 큰 커뮤니티부터 하나씩 받아 합침
+// prioritize(community)로 사용자가 고른 커뮤니티를 다음 순서로 당김
+export const createShardLoader = (
+  manifest: ShardManifest,
+  overview: GraphCollabT,
+  onUpdate: (graph: GraphCollabT) => void
+) => {
+  const loaded = new Map<number, GraphCollabT>();
+  const pending = [...manifest.shards].sort((a, b) => b.nodes - a.nodes);
+  let running = false;
+  let stopped = false;
+
+  const pump = async () => {
+    if (running) return;
+    running = true;
+    while (!stopped && pending.length) {
+      const entry = pending.shift() as ShardEntry;
+      try {
+        const shard = await fetchShard(entry);
+        if (stopped) break;
+        loaded.set(entry.community, shard);
+        onUpdate(mergeShards(overview, loaded));
+      } catch (err) {
+        console.error(`커뮤니티 ${entry.community} 로드 실패:`, err);
+      }
+    }
+    running = false;
+  };
+
+  return {
+    start: () => {
+      onUpdate(mergeShards(overview, loaded));
+      void pump();
+    },
+    prioritize: (community: number) => {
+      const index = pending.findIndex((entry) => entry.community === community);
+      if (index > 0) pending.unshift(...pending.splice(index, 1));
+    },
+    stop: () => {
+      stopped = true;
+    },
+  };
+};
+
+export type ShardLoader = ReturnType<typeof createShardLoader>;